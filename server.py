@@ -1,22 +1,28 @@
+import asyncio
+import dataclasses
+import json
 import logging
 import os
 import threading
 import time
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from itertools import islice
+from typing import Any, Dict, List, Optional
 
 import uvicorn
 
 logger = logging.getLogger(__name__)
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Query, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
 
 # Import the bot engine class
 from src.trading.engine import AlphaLoop
+from src.trading.funding import funding_store
+from src.trading.order_journal import OrderJournal
 from src.portfolio.manager import PortfolioManager, StrategyStatus
 from src.portfolio.risk import RiskIndicators
 from src.trading.strategies.funding_rate import FundingRateStrategy
@@ -26,12 +32,18 @@ from src.trading.strategies.fixed_spread import FixedSpreadStrategy
 from src.ai.evaluation.evaluator import MultiLLMEvaluator
 from src.ai.evaluation.schemas import MarketContext
 from src.ai import create_all_providers
+from src.ai.cache import get_llm_cache
+from src.ai.evaluation.store import LEADERBOARD_SORT_KEYS, get_evaluation_store
+from src.shared.config import EVALUATION_CONFIG
 
 # Import tracing utilities / 导入追踪工具
 from src.shared.tracing import generate_trace_id, set_trace_id, get_trace_id, create_request_context, hash_payload
 from src.shared.error_mapper import ErrorMapper
 from src.shared.errors import StandardErrorResponse
 from src.shared.exchange_metrics import metrics_collector, ExchangeName
+from src.shared.latency import tick_to_trade_tracker
+from src.shared.market_stats import market_stats, normalize_symbol
+from src.shared.openmetrics import CONTENT_TYPE as OPENMETRICS_CONTENT_TYPE, openmetrics_registry
 
 
 @asynccontextmanager
@@ -44,7 +56,9 @@ async def lifespan(app: FastAPI):
     init_portfolio_capital()
     yield
     # Shutdown / 关闭
-    # Add any cleanup code here if needed / 如果需要，在此添加清理代码
+    global is_running
+    is_running = False
+    bot_engine.advisor.stop(timeout=5.0)
 
 
 app = FastAPI(lifespan=lifespan)
@@ -454,11 +468,23 @@ class EvaluationRunRequest(BaseModel):
     symbol: str
     simulation_steps: int = 500
     exchange: str = "binance"  # "binance" or "hyperliquid"
+    # Return once this many providers answered / within this many seconds;
+    # providers still running are merged into the stored run when they finish
+    quorum: Optional[int] = None
+    latency_budget_seconds: Optional[float] = None
+
+
+class BatchEvaluationRequest(BaseModel):
+    symbols: List[str]
+    simulation_steps: int = 500
+    exchange: str = "binance"  # "binance" or "hyperliquid"
+    latency_budget_seconds: Optional[float] = None
 
 
 class EvaluationApplyRequest(BaseModel):
     source: str  # "consensus" or "individual"
     provider_name: Optional[str] = None
+    evaluation_id: Optional[str] = None  # None: the latest for the bot's symbol
     exchange: str = "binance"  # "binance" or "hyperliquid"
 
 
@@ -495,9 +521,14 @@ def _get_or_create_strategy_instance(
 
 def run_bot_loop():
     global is_running
-    while is_running:
-        bot_engine.run_cycle()
-        time.sleep(1)
+    # Quant/LLM analysis runs in the background so cycles never wait on it
+    bot_engine.advisor.start()
+    try:
+        while is_running:
+            bot_engine.run_cycle()
+            time.sleep(1)
+    finally:
+        bot_engine.advisor.stop(timeout=5.0)
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -948,6 +979,12 @@ async def get_suggestions():
     return suggestion
 
 
+def _get_order_journal() -> Optional[OrderJournal]:
+    """Return the engine's persistent order journal, if it has one."""
+    journal = getattr(bot_engine, "order_journal", None)
+    return journal if isinstance(journal, OrderJournal) else None
+
+
 @app.get("/api/order-history")
 async def get_order_history(
     symbol: str = None,
@@ -955,6 +992,9 @@ async def get_order_history(
     from_time: float = None,
     to_time: float = None,
     strategy_type: str = None,
+    strategy_id: str = None,
+    limit: int = Query(200, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
 ):
     """
     Get order history with optional filters
@@ -963,7 +1003,23 @@ async def get_order_history(
     :param from_time: Filter by start timestamp
     :param to_time: Filter by end timestamp
     :param strategy_type: Filter by strategy type ('fixed_spread', 'funding_rate')
-    """
+    :param strategy_id: Filter by strategy instance ID
+    :param limit: Page size (newest first)
+    :param offset: Number of matching orders to skip
+    """
+    journal = _get_order_journal()
+    if journal is not None:
+        return journal.query_orders(
+            symbol=symbol,
+            status=status,
+            strategy_id=strategy_id,
+            strategy_type=strategy_type,
+            from_time=from_time,
+            to_time=to_time,
+            limit=limit,
+            offset=offset,
+        )
+
     history = list(bot_engine.order_history)
 
     # Apply filters
@@ -977,11 +1033,13 @@ async def get_order_history(
         history = [o for o in history if o["timestamp"] <= to_time]
     if strategy_type:
         history = [o for o in history if o.get("strategy_type") == strategy_type]
+    if strategy_id:
+        history = [o for o in history if o.get("strategy_id") == strategy_id]
 
     # Sort by timestamp descending (newest first)
     history.sort(key=lambda x: x["timestamp"], reverse=True)
 
-    return history
+    return history[offset : offset + limit]
 
 
 @app.get("/api/error-history")
@@ -991,6 +1049,9 @@ async def get_error_history(
     strategy_type: str = None,
     from_time: float = None,
     to_time: float = None,
+    strategy_id: str = None,
+    limit: int = Query(200, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
 ):
     """
     Get error history with optional filters.
@@ -999,7 +1060,23 @@ async def get_error_history(
     :param strategy_type: Filter by strategy type ('fixed_spread', 'funding_rate')
     :param from_time: Filter by start timestamp (seconds since epoch)
     :param to_time: Filter by end timestamp (seconds since epoch)
-    """
+    :param strategy_id: Filter by strategy instance ID
+    :param limit: Page size (newest first)
+    :param offset: Number of matching errors to skip
+    """
+    journal = _get_order_journal()
+    if journal is not None:
+        return journal.query_errors(
+            symbol=symbol,
+            error_type=error_type,
+            strategy_id=strategy_id,
+            strategy_type=strategy_type,
+            from_time=from_time,
+            to_time=to_time,
+            limit=limit,
+            offset=offset,
+        )
+
     # AlphaLoop maintains a deque error_history; fall back to empty list if not present.
     history = list(getattr(bot_engine, "error_history", []))
 
@@ -1013,11 +1090,13 @@ async def get_error_history(
         history = [e for e in history if e.get("timestamp", 0) >= from_time]
     if to_time:
         history = [e for e in history if e.get("timestamp", 0) <= to_time]
+    if strategy_id:
+        history = [e for e in history if e.get("strategy_id") == strategy_id]
 
     # Sort newest first
     history.sort(key=lambda x: x.get("timestamp", 0), reverse=True)
 
-    return history
+    return history[offset : offset + limit]
 
 
 @app.get("/api/performance")
@@ -1098,12 +1177,16 @@ async def get_metrics(request: Request):
     - Error rates and counts
     - Recent errors with trace_ids
     - Health status
+    - Per-strategy cancel/place/amend counts per sync cycle
+    - Tick-to-trade stage latencies (p50/p90/p99)
     
     返回所有交易所的指标，包括：
     - 每种操作类型的延迟桶
     - 错误率和计数
     - 带 trace_id 的最近错误
     - 健康状态
+    - 每个策略每个同步周期的撤单/下单/改单计数
+    - 行情到成交各阶段延迟（p50/p90/p99）
     """
     trace_id = get_trace_id()
     
@@ -1118,6 +1201,8 @@ async def get_metrics(request: Request):
             "timestamp": time.time(),
             "exchanges": all_metrics,
             "health_summary": health_summary,
+            "order_actions": metrics_collector.get_order_action_summary(),
+            "tick_to_trade": tick_to_trade_tracker.get_summary(),
         }
     except Exception as e:
         logger.error(
@@ -1135,6 +1220,21 @@ async def get_metrics(request: Request):
         )
 
 
+@app.get("/metrics")
+async def get_openmetrics():
+    """
+    OpenMetrics exposition for Prometheus scraping / 供 Prometheus 抓取的 OpenMetrics 导出
+
+    Exports engine cycles, order actions, errors, positions, exchange request
+    counts/latencies and tick-to-trade stage histograms.
+    导出引擎周期、订单操作、错误、仓位、交易所请求计数/延迟以及行情到成交阶段直方图。
+    """
+    return Response(
+        content=openmetrics_registry.render(),
+        media_type=OPENMETRICS_CONTENT_TYPE,
+    )
+
+
 @app.get("/api/session-start")
 async def get_session_start():
     """
@@ -1225,12 +1325,18 @@ async def get_funding_rates():
         if exchange is None:
             return {"error": "Exchange not available"}
 
-        # Fetch bulk funding rates
-        funding_rates = exchange.fetch_bulk_funding_rates(symbols)
+        # Refresh live rates with one bulk call at most every live TTL; the
+        # response is served from the in-memory funding store
+        # 每个实时 TTL 至多一次批量调用刷新实时费率；响应从内存资金费率存储读取
+        funding_store.refresh_live(exchange, symbols)
 
         # Build response with metadata
         result = []
-        for symbol, rate in funding_rates.items():
+        for symbol in symbols:
+            funding = funding_store.get(exchange, symbol)
+            rate = funding.get("funding_rate")
+            if rate is None:
+                continue
             # Determine trading direction preference
             if rate > 0.0001:  # Positive funding rate (> 0.01%)
                 direction = "short_favored"  # Shorts receive funding
@@ -1243,8 +1349,11 @@ async def get_funding_rates():
                 {
                     "symbol": symbol,
                     "funding_rate": rate,
-                    "daily_yield": rate * 3,  # 3 funding periods per day
+                    "daily_yield": funding["daily_yield"],
                     "direction": direction,
+                    "trend": funding["trend"],
+                    "predicted_rate": funding["predicted_rate"],
+                    "annualized_carry": funding["annualized_carry"],
                     "abs_rate": abs(rate),  # For sorting
                 }
             )
@@ -1266,9 +1375,357 @@ async def get_funding_rates():
 # Multi-LLM Evaluation APIs
 # ============================================================================
 
-# Store last evaluation results for apply endpoint
-_last_evaluation_results = None
-_last_evaluation_aggregated = None
+# Runs are kept in the evaluation store (see get_evaluation_store) by ID;
+# the lock serializes late-result merges with storing the run.
+_evaluation_lock = threading.Lock()
+
+
+def _new_evaluation_run(prepared: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Bookkeeping for one run: stored ID, results and late provider results.
+    单次评估的簿记：存储 ID、结果和迟到的 Provider 结果。
+    """
+    return {"id": None, "prepared": prepared, "results": [], "late": []}
+
+
+def _merge_late_results(evaluator, run):
+    """
+    Fold provider results that arrived after the response into the stored run.
+    将响应返回后才到达的 Provider 结果合并进已存储的评估。
+
+    Must be called with _evaluation_lock held; waits until the run is stored.
+    """
+    if not run["late"] or run["id"] is None:
+        return
+    run["results"][:] = evaluator._score_and_rank(run["results"] + run["late"])
+    run["late"].clear()
+    get_evaluation_store().update(
+        run["id"], run["results"], evaluator.aggregate_results(run["results"])
+    )
+
+
+def _evaluation_result_to_dict(result) -> Dict[str, Any]:
+    """JSON view of an EvaluationResult / EvaluationResult 的 JSON 视图"""
+    return {
+        "provider_name": result.provider_name,
+        "rank": result.rank,
+        "score": result.score,
+        "latency_ms": result.latency_ms,
+        "cached": result.cached,
+        "status": result.status,
+        "proposal": {
+            "recommended_strategy": result.proposal.recommended_strategy,
+            "spread": result.proposal.spread,
+            "skew_factor": result.proposal.skew_factor,
+            "quantity": result.proposal.quantity,
+            "leverage": result.proposal.leverage,
+            "confidence": result.proposal.confidence,
+            "risk_level": result.proposal.risk_level,
+            "reasoning": result.proposal.reasoning,
+            "parse_success": result.proposal.parse_success,
+        },
+        "simulation": {
+            "realized_pnl": result.simulation.realized_pnl,
+            "total_trades": result.simulation.total_trades,
+            "win_rate": result.simulation.win_rate,
+            "sharpe_ratio": result.simulation.sharpe_ratio,
+            "max_drawdown": result.simulation.max_drawdown,
+            "funding_pnl": result.simulation.funding_pnl,
+            "simulation_steps": result.simulation.simulation_steps,
+            "paths": result.simulation.paths,
+            "confidence_intervals": result.simulation.confidence_intervals,
+        },
+    }
+
+
+def _aggregated_to_dict(agg) -> Dict[str, Any]:
+    """JSON view of an AggregatedResult / AggregatedResult 的 JSON 视图"""
+    return {
+        "strategy_consensus": {
+            "consensus_strategy": agg.strategy_consensus.consensus_strategy,
+            "consensus_level": agg.strategy_consensus.consensus_level,
+            "consensus_ratio": agg.strategy_consensus.consensus_ratio,
+            "consensus_count": agg.strategy_consensus.consensus_count,
+            "total_models": agg.strategy_consensus.total_models,
+            "strategy_votes": agg.strategy_consensus.strategy_votes,
+            "strategy_percentages": agg.strategy_consensus.strategy_percentages,
+        },
+        "consensus_confidence": agg.consensus_confidence,
+        "consensus_proposal": {
+            "recommended_strategy": agg.consensus_proposal.recommended_strategy,
+            "spread": agg.consensus_proposal.spread,
+            "skew_factor": agg.consensus_proposal.skew_factor,
+            "quantity": agg.consensus_proposal.quantity,
+            "leverage": agg.consensus_proposal.leverage,
+            "confidence": agg.consensus_proposal.confidence,
+            "reasoning": agg.consensus_proposal.reasoning,
+        },
+        "avg_pnl": agg.avg_pnl,
+        "avg_sharpe": agg.avg_sharpe,
+        "avg_win_rate": agg.avg_win_rate,
+        "avg_latency_ms": agg.avg_latency_ms,
+        "successful_evaluations": agg.successful_evaluations,
+        "failed_evaluations": agg.failed_evaluations,
+    }
+
+
+def _prepare_evaluation(
+    request: EvaluationRunRequest, market_data: Optional[Dict[str, Any]] = None
+):
+    """
+    Fetch market data and build the MarketContext for an evaluation run.
+    获取市场数据并构建评估所需的 MarketContext。
+
+    Blocking (exchange REST calls): async endpoints run it in a worker thread.
+
+    Args:
+        request: Evaluation request
+        market_data: Quote already fetched in bulk; skips the per-symbol fetch
+
+    Returns:
+        (prepared, None) with symbol, exchange, context and market_data,
+        or (None, error_response)
+    """
+    # Validate exchange parameter
+    # 验证交易所参数
+    is_valid, validation_error = _validate_exchange_parameter(request.exchange)
+    if not is_valid:
+        return None, validation_error
+
+    exchange_name = request.exchange.lower()
+
+    # Normalize symbol (remove / and :)
+    symbol = request.symbol.upper().replace("/", "").replace(":", "")
+
+    # Get exchange client by name
+    # 根据名称获取交易所客户端
+    exchange = get_exchange_by_name(exchange_name)
+
+    # Check exchange connection
+    # 检查交易所连接
+    is_connected, connection_error, status_code = _check_exchange_connection(
+        exchange_name, exchange, error_format="error"
+    )
+    if not is_connected:
+        return None, (connection_error, status_code if status_code else 400)
+
+    # Fetch market data
+    # 获取市场数据
+    try:
+        # Temporarily set symbol if needed
+        original_symbol = getattr(exchange, "symbol", None)
+        if hasattr(exchange, "set_symbol"):
+            exchange.set_symbol(symbol)
+
+        if market_data is None:
+            market_data = exchange.fetch_market_data()
+        account_data = exchange.fetch_account_data()
+        # Backfill / extend funding history when a settlement is due
+        funding_store.sync_history(exchange, symbol)
+
+        # Restore original symbol
+        if original_symbol and hasattr(exchange, "set_symbol"):
+            exchange.set_symbol(original_symbol)
+    except Exception as e:
+        error_msg = f"Failed to fetch market data: {str(e)} / 获取市场数据失败：{str(e)}"
+        return None, {"error": error_msg}
+
+    if not market_data:
+        return None, {"error": "No market data available / 无可用市场数据"}
+
+    # Build MarketContext
+    # 构建市场上下文
+    # Keys may be present with None (quotes without a book)
+    mid_price = market_data.get("mid_price") or 0.0
+    best_bid = market_data.get("best_bid") or mid_price * 0.999
+    best_ask = market_data.get("best_ask") or mid_price * 1.001
+    spread_bps = ((best_ask - best_bid) / mid_price * 10000) if mid_price > 0 else 10.0
+
+    # Get funding rate if available
+    # 获取资金费率（如果可用）
+    funding = funding_store.get(exchange, symbol)
+    funding_rate = market_data.get("funding_rate", funding.get("funding_rate") or 0.0)
+    funding_rate_trend = funding.get("trend", "stable")
+
+    # Get position and account info
+    # 获取仓位和账户信息
+    position_amt = account_data.get("position_amt", 0.0) if account_data else 0.0
+    position_side = "long" if position_amt > 0 else ("short" if position_amt < 0 else "neutral")
+    unrealized_pnl = account_data.get("unrealizedProfit", 0.0) if account_data else 0.0
+    balance = account_data.get("balance", 10000.0) if account_data else 10000.0
+    leverage = account_data.get("leverage", 1.0) if account_data else 1.0
+
+    # Get historical performance (simplified)
+    # 获取历史绩效（简化版）
+    win_rate = 0.0
+    sharpe_ratio = 0.0
+    recent_pnl = 0.0
+    if hasattr(bot_engine, "data"):
+        metrics = bot_engine.data.calculate_metrics()
+        sharpe_ratio = metrics.get("sharpe_ratio", 0.0) or 0.0
+        # Calculate win rate from trade history
+        trades = bot_engine.data.trade_history
+        if trades:
+            winning = len([t for t in trades if t.get("pnl", 0) > 0])
+            win_rate = winning / len(trades) if len(trades) > 0 else 0.0
+            recent_pnl = sum(
+                t.get("pnl", 0) for t in islice(reversed(trades), 10)
+            )  # Last 10 trades
+
+    # Realized volatility from the rolling market stats (fed by the trading
+    # loop, read-only here), defaults until warmed up
+    # 来自滚动市场统计的已实现波动率（由交易循环输入，此处只读），预热前使用默认值
+    symbol_stats = market_stats.get(symbol)
+    volatility_24h = symbol_stats.get("volatility_24h") or 0.03  # 3% default
+    volatility_1h = symbol_stats.get("volatility_1h") or 0.01   # 1% default
+
+    # Add exchange information to symbol for LLM context
+    # 在 symbol 中添加交易所信息以供 LLM 上下文使用
+    # This ensures the LLM knows which exchange the evaluation is for
+    # 这确保 LLM 知道评估是针对哪个交易所的
+    symbol_with_exchange = _format_symbol_with_exchange(symbol, exchange_name)
+
+    context = MarketContext(
+        symbol=symbol_with_exchange,  # Include exchange name in symbol for LLM context
+        mid_price=mid_price,
+        best_bid=best_bid,
+        best_ask=best_ask,
+        spread_bps=spread_bps,
+        volatility_24h=volatility_24h,
+        volatility_1h=volatility_1h,
+        funding_rate=funding_rate,
+        funding_rate_trend=funding_rate_trend,
+        current_position=position_amt,
+        position_side=position_side,
+        unrealized_pnl=unrealized_pnl,
+        available_balance=balance,
+        current_leverage=leverage,
+        win_rate=win_rate,
+        sharpe_ratio=sharpe_ratio,
+        recent_pnl=recent_pnl,
+    )
+
+    # Prepare market_data for response
+    # 准备响应中的市场数据
+    response_market_data = {
+        "symbol": symbol,
+        "mid_price": mid_price,
+        "best_bid": best_bid,
+        "best_ask": best_ask,
+        "funding_rate": funding_rate,
+        "spread_bps": spread_bps,
+    }
+
+    return {
+        "symbol": symbol,
+        "exchange": exchange_name,
+        "context": context,
+        "market_data": response_market_data,
+    }, None
+
+
+
+def _prepare_batch_evaluation(request: BatchEvaluationRequest, symbols: List[str]):
+    """
+    Prepare every symbol of a batch evaluation (blocking, run in a thread).
+    准备批量评估的每个交易对（阻塞调用，在工作线程中运行）。
+
+    Quotes come from one bulk call when the exchange client has one
+    (MarketDataPlanner's fetch_bulk_market_data); symbols it does not cover
+    fall back to the per-symbol fetch. Symbols are prepared one after another
+    because preparation switches the shared client's symbol.
+
+    Returns:
+        ({symbol: prepared}, {symbol: error}, None), or (None, None, error_response)
+        when the exchange itself is unusable
+    """
+    exchange = get_exchange_by_name(request.exchange.lower())
+    quotes: Dict[str, Dict[str, Any]] = {}
+    if callable(getattr(exchange, "fetch_bulk_market_data", None)):
+        normalized = [s.upper().replace("/", "").replace(":", "") for s in symbols]
+        try:
+            bulk = exchange.fetch_bulk_market_data(normalized)
+            if isinstance(bulk, dict):
+                quotes = {
+                    symbol: data
+                    for symbol, data in bulk.items()
+                    if isinstance(data, dict) and data.get("mid_price")
+                }
+        except Exception as e:
+            logger.warning(f"Bulk quote fetch failed, fetching per symbol: {e}")
+
+    prepared_by_symbol = {}
+    errors = {}
+    for symbol in symbols:
+        prepared, error = _prepare_evaluation(
+            EvaluationRunRequest(
+                symbol=symbol,
+                simulation_steps=request.simulation_steps,
+                exchange=request.exchange,
+            ),
+            market_data=quotes.get(symbol.upper().replace("/", "").replace(":", "")),
+        )
+        if error is None:
+            prepared_by_symbol[prepared["symbol"]] = prepared
+        elif isinstance(error, tuple):
+            # Exchange connection failure applies to every symbol
+            return None, None, error
+        else:
+            errors[symbol] = error.get("error", "Unknown error")
+    return prepared_by_symbol, errors, None
+
+def _create_evaluator(request: EvaluationRunRequest, run: Optional[Dict[str, Any]]):
+    """
+    Evaluator over all available providers; results arriving after ``run``
+    was stored are merged into it (see _merge_late_results). Batch runs pass
+    None: they do not leave providers running.
+    基于所有可用 Provider 的评估器；存储后才到达的结果合并进 ``run``。
+
+    Returns:
+        (evaluator, None) or (None, error_response)
+    """
+    try:
+        providers = create_all_providers()
+    except Exception as e:
+        return None, {"error": f"Failed to create LLM providers: {str(e)}"}
+
+    if not providers:
+        return None, {"error": "No LLM providers available. Please configure API keys."}
+
+    def on_late_result(result):
+        if run is None:
+            return
+        with _evaluation_lock:
+            run["late"].append(result)
+            _merge_late_results(evaluator, run)
+
+    evaluator = MultiLLMEvaluator(
+        providers=providers,
+        simulation_steps=request.simulation_steps,
+        parallel=True,
+        cache=get_llm_cache(),
+        quorum=getattr(request, "quorum", None),
+        latency_budget=request.latency_budget_seconds,
+        on_late_result=on_late_result,
+    )
+    return evaluator, None
+
+
+def _store_evaluation(evaluator, run, results, aggregated) -> str:
+    """
+    Record a finished run in the evaluation store / 将评估记录到评估存储
+
+    Returns:
+        The evaluation ID to pass to /api/evaluation/apply
+    """
+    prepared = run["prepared"]
+    with _evaluation_lock:
+        run["results"][:] = results
+        run["id"] = get_evaluation_store().record(
+            prepared["symbol"], prepared["exchange"], prepared["context"], results, aggregated
+        )
+        _merge_late_results(evaluator, run)
+    return run["id"]
 
 
 @app.post("/api/evaluation/run")
@@ -1285,144 +1742,32 @@ async def run_evaluation(request: EvaluationRunRequest):
         {
             "symbol": str,
             "exchange": str,
+            "evaluation_id": str,  # For /api/evaluation/apply and history
             "individual_results": List[EvaluationResult],
             "aggregated": AggregatedResult,
             "comparison_table": str,
             "consensus_report": dict,
-            "market_data": dict
+            "market_data": dict,
+            "pending_providers": List[str],  # Still running (quorum / latency budget)
+            "partial": bool
         }
     """
-    global _last_evaluation_results, _last_evaluation_aggregated
-    
     try:
-        # Validate exchange parameter
-        # 验证交易所参数
-        is_valid, validation_error = _validate_exchange_parameter(request.exchange)
-        if not is_valid:
-            return validation_error
-        
-        exchange_name = request.exchange.lower()
-        
-        # Normalize symbol (remove / and :)
-        symbol = request.symbol.upper().replace("/", "").replace(":", "")
-        
-        # Get exchange client by name
-        # 根据名称获取交易所客户端
-        exchange = get_exchange_by_name(exchange_name)
-        
-        # Check exchange connection
-        # 检查交易所连接
-        is_connected, connection_error, status_code = _check_exchange_connection(
-            exchange_name, exchange, error_format="error"
-        )
-        if not is_connected:
-            return connection_error, status_code if status_code else 400
-        
-        # Fetch market data
-        # 获取市场数据
-        try:
-            # Temporarily set symbol if needed
-            original_symbol = getattr(exchange, "symbol", None)
-            if hasattr(exchange, "set_symbol"):
-                exchange.set_symbol(symbol)
-            
-            market_data = exchange.fetch_market_data()
-            account_data = exchange.fetch_account_data()
-            
-            # Restore original symbol
-            if original_symbol and hasattr(exchange, "set_symbol"):
-                exchange.set_symbol(original_symbol)
-        except Exception as e:
-            error_msg = f"Failed to fetch market data: {str(e)} / 获取市场数据失败：{str(e)}"
-            return {"error": error_msg}
-        
-        if not market_data:
-            return {"error": "No market data available / 无可用市场数据"}
-        
-        # Build MarketContext
-        # 构建市场上下文
-        mid_price = market_data.get("mid_price", 0.0)
-        best_bid = market_data.get("best_bid", mid_price * 0.999)
-        best_ask = market_data.get("best_ask", mid_price * 1.001)
-        spread_bps = ((best_ask - best_bid) / mid_price * 10000) if mid_price > 0 else 10.0
-        
-        # Get funding rate if available
-        # 获取资金费率（如果可用）
-        funding_rate = market_data.get("funding_rate", 0.0)
-        funding_rate_trend = "stable"  # Default, could be enhanced
-        
-        # Get position and account info
-        # 获取仓位和账户信息
-        position_amt = account_data.get("position_amt", 0.0) if account_data else 0.0
-        position_side = "long" if position_amt > 0 else ("short" if position_amt < 0 else "neutral")
-        unrealized_pnl = account_data.get("unrealizedProfit", 0.0) if account_data else 0.0
-        balance = account_data.get("balance", 10000.0) if account_data else 10000.0
-        leverage = account_data.get("leverage", 1.0) if account_data else 1.0
-        
-        # Get historical performance (simplified)
-        # 获取历史绩效（简化版）
-        win_rate = 0.0
-        sharpe_ratio = 0.0
-        recent_pnl = 0.0
-        if hasattr(bot_engine, "data"):
-            metrics = bot_engine.data.calculate_metrics()
-            sharpe_ratio = metrics.get("sharpe_ratio", 0.0) or 0.0
-            # Calculate win rate from trade history
-            trades = bot_engine.data.trade_history
-            if trades:
-                winning = len([t for t in trades if t.get("pnl", 0) > 0])
-                win_rate = winning / len(trades) if len(trades) > 0 else 0.0
-                recent_pnl = sum(t.get("pnl", 0) for t in trades[-10:])  # Last 10 trades
-        
-        # Estimate volatility (simplified - could be enhanced)
-        # 估算波动率（简化版 - 可以增强）
-        volatility_24h = 0.03  # 3% default
-        volatility_1h = 0.01   # 1% default
-        
-        # Add exchange information to symbol for LLM context
-        # 在 symbol 中添加交易所信息以供 LLM 上下文使用
-        # This ensures the LLM knows which exchange the evaluation is for
-        # 这确保 LLM 知道评估是针对哪个交易所的
-        symbol_with_exchange = _format_symbol_with_exchange(symbol, exchange_name)
-        
-        context = MarketContext(
-            symbol=symbol_with_exchange,  # Include exchange name in symbol for LLM context
-            mid_price=mid_price,
-            best_bid=best_bid,
-            best_ask=best_ask,
-            spread_bps=spread_bps,
-            volatility_24h=volatility_24h,
-            volatility_1h=volatility_1h,
-            funding_rate=funding_rate,
-            funding_rate_trend=funding_rate_trend,
-            current_position=position_amt,
-            position_side=position_side,
-            unrealized_pnl=unrealized_pnl,
-            available_balance=balance,
-            current_leverage=leverage,
-            win_rate=win_rate,
-            sharpe_ratio=sharpe_ratio,
-            recent_pnl=recent_pnl,
-        )
-        
-        # Create evaluator with all available providers
-        try:
-            providers = create_all_providers()
-        except Exception as e:
-            return {"error": f"Failed to create LLM providers: {str(e)}"}
-        
-        if not providers:
-            return {"error": "No LLM providers available. Please configure API keys."}
-        
-        evaluator = MultiLLMEvaluator(
-            providers=providers,
-            simulation_steps=request.simulation_steps,
-            parallel=True,
-        )
-        
-        # Run evaluation (in thread to avoid blocking)
-        import asyncio
-        results = await asyncio.to_thread(evaluator.evaluate, context)
+        # Exchange REST calls must not block the event loop
+        prepared, error = await asyncio.to_thread(_prepare_evaluation, request)
+        if error is not None:
+            return error
+
+        # Providers finishing after the response are merged into the stored run
+        # 响应之后完成的 Provider 结果合并进已存储的评估
+        run = _new_evaluation_run(prepared)
+        evaluator, error = _create_evaluator(request, run)
+        if error is not None:
+            return error
+        
+        # Run evaluation on the event loop through the async provider clients
+        pending_providers = []
+        results = await evaluator.aevaluate(prepared["context"], pending=pending_providers)
         
         # Aggregate results
         aggregated = evaluator.aggregate_results(results)
@@ -1431,85 +1776,20 @@ async def run_evaluation(request: EvaluationRunRequest):
         comparison_table = MultiLLMEvaluator.generate_comparison_table(results)
         consensus_report = MultiLLMEvaluator.generate_consensus_summary(aggregated)
         
-        # Store results for apply endpoint
-        _last_evaluation_results = results
-        _last_evaluation_aggregated = aggregated
-        
-        # Convert results to dict for JSON response
-        def result_to_dict(result):
-            return {
-                "provider_name": result.provider_name,
-                "rank": result.rank,
-                "score": result.score,
-                "latency_ms": result.latency_ms,
-                "proposal": {
-                    "recommended_strategy": result.proposal.recommended_strategy,
-                    "spread": result.proposal.spread,
-                    "skew_factor": result.proposal.skew_factor,
-                    "quantity": result.proposal.quantity,
-                    "leverage": result.proposal.leverage,
-                    "confidence": result.proposal.confidence,
-                    "risk_level": result.proposal.risk_level,
-                    "reasoning": result.proposal.reasoning,
-                    "parse_success": result.proposal.parse_success,
-                },
-                "simulation": {
-                    "realized_pnl": result.simulation.realized_pnl,
-                    "total_trades": result.simulation.total_trades,
-                    "win_rate": result.simulation.win_rate,
-                    "sharpe_ratio": result.simulation.sharpe_ratio,
-                    "simulation_steps": result.simulation.simulation_steps,
-                },
-            }
-        
-        def aggregated_to_dict(agg):
-            return {
-                "strategy_consensus": {
-                    "consensus_strategy": agg.strategy_consensus.consensus_strategy,
-                    "consensus_level": agg.strategy_consensus.consensus_level,
-                    "consensus_ratio": agg.strategy_consensus.consensus_ratio,
-                    "consensus_count": agg.strategy_consensus.consensus_count,
-                    "total_models": agg.strategy_consensus.total_models,
-                    "strategy_votes": agg.strategy_consensus.strategy_votes,
-                    "strategy_percentages": agg.strategy_consensus.strategy_percentages,
-                },
-                "consensus_confidence": agg.consensus_confidence,
-                "consensus_proposal": {
-                    "recommended_strategy": agg.consensus_proposal.recommended_strategy,
-                    "spread": agg.consensus_proposal.spread,
-                    "skew_factor": agg.consensus_proposal.skew_factor,
-                    "quantity": agg.consensus_proposal.quantity,
-                    "leverage": agg.consensus_proposal.leverage,
-                    "confidence": agg.consensus_proposal.confidence,
-                    "reasoning": agg.consensus_proposal.reasoning,
-                },
-                "avg_pnl": agg.avg_pnl,
-                "avg_sharpe": agg.avg_sharpe,
-                "avg_win_rate": agg.avg_win_rate,
-                "avg_latency_ms": agg.avg_latency_ms,
-                "successful_evaluations": agg.successful_evaluations,
-                "failed_evaluations": agg.failed_evaluations,
-            }
-        
-        # Prepare market_data for response
-        # 准备响应中的市场数据
-        response_market_data = {
-            "symbol": symbol,
-            "mid_price": mid_price,
-            "best_bid": best_bid,
-            "best_ask": best_ask,
-            "funding_rate": funding_rate,
-            "spread_bps": spread_bps,
-        }
+        # Store the run for history and the apply endpoint
+        evaluation_id = _store_evaluation(evaluator, run, results, aggregated)
         
         return {
-            "symbol": symbol,
-            "exchange": exchange_name,
-            "individual_results": [result_to_dict(r) for r in results],
-            "aggregated": aggregated_to_dict(aggregated),
+            "symbol": prepared["symbol"],
+            "exchange": prepared["exchange"],
+            "evaluation_id": evaluation_id,
+            "individual_results": [_evaluation_result_to_dict(r) for r in results],
+            "aggregated": _aggregated_to_dict(aggregated),
             "comparison_table": comparison_table,
             "consensus_report": {"summary": consensus_report},
-            "market_data": response_market_data,
+            "market_data": prepared["market_data"],
+            "pending_providers": pending_providers,
+            "partial": bool(pending_providers),
         }
         
     except Exception as e:
@@ -1517,6 +1797,240 @@ async def run_evaluation(request: EvaluationRunRequest):
         return {"error": str(e)}
 
 
+@app.post("/api/evaluation/stream")
+async def stream_evaluation(request: EvaluationRunRequest):
+    """
+    Streaming variant of /api/evaluation/run (NDJSON, one event per line).
+
+    流式多 LLM 评估（NDJSON，每行一个事件）
+
+    Events, in the order they become available:
+        {"event": "start", "symbol", "exchange", "market_data", "providers"}
+        {"event": "proposal", "result"}      # parsed proposal, simulation pending
+        {"event": "simulation", "result"}    # simulated and scored result
+        {"event": "consensus", "aggregated"} # consensus over results so far
+        {"event": "done", "evaluation_id", "ranking", "pending_providers", "partial"}
+        {"event": "error", "error"}
+
+    Setup errors (exchange, market data, providers) are returned as a plain
+    JSON error like /api/evaluation/run. quorum is not used: results stream
+    as they arrive; latency_budget_seconds still ends the stream early.
+    """
+    try:
+        # Exchange REST calls must not block the event loop
+        prepared, error = await asyncio.to_thread(_prepare_evaluation, request)
+        if error is not None:
+            return error
+        run = _new_evaluation_run(prepared)
+        evaluator, error = _create_evaluator(request, run)
+        if error is not None:
+            return error
+    except Exception as e:
+        logger.error(f"Evaluation error: {e}", exc_info=True)
+        return {"error": str(e)}
+
+    def line(payload: Dict[str, Any]) -> str:
+        return json.dumps(payload, default=str) + "\n"
+
+    def events():
+        yield line(
+            {
+                "event": "start",
+                "symbol": prepared["symbol"],
+                "exchange": prepared["exchange"],
+                "market_data": prepared["market_data"],
+                "providers": [provider.name for provider in evaluator.providers],
+            }
+        )
+        try:
+            for event, payload in evaluator.evaluate_stream(prepared["context"]):
+                if event == "proposal":
+                    yield line({"event": "proposal", "result": _evaluation_result_to_dict(payload)})
+                elif event == "result":
+                    yield line({"event": "simulation", "result": _evaluation_result_to_dict(payload)})
+                elif event == "consensus":
+                    yield line({"event": "consensus", "aggregated": _aggregated_to_dict(payload)})
+                elif event == "done":
+                    aggregated = evaluator.aggregate_results(payload)
+                    evaluation_id = _store_evaluation(evaluator, run, payload, aggregated)
+                    yield line(
+                        {
+                            "event": "done",
+                            "evaluation_id": evaluation_id,
+                            "ranking": [
+                                {
+                                    "provider_name": r.provider_name,
+                                    "rank": r.rank,
+                                    "score": r.score,
+                                }
+                                for r in payload
+                            ],
+                            "pending_providers": list(evaluator.pending_providers),
+                            "partial": bool(evaluator.pending_providers),
+                        }
+                    )
+        except Exception as e:
+            logger.error(f"Streaming evaluation error: {e}", exc_info=True)
+            yield line({"event": "error", "error": str(e)})
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+@app.post("/api/evaluation/batch")
+async def batch_evaluation(request: BatchEvaluationRequest):
+    """
+    Screen a watchlist: one LLM call per provider for all symbols.
+    批量评估多个交易对：每个 Provider 只调用一次。
+
+    Each provider gets a single prompt with a shared static prefix and a
+    compact per-symbol table, and answers with a JSON array of proposals.
+    Each symbol is stored as its own evaluation.
+
+    Returns:
+        {
+            "symbols": List[str],
+            "results": {symbol: {"evaluation_id", "individual_results", "aggregated", ...}},
+            "errors": {symbol: str},  # Symbols whose market data failed
+            "provider_calls": int,
+            "pending_providers": List[str],
+            "partial": bool
+        }
+    """
+    try:
+        symbols = list(dict.fromkeys(s for s in request.symbols if s.strip()))
+        if not symbols:
+            return {"error": "No symbols provided / 未提供交易对"}
+        limit = EVALUATION_CONFIG["max_batch_symbols"]
+        if len(symbols) > limit:
+            return {"error": f"Too many symbols ({len(symbols)} > {limit})"}
+        is_valid, validation_error = _validate_exchange_parameter(request.exchange)
+        if not is_valid:
+            return validation_error
+
+        prepared_by_symbol, errors, error = await asyncio.to_thread(
+            _prepare_batch_evaluation, request, symbols
+        )
+        if error is not None:
+            return error
+        if not prepared_by_symbol:
+            return {"symbols": symbols, "results": {}, "errors": errors}
+
+        evaluator, error = _create_evaluator(request, None)
+        if error is not None:
+            return error
+
+        # One exchange per batch: key rows by the bare symbol the LLM echoes back
+        contexts = [
+            dataclasses.replace(prepared["context"], symbol=symbol)
+            for symbol, prepared in prepared_by_symbol.items()
+        ]
+        by_symbol = await evaluator.aevaluate_batch(
+            contexts, latency_budget=request.latency_budget_seconds
+        )
+        pending_providers = list(evaluator.pending_providers)
+
+        store = get_evaluation_store()
+        results = {}
+        for symbol, symbol_results in by_symbol.items():
+            prepared = prepared_by_symbol[symbol]
+            aggregated = evaluator.aggregate_results(symbol_results)
+            results[symbol] = {
+                "evaluation_id": store.record(
+                    symbol, prepared["exchange"], prepared["context"], symbol_results, aggregated
+                ),
+                "individual_results": [_evaluation_result_to_dict(r) for r in symbol_results],
+                "aggregated": _aggregated_to_dict(aggregated),
+                "market_data": prepared["market_data"],
+            }
+
+        return {
+            "symbols": list(results),
+            "results": results,
+            "errors": errors,
+            "provider_calls": len(evaluator.providers),
+            "pending_providers": pending_providers,
+            "partial": bool(pending_providers),
+        }
+
+    except Exception as e:
+        logger.error(f"Batch evaluation error: {e}", exc_info=True)
+        return {"error": str(e)}
+
+
+@app.get("/api/evaluation/history")
+async def get_evaluation_history(
+    symbol: Optional[str] = None,
+    provider: Optional[str] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    limit: int = Query(50, ge=1, le=500),
+):
+    """
+    Stored evaluation runs, newest first.
+    查询历史评估记录（最新在前）。
+
+    Args:
+        symbol: Only runs for this symbol
+        provider: Only runs this provider took part in
+        since / until: Epoch-second bounds on the run time
+
+    Returns:
+        {"evaluations": [{"id", "symbol", "exchange", "created_at",
+                          "consensus_strategy", "applied", ...}]}
+    """
+    try:
+        return {
+            "evaluations": get_evaluation_store().query(
+                symbol=symbol, provider=provider, since=since, until=until, limit=limit
+            )
+        }
+    except Exception as e:
+        logger.error(f"Evaluation history error: {e}", exc_info=True)
+        return {"error": str(e)}
+
+
+@app.get("/api/evaluation/leaderboard")
+async def get_evaluation_leaderboard(symbol: Optional[str] = None, sort_by: str = "avg_score"):
+    """
+    Provider accuracy leaderboard, maintained incrementally as runs are stored.
+    Provider 准确度排行榜（随评估写入增量维护）。
+
+    Args:
+        symbol: Only count runs for this symbol
+        sort_by: avg_score, win_rate, consensus_rate, valid_rate, avg_pnl,
+                 avg_latency_ms (ascending) or runs
+
+    Returns:
+        {"symbol", "sort_by", "providers": [{"rank", "provider", "runs",
+         "valid_rate", "win_rate", "consensus_rate", "applied", "avg_score",
+         "avg_pnl", "avg_latency_ms"}]}
+    """
+    if sort_by not in LEADERBOARD_SORT_KEYS:
+        return {"error": f"Invalid sort_by: {sort_by}. Use one of {', '.join(LEADERBOARD_SORT_KEYS)}"}
+    try:
+        return {
+            "symbol": symbol,
+            "sort_by": sort_by,
+            "providers": get_evaluation_store().leaderboard(symbol=symbol, sort_by=sort_by),
+        }
+    except Exception as e:
+        logger.error(f"Evaluation leaderboard error: {e}", exc_info=True)
+        return {"error": str(e)}
+
+
+@app.get("/api/evaluation/{evaluation_id}")
+async def get_evaluation(evaluation_id: str):
+    """
+    One stored run: context, every provider's proposal and simulation,
+    the aggregated consensus and the applied decision.
+    获取单次评估的完整记录。
+    """
+    evaluation = get_evaluation_store().get(evaluation_id)
+    if evaluation is None:
+        return {"error": f"Evaluation {evaluation_id} not found / 未找到评估 {evaluation_id}"}
+    return evaluation
+
+
 @app.post("/api/evaluation/apply")
 async def apply_evaluation(request: EvaluationApplyRequest):
     """
@@ -1526,11 +2040,18 @@ async def apply_evaluation(request: EvaluationApplyRequest):
     
     Args:
         request: EvaluationApplyRequest with source ("consensus" or "individual"), 
-                 optional provider_name, and exchange parameter
+                 optional provider_name, optional evaluation_id (defaults to
+                 the most recent evaluation of the bot's symbol on this
+                 exchange) and exchange parameter
+
+    The run must have been made for the symbol and exchange the bot trades;
+    applying another market's proposal is refused.
+    评估必须针对机器人当前交易的交易对和交易所，否则拒绝应用。
         
     Returns:
         {
             "status": "success" or "error",
+            "evaluation_id": str,
             "applied_config": {
                 "strategy_type": str,
                 "spread": float,
@@ -1542,8 +2063,6 @@ async def apply_evaluation(request: EvaluationApplyRequest):
             "message": str (bilingual: English and Chinese)
         }
     """
-    global _last_evaluation_results, _last_evaluation_aggregated
-    
     # Validate exchange parameter
     # 验证交易所参数
     is_valid, validation_error = _validate_exchange_parameter(request.exchange)
@@ -1555,27 +2074,62 @@ async def apply_evaluation(request: EvaluationApplyRequest):
     
     exchange_name = request.exchange.lower()
     
-    if _last_evaluation_aggregated is None:
-        return {
-            "status": "error",
-            "error": "No evaluation results available. Please run evaluation first. / 没有可用的评估结果。请先运行评估。"
-        }
-    
     try:
+        exchange = get_exchange_by_name(exchange_name)
         # Check exchange connection if hyperliquid
         # 如果是 hyperliquid，检查交易所连接
         if exchange_name == "hyperliquid":
-            exchange = get_exchange_by_name(exchange_name)
             is_connected, connection_error, status_code = _check_exchange_connection(
                 exchange_name, exchange, error_format="status"
             )
             if not is_connected:
                 return connection_error, status_code if status_code else 400
-        
+
+        # The proposal configures the default instance: it must be for its market
+        # 建议将应用到默认实例：评估必须针对其市场
+        default_instance = bot_engine.strategy_instances.get("default")
+        bot_symbol = getattr(default_instance, "symbol", None) or getattr(
+            exchange, "symbol", None
+        )
+        if not isinstance(bot_symbol, str):
+            return {
+                "status": "error",
+                "error": "Cannot determine the bot's trading symbol / 无法确定机器人的交易对",
+            }
+        bot_symbol = normalize_symbol(bot_symbol)
+
+        store = get_evaluation_store()
+        evaluation_id = request.evaluation_id or store.latest_id(bot_symbol, exchange_name)
+        if evaluation_id is None:
+            return {
+                "status": "error",
+                "error": (
+                    f"No evaluation results for {bot_symbol} on {exchange_name}. Please run evaluation first. / "
+                    f"没有 {exchange_name} 上 {bot_symbol} 的评估结果。请先运行评估。"
+                ),
+            }
+        target = store.get_target(evaluation_id)
+        if target is None:
+            return {
+                "status": "error",
+                "error": f"Evaluation {evaluation_id} not found / 未找到评估 {evaluation_id}"
+            }
+        if normalize_symbol(target["symbol"]) != bot_symbol or target["exchange"] != exchange_name:
+            return {
+                "status": "error",
+                "error": (
+                    f"Evaluation {evaluation_id} is for {target['symbol']} on {target['exchange']}, "
+                    f"but the bot trades {bot_symbol} on {exchange_name} / "
+                    f"评估 {evaluation_id} 针对 {target['exchange']} 上的 {target['symbol']}，"
+                    f"但机器人交易的是 {exchange_name} 上的 {bot_symbol}"
+                ),
+                "exchange": exchange_name,
+            }
+
         proposal = None
         
         if request.source == "consensus":
-            proposal = _last_evaluation_aggregated.consensus_proposal
+            proposal = store.get_proposal(evaluation_id)
         elif request.source == "individual":
             if not request.provider_name:
                 return {
@@ -1584,14 +2138,9 @@ async def apply_evaluation(request: EvaluationApplyRequest):
                 }
             
             # Find result by provider name
-            found = False
-            for result in _last_evaluation_results:
-                if result.provider_name == request.provider_name:
-                    proposal = result.proposal
-                    found = True
-                    break
+            proposal = store.get_proposal(evaluation_id, request.provider_name)
             
-            if not found:
+            if proposal is None:
                 return {
                     "status": "error",
                     "error": f"Provider {request.provider_name} not found in evaluation results / 在评估结果中未找到提供商 {request.provider_name}"
@@ -1650,6 +2199,20 @@ async def apply_evaluation(request: EvaluationApplyRequest):
                     "exchange": exchange_name,
                 }
         
+        applied_config = {
+            "strategy_type": strategy_type,
+            "spread": proposal.spread,
+            "skew_factor": proposal.skew_factor,
+            "quantity": proposal.quantity,
+            "leverage": proposal.leverage,
+        }
+        store.mark_applied(
+            evaluation_id,
+            request.source,
+            request.provider_name if request.source == "individual" else None,
+            applied_config,
+        )
+        
         # Success message in bilingual format
         # 双语格式的成功消息
         success_message = (
@@ -1659,13 +2222,8 @@ async def apply_evaluation(request: EvaluationApplyRequest):
         
         return {
             "status": "success",
-            "applied_config": {
-                "strategy_type": strategy_type,
-                "spread": proposal.spread,
-                "skew_factor": proposal.skew_factor,
-                "quantity": proposal.quantity,
-                "leverage": proposal.leverage,
-            },
+            "evaluation_id": evaluation_id,
+            "applied_config": applied_config,
             "exchange": exchange_name,
             "message": success_message,
         }
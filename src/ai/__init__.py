@@ -4,10 +4,12 @@
 """
 AI module components:
 - llm: LLM providers (Gemini, OpenAI, Claude)
+- cache: Content-addressed LLM response cache
 - agents/: Trading agents (data, quant, risk)
 - evaluation/: Multi-LLM evaluation framework
 """
 
+from src.ai.cache import LLMResponseCache, get_llm_cache
 from src.ai.llm import (
     ClaudeProvider,
     GeminiProvider,
@@ -24,6 +26,8 @@ __all__ = [
     "OpenAIProvider",
     "ClaudeProvider",
     "LLMGateway",
+    "LLMResponseCache",
+    "get_llm_cache",
     "create_all_providers",
     "create_provider",
 ]
@@ -7,9 +7,11 @@ Ingests market data and calculates metrics.
 Owner: Agent AI
 """
 
+from collections import deque
+
 import numpy as np
 
-from src.shared.config import METRICS_CONFIG
+from src.shared.config import DATA_HISTORY_SIZE, METRICS_CONFIG
 from src.shared.logger import setup_logger
 from src.shared.metrics.definitions import (
     FillRate,
@@ -18,6 +20,7 @@ from src.shared.metrics.definitions import (
     TickToTradeLatency,
 )
 from src.shared.metrics.registry import MetricsRegistry
+from src.shared.ring_buffer import RingBuffer
 
 logger = setup_logger("DataAgent")
 
@@ -25,9 +28,15 @@ logger = setup_logger("DataAgent")
 class DataAgent:
     """Agent for data ingestion and metrics calculation."""
 
-    def __init__(self):
-        self.trade_history = []
-        self.price_history = []
+    def __init__(self, history_size: int = DATA_HISTORY_SIZE):
+        """
+        Args:
+            history_size: Number of prices / trades kept
+        """
+        # Trade dicts for display; PnLs mirrored in a typed buffer for metrics
+        self.trade_history = deque(maxlen=history_size)
+        self.trade_pnls = RingBuffer(history_size)
+        self.price_history = RingBuffer(history_size)
         self.registry = MetricsRegistry()
         self._register_metrics()
 
@@ -59,11 +68,15 @@ class DataAgent:
         Ingests market data and trades for analysis.
 
         Args:
-            market_data: Dict with 'price' key
+            market_data: Dict with 'price' key (None when no price is known)
             trades: List of trade dicts
         """
-        self.price_history.append(market_data["price"])
+        price = market_data.get("price")
+        if price is not None:
+            self.price_history.append(price)
         self.trade_history.extend(trades)
+        for trade in trades:
+            self.trade_pnls.append(trade.get("pnl", 0.0))
 
     def calculate_metrics(self):
         """
@@ -72,7 +85,11 @@ class DataAgent:
         Returns:
             Dict of metric names to values
         """
-        data_context = {"trades": self.trade_history, "prices": self.price_history}
+        data_context = {
+            "trades": self.trade_history,
+            "trade_pnls": self.trade_pnls.view(),
+            "prices": self.price_history.view(),
+        }
 
         metrics = self.registry.calculate_all(data_context)
         logger.info("Calculated Metrics", extra={"extra_data": metrics})
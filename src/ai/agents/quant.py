@@ -7,8 +7,7 @@ Analyzes performance and proposes strategy changes.
 Owner: Agent AI
 """
 
-import json
-
+from src.ai.cache import get_llm_cache
 from src.ai.llm import GeminiProvider, LLMGateway
 from src.shared.logger import setup_logger
 
@@ -22,7 +21,9 @@ class QuantAgent:
         self.gateway = gateway
         if not self.gateway:
             try:
-                self.gateway = LLMGateway(GeminiProvider())
+                self.gateway = LLMGateway(
+                    GeminiProvider(), cache=get_llm_cache(), bucket_prompt=True
+                )
             except Exception as e:
                 logger.warning(
                     f"LLM Gateway initialization failed: {e}. Using rule-based fallback."
@@ -62,13 +63,26 @@ class QuantAgent:
         Return ONLY a JSON object with keys: "spread" (float), "reasoning" (string).
         Example: {{"spread": 0.015, "reasoning": "High volatility detected"}}
         """
+        # Imported here: src.ai.evaluation pulls in src.trading, whose engine imports us
+        from src.ai.evaluation.parsing import (
+            ExtractionError,
+            coerce_proposal,
+            extract_json,
+            record_parse_failure,
+        )
+
         response = self.gateway.generate(prompt)
-        clean_response = response.replace("```json", "").replace("```", "").strip()
-        data = json.loads(clean_response)
+        try:
+            proposal = coerce_proposal(
+                extract_json(response), response, required=("spread",)
+            )
+        except ExtractionError as e:
+            record_parse_failure("quant", e.reason)
+            raise
 
-        new_spread = float(data["spread"])
+        new_spread = proposal.spread
         logger.info(
-            f"LLM Proposal: Spread {new_spread:.4f}. Reason: {data.get('reasoning')}"
+            f"LLM Proposal: Spread {new_spread:.4f}. Reason: {proposal.reasoning}"
         )
         return {"spread": new_spread}
 
@@ -0,0 +1,374 @@
+"""
+LLM Response Cache / LLM 响应缓存
+
+Content-addressed cache in front of ``LLMProvider.generate``.
+位于 ``LLMProvider.generate`` 之前的内容寻址缓存。
+
+Owner: Agent AI
+
+Entries are keyed by a SHA-256 of provider, model and the whitespace-
+normalized prompt. Numbers can be bucketed to significant digits, either
+inside the prompt text or in an explicit context dict (e.g. a MarketContext),
+so repeated requests for the same market state share an entry. The default
+precision (6 digits) only merges sub-tick noise; coarser bucketing, where
+e.g. mid prices 3012 and 3049 share an answer, is opt-in. Entries
+expire after a TTL; the in-memory tier is LRU-bounded and backed by SQLite
+so cached answers survive restarts.
+缓存键为提供者、模型和规范化 prompt 的 SHA-256。数字可按有效位数分桶（prompt 文本或显式上下文），
+使相同的市场状态共享条目；默认精度（6 位）只合并低于最小价位的噪声，更粗的分桶需显式启用。条目按 TTL 过期；内存层按 LRU 限制容量，并以 SQLite 持久化。
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from src.shared.config import LLM_CACHE
+from src.shared.logger import setup_logger
+from src.shared.openmetrics import openmetrics_registry
+
+logger = setup_logger("LLMCache")
+
+_NUMBER = re.compile(r"-?\d[\d,]*(?:\.\d+)?(?:[eE][-+]?\d+)?")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    provider TEXT,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_expires ON llm_cache(expires_at);
+"""
+
+_LOOKUPS = openmetrics_registry.counter(
+    "mm_llm_cache_lookups",
+    "LLM response cache lookups by outcome",
+    ("provider", "outcome"),
+)
+_ENTRIES = openmetrics_registry.gauge(
+    "mm_llm_cache_entries", "LLM responses held in the in-memory cache tier"
+)
+
+
+def bucket_number(value: float, significant_digits: int) -> float:
+    """Round to ``significant_digits`` significant digits / 按有效位数取整"""
+    if not math.isfinite(value) or value == 0:
+        return value
+    return float(f"{value:.{significant_digits}g}")
+
+
+def bucket_context(context: Dict[str, Any], significant_digits: int) -> Dict[str, Any]:
+    """
+    Bucket numeric fields of a context dict (other values are kept).
+    对上下文字典中的数值字段分桶（其他值保持不变）。
+    """
+    bucketed = {}
+    for key in sorted(context):
+        value = context[key]
+        if isinstance(value, float) or (
+            isinstance(value, int) and not isinstance(value, bool)
+        ):
+            value = bucket_number(float(value), significant_digits)
+        elif not isinstance(value, (str, bool, type(None))):
+            value = str(value)
+        bucketed[key] = value
+    return bucketed
+
+
+def normalize_prompt(prompt: str, significant_digits: Optional[int] = None) -> str:
+    """
+    Collapse whitespace and optionally bucket every number in the prompt.
+    合并空白，并可选地对 prompt 中的每个数字分桶。
+    """
+    text = " ".join(prompt.split())
+    if significant_digits is None:
+        return text
+
+    def _bucket(match: "re.Match") -> str:
+        try:
+            value = float(match.group(0).replace(",", ""))
+        except ValueError:
+            return match.group(0)
+        return f"{bucket_number(value, significant_digits):g}"
+
+    return _NUMBER.sub(_bucket, text)
+
+
+def cache_key(
+    provider: str,
+    model: str,
+    prompt: str,
+    context: Optional[Dict[str, Any]] = None,
+    significant_digits: Optional[int] = None,
+) -> str:
+    """
+    Content address of a request / 请求的内容地址
+
+    With a context, numbers in the prompt are masked and the bucketed context
+    stands in for them, so the key tracks the prompt template plus the state.
+    """
+    payload: Dict[str, Any] = {"provider": provider, "model": model}
+    if context is not None:
+        payload["prompt"] = _NUMBER.sub("#", " ".join(prompt.split()))
+        payload["context"] = bucket_context(
+            context, significant_digits or LLM_CACHE["significant_digits"]
+        )
+    else:
+        payload["prompt"] = normalize_prompt(prompt, significant_digits)
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    TTL + LRU response cache with an optional SQLite backing store.
+    带可选 SQLite 持久化的 TTL + LRU 响应缓存。
+
+    Only successful responses are stored; provider errors always propagate.
+    Disk failures are logged and the cache degrades to memory only.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = LLM_CACHE["ttl_seconds"],
+        max_entries: int = LLM_CACHE["max_entries"],
+        path: Optional[str] = None,
+        significant_digits: int = LLM_CACHE["significant_digits"],
+        clock=time.time,
+    ):
+        """
+        Args:
+            ttl_seconds: Lifetime of an entry
+            max_entries: Entries kept in memory before LRU eviction
+            path: SQLite file for the backing store, None for memory only
+            significant_digits: Digits kept when bucketing numbers
+            clock: Time source (wall clock, as entries persist across runs)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.significant_digits = significant_digits
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        if path:
+            self._open(path)
+
+    def _open(self, path: str) -> None:
+        try:
+            if path != ":memory:":
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False)
+            if path != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            conn.execute(
+                "DELETE FROM llm_cache WHERE expires_at <= ?", (self._clock(),)
+            )
+            conn.commit()
+            self._conn = conn
+        except sqlite3.Error as e:
+            logger.error(f"Failed to open LLM cache at {path}: {e}. Using memory only.")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def key(
+        self,
+        provider: str,
+        model: str,
+        prompt: str,
+        context: Optional[Dict[str, Any]] = None,
+        bucket_prompt: bool = False,
+    ) -> str:
+        """Cache key for a request (see cache_key) / 请求的缓存键"""
+        return cache_key(
+            provider,
+            model,
+            prompt,
+            context=context,
+            significant_digits=(
+                self.significant_digits
+                if bucket_prompt or context is not None
+                else None
+            ),
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response, or None if missing or expired / 获取缓存响应"""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, response = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    return response
+                del self._entries[key]
+            if self._conn is None:
+                return None
+            try:
+                row = self._conn.execute(
+                    "SELECT response, expires_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.error(f"LLM cache read failed: {e}")
+                return None
+            if row is None or row[1] <= now:
+                return None
+            self._store(key, row[0], row[1])
+            return row[0]
+
+    def put(self, key: str, response: str, provider: str = "") -> None:
+        """Store a response / 存储响应"""
+        now = self._clock()
+        expires_at = now + self.ttl_seconds
+        with self._lock:
+            self._store(key, response, expires_at)
+            if self._conn is None:
+                return
+            try:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO llm_cache "
+                        "(key, provider, response, created_at, expires_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (key, provider, response, now, expires_at),
+                    )
+                    self._conn.execute(
+                        "DELETE FROM llm_cache WHERE expires_at <= ?", (now,)
+                    )
+            except sqlite3.Error as e:
+                logger.error(f"LLM cache write failed: {e}")
+
+    def _store(self, key: str, response: str, expires_at: float) -> None:
+        self._entries[key] = (expires_at, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def generate(
+        self,
+        provider,
+        prompt: str,
+        context: Optional[Dict[str, Any]] = None,
+        bucket_prompt: bool = False,
+    ) -> Tuple[str, bool]:
+        """
+        Return a cached response or call ``provider.generate`` and cache it.
+        返回缓存响应，或调用 ``provider.generate`` 并缓存结果。
+
+        Returns:
+            (response, cache_hit)
+        """
+        key, response = self._lookup(provider, prompt, context, bucket_prompt)
+        if response is not None:
+            return response, True
+        response = provider.generate(prompt)
+        if isinstance(response, str):
+            self.put(key, response, provider=provider.name)
+        return response, False
+
+    async def agenerate(
+        self,
+        provider,
+        prompt: str,
+        context: Optional[Dict[str, Any]] = None,
+        bucket_prompt: bool = False,
+    ) -> Tuple[str, bool]:
+        """
+        Async ``generate``: awaits the provider on a miss (see llm.agenerate).
+        异步版 ``generate``：未命中时等待 Provider 的异步调用。
+
+        Returns:
+            (response, cache_hit)
+        """
+        from src.ai.llm import agenerate
+
+        key, response = self._lookup(provider, prompt, context, bucket_prompt)
+        if response is not None:
+            return response, True
+        response = await agenerate(provider, prompt)
+        if isinstance(response, str):
+            self.put(key, response, provider=provider.name)
+        return response, False
+
+    def _lookup(
+        self,
+        provider,
+        prompt: str,
+        context: Optional[Dict[str, Any]],
+        bucket_prompt: bool,
+    ) -> Tuple[str, Optional[str]]:
+        """(key, cached response or None), counting the hit or miss"""
+        name = provider.name
+        model = str(getattr(provider, "_model_name", ""))
+        key = self.key(
+            name, model, prompt, context=context, bucket_prompt=bucket_prompt
+        )
+        response = self.get(key)
+        outcome = "hit" if response is not None else "miss"
+        with self._lock:
+            if response is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        _LOOKUPS.labels(provider=name, outcome=outcome).inc()
+        return key, response
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rate and size / 命中率和容量"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "evictions": self.evictions,
+                "persistent": self._conn is not None,
+            }
+
+
+_llm_cache: Optional[LLMResponseCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Shared response cache (None when disabled by LLM_CACHE["enabled"]).
+    共享响应缓存（LLM_CACHE["enabled"] 关闭时为 None）。
+
+    Created on first use so importing this module does not touch the disk.
+    """
+    global _llm_cache
+    if not LLM_CACHE["enabled"]:
+        return None
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                _llm_cache = LLMResponseCache(path=LLM_CACHE["path"])
+                openmetrics_registry.register_collector(_export_size)
+    return _llm_cache
+
+
+def _export_size() -> None:
+    if _llm_cache is not None:
+        _ENTRIES.set(_llm_cache.get_stats()["entries"])
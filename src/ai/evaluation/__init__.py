@@ -3,6 +3,13 @@
 # Owner: Agent AI
 
 from src.ai.evaluation.evaluator import MultiLLMEvaluator, StrategySimulator
+from src.ai.evaluation.monte_carlo import MonteCarloSimulator
+from src.ai.evaluation.parsing import (
+    ExtractionError,
+    coerce_proposal,
+    extract_json,
+    parse_proposal,
+)
 from src.ai.evaluation.prompts import (
     MarketDiagnosisPrompt,
     RiskAdvisorPrompt,
@@ -17,10 +24,18 @@ from src.ai.evaluation.schemas import (
     StrategyConsensus,
     StrategyProposal,
 )
+from src.ai.evaluation.store import EvaluationStore, get_evaluation_store
 
 __all__ = [
     "MultiLLMEvaluator",
     "StrategySimulator",
+    "MonteCarloSimulator",
+    "ExtractionError",
+    "extract_json",
+    "coerce_proposal",
+    "parse_proposal",
+    "EvaluationStore",
+    "get_evaluation_store",
     "MarketContext",
     "StrategyProposal",
     "SimulationResult",
@@ -6,14 +6,27 @@ Multi-LLM Strategy Evaluator / 多 LLM 策略评估器
 Owner: Agent AI
 """
 
-import json
+import asyncio
+import queue
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List, Tuple
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 
-from src.ai.evaluation.prompts import StrategyAdvisorPrompt
+from src.ai.evaluation.monte_carlo import MonteCarloSimulator
+from src.ai.evaluation.parsing import (
+    SCHEMA,
+    ExtractionError,
+    coerce_proposal,
+    extract_json,
+    failed_proposal,
+    parse_proposal,
+    record_parse_failure,
+)
+from src.ai.evaluation.prompts import BatchStrategyAdvisorPrompt, StrategyAdvisorPrompt
 from src.ai.evaluation.schemas import (
     AggregatedResult,
     EvaluationResult,
@@ -23,13 +36,36 @@ from src.ai.evaluation.schemas import (
     StrategyConsensus,
     StrategyProposal,
 )
-from src.ai.llm import LLMProvider
+from src.ai.llm import LLMProvider, agenerate
+from src.shared.config import EVALUATION_CONFIG
 from src.shared.logger import setup_logger
+from src.shared.openmetrics import openmetrics_registry
 from src.trading.performance import PerformanceTracker
-from src.trading.strategies.fixed_spread import FixedSpreadStrategy
 
 logger = setup_logger("MultiLLMEvaluator")
 
+_PROVIDER_LATENCY = openmetrics_registry.histogram(
+    "mm_llm_provider_latency_seconds",
+    "LLM provider response time in seconds by outcome",
+    ("provider", "outcome"),
+    buckets=(0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0),
+)
+_HEDGES = openmetrics_registry.counter(
+    "mm_llm_hedged_requests",
+    "Duplicate requests issued to slow providers",
+    ("provider",),
+)
+
+
+@dataclass
+class _ProviderRun:
+    """Attempts in flight for one provider / 单个 Provider 的进行中请求"""
+
+    provider: LLMProvider
+    started: float
+    attempts: List[Future] = field(default_factory=list)
+    resolved: bool = False
+
 
 class MultiLLMEvaluator:
     """
@@ -52,6 +88,16 @@ class MultiLLMEvaluator:
         providers: List[LLMProvider],
         simulation_steps: int = 500,
         parallel: bool = True,
+        cache=None,
+        provider_timeout: Optional[float] = EVALUATION_CONFIG[
+            "provider_timeout_seconds"
+        ],
+        hedge_after: Optional[float] = EVALUATION_CONFIG["hedge_after_seconds"],
+        quorum: Optional[int] = EVALUATION_CONFIG["quorum"],
+        latency_budget: Optional[float] = EVALUATION_CONFIG["latency_budget_seconds"],
+        on_late_result: Optional[Callable[[EvaluationResult], None]] = None,
+        simulation_paths: int = EVALUATION_CONFIG["simulation_paths"],
+        simulation_seed: Optional[int] = EVALUATION_CONFIG["simulation_seed"],
     ):
         """
         初始化评估器
@@ -60,53 +106,574 @@ class MultiLLMEvaluator:
             providers: LLM Provider 列表
             simulation_steps: 模拟交易步数
             parallel: 是否并行调用 LLM
+            cache: 可选的 LLMResponseCache（按分桶后的市场上下文复用响应）
+            provider_timeout: 单个 Provider 的超时（秒），超时记为 "timeout" 结果
+            hedge_after: Provider 超过该时间未响应时再发一次请求（对冲），取先返回者
+            quorum: 达到该数量的成功结果后立即返回
+            latency_budget: 整体延迟预算（秒），到期返回已完成的结果
+            on_late_result: 返回后才完成的 Provider 结果回调（未评分）
+            simulation_paths: 蒙特卡洛路径数（所有建议共用同一组路径）
+            simulation_seed: 路径随机种子（None 表示每个评估器随机）
         """
         self.providers = providers
         self.simulation_steps = simulation_steps
         self.parallel = parallel
-
-    def evaluate(self, context: MarketContext) -> List[EvaluationResult]:
+        self.cache = cache
+        self.provider_timeout = provider_timeout
+        self.hedge_after = hedge_after
+        self.quorum = quorum
+        self.latency_budget = latency_budget
+        self.on_late_result = on_late_result
+        self.simulation_paths = simulation_paths
+        self.simulation_seed = simulation_seed
+        self._monte_carlo: Optional[MonteCarloSimulator] = None
+        # Providers still running when the last evaluate() returned
+        # 上次 evaluate() 返回时仍在运行的 Provider
+        self.pending_providers: List[str] = []
+        # Late-result deliveries of aevaluate(), referenced until done
+        self._late_tasks: set = set()
+
+    def evaluate(
+        self,
+        context: MarketContext,
+        quorum: Optional[int] = None,
+        latency_budget: Optional[float] = None,
+        on_late_result: Optional[Callable[[EvaluationResult], None]] = None,
+    ) -> List[EvaluationResult]:
         """
         使用所有 Provider 评估市场数据
 
         Args:
             context: 市场上下文数据
+            quorum: 覆盖实例的 quorum 设置
+            latency_budget: 覆盖实例的延迟预算
+            on_late_result: 覆盖实例的迟到结果回调
 
         Returns:
-            评估结果列表（按得分排名）
+            评估结果列表（按得分排名）；未完成的 Provider 见 pending_providers
         """
         prompt = StrategyAdvisorPrompt.generate(context)
-
-        if self.parallel and len(self.providers) > 1:
-            results = self._evaluate_parallel(prompt, context)
+        self.pending_providers = []
+
+        if self.parallel and self.providers:
+            results = self._evaluate_parallel(
+                prompt,
+                context,
+                quorum=quorum if quorum is not None else self.quorum,
+                latency_budget=(
+                    latency_budget
+                    if latency_budget is not None
+                    else self.latency_budget
+                ),
+                on_late_result=on_late_result or self.on_late_result,
+            )
         else:
             results = self._evaluate_sequential(prompt, context)
 
         results = self._score_and_rank(results)
         return results
 
+    def evaluate_stream(
+        self, context: MarketContext, latency_budget: Optional[float] = None
+    ) -> Iterator[Tuple[str, Any]]:
+        """
+        逐步产出评估事件
+
+        Yields (event, payload) as providers progress:
+        - ("proposal", EvaluationResult): parsed proposal, simulation pending
+        - ("result", EvaluationResult): simulated and scored (rank so far)
+        - ("consensus", AggregatedResult): consensus over results so far
+        - ("done", List[EvaluationResult]): final ranking; pending_providers
+          lists providers cut off by the latency budget
+
+        Providers run on background threads; closing the generator early does
+        not cancel calls already in flight.
+        """
+        prompt = StrategyAdvisorPrompt.generate(context)
+        self.pending_providers = []
+        events: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+
+        def run() -> None:
+            try:
+                results = self._evaluate_parallel(
+                    prompt,
+                    context,
+                    latency_budget=(
+                        latency_budget
+                        if latency_budget is not None
+                        else self.latency_budget
+                    ),
+                    on_late_result=self.on_late_result,
+                    on_proposal=lambda r: events.put(("proposal", r)),
+                    on_result=lambda r: events.put(("result", r)),
+                )
+                events.put(("done", self._score_and_rank(results)))
+            except Exception as e:
+                events.put(("error", e))
+
+        threading.Thread(target=run, name="llm-eval-stream", daemon=True).start()
+
+        proposed = set()
+        completed: List[EvaluationResult] = []
+        while True:
+            event, payload = events.get()
+            if event == "proposal":
+                # A hedged duplicate may parse a second proposal
+                if payload.provider_name in proposed:
+                    continue
+                proposed.add(payload.provider_name)
+                yield event, payload
+            elif event == "result":
+                completed.append(payload)
+                self._score_and_rank(completed)
+                yield event, payload
+                yield "consensus", self.aggregate_results(completed)
+            elif event == "done":
+                yield event, payload
+                return
+            else:
+                raise payload
+
+    async def aevaluate(
+        self,
+        context: MarketContext,
+        quorum: Optional[int] = None,
+        latency_budget: Optional[float] = None,
+        on_late_result: Optional[Callable[[EvaluationResult], None]] = None,
+        pending: Optional[List[str]] = None,
+    ) -> List[EvaluationResult]:
+        """
+        evaluate() 的 asyncio 版本
+
+        Providers are awaited concurrently on the running loop through their
+        async clients (no thread per call), with the same provider timeout,
+        hedging, quorum and latency budget as evaluate(). Parsed proposals are
+        then simulated in one batch on a worker thread. Safe to run many at
+        once, e.g. one per symbol with asyncio.gather.
+
+        Args:
+            context: 市场上下文数据
+            quorum: 覆盖实例的 quorum 设置
+            latency_budget: 覆盖实例的延迟预算
+            on_late_result: 覆盖实例的迟到结果回调（在事件循环中调用）
+            pending: 可选列表，填入本次调用中仍在运行的 Provider
+                     （并发调用时 pending_providers 只反映最后一次）
+
+        Returns:
+            评估结果列表（按得分排名）
+        """
+        quorum = quorum if quorum is not None else self.quorum
+        latency_budget = (
+            latency_budget if latency_budget is not None else self.latency_budget
+        )
+        on_late_result = on_late_result or self.on_late_result
+        prompt = StrategyAdvisorPrompt.generate(context)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + latency_budget if latency_budget is not None else None
+
+        tasks = {
+            asyncio.ensure_future(self._apropose(provider, prompt, context)): provider
+            for provider in self.providers
+        }
+        proposed: List[EvaluationResult] = []
+        waiting = set(tasks)
+        while waiting:
+            timeout = max(deadline - loop.time(), 0.0) if deadline is not None else None
+            done, waiting = await asyncio.wait(
+                waiting, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            proposed.extend(task.result() for task in done)
+            answered = sum(1 for r in proposed if r.proposal.parse_success)
+            if not done or (quorum and answered >= quorum):
+                break
+
+        late = [tasks[task].name for task in waiting]
+        self.pending_providers = late
+        if pending is not None:
+            pending.extend(late)
+        for task in waiting:
+            logger.info(f"Returning without {tasks[task].name} (still running)")
+            self._finish_late(task, context, on_late_result)
+
+        results = await self._asimulate(proposed, context)
+        return self._score_and_rank(results)
+
+    async def _apropose(
+        self, provider: LLMProvider, prompt: str, context: MarketContext
+    ) -> EvaluationResult:
+        """
+        Ask one provider (async) and parse its proposal; never raises.
+        异步调用单个 Provider 并解析建议（结果尚无模拟数据）。
+        """
+        response = await self._acall(provider, prompt, asdict(context))
+        if isinstance(response, EvaluationResult):
+            return response
+        raw_response, cached, latency_ms = response
+        return EvaluationResult(
+            provider_name=provider.name,
+            proposal=self._parse_response(raw_response, provider.name),
+            simulation=SimulationResult(),
+            latency_ms=latency_ms,
+            cached=cached,
+        )
+
+    async def _acall(
+        self, provider: LLMProvider, prompt: str, cache_context: Dict[str, Any]
+    ) -> Union[Tuple[str, bool, float], EvaluationResult]:
+        """
+        (raw response, cached, latency ms), or an error / timeout result.
+        异步调用 Provider（超时与对冲），失败时返回错误结果而不抛出。
+        """
+        name = provider.name
+        start_time = time.time()
+        try:
+            raw_response, cached = await asyncio.wait_for(
+                self._agenerate_hedged(provider, prompt, cache_context),
+                timeout=self.provider_timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"{name} timed out after {self.provider_timeout:.1f}s")
+            _PROVIDER_LATENCY.labels(provider=name, outcome="timeout").observe(
+                self.provider_timeout
+            )
+            return self._create_error_result(
+                name, f"Timed out after {self.provider_timeout:.1f}s", status="timeout"
+            )
+        except Exception as e:
+            logger.error(f"LLM call failed for {name}: {e}")
+            _PROVIDER_LATENCY.labels(provider=name, outcome="error").observe(
+                time.time() - start_time
+            )
+            return self._create_error_result(name, str(e))
+
+        latency_ms = (time.time() - start_time) * 1000
+        _PROVIDER_LATENCY.labels(
+            provider=name, outcome="cached" if cached else "ok"
+        ).observe(latency_ms / 1000)
+        return raw_response, cached, latency_ms
+
+    async def _agenerate_hedged(
+        self, provider: LLMProvider, prompt: str, cache_context: Dict[str, Any]
+    ) -> Tuple[str, bool]:
+        """(response, cached); re-issues once after hedge_after, first success wins"""
+
+        async def call() -> Tuple[str, bool]:
+            if self.cache is not None:
+                return await self.cache.agenerate(
+                    provider, prompt, context=cache_context
+                )
+            return await agenerate(provider, prompt), False
+
+        attempts = {asyncio.ensure_future(call())}
+        try:
+            if self.hedge_after is not None:
+                done, _ = await asyncio.wait(attempts, timeout=self.hedge_after)
+                if not done:
+                    logger.info(f"Hedging slow provider {provider.name}")
+                    _HEDGES.labels(provider=provider.name).inc()
+                    attempts.add(asyncio.ensure_future(call()))
+            error: Optional[BaseException] = None
+            while attempts:
+                done, attempts = await asyncio.wait(
+                    attempts, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in attempts:
+                task.cancel()
+
+    def evaluate_batch(
+        self, contexts: List[MarketContext], latency_budget: Optional[float] = None
+    ) -> Dict[str, List[EvaluationResult]]:
+        """aevaluate_batch() for synchronous callers / 同步调用版本"""
+        return asyncio.run(
+            self.aevaluate_batch(contexts, latency_budget=latency_budget)
+        )
+
+    async def aevaluate_batch(
+        self, contexts: List[MarketContext], latency_budget: Optional[float] = None
+    ) -> Dict[str, List[EvaluationResult]]:
+        """
+        一次请求评估多个交易对
+
+        Sends one BatchStrategyAdvisorPrompt per provider (instead of one
+        prompt per symbol per provider), parses the returned JSON array and
+        simulates every symbol's proposals in one batch on that symbol's
+        paths. Providers still running when the latency budget is spent are
+        cancelled and listed in pending_providers.
+
+        Args:
+            contexts: 各交易对的市场上下文（symbol 唯一）
+            latency_budget: 覆盖实例的延迟预算
+
+        Returns:
+            {symbol: 评估结果列表（按得分排名）}
+        """
+        if not contexts:
+            return {}
+        latency_budget = (
+            latency_budget if latency_budget is not None else self.latency_budget
+        )
+        prompt = BatchStrategyAdvisorPrompt.generate(contexts)
+        symbols = [context.symbol for context in contexts]
+        cache_context = {
+            f"{context.symbol}.{key}": value
+            for context in contexts
+            for key, value in asdict(context).items()
+        }
+
+        tasks = {
+            asyncio.ensure_future(
+                self._acall(provider, prompt, cache_context)
+            ): provider
+            for provider in self.providers
+        }
+        done: set = set()
+        waiting: set = set(tasks)
+        if waiting:
+            done, waiting = await asyncio.wait(waiting, timeout=latency_budget)
+        self.pending_providers = [tasks[task].name for task in waiting]
+        for task in waiting:
+            logger.info(f"Batch returning without {tasks[task].name} (cancelled)")
+            task.cancel()
+
+        by_symbol: Dict[str, List[EvaluationResult]] = {
+            symbol: [] for symbol in symbols
+        }
+        for task in done:
+            name = tasks[task].name
+            response = task.result()
+            if isinstance(response, EvaluationResult):
+                for symbol in symbols:
+                    by_symbol[symbol].append(
+                        self._create_error_result(
+                            name, response.proposal.parse_error, status=response.status
+                        )
+                    )
+                continue
+            raw_response, cached, latency_ms = response
+            proposals = self._parse_batch_response(raw_response, name, symbols)
+            for symbol in symbols:
+                by_symbol[symbol].append(
+                    EvaluationResult(
+                        provider_name=name,
+                        proposal=proposals[symbol],
+                        simulation=SimulationResult(),
+                        latency_ms=latency_ms,
+                        cached=cached,
+                    )
+                )
+
+        def simulate_all() -> None:
+            for context in contexts:
+                parsed = [
+                    r for r in by_symbol[context.symbol] if r.proposal.parse_success
+                ]
+                if not parsed:
+                    continue
+                simulations = self.simulate_proposals(
+                    [r.proposal for r in parsed], context
+                )
+                for result, simulation in zip(parsed, simulations):
+                    result.simulation = simulation
+
+        await asyncio.to_thread(simulate_all)
+        return {
+            symbol: self._score_and_rank(results)
+            for symbol, results in by_symbol.items()
+        }
+
+    async def _asimulate(
+        self, results: List[EvaluationResult], context: MarketContext
+    ) -> List[EvaluationResult]:
+        """Batch-simulate parsed proposals off the event loop / 在线程中批量模拟"""
+        parsed = [r for r in results if r.proposal.parse_success]
+        if parsed:
+            simulations = await asyncio.to_thread(
+                self.simulate_proposals, [r.proposal for r in parsed], context
+            )
+            for result, simulation in zip(parsed, simulations):
+                result.simulation = simulation
+        return results
+
+    def _finish_late(
+        self,
+        task: "asyncio.Future[EvaluationResult]",
+        context: MarketContext,
+        on_late_result: Optional[Callable[[EvaluationResult], None]],
+    ) -> None:
+        """Simulate and deliver a provider that answers after aevaluate() returned."""
+
+        async def deliver() -> None:
+            try:
+                (result,) = await self._asimulate([await task], context)
+                if on_late_result is not None:
+                    on_late_result(result)
+            except Exception as e:
+                logger.error(f"Late result delivery failed: {e}")
+            finally:
+                self._late_tasks.discard(finisher)
+
+        finisher = asyncio.ensure_future(deliver())
+        self._late_tasks.add(finisher)
+
     def _evaluate_parallel(
-        self, prompt: str, context: MarketContext
+        self,
+        prompt: str,
+        context: MarketContext,
+        quorum: Optional[int] = None,
+        latency_budget: Optional[float] = None,
+        on_late_result: Optional[Callable[[EvaluationResult], None]] = None,
+        on_proposal: Optional[Callable[[EvaluationResult], None]] = None,
+        on_result: Optional[Callable[[EvaluationResult], None]] = None,
     ) -> List[EvaluationResult]:
-        """并行调用所有 LLM"""
-        results = []
+        """
+        并行调用所有 LLM（带截止时间）
+
+        Each provider is abandoned after provider_timeout; a slow one gets one
+        hedged duplicate after hedge_after. Returns once every provider has
+        resolved, ``quorum`` successful proposals are in, or the latency budget
+        is spent; providers still running are listed in pending_providers and
+        their results go to ``on_late_result``. ``on_proposal`` sees each parsed
+        proposal before its simulation, ``on_result`` each provider's result as
+        it resolves (both from worker or caller threads).
+        """
+        workers = len(self.providers) * (2 if self.hedge_after else 1)
+        executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="llm-eval"
+        )
+        lock = threading.Lock()
+        started = time.monotonic()
+        runs = [_ProviderRun(provider, started) for provider in self.providers]
+        results: List[EvaluationResult] = []
 
-        with ThreadPoolExecutor(max_workers=len(self.providers)) as executor:
-            futures = {
+        def attempt(run: _ProviderRun) -> None:
+            run.attempts.append(
                 executor.submit(
-                    self._evaluate_single, provider, prompt, context
-                ): provider
-                for provider in self.providers
-            }
+                    self._evaluate_single, run.provider, prompt, context, on_proposal
+                )
+            )
 
-            for future in as_completed(futures):
+        def outcome(run: _ProviderRun) -> Optional[EvaluationResult]:
+            """First successful attempt, else the error once all attempts are done."""
+            failed = None
+            for future in run.attempts:
+                if not future.done():
+                    continue
                 try:
                     result = future.result()
-                    results.append(result)
                 except Exception as e:
-                    provider = futures[future]
-                    logger.error(f"Parallel evaluation failed for {provider.name}: {e}")
-                    results.append(self._create_error_result(provider.name, str(e)))
+                    logger.error(
+                        f"Parallel evaluation failed for {run.provider.name}: {e}"
+                    )
+                    result = self._create_error_result(run.provider.name, str(e))
+                if result.proposal.parse_success:
+                    return result
+                failed = result
+            return failed if all(f.done() for f in run.attempts) else None
+
+        def timed_out(run: _ProviderRun, now: float) -> bool:
+            return (
+                self.provider_timeout is not None
+                and now - run.started >= self.provider_timeout
+            )
+
+        def timeout_result(run: _ProviderRun) -> EvaluationResult:
+            name = run.provider.name
+            logger.warning(f"{name} timed out after {self.provider_timeout:.1f}s")
+            _PROVIDER_LATENCY.labels(provider=name, outcome="timeout").observe(
+                self.provider_timeout
+            )
+            return self._create_error_result(
+                name, f"Timed out after {self.provider_timeout:.1f}s", status="timeout"
+            )
+
+        def deliver_late(run: _ProviderRun) -> None:
+            """Resolve a provider that finished after evaluate() returned."""
+            with lock:
+                if run.resolved:
+                    return
+                result = outcome(run)
+                if result is None:
+                    return
+                run.resolved = True
+                if timed_out(run, time.monotonic()):
+                    result = timeout_result(run)
+            if on_late_result is not None:
+                try:
+                    on_late_result(result)
+                except Exception as e:
+                    logger.error(
+                        f"Late result callback failed for {run.provider.name}: {e}"
+                    )
+
+        for run in runs:
+            attempt(run)
+
+        try:
+            while True:
+                now = time.monotonic()
+                resolved: List[EvaluationResult] = []
+                with lock:
+                    for run in runs:
+                        if run.resolved:
+                            continue
+                        result = outcome(run)
+                        if result is None and timed_out(run, now):
+                            result = timeout_result(run)
+                        if result is not None:
+                            run.resolved = True
+                            results.append(result)
+                            resolved.append(result)
+                        elif (
+                            self.hedge_after is not None
+                            and len(run.attempts) == 1
+                            and now - run.started >= self.hedge_after
+                        ):
+                            logger.info(f"Hedging slow provider {run.provider.name}")
+                            _HEDGES.labels(provider=run.provider.name).inc()
+                            attempt(run)
+                if on_result is not None:
+                    for result in resolved:
+                        on_result(result)
+
+                open_runs = [run for run in runs if not run.resolved]
+                answered = sum(1 for r in results if r.proposal.parse_success)
+                if not open_runs or (quorum and answered >= quorum):
+                    break
+                if latency_budget is not None and now - started >= latency_budget:
+                    break
+
+                # Sleep until the next completion, timeout, hedge or budget
+                # 休眠至下一次完成、超时、对冲或预算到期
+                wake = []
+                for run in open_runs:
+                    if self.provider_timeout is not None:
+                        wake.append(run.started + self.provider_timeout)
+                    if self.hedge_after is not None and len(run.attempts) == 1:
+                        wake.append(run.started + self.hedge_after)
+                if latency_budget is not None:
+                    wake.append(started + latency_budget)
+                wait(
+                    [f for run in open_runs for f in run.attempts if not f.done()],
+                    timeout=max(min(wake) - now, 0.0) if wake else None,
+                    return_when=FIRST_COMPLETED,
+                )
+
+            with lock:
+                late_runs = [run for run in runs if not run.resolved]
+                self.pending_providers = [run.provider.name for run in late_runs]
+            for run in late_runs:
+                logger.info(f"Returning without {run.provider.name} (still running)")
+                for future in run.attempts:
+                    future.add_done_callback(lambda _, run=run: deliver_late(run))
+        finally:
+            # Do not block on stragglers; their threads finish in the background
+            executor.shutdown(wait=False)
 
         return results
 
@@ -127,7 +694,11 @@ class MultiLLMEvaluator:
         return results
 
     def _evaluate_single(
-        self, provider: LLMProvider, prompt: str, context: MarketContext
+        self,
+        provider: LLMProvider,
+        prompt: str,
+        context: MarketContext,
+        on_proposal: Optional[Callable[[EvaluationResult], None]] = None,
     ) -> EvaluationResult:
         """
         使用单个 Provider 进行评估
@@ -136,6 +707,7 @@ class MultiLLMEvaluator:
             provider: LLM Provider
             prompt: Prompt 字符串
             context: 市场上下文
+            on_proposal: 解析完成、模拟开始前的回调（结果尚无模拟数据）
 
         Returns:
             单个评估结果
@@ -143,14 +715,36 @@ class MultiLLMEvaluator:
         provider_name = provider.name
 
         start_time = time.time()
+        cached = False
         try:
-            raw_response = provider.generate(prompt)
+            if self.cache is not None:
+                raw_response, cached = self.cache.generate(
+                    provider, prompt, context=asdict(context)
+                )
+            else:
+                raw_response = provider.generate(prompt)
             latency_ms = (time.time() - start_time) * 1000
         except Exception as e:
             logger.error(f"LLM call failed for {provider_name}: {e}")
+            _PROVIDER_LATENCY.labels(provider=provider_name, outcome="error").observe(
+                time.time() - start_time
+            )
             return self._create_error_result(provider_name, str(e))
+        _PROVIDER_LATENCY.labels(
+            provider=provider_name, outcome="cached" if cached else "ok"
+        ).observe(latency_ms / 1000)
 
         proposal = self._parse_response(raw_response, provider_name)
+        if on_proposal is not None:
+            on_proposal(
+                EvaluationResult(
+                    provider_name=provider_name,
+                    proposal=proposal,
+                    simulation=SimulationResult(),
+                    latency_ms=latency_ms,
+                    cached=cached,
+                )
+            )
         simulation = self._run_simulation(proposal, context)
 
         result = EvaluationResult(
@@ -158,6 +752,7 @@ class MultiLLMEvaluator:
             proposal=proposal,
             simulation=simulation,
             latency_ms=latency_ms,
+            cached=cached,
         )
 
         logger.info(
@@ -184,92 +779,130 @@ class MultiLLMEvaluator:
             provider_name: Provider 名称
 
         Returns:
-            解析后的策略建议
+            解析后的策略建议（失败时为默认值且 parse_success=False）
         """
-        try:
-            clean_response = raw_response.strip()
-
-            if "```" in clean_response:
-                lines = clean_response.split("\n")
-                json_lines = []
-                in_json = False
-                for line in lines:
-                    stripped = line.strip()
-                    if stripped.startswith("```") and not in_json:
-                        in_json = True
-                        continue
-                    if stripped.startswith("```") and in_json:
-                        break
-                    if in_json:
-                        json_lines.append(line)
-                clean_response = "\n".join(json_lines).strip()
-
-            data = json.loads(clean_response)
-
-            return StrategyProposal(
-                recommended_strategy=data.get("recommended_strategy", "FixedSpread"),
-                spread=float(data.get("spread", 0.01)),
-                skew_factor=float(data.get("skew_factor", 100.0)),
-                quantity=float(data.get("quantity", 0.1)),
-                leverage=float(data.get("leverage", 1.0)),
-                reasoning=data.get("reasoning", ""),
-                confidence=float(data.get("confidence", 0.5)),
-                risk_level=data.get("risk_level", "medium"),
-                expected_return=float(data.get("expected_return", 0.0)),
-                provider_name=provider_name,
-                raw_response=raw_response,
-                parse_success=True,
+        proposal = parse_proposal(raw_response, provider_name)
+        if not proposal.parse_success:
+            logger.warning(
+                f"Failed to parse response from {provider_name}: {proposal.parse_error}"
             )
+        return proposal
 
-        except (json.JSONDecodeError, KeyError, ValueError) as e:
-            logger.warning(f"Failed to parse response from {provider_name}: {e}")
-            return StrategyProposal(
-                recommended_strategy="FixedSpread",
-                spread=0.01,
-                provider_name=provider_name,
-                raw_response=raw_response,
-                parse_success=False,
-                parse_error=str(e),
-            )
+    def _parse_batch_response(
+        self, raw_response: str, provider_name: str, symbols: List[str]
+    ) -> Dict[str, StrategyProposal]:
+        """
+        解析多交易对响应（JSON 数组）为 {symbol: StrategyProposal}
+
+        Symbols are matched ignoring case and separators ("ETH/USDT" matches
+        "ETHUSDT"); a symbol without a usable entry gets a failed proposal.
+        """
+
+        def normalize(symbol: Any) -> str:
+            return "".join(ch for ch in str(symbol).upper() if ch.isalnum())
+
+        wanted = {normalize(symbol): symbol for symbol in symbols}
+        proposals: Dict[str, StrategyProposal] = {}
+        error = ""
+        try:
+            data = extract_json(raw_response, types=(list, dict))
+            if isinstance(data, dict):
+                data = data.get("proposals", [data])
+            if not isinstance(data, list):
+                raise ExtractionError(SCHEMA, "Expected a JSON array of proposals")
+            for item in data:
+                if not isinstance(item, dict):
+                    continue
+                symbol = wanted.get(normalize(item.get("symbol", "")))
+                if symbol is None or symbol in proposals:
+                    continue
+                try:
+                    proposals[symbol] = coerce_proposal(
+                        item, raw_response, provider_name
+                    )
+                except ExtractionError as e:
+                    record_parse_failure("evaluator_batch", e.reason)
+                    proposals[symbol] = failed_proposal(
+                        raw_response, provider_name, str(e)
+                    )
+        except ExtractionError as e:
+            logger.warning(f"Failed to parse batch response from {provider_name}: {e}")
+            record_parse_failure("evaluator_batch", e.reason)
+            error = str(e)
+
+        for symbol in symbols:
+            if symbol not in proposals:
+                proposals[symbol] = failed_proposal(
+                    raw_response, provider_name, error or f"No proposal for {symbol}"
+                )
+        return proposals
 
     def _run_simulation(
         self, proposal: StrategyProposal, context: MarketContext
     ) -> SimulationResult:
         """
-        运行模拟交易
+        运行模拟交易（多路径蒙特卡洛）
 
-        Note: Only FixedSpread strategy is supported in simulation.
-        注意：模拟中仅支持 FixedSpread 策略。
+        FundingRate proposals are simulated with their skew_factor and funding
+        payments; anything else is simulated as FixedSpread.
+        FundingRate 建议按其 skew_factor 和资金费率支付模拟；其他按 FixedSpread 模拟。
 
         Args:
             proposal: 策略建议
             context: 市场上下文
 
         Returns:
-            模拟结果
+            模拟结果（路径均值及 95% 置信区间）
         """
-        strategy = FixedSpreadStrategy()
-        strategy.spread = proposal.spread
-        strategy.quantity = proposal.quantity
-        strategy.leverage = proposal.leverage
+        return self.simulate_proposals([proposal], context)[0]
 
-        simulator = StrategySimulator(
-            strategy=strategy,
+    def simulate_proposals(
+        self, proposals: List[StrategyProposal], context: MarketContext
+    ) -> List[SimulationResult]:
+        """
+        Simulate proposals together on common random-number paths.
+        在共同随机数路径上批量模拟多个建议。
+
+        Paths are cached per market context, so proposals simulated in
+        separate calls (e.g. as providers answer) still share them.
+        """
+        simulator = self._monte_carlo
+        if simulator is None or simulator.steps != self.simulation_steps:
+            simulator = MonteCarloSimulator(
+                paths=self.simulation_paths,
+                steps=self.simulation_steps,
+                seed=self.simulation_seed,
+            )
+            self._monte_carlo = simulator
+
+        summaries = simulator.run(
+            [
+                (
+                    (p.spread, p.quantity, p.skew_factor)
+                    if p.recommended_strategy == "FundingRate"
+                    else (p.spread, p.quantity)
+                )
+                for p in proposals
+            ],
             initial_price=context.mid_price,
             volatility=context.volatility_1h,
+            funding_rate=context.funding_rate,
         )
-
-        stats = simulator.run(steps=self.simulation_steps)
-
-        return SimulationResult(
-            realized_pnl=stats.get("realized_pnl", 0.0),
-            total_trades=stats.get("total_trades", 0),
-            winning_trades=stats.get("winning_trades", 0),
-            win_rate=stats.get("win_rate", 0.0) / 100.0,
-            sharpe_ratio=self._calculate_sharpe(stats.get("pnl_history", [])),
-            simulation_steps=self.simulation_steps,
-            pnl_history=stats.get("pnl_history", []),
-        )
+        return [
+            SimulationResult(
+                realized_pnl=summary["realized_pnl"],
+                total_trades=summary["total_trades"],
+                winning_trades=summary["winning_trades"],
+                win_rate=summary["win_rate"],
+                max_drawdown=summary["max_drawdown"],
+                funding_pnl=summary["funding_pnl"],
+                sharpe_ratio=summary["sharpe_ratio"],
+                simulation_steps=self.simulation_steps,
+                paths=simulator.paths,
+                confidence_intervals=summary["confidence_intervals"],
+            )
+            for summary in summaries
+        ]
 
     def _calculate_sharpe(
         self, pnl_history: list, risk_free_rate: float = 0.0
@@ -309,9 +942,10 @@ class MultiLLMEvaluator:
         计算得分并排名
 
         评分公式：
-        - PnL 权重: 40%
-        - 夏普比率权重: 30%
-        - 胜率权重: 20%
+        - PnL 权重: 35%（使用 95% 置信区间下限，惩罚不确定性）
+        - 夏普比率权重: 25%（路径均值，按步计算）
+        - 胜率权重: 15%
+        - 最大回撤权重: 15%
         - 置信度权重: 10%
         """
         for result in results:
@@ -319,19 +953,22 @@ class MultiLLMEvaluator:
                 result.score = 0.0
                 continue
 
-            pnl_score = (
-                min(max(result.simulation.realized_pnl / 100.0, -1), 1) * 50 + 50
-            )
-            sharpe_score = (
-                min(max(result.simulation.sharpe_ratio / 3.0, -1), 1) * 50 + 50
-            )
-            win_rate_score = result.simulation.win_rate * 100
+            simulation = result.simulation
+            pnl_interval = simulation.confidence_intervals.get("realized_pnl")
+            pnl = pnl_interval[0] if pnl_interval else simulation.realized_pnl
+
+            pnl_score = min(max(pnl / 100.0, -1), 1) * 50 + 50
+            # Per-step Sharpe is small; 0.1 per step already scores full
+            sharpe_score = min(max(simulation.sharpe_ratio / 0.1, -1), 1) * 50 + 50
+            win_rate_score = simulation.win_rate * 100
+            drawdown_score = (1 - min(simulation.max_drawdown / 100.0, 1)) * 100
             confidence_score = result.proposal.confidence * 100
 
             result.score = (
-                pnl_score * 0.40
-                + sharpe_score * 0.30
-                + win_rate_score * 0.20
+                pnl_score * 0.35
+                + sharpe_score * 0.25
+                + win_rate_score * 0.15
+                + drawdown_score * 0.15
                 + confidence_score * 0.10
             )
 
@@ -341,7 +978,9 @@ class MultiLLMEvaluator:
 
         return sorted_results
 
-    def _create_error_result(self, provider_name: str, error: str) -> EvaluationResult:
+    def _create_error_result(
+        self, provider_name: str, error: str, status: str = "error"
+    ) -> EvaluationResult:
         """创建错误结果"""
         return EvaluationResult(
             provider_name=provider_name,
@@ -354,6 +993,7 @@ class MultiLLMEvaluator:
             ),
             simulation=SimulationResult(),
             score=0.0,
+            status=status,
         )
 
     @staticmethod
@@ -841,8 +1481,10 @@ class StrategySimulator:
 
     基于 MarketSimulator，但允许自定义参数
 
-    Note: Only supports FixedSpread strategy in simulation.
-    注意：模拟中仅支持 FixedSpread 策略。
+    Legacy single-path simulator, FixedSpread only (no funding). The
+    evaluator simulates proposals with MonteCarloSimulator, which also covers
+    FundingRate skew and funding payments (see simulate_proposals).
+    旧版单路径模拟器，仅支持 FixedSpread（不含资金费率）；评估器使用 MonteCarloSimulator。
     """
 
     def __init__(
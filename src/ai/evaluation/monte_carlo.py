@@ -0,0 +1,359 @@
+"""
+Monte Carlo Proposal Simulator / 蒙特卡洛建议模拟器
+
+Scores strategy proposals over many simulated price paths instead of one.
+在多条模拟价格路径上评估策略建议，而不是单条路径。
+
+Owner: Agent AI
+
+All proposals of an evaluation are simulated on the same set of paths
+(common random numbers), so differences between them reflect their
+parameters rather than path noise. The simulation is vectorized across
+proposals x paths; only the time loop runs in Python.
+同一次评估中的所有建议在同一组路径上模拟（共同随机数），使差异反映参数而非路径噪声。
+模拟在建议 x 路径上向量化，仅时间循环在 Python 中执行。
+
+Model: each step quotes bid/ask at mid * (1 -/+ spread/2) - skew_offset, where
+skew_offset = funding_rate * skew_factor * mid as in FundingRateStrategy
+(skew_factor 0 is FixedSpread). A quote fills at its price when the next mid
+trades through it. The funding rate follows a mean-reverting path and every
+``funding_interval`` steps the position pays position * mid * rate. PnL uses
+average-cost accounting like PerformanceTracker plus funding cash flows;
+Sharpe is per step (not annualised) on the mark-to-market equity curve,
+drawdown is peak-to-trough.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.shared.config import EVALUATION_CONFIG
+from src.shared.utils import round_step_size
+
+# z-score of the two-sided 95% confidence interval
+CI_Z = 1.96
+
+
+@dataclass
+class PathStatistics:
+    """Mean and confidence interval of one metric per proposal / 每个建议单个指标的均值和置信区间"""
+
+    mean: np.ndarray
+    ci_low: np.ndarray
+    ci_high: np.ndarray
+
+
+def simulate_price_paths(
+    initial_price: float,
+    volatility: float,
+    steps: int,
+    paths: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    Gaussian random-walk mid prices, shape (paths, steps + 1).
+    高斯随机游走中间价。
+
+    Each step moves the price by ``volatility`` of itself (as StrategySimulator).
+    """
+    shocks = 1.0 + volatility * rng.standard_normal((paths, steps))
+    growth = np.cumprod(np.maximum(shocks, 1e-6), axis=1)
+    prices = np.empty((paths, steps + 1))
+    prices[:, 0] = initial_price
+    prices[:, 1:] = initial_price * growth
+    return np.maximum(prices, 1.0)
+
+
+def simulate_funding_paths(
+    initial_rate: float,
+    steps: int,
+    paths: int,
+    rng: np.random.Generator,
+    reversion: float = EVALUATION_CONFIG["funding_rate_reversion"],
+    volatility: float = EVALUATION_CONFIG["funding_rate_volatility"],
+) -> np.ndarray:
+    """
+    Mean-reverting funding-rate paths around ``initial_rate``, shape (paths, steps + 1).
+    围绕 ``initial_rate`` 均值回归的资金费率路径。
+    """
+    shocks = volatility * rng.standard_normal((paths, steps))
+    rates = np.empty((paths, steps + 1))
+    rates[:, 0] = initial_rate
+    for t in range(steps):
+        rates[:, t + 1] = (
+            rates[:, t] + reversion * (initial_rate - rates[:, t]) + shocks[:, t]
+        )
+    return rates
+
+
+def simulate_fixed_spread(
+    prices: np.ndarray, spreads: Sequence[float], quantities: Sequence[float]
+) -> Dict[str, np.ndarray]:
+    """Run FixedSpread quoting without funding / 无资金费率的 FixedSpread 模拟"""
+    return simulate_quotes(prices, spreads, quantities)
+
+
+def simulate_quotes(
+    prices: np.ndarray,
+    spreads: Sequence[float],
+    quantities: Sequence[float],
+    skew_factors: Optional[Sequence[float]] = None,
+    funding_rates: Optional[np.ndarray] = None,
+    funding_interval: int = EVALUATION_CONFIG["funding_interval_steps"],
+) -> Dict[str, np.ndarray]:
+    """
+    Run FixedSpread / FundingRate quoting for P proposals on M paths at once.
+    在 M 条路径上同时运行 P 个 FixedSpread / FundingRate 建议。
+
+    Args:
+        prices: Mid prices, shape (M, T + 1)
+        spreads: Spread per proposal, shape (P,)
+        quantities: Order quantity per proposal, shape (P,)
+        skew_factors: Funding skew per proposal, shape (P,); 0 = FixedSpread
+        funding_rates: Funding rates, shape (M, T + 1); None = no funding
+        funding_interval: Steps between funding payments
+
+    Returns:
+        Per-path metrics, each shape (P, M): realized_pnl (incl. funding),
+        funding_pnl, total_pnl, sharpe_ratio, max_drawdown, total_trades,
+        winning_trades
+    """
+    n_paths, n_points = prices.shape
+    steps = n_points - 1
+    half = np.asarray(spreads, dtype=float)[:, None] / 2
+    qty = np.asarray(quantities, dtype=float)[:, None]
+    shape = (half.shape[0], n_paths)
+    skew = (
+        np.zeros((shape[0], 1))
+        if skew_factors is None
+        else np.asarray(skew_factors, dtype=float)[:, None]
+    )
+
+    position = np.zeros(shape)
+    avg_entry = np.zeros(shape)
+    realized = np.zeros(shape)
+    funding_pnl = np.zeros(shape)
+    trades = np.zeros(shape, dtype=np.int64)
+    wins = np.zeros(shape, dtype=np.int64)
+    equity_prev = np.zeros(shape)
+    sum_d = np.zeros(shape)
+    sum_d2 = np.zeros(shape)
+    peak = np.zeros(shape)
+    max_dd = np.zeros(shape)
+
+    for t in range(steps):
+        mid = prices[:, t]
+        nxt = prices[:, t + 1]
+        bid = mid * (1 - half)
+        ask = mid * (1 + half)
+        if funding_rates is not None:
+            # Rate > 0: longs pay shorts, so lean short (FundingRateStrategy)
+            offset = funding_rates[:, t] * skew * mid
+            bid = bid - offset
+            ask = ask - offset
+            # Never cross the (mid-approximated) book
+            bid = np.where(bid >= mid, mid * 0.9995, bid)
+            ask = np.where(ask <= mid, mid * 1.0005, ask)
+        buy = nxt <= bid
+        sell = nxt >= ask
+        fill_price = np.where(buy, bid, ask)
+        delta = np.where(buy, qty, np.where(sell, -qty, 0.0))
+        new_position = position + delta
+
+        old_size = np.abs(position)
+        new_size = np.abs(new_position)
+        closing = new_size < old_size
+        pnl = np.where(
+            closing, (fill_price - avg_entry) * (position - new_position), 0.0
+        )
+        realized += pnl
+        trades += closing
+        wins += closing & (pnl > 0)
+
+        adding = new_size > old_size
+        with np.errstate(invalid="ignore", divide="ignore"):
+            averaged = (old_size * avg_entry + np.abs(delta) * fill_price) / new_size
+        avg_entry = np.where(
+            adding, np.where(position == 0, fill_price, averaged), avg_entry
+        )
+        avg_entry = np.where(new_position == 0, 0.0, avg_entry)
+        position = new_position
+
+        if (
+            funding_rates is not None
+            and funding_interval
+            and (t + 1) % funding_interval == 0
+        ):
+            payment = -position * nxt * funding_rates[:, t + 1]
+            funding_pnl += payment
+            realized += payment
+
+        equity = realized + position * (nxt - avg_entry)
+        d = equity - equity_prev
+        sum_d += d
+        sum_d2 += d * d
+        equity_prev = equity
+        np.maximum(peak, equity, out=peak)
+        np.maximum(max_dd, peak - equity, out=max_dd)
+
+    if steps:
+        mean_d = sum_d / steps
+        std_d = np.sqrt(np.maximum(sum_d2 / steps - mean_d * mean_d, 0.0))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sharpe = np.where(std_d > 1e-12, mean_d / std_d, 0.0)
+    else:
+        sharpe = np.zeros(shape)
+
+    return {
+        "realized_pnl": realized,
+        "funding_pnl": funding_pnl,
+        "total_pnl": equity_prev,
+        "sharpe_ratio": sharpe,
+        "max_drawdown": max_dd,
+        "total_trades": trades,
+        "winning_trades": wins,
+    }
+
+
+def summarize(values: np.ndarray, z: float = CI_Z) -> PathStatistics:
+    """Mean and normal-approximation CI across paths (axis 1) / 跨路径的均值和置信区间"""
+    mean = values.mean(axis=1)
+    if values.shape[1] < 2:
+        return PathStatistics(mean, mean.copy(), mean.copy())
+    half_width = z * values.std(axis=1, ddof=1) / np.sqrt(values.shape[1])
+    return PathStatistics(mean, mean - half_width, mean + half_width)
+
+
+class MonteCarloSimulator:
+    """
+    Batched multi-path simulator with cached common random numbers.
+    带缓存共同随机数的批量多路径模拟器。
+
+    Paths are generated once per (price, volatility, funding rate) and reused
+    for every proposal, whether proposals are simulated together or one at a
+    time. Price shocks do not depend on the funding rate, so FixedSpread and
+    FundingRate proposals always see identical price paths. The most recent
+    ``max_cached`` market contexts are kept (each is paths x steps x 2 floats).
+    """
+
+    def __init__(
+        self, paths: int, steps: int, seed: Optional[int] = None, max_cached: int = 8
+    ):
+        self.paths = max(int(paths), 1)
+        self.steps = int(steps)
+        self.max_cached = max(int(max_cached), 1)
+        # Fixed per simulator so every proposal sees the same shocks
+        self._seed = np.random.SeedSequence(seed).entropy
+        self._lock = threading.Lock()
+        self._paths: (
+            "OrderedDict[Tuple[float, float, float], Tuple[np.ndarray, np.ndarray]]"
+        ) = OrderedDict()
+
+    def market_paths(
+        self, initial_price: float, volatility: float, funding_rate: float = 0.0
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(prices, funding_rates), each shape (paths, steps + 1) / 价格与资金费率路径"""
+        key = (float(initial_price), float(volatility), float(funding_rate))
+        with self._lock:
+            cached = self._paths.get(key)
+            if cached is None:
+                price_seed, funding_seed = np.random.SeedSequence(self._seed).spawn(2)
+                prices = simulate_price_paths(
+                    initial_price,
+                    volatility,
+                    self.steps,
+                    self.paths,
+                    np.random.default_rng(price_seed),
+                )
+                rates = simulate_funding_paths(
+                    funding_rate,
+                    self.steps,
+                    self.paths,
+                    np.random.default_rng(funding_seed),
+                )
+                cached = (prices, rates)
+                self._paths[key] = cached
+                while len(self._paths) > self.max_cached:
+                    self._paths.popitem(last=False)
+            else:
+                self._paths.move_to_end(key)
+            return cached
+
+    def price_paths(self, initial_price: float, volatility: float) -> np.ndarray:
+        return self.market_paths(initial_price, volatility)[0]
+
+    def run(
+        self,
+        proposals: List[Tuple[float, ...]],
+        initial_price: float,
+        volatility: float,
+        funding_rate: float = 0.0,
+    ) -> List[Dict[str, object]]:
+        """
+        Simulate proposals on the shared paths in one batch.
+        在共享路径上批量模拟建议。
+
+        Args:
+            proposals: (spread, quantity) for FixedSpread or
+                (spread, quantity, skew_factor) for FundingRate; both kinds
+                can be mixed to compare them on identical paths
+            initial_price: Starting mid price
+            volatility: Per-step price volatility
+            funding_rate: Current funding rate (start of the funding paths)
+
+        Returns:
+            One dict per proposal with path means, 95% CIs and trade counts
+        """
+        if not proposals:
+            return []
+        prices, rates = self.market_paths(initial_price, volatility, funding_rate)
+        spreads = [p[0] for p in proposals]
+        quantities = [round_step_size(p[1], 0.001) for p in proposals]
+        skews = [p[2] if len(p) > 2 else 0.0 for p in proposals]
+        metrics = simulate_quotes(
+            prices, spreads, quantities, skew_factors=skews, funding_rates=rates
+        )
+
+        pnl = summarize(metrics["realized_pnl"])
+        funding = summarize(metrics["funding_pnl"])
+        total = summarize(metrics["total_pnl"])
+        sharpe = summarize(metrics["sharpe_ratio"])
+        drawdown = summarize(metrics["max_drawdown"])
+        trades = metrics["total_trades"].sum(axis=1)
+        wins = metrics["winning_trades"].sum(axis=1)
+
+        summaries = []
+        for i in range(len(proposals)):
+            summaries.append(
+                {
+                    "realized_pnl": float(pnl.mean[i]),
+                    "funding_pnl": float(funding.mean[i]),
+                    "total_pnl": float(total.mean[i]),
+                    "sharpe_ratio": float(sharpe.mean[i]),
+                    "max_drawdown": float(drawdown.mean[i]),
+                    # Average per path / 每条路径的平均值
+                    "total_trades": int(round(trades[i] / self.paths)),
+                    "winning_trades": int(round(wins[i] / self.paths)),
+                    "win_rate": float(wins[i] / trades[i]) if trades[i] else 0.0,
+                    "confidence_intervals": {
+                        "realized_pnl": [float(pnl.ci_low[i]), float(pnl.ci_high[i])],
+                        "funding_pnl": [
+                            float(funding.ci_low[i]),
+                            float(funding.ci_high[i]),
+                        ],
+                        "total_pnl": [float(total.ci_low[i]), float(total.ci_high[i])],
+                        "sharpe_ratio": [
+                            float(sharpe.ci_low[i]),
+                            float(sharpe.ci_high[i]),
+                        ],
+                        "max_drawdown": [
+                            float(drawdown.ci_low[i]),
+                            float(drawdown.ci_high[i]),
+                        ],
+                    },
+                }
+            )
+        return summaries
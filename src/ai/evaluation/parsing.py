@@ -0,0 +1,291 @@
+"""
+Tolerant JSON Extraction for LLM Responses / LLM 响应的容错 JSON 提取
+
+LLMs wrap JSON in code fences, add prose before or after it, and leave
+trailing commas. Rather than failing the whole (paid) call, extract_json
+scans the response once for the first balanced JSON value, dropping trailing
+commas as it goes, and coerce_proposal maps the result onto StrategyProposal
+by its field types. Failures are counted by reason in mm_llm_parse_failures.
+
+LLM 常在 JSON 外包裹代码块、前后附加说明文字或留下尾随逗号。extract_json
+单次扫描找到第一个括号平衡的 JSON 值并顺带去除尾随逗号，coerce_proposal
+按字段类型将其转换为 StrategyProposal；失败原因计入 mm_llm_parse_failures。
+
+Owner: Agent AI
+"""
+
+import json
+import math
+import typing
+from dataclasses import MISSING, fields
+from typing import Any, Dict, Optional, Tuple
+
+from src.ai.evaluation.schemas import StrategyProposal
+from src.shared.openmetrics import openmetrics_registry
+
+_PARSE_FAILURES = openmetrics_registry.counter(
+    "mm_llm_parse_failures",
+    "LLM responses that yielded no usable JSON, by reason",
+    ("source", "reason"),
+)
+
+# Failure reasons / 失败原因
+EMPTY = "empty"  # Blank response
+NO_JSON = "no_json"  # No opening bracket at all
+UNBALANCED = "unbalanced"  # Truncated: brackets never close
+INVALID_JSON = "invalid_json"  # Balanced, but not valid JSON even after repair
+SCHEMA = "schema"  # Valid JSON that does not fit the expected shape
+
+# Fields the LLM fills in; the rest are set by the evaluator
+# LLM 填写的字段；其余由评估器设置
+_RESPONSE_FIELDS = (
+    "recommended_strategy",
+    "spread",
+    "skew_factor",
+    "quantity",
+    "leverage",
+    "reasoning",
+    "confidence",
+    "risk_level",
+    "expected_return",
+)
+# Defaults for missing keys where they differ from the dataclass defaults
+_DEFAULTS = {"recommended_strategy": "FixedSpread", "spread": 0.01, "confidence": 0.5}
+_ALIASES = {
+    "strategy": "recommended_strategy",
+    "skew": "skew_factor",
+    "qty": "quantity",
+}
+_STRATEGIES = {"fixedspread": "FixedSpread", "fundingrate": "FundingRate"}
+
+
+class ExtractionError(ValueError):
+    """JSON extraction/coercion failure with a countable reason / 带失败原因的提取错误"""
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+def record_parse_failure(source: str, reason: str) -> None:
+    """Count an unusable response / 记录一次不可用的响应"""
+    _PARSE_FAILURES.labels(source=source, reason=reason).inc()
+
+
+def _scan_balanced(text: str, start: int) -> Tuple[Optional[str], int]:
+    """
+    Scan one JSON value starting at the bracket at ``start``.
+
+    Returns the value text with trailing commas removed and the index just past
+    it, or (None, len(text)) if the brackets never balance.
+    """
+    out = []
+    depth = 0
+    in_string = False
+    escaped = False
+    pending_comma = False
+    for index in range(start, len(text)):
+        ch = text[index]
+        if in_string:
+            out.append(ch)
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch in " \t\r\n":
+            out.append(ch)
+            continue
+        if pending_comma:
+            # A comma directly before a closer is a trailing comma: drop it
+            if ch not in "}]":
+                out.append(",")
+            pending_comma = False
+        if ch == ",":
+            pending_comma = True
+            continue
+        out.append(ch)
+        if ch == '"':
+            in_string = True
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+            if depth == 0:
+                return "".join(out), index + 1
+    return None, len(text)
+
+
+def extract_json(text: str, types: Tuple[type, ...] = (dict,)) -> Any:
+    """
+    Extract the first JSON value of one of ``types`` from an LLM response.
+    从 LLM 响应中提取第一个指定类型的 JSON 值。
+
+    Well-formed responses are decoded directly; otherwise the text is scanned
+    for balanced ``{...}`` (and ``[...]`` when list is allowed) values, skipping
+    code fences and prose, and the first one that decodes wins. Each character
+    is visited once.
+
+    Args:
+        text: Raw response
+        types: Acceptable top-level types, dict and/or list
+
+    Returns:
+        The decoded value
+
+    Raises:
+        ExtractionError: With reason EMPTY, NO_JSON, UNBALANCED or INVALID_JSON
+    """
+    stripped = (text or "").strip()
+    if not stripped:
+        raise ExtractionError(EMPTY, "Empty response")
+    try:
+        data = json.loads(stripped)
+        if isinstance(data, types):
+            return data
+    except ValueError:
+        pass
+
+    openers = "{[" if list in types else "{"
+    reason, message = NO_JSON, "No JSON object in response"
+    position = 0
+    while True:
+        starts = [i for i in (stripped.find(o, position) for o in openers) if i >= 0]
+        if not starts:
+            break
+        candidate, position = _scan_balanced(stripped, min(starts))
+        if candidate is None:
+            # Everything after an unclosed bracket is inside it: truncated
+            reason, message = UNBALANCED, "Unbalanced JSON in response (truncated?)"
+            break
+        try:
+            return json.loads(candidate)
+        except ValueError as e:
+            # Braces in prose, or broken JSON: try the next value after it
+            reason, message = INVALID_JSON, f"Invalid JSON: {e}"
+    raise ExtractionError(reason, message)
+
+
+def _normalize_key(key: Any) -> str:
+    return "".join(ch for ch in str(key).lower() if ch.isalnum())
+
+
+_FIELD_BY_KEY = {_normalize_key(name): name for name in _RESPONSE_FIELDS}
+_FIELD_BY_KEY.update(_ALIASES)
+_FIELD_TYPES = typing.get_type_hints(StrategyProposal)
+
+
+def _to_float(name: str, value: Any) -> float:
+    if isinstance(value, bool):
+        raise ExtractionError(SCHEMA, f"{name}: expected a number, got {value!r}")
+    percent = False
+    if isinstance(value, str):
+        value = value.strip()
+        if value.endswith("%"):
+            percent, value = True, value[:-1].strip()
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ExtractionError(SCHEMA, f"{name}: expected a number, got {value!r}")
+    if not math.isfinite(number):
+        raise ExtractionError(SCHEMA, f"{name}: not finite")
+    if percent:
+        number /= 100
+    elif name == "confidence" and 1 < number <= 100:
+        # "confidence": 85 means 85%
+        number /= 100
+    return number
+
+
+def coerce_proposal(
+    data: Dict[str, Any],
+    raw_response: str = "",
+    provider_name: str = "",
+    required: Tuple[str, ...] = (),
+) -> StrategyProposal:
+    """
+    Build a StrategyProposal from decoded JSON, directed by its field types.
+    按 StrategyProposal 字段类型将 JSON 转换为策略建议。
+
+    Keys match ignoring case and separators ("skewFactor", "Skew Factor"),
+    numbers may be strings or percentages ("1.2%" -> 0.012), and strategy names
+    are canonicalized ("fixed_spread" -> "FixedSpread"). Missing keys take
+    defaults unless listed in ``required``, but an object with none of the
+    proposal keys is rejected.
+
+    Raises:
+        ExtractionError: reason SCHEMA
+    """
+    if not isinstance(data, dict):
+        raise ExtractionError(
+            SCHEMA, f"Expected a JSON object, got {type(data).__name__}"
+        )
+    values: Dict[str, Any] = {}
+    for key, value in data.items():
+        name = _FIELD_BY_KEY.get(_normalize_key(key))
+        if name is None or name in values or value is None:
+            continue
+        if _FIELD_TYPES[name] is float:
+            values[name] = _to_float(name, value)
+        else:
+            values[name] = str(value).strip()
+    if not values:
+        raise ExtractionError(SCHEMA, "No strategy proposal fields in JSON object")
+    missing = [name for name in required if name not in values]
+    if missing:
+        raise ExtractionError(
+            SCHEMA, f"Missing required field(s): {', '.join(missing)}"
+        )
+
+    strategy = values.get("recommended_strategy")
+    if strategy is not None:
+        values["recommended_strategy"] = _STRATEGIES.get(
+            _normalize_key(strategy), strategy
+        )
+
+    for field_info in fields(StrategyProposal):
+        name = field_info.name
+        if name in _RESPONSE_FIELDS and name not in values:
+            values[name] = _DEFAULTS.get(name, field_info.default)
+            if values[name] is MISSING:
+                raise ExtractionError(SCHEMA, f"No default for {name}")
+
+    return StrategyProposal(
+        **values,
+        provider_name=provider_name,
+        raw_response=raw_response,
+        parse_success=True,
+    )
+
+
+def failed_proposal(
+    raw_response: str, provider_name: str, error: str
+) -> StrategyProposal:
+    """Default proposal marked as a parse failure / 标记为解析失败的默认建议"""
+    return StrategyProposal(
+        recommended_strategy="FixedSpread",
+        spread=0.01,
+        provider_name=provider_name,
+        raw_response=raw_response,
+        parse_success=False,
+        parse_error=error,
+    )
+
+
+def parse_proposal(
+    raw_response: str, provider_name: str, source: str = "evaluator"
+) -> StrategyProposal:
+    """
+    Parse one LLM response into a StrategyProposal; never raises.
+    解析单个 LLM 响应为策略建议；不抛出异常。
+
+    Failures return a default proposal with parse_success=False and are
+    counted under ``source``.
+    """
+    try:
+        return coerce_proposal(extract_json(raw_response), raw_response, provider_name)
+    except ExtractionError as e:
+        record_parse_failure(source, e.reason)
+        return failed_proposal(raw_response, provider_name, str(e))
@@ -5,6 +5,8 @@ Prompt Templates for Multi-LLM Strategy Evaluation
 Owner: Agent AI
 """
 
+from typing import List
+
 from src.ai.evaluation.schemas import MarketContext
 
 
@@ -19,14 +21,17 @@ Analyze the following market data and recommend optimal trading strategy paramet
 
 【策略 / Strategy】
 FixedSpread - 固定价差做市策略，适合低波动市场
-Note: Only FixedSpread strategy is supported in simulation.
+FundingRate - 按资金费率偏移报价的做市策略（偏移 = funding_rate * skew_factor * mid），
+  leans toward the side that receives funding
+Both strategies are simulated, including funding payments on the position.
 
 【你的任务 / Your Task】
-Based on the market conditions, recommend optimal parameters for FixedSpread strategy:
+Based on the market conditions, recommend a strategy ("FixedSpread" or "FundingRate") and its optimal parameters:
 1. Optimal spread (价差)
-2. Optimal quantity (数量)
-3. Optimal leverage (杠杆)
-4. Your confidence level in this recommendation (置信度)
+2. Optimal skew_factor (资金费率偏移系数, FundingRate only)
+3. Optimal quantity (数量)
+4. Optimal leverage (杠杆)
+5. Your confidence level in this recommendation (置信度)
 
 【输出格式要求 / Output Format】
 Return ONLY a valid JSON object with the following structure:
@@ -50,6 +55,68 @@ Now analyze and provide your recommendation:"""
         return cls.TEMPLATE.format(market_context=context.to_prompt_string())
 
 
+class BatchStrategyAdvisorPrompt:
+    """
+    多交易对策略顾问 Prompt 生成器
+
+    One prompt for a whole watchlist: a static instruction prefix (identical
+    for every batch, so providers can cache it) followed by a compact table
+    with one row per symbol. The model answers with a JSON array holding one
+    proposal per symbol.
+    """
+
+    PREFIX = """You are an expert quantitative trading analyst specializing in cryptocurrency perpetual futures market making.
+
+Analyze each perpetual in the market table below and recommend optimal trading strategy parameters for EACH symbol independently.
+
+【策略 / Strategy】
+FixedSpread - 固定价差做市策略，适合低波动市场
+FundingRate - 按资金费率偏移报价的做市策略（偏移 = funding_rate * skew_factor * mid），
+  leans toward the side that receives funding
+Both strategies are simulated, including funding payments on the position.
+
+【你的任务 / Your Task】
+For every row, recommend a strategy ("FixedSpread" or "FundingRate") with its spread, skew_factor (FundingRate only), quantity, leverage and your confidence.
+
+【输出格式要求 / Output Format】
+Return ONLY a valid JSON array with exactly one object per symbol, using the symbol exactly as written in the table:
+
+[
+    {
+        "symbol": "ETHUSDT",
+        "recommended_strategy": "FixedSpread",
+        "spread": 0.01,
+        "skew_factor": 100,
+        "quantity": 0.1,
+        "leverage": 1.0,
+        "reasoning": "One short sentence",
+        "confidence": 0.85,
+        "risk_level": "low" or "medium" or "high",
+        "expected_return": 0.05
+    }
+]
+"""
+
+    COLUMNS = "symbol | mid | spread_bps | vol_1h | vol_24h | funding | funding_trend | position"
+
+    @staticmethod
+    def format_row(context: MarketContext) -> str:
+        return (
+            f"{context.symbol} | {context.mid_price:.6g} | {context.spread_bps:.2f} | "
+            f"{context.volatility_1h:.2%} | {context.volatility_24h:.2%} | "
+            f"{context.funding_rate:.4%} | {context.funding_rate_trend} | "
+            f"{context.current_position:g} ({context.position_side})"
+        )
+
+    @classmethod
+    def generate(cls, contexts: List[MarketContext]) -> str:
+        rows = "\n".join(cls.format_row(context) for context in contexts)
+        return (
+            f"{cls.PREFIX}\n【市场数据 / Market Data】({len(contexts)} symbols)\n"
+            f"{cls.COLUMNS}\n{rows}\n\nNow analyze and provide your recommendations:"
+        )
+
+
 class RiskAdvisorPrompt:
     """风险顾问 Prompt 生成器"""
 
@@ -101,6 +101,7 @@ class SimulationResult:
     winning_trades: int = 0
     win_rate: float = 0.0
     max_drawdown: float = 0.0
+    funding_pnl: float = 0.0  # Funding payments, included in realized_pnl
 
     avg_slippage_bps: float = 0.0
     fill_rate: float = 0.0
@@ -112,6 +113,11 @@ class SimulationResult:
     simulation_steps: int = 0
     pnl_history: list = field(default_factory=list)
 
+    # Monte Carlo: metrics above are means over `paths` paths; 95% CI per metric
+    # 蒙特卡洛：上述指标为 `paths` 条路径的均值；各指标的 95% 置信区间
+    paths: int = 1
+    confidence_intervals: Dict[str, List[float]] = field(default_factory=dict)
+
 
 @dataclass
 class EvaluationResult:
@@ -126,6 +132,8 @@ class EvaluationResult:
 
     timestamp: datetime = field(default_factory=datetime.now)
     latency_ms: float = 0.0
+    cached: bool = False  # Proposal served from the LLM response cache
+    status: str = "ok"  # "ok", "error" or "timeout"
 
     def to_summary(self) -> dict:
         return {
@@ -0,0 +1,602 @@
+"""
+Evaluation Store / 评估记录存储
+
+Persistent, indexed history of multi-LLM evaluation runs backed by SQLite.
+基于 SQLite 的多 LLM 评估历史记录，支持索引查询。
+
+Owner: Agent AI
+
+Each run gets an ID and keeps its market context, every provider's proposal
+and simulation, the aggregated consensus and, once applied, the decision.
+Runs are indexed by symbol, provider and time. Per-(provider, symbol)
+counters are updated in the same transaction as each write, so provider
+leaderboards are read from those counters instead of rescanning results.
+每次评估分配 ID，保存市场上下文、各 Provider 的建议与模拟、共识及应用决策；
+按交易对、Provider 和时间建立索引。排行榜读取随写入增量更新的计数器，无需重新扫描。
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
+
+from src.ai.evaluation.schemas import (
+    AggregatedResult,
+    EvaluationResult,
+    MarketContext,
+    StrategyProposal,
+)
+from src.shared.config import EVALUATION_STORE_PATH
+from src.shared.logger import setup_logger
+
+logger = setup_logger("EvaluationStore")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS evaluations (
+    id TEXT PRIMARY KEY,
+    symbol TEXT NOT NULL,
+    exchange TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    context TEXT,
+    aggregated TEXT,
+    applied_source TEXT,
+    applied_provider TEXT,
+    applied_config TEXT,
+    applied_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_evaluations_symbol ON evaluations(symbol, created_at);
+CREATE INDEX IF NOT EXISTS idx_evaluations_created ON evaluations(created_at);
+
+CREATE TABLE IF NOT EXISTS evaluation_results (
+    evaluation_id TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    rank INTEGER,
+    score REAL,
+    status TEXT,
+    valid INTEGER NOT NULL,
+    agrees INTEGER NOT NULL,
+    realized_pnl REAL,
+    latency_ms REAL,
+    cached INTEGER,
+    proposal TEXT,
+    simulation TEXT,
+    PRIMARY KEY (evaluation_id, provider)
+);
+CREATE INDEX IF NOT EXISTS idx_results_provider ON evaluation_results(provider, created_at);
+
+CREATE TABLE IF NOT EXISTS provider_stats (
+    provider TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    runs INTEGER NOT NULL DEFAULT 0,
+    valid INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    agrees INTEGER NOT NULL DEFAULT 0,
+    applied INTEGER NOT NULL DEFAULT 0,
+    score_sum REAL NOT NULL DEFAULT 0,
+    pnl_sum REAL NOT NULL DEFAULT 0,
+    latency_sum REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (provider, symbol)
+);
+"""
+
+LEADERBOARD_SORT_KEYS = (
+    "avg_score",
+    "win_rate",
+    "consensus_rate",
+    "valid_rate",
+    "avg_pnl",
+    "avg_latency_ms",
+    "runs",
+)
+
+
+def _dumps(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return json.dumps(value, default=str)
+
+
+def _loads(text: Optional[str]) -> Any:
+    return json.loads(text) if text else None
+
+
+def _aggregated_record(aggregated: AggregatedResult) -> Dict[str, Any]:
+    # Individual results are stored per row; don't duplicate them here
+    record = asdict(aggregated)
+    record.pop("individual_results", None)
+    return record
+
+
+def _simulation_record(result: EvaluationResult) -> Dict[str, Any]:
+    record = asdict(result.simulation)
+    record.pop("pnl_history", None)
+    return record
+
+
+class EvaluationStore:
+    """
+    Persistent evaluation history with incrementally maintained leaderboards.
+    带增量排行榜的持久化评估历史。
+
+    Writes never raise into the caller: a failing write is logged and the
+    run is still returned to the user, it just is not in the history.
+    """
+
+    def __init__(self, path: str = ":memory:", clock=time.time):
+        """
+        Open (or create) the store.
+
+        Args:
+            path: SQLite file path, or ":memory:" for a non-persistent store
+            clock: Time source (wall clock, as runs persist across restarts)
+        """
+        self.path = path
+        if path != ":memory:":
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def record(
+        self,
+        symbol: str,
+        exchange: str,
+        context: Optional[MarketContext],
+        results: List[EvaluationResult],
+        aggregated: AggregatedResult,
+    ) -> str:
+        """
+        Store a finished run / 保存一次评估
+
+        Returns:
+            The evaluation ID
+        """
+        evaluation_id = uuid.uuid4().hex
+        now = self._clock()
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT INTO evaluations "
+                    "(id, symbol, exchange, created_at, updated_at, context, aggregated) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        evaluation_id,
+                        symbol,
+                        exchange,
+                        now,
+                        now,
+                        _dumps(asdict(context) if context is not None else None),
+                        _dumps(_aggregated_record(aggregated)),
+                    ),
+                )
+                self._insert_results(evaluation_id, symbol, now, results, aggregated)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to store evaluation for {symbol}: {e}")
+        return evaluation_id
+
+    def update(
+        self,
+        evaluation_id: str,
+        results: List[EvaluationResult],
+        aggregated: AggregatedResult,
+    ) -> None:
+        """
+        Replace a run's results, e.g. after late providers were merged in.
+        替换评估结果（如合并迟到的 Provider 结果后）。
+
+        The run's previous contribution to the leaderboard is backed out
+        before the new one is added.
+        """
+        try:
+            with self._lock, self._conn:
+                row = self._conn.execute(
+                    "SELECT symbol, created_at FROM evaluations WHERE id = ?",
+                    (evaluation_id,),
+                ).fetchone()
+                if row is None:
+                    return
+                old_rows = self._conn.execute(
+                    "SELECT * FROM evaluation_results WHERE evaluation_id = ?",
+                    (evaluation_id,),
+                ).fetchall()
+                for old in old_rows:
+                    self._add_stats(old["provider"], old["symbol"], old, sign=-1)
+                self._conn.execute(
+                    "DELETE FROM evaluation_results WHERE evaluation_id = ?",
+                    (evaluation_id,),
+                )
+                self._conn.execute(
+                    "UPDATE evaluations SET aggregated = ?, updated_at = ? WHERE id = ?",
+                    (
+                        _dumps(_aggregated_record(aggregated)),
+                        self._clock(),
+                        evaluation_id,
+                    ),
+                )
+                self._insert_results(
+                    evaluation_id, row["symbol"], row["created_at"], results, aggregated
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Failed to update evaluation {evaluation_id}: {e}")
+
+    def mark_applied(
+        self,
+        evaluation_id: str,
+        source: str,
+        provider_name: Optional[str],
+        applied_config: Dict[str, Any],
+    ) -> None:
+        """
+        Record which proposal of a run was applied / 记录应用了哪个建议
+
+        Applying an individual provider's proposal counts towards that
+        provider's ``applied`` total.
+        """
+        try:
+            with self._lock, self._conn:
+                row = self._conn.execute(
+                    "SELECT symbol FROM evaluations WHERE id = ?", (evaluation_id,)
+                ).fetchone()
+                if row is None:
+                    return
+                self._conn.execute(
+                    "UPDATE evaluations SET applied_source = ?, applied_provider = ?, "
+                    "applied_config = ?, applied_at = ? WHERE id = ?",
+                    (
+                        source,
+                        provider_name,
+                        _dumps(applied_config),
+                        self._clock(),
+                        evaluation_id,
+                    ),
+                )
+                if source == "individual" and provider_name:
+                    self._conn.execute(
+                        "UPDATE provider_stats SET applied = applied + 1 "
+                        "WHERE provider = ? AND symbol = ?",
+                        (provider_name, row["symbol"]),
+                    )
+        except sqlite3.Error as e:
+            logger.error(f"Failed to record apply for evaluation {evaluation_id}: {e}")
+
+    def _insert_results(
+        self,
+        evaluation_id: str,
+        symbol: str,
+        created_at: float,
+        results: List[EvaluationResult],
+        aggregated: AggregatedResult,
+    ) -> None:
+        consensus = aggregated.strategy_consensus.consensus_strategy
+        for result in results:
+            valid = int(result.status == "ok" and result.proposal.parse_success)
+            row = {
+                "rank": result.rank,
+                "score": result.score,
+                "valid": valid,
+                "agrees": int(
+                    bool(valid and consensus)
+                    and result.proposal.recommended_strategy == consensus
+                ),
+                "realized_pnl": result.simulation.realized_pnl if valid else 0.0,
+                "latency_ms": result.latency_ms,
+            }
+            self._conn.execute(
+                "INSERT OR REPLACE INTO evaluation_results "
+                "(evaluation_id, provider, symbol, created_at, rank, score, status, "
+                "valid, agrees, realized_pnl, latency_ms, cached, proposal, simulation) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    evaluation_id,
+                    result.provider_name,
+                    symbol,
+                    created_at,
+                    row["rank"],
+                    row["score"],
+                    result.status,
+                    row["valid"],
+                    row["agrees"],
+                    row["realized_pnl"],
+                    row["latency_ms"],
+                    int(result.cached),
+                    _dumps(asdict(result.proposal)),
+                    _dumps(_simulation_record(result)),
+                ),
+            )
+            self._add_stats(result.provider_name, symbol, row, sign=1)
+
+    def _add_stats(self, provider: str, symbol: str, row, sign: int) -> None:
+        """Add (sign=1) or back out (sign=-1) one result's leaderboard contribution"""
+        self._conn.execute(
+            "INSERT OR IGNORE INTO provider_stats (provider, symbol) VALUES (?, ?)",
+            (provider, symbol),
+        )
+        self._conn.execute(
+            "UPDATE provider_stats SET runs = runs + ?, valid = valid + ?, "
+            "wins = wins + ?, agrees = agrees + ?, score_sum = score_sum + ?, "
+            "pnl_sum = pnl_sum + ?, latency_sum = latency_sum + ? "
+            "WHERE provider = ? AND symbol = ?",
+            (
+                sign,
+                sign * row["valid"],
+                sign * int(bool(row["valid"]) and row["rank"] == 1),
+                sign * row["agrees"],
+                sign * (row["score"] or 0.0),
+                sign * (row["realized_pnl"] or 0.0),
+                sign * (row["latency_ms"] or 0.0),
+                provider,
+                symbol,
+            ),
+        )
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def get(self, evaluation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Full record of a run, or None / 获取完整评估记录
+
+        Returns:
+            {"id", "symbol", "exchange", "created_at", "context", "aggregated",
+             "results": [...], "applied": {...} or None}
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM evaluations WHERE id = ?", (evaluation_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            result_rows = self._conn.execute(
+                "SELECT * FROM evaluation_results WHERE evaluation_id = ? "
+                "ORDER BY rank, provider",
+                (evaluation_id,),
+            ).fetchall()
+
+        record = self._summary(row)
+        record["context"] = _loads(row["context"])
+        record["aggregated"] = _loads(row["aggregated"])
+        record["results"] = [
+            {
+                "provider_name": r["provider"],
+                "rank": r["rank"],
+                "score": r["score"],
+                "status": r["status"],
+                "latency_ms": r["latency_ms"],
+                "cached": bool(r["cached"]),
+                "proposal": _loads(r["proposal"]),
+                "simulation": _loads(r["simulation"]),
+            }
+            for r in result_rows
+        ]
+        return record
+
+    def get_proposal(
+        self, evaluation_id: str, provider_name: Optional[str] = None
+    ) -> Optional[StrategyProposal]:
+        """
+        A run's consensus proposal (provider_name None) or one provider's.
+        获取评估的共识建议（provider_name 为 None）或某个 Provider 的建议。
+        """
+        with self._lock:
+            if provider_name is None:
+                row = self._conn.execute(
+                    "SELECT aggregated FROM evaluations WHERE id = ?", (evaluation_id,)
+                ).fetchone()
+                data = (
+                    (_loads(row["aggregated"]) or {}).get("consensus_proposal")
+                    if row
+                    else None
+                )
+            else:
+                row = self._conn.execute(
+                    "SELECT proposal FROM evaluation_results "
+                    "WHERE evaluation_id = ? AND provider = ?",
+                    (evaluation_id, provider_name),
+                ).fetchone()
+                data = _loads(row["proposal"]) if row else None
+        return StrategyProposal(**data) if data else None
+
+    def get_target(self, evaluation_id: str) -> Optional[Dict[str, str]]:
+        """
+        Symbol and exchange a run was made for, or None (no results loaded)
+        获取评估对应的交易对和交易所（不加载结果）
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT symbol, exchange FROM evaluations WHERE id = ?",
+                (evaluation_id,),
+            ).fetchone()
+        return {"symbol": row["symbol"], "exchange": row["exchange"]} if row else None
+
+    def latest_id(
+        self, symbol: Optional[str] = None, exchange: Optional[str] = None
+    ) -> Optional[str]:
+        """ID of the most recent run, optionally for one symbol/exchange / 最近一次评估的 ID"""
+        query = "SELECT id FROM evaluations"
+        clauses: List[str] = []
+        params: List[Any] = []
+        if symbol:
+            clauses.append("symbol = ?")
+            params.append(symbol)
+        if exchange:
+            clauses.append("exchange = ?")
+            params.append(exchange)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY created_at DESC, rowid DESC LIMIT 1"
+        with self._lock:
+            row = self._conn.execute(query, params).fetchone()
+        return row["id"] if row else None
+
+    def query(
+        self,
+        symbol: Optional[str] = None,
+        provider: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: int = 50,
+    ) -> List[Dict[str, Any]]:
+        """
+        Run summaries, newest first / 按条件查询评估摘要（最新在前）
+
+        Args:
+            symbol: Only runs for this symbol
+            provider: Only runs this provider took part in
+            since: Only runs created at or after this epoch time
+            until: Only runs created before this epoch time
+            limit: Maximum number of runs
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+        if symbol:
+            clauses.append("e.symbol = ?")
+            params.append(symbol)
+        if provider:
+            clauses.append(
+                "e.id IN (SELECT evaluation_id FROM evaluation_results WHERE provider = ?)"
+            )
+            params.append(provider)
+        if since is not None:
+            clauses.append("e.created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("e.created_at < ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT e.* FROM evaluations e {where} "
+                "ORDER BY e.created_at DESC, e.rowid DESC LIMIT ?",
+                params,
+            ).fetchall()
+        return [self._summary(row) for row in rows]
+
+    def leaderboard(
+        self, symbol: Optional[str] = None, sort_by: str = "avg_score"
+    ) -> List[Dict[str, Any]]:
+        """
+        Provider accuracy leaderboard from the incremental counters.
+        基于增量计数器的 Provider 准确度排行榜。
+
+        Rates are per run: valid_rate (usable proposals), win_rate (ranked
+        first), consensus_rate (matched the consensus strategy). avg_pnl is
+        over valid runs; avg_score and avg_latency_ms over all runs.
+
+        Args:
+            symbol: Only count runs for this symbol
+            sort_by: One of LEADERBOARD_SORT_KEYS (latency sorts ascending)
+        """
+        if sort_by not in LEADERBOARD_SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {sort_by}")
+        query = (
+            "SELECT provider, SUM(runs) AS runs, SUM(valid) AS valid, SUM(wins) AS wins, "
+            "SUM(agrees) AS agrees, SUM(applied) AS applied, SUM(score_sum) AS score_sum, "
+            "SUM(pnl_sum) AS pnl_sum, SUM(latency_sum) AS latency_sum FROM provider_stats"
+        )
+        params: List[Any] = []
+        if symbol:
+            query += " WHERE symbol = ?"
+            params.append(symbol)
+        query += " GROUP BY provider HAVING SUM(runs) > 0"
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        board = []
+        for row in rows:
+            runs, valid = row["runs"], row["valid"]
+            board.append(
+                {
+                    "provider": row["provider"],
+                    "runs": runs,
+                    "valid_rate": valid / runs,
+                    "win_rate": row["wins"] / runs,
+                    "consensus_rate": row["agrees"] / runs,
+                    "applied": row["applied"],
+                    "avg_score": row["score_sum"] / runs,
+                    "avg_pnl": row["pnl_sum"] / valid if valid else 0.0,
+                    "avg_latency_ms": row["latency_sum"] / runs,
+                }
+            )
+        # Stable sorts: provider names stay ascending among ties
+        board.sort(key=lambda entry: entry["provider"])
+        board.sort(
+            key=lambda entry: entry[sort_by], reverse=sort_by != "avg_latency_ms"
+        )
+        for rank, entry in enumerate(board, start=1):
+            entry["rank"] = rank
+        return board
+
+    @staticmethod
+    def _summary(row) -> Dict[str, Any]:
+        applied = None
+        if row["applied_source"]:
+            applied = {
+                "source": row["applied_source"],
+                "provider_name": row["applied_provider"],
+                "config": _loads(row["applied_config"]),
+                "applied_at": row["applied_at"],
+            }
+        aggregated = _loads(row["aggregated"]) or {}
+        consensus = aggregated.get("strategy_consensus") or {}
+        return {
+            "id": row["id"],
+            "symbol": row["symbol"],
+            "exchange": row["exchange"],
+            "created_at": row["created_at"],
+            "consensus_strategy": consensus.get("consensus_strategy", ""),
+            "successful_evaluations": aggregated.get("successful_evaluations", 0),
+            "failed_evaluations": aggregated.get("failed_evaluations", 0),
+            "applied": applied,
+        }
+
+
+_evaluation_store: Optional[EvaluationStore] = None
+_evaluation_store_lock = threading.Lock()
+
+
+def get_evaluation_store() -> EvaluationStore:
+    """
+    Shared store at EVALUATION_STORE_PATH, falling back to memory if it
+    cannot be opened. Created on first use so imports do not touch the disk.
+    共享评估存储（无法打开文件时回退到内存）；首次使用时创建。
+    """
+    global _evaluation_store
+    if _evaluation_store is None:
+        with _evaluation_store_lock:
+            if _evaluation_store is None:
+                try:
+                    _evaluation_store = EvaluationStore(EVALUATION_STORE_PATH)
+                except (sqlite3.Error, OSError) as e:
+                    logger.warning(
+                        f"Failed to open evaluation store at {EVALUATION_STORE_PATH}: {e}. "
+                        "Using in-memory store."
+                    )
+                    _evaluation_store = EvaluationStore(":memory:")
+    return _evaluation_store
@@ -6,9 +6,11 @@ LLM Provider Implementations / LLM 提供者实现
 Owner: Agent AI
 """
 
+import asyncio
 import os
+import threading
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import google.generativeai as genai
 
@@ -16,6 +18,13 @@ from src.shared.logger import setup_logger
 
 logger = setup_logger("LLMProvider")
 
+SYSTEM_PROMPT = "You are an expert quantitative trading analyst."
+
+# Async SDK clients shared by all provider instances with the same API key:
+# (provider class, api key) -> (event loop, client)
+_async_clients: Dict[Tuple[str, str], Tuple[asyncio.AbstractEventLoop, Any]] = {}
+_async_clients_lock = threading.Lock()
+
 
 class LLMProvider(ABC):
     """Abstract base class for LLM providers"""
@@ -31,6 +40,40 @@ class LLMProvider(ABC):
         """Generate response from the LLM"""
         pass
 
+    async def agenerate(self, prompt: str) -> str:
+        """
+        Generate response without blocking the event loop.
+        Providers with an async SDK override this; the default runs
+        ``generate`` on a worker thread.
+        """
+        return await asyncio.to_thread(self.generate, prompt)
+
+    def _loop_client(self, factory: Callable[[], Any]) -> Any:
+        """
+        Long-lived async client shared across instances of this provider.
+        SDK async clients pool connections per event loop, so a new one is
+        made only when the running loop changes.
+        """
+        loop = asyncio.get_running_loop()
+        key = (type(self).__name__, str(getattr(self, "api_key", "")))
+        with _async_clients_lock:
+            entry = _async_clients.get(key)
+            if entry is None or entry[0] is not loop:
+                entry = (loop, factory())
+                _async_clients[key] = entry
+            return entry[1]
+
+
+async def agenerate(provider: Any, prompt: str) -> str:
+    """
+    Await ``provider.agenerate``, or run ``provider.generate`` on a worker
+    thread for providers without a native async implementation.
+    """
+    method = getattr(type(provider), "agenerate", None)
+    if method is not None and asyncio.iscoroutinefunction(method):
+        return await provider.agenerate(prompt)
+    return await asyncio.to_thread(provider.generate, prompt)
+
 
 class GeminiProvider(LLMProvider):
     """Google Gemini implementation of LLMProvider"""
@@ -69,6 +112,21 @@ class GeminiProvider(LLMProvider):
                 return response.text
             raise RuntimeError(f"Gemini API error: {e}")
 
+    async def agenerate(self, prompt: str) -> str:
+        try:
+            response = await self.model.generate_content_async(prompt)
+            return response.text
+        except Exception as e:
+            if self._model_name == "gemini-3-pro" and "not found" in str(e).lower():
+                logger.warning(
+                    f"Gemini 3 Pro not available, falling back to gemini-1.5-pro: {e}"
+                )
+                self._model_name = "gemini-1.5-pro"
+                self.model = genai.GenerativeModel(self._model_name)
+                response = await self.model.generate_content_async(prompt)
+                return response.text
+            raise RuntimeError(f"Gemini API error: {e}")
+
 
 class OpenAIProvider(LLMProvider):
     """OpenAI GPT implementation of LLMProvider"""
@@ -98,37 +156,45 @@ class OpenAIProvider(LLMProvider):
     def name(self) -> str:
         return f"OpenAI ({self._model_name})"
 
+    def _request(self, prompt: str) -> Dict[str, Any]:
+        return {
+            "model": self._model_name,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            "temperature": 0.7,
+        }
+
+    def _should_fall_back(self, error: Exception) -> bool:
+        if self._model_name == "gpt-5" and (
+            "not found" in str(error).lower() or "invalid" in str(error).lower()
+        ):
+            logger.warning(f"GPT-5 not available, falling back to gpt-4o: {error}")
+            self._model_name = "gpt-4o"
+            return True
+        return False
+
     def generate(self, prompt: str) -> str:
         try:
-            response = self.client.chat.completions.create(
-                model=self._model_name,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert quantitative trading analyst.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.7,
-            )
+            response = self.client.chat.completions.create(**self._request(prompt))
             return response.choices[0].message.content
         except Exception as e:
-            if self._model_name == "gpt-5" and (
-                "not found" in str(e).lower() or "invalid" in str(e).lower()
-            ):
-                logger.warning(f"GPT-5 not available, falling back to gpt-4o: {e}")
-                self._model_name = "gpt-4o"
-                response = self.client.chat.completions.create(
-                    model=self._model_name,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are an expert quantitative trading analyst.",
-                        },
-                        {"role": "user", "content": prompt},
-                    ],
-                    temperature=0.7,
-                )
+            if self._should_fall_back(e):
+                response = self.client.chat.completions.create(**self._request(prompt))
+                return response.choices[0].message.content
+            raise RuntimeError(f"OpenAI API error: {e}")
+
+    async def agenerate(self, prompt: str) -> str:
+        from openai import AsyncOpenAI
+
+        client = self._loop_client(lambda: AsyncOpenAI(api_key=self.api_key))
+        try:
+            response = await client.chat.completions.create(**self._request(prompt))
+            return response.choices[0].message.content
+        except Exception as e:
+            if self._should_fall_back(e):
+                response = await client.chat.completions.create(**self._request(prompt))
                 return response.choices[0].message.content
             raise RuntimeError(f"OpenAI API error: {e}")
 
@@ -156,14 +222,29 @@ class ClaudeProvider(LLMProvider):
     def name(self) -> str:
         return f"Claude ({self._model_name})"
 
+    def _request(self, prompt: str) -> Dict[str, Any]:
+        return {
+            "model": self._model_name,
+            "max_tokens": 1024,
+            "messages": [{"role": "user", "content": prompt}],
+            "system": SYSTEM_PROMPT,
+        }
+
     def generate(self, prompt: str) -> str:
         try:
-            message = self.client.messages.create(
-                model=self._model_name,
-                max_tokens=1024,
-                messages=[{"role": "user", "content": prompt}],
-                system="You are an expert quantitative trading analyst.",
-            )
+            message = self.client.messages.create(**self._request(prompt))
+            return message.content[0].text
+        except Exception as e:
+            raise RuntimeError(f"Claude API error: {e}")
+
+    async def agenerate(self, prompt: str) -> str:
+        import anthropic
+
+        client = self._loop_client(
+            lambda: anthropic.AsyncAnthropic(api_key=self.api_key)
+        )
+        try:
+            message = await client.messages.create(**self._request(prompt))
             return message.content[0].text
         except Exception as e:
             raise RuntimeError(f"Claude API error: {e}")
@@ -172,8 +253,17 @@ class ClaudeProvider(LLMProvider):
 class LLMGateway:
     """Gateway service for interacting with LLMs"""
 
-    def __init__(self, provider: LLMProvider):
+    def __init__(self, provider: LLMProvider, cache=None, bucket_prompt: bool = False):
+        """
+        Args:
+            provider: LLM provider
+            cache: Optional LLMResponseCache in front of the provider
+            bucket_prompt: Bucket numbers in the prompt so near-identical
+                           prompts share a cache entry
+        """
         self.provider = provider
+        self.cache = cache
+        self.bucket_prompt = bucket_prompt
 
     @property
     def provider_name(self) -> str:
@@ -182,7 +272,21 @@ class LLMGateway:
 
     def generate(self, prompt: str) -> str:
         """Generate content using the configured provider"""
-        return self.provider.generate(prompt)
+        if self.cache is None:
+            return self.provider.generate(prompt)
+        response, _ = self.cache.generate(
+            self.provider, prompt, bucket_prompt=self.bucket_prompt
+        )
+        return response
+
+    async def agenerate(self, prompt: str) -> str:
+        """Async variant of generate / generate 的异步版本"""
+        if self.cache is None:
+            return await agenerate(self.provider, prompt)
+        response, _ = await self.cache.agenerate(
+            self.provider, prompt, bucket_prompt=self.bucket_prompt
+        )
+        return response
 
 
 def create_all_providers() -> List[LLMProvider]:
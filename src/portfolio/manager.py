@@ -13,11 +13,15 @@ Owner: Agent PORTFOLIO
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 
 import numpy as np
 
 from src.portfolio.health import calculate_strategy_health
+from src.shared.ring_buffer import RingBuffer
+
+# Portfolio PnL snapshots kept for the Sharpe calculation
+PNL_HISTORY_SIZE = 1000
 
 
 class StrategyStatus(Enum):
@@ -101,7 +105,7 @@ class PortfolioManager:
         """
         self.total_capital = total_capital
         self.strategies: Dict[str, StrategyInfo] = {}
-        self.pnl_history: List[float] = []
+        self.pnl_history = RingBuffer(PNL_HISTORY_SIZE)
         self.min_allocation = min_allocation
         self.max_allocation = max_allocation
         self.auto_rebalance = auto_rebalance
@@ -230,7 +234,7 @@ class PortfolioManager:
         if len(self.pnl_history) < 10:
             return None
 
-        returns = np.diff(self.pnl_history)
+        returns = np.diff(self.pnl_history.view())
         if len(returns) == 0 or np.std(returns) == 0:
             return None
 
@@ -268,11 +272,9 @@ class PortfolioManager:
     def record_pnl_snapshot(self) -> None:
         """记录当前 PnL 快照"""
         total_pnl = self.get_total_pnl()
+        # Oldest snapshot is overwritten once PNL_HISTORY_SIZE is reached
         self.pnl_history.append(total_pnl)
 
-        if len(self.pnl_history) > 1000:
-            self.pnl_history = self.pnl_history[-1000:]
-
     def set_allocation_limits(
         self, min_allocation: float = None, max_allocation: float = None
     ) -> None:
@@ -6,6 +6,8 @@ Shared utilities:
 - config: Configuration management
 - logger: Logging utilities
 - utils: Common helper functions
+- latency: Tick-to-trade hot-path latency instrumentation
+- market_stats: Rolling realized volatility and spread statistics
 """
 
 from src.shared.config import (
@@ -18,6 +20,7 @@ from src.shared.config import (
     LOG_LEVEL,
     MAX_POSITION,
     METRICS_CONFIG,
+    ORDER_JOURNAL_PATH,
     QUANTITY,
     REFRESH_INTERVAL,
     RISK_LIMITS,
@@ -34,12 +37,24 @@ from src.shared.errors import (
 )
 from src.shared.exchange_metrics import (
     ExchangeName,
+    LatencyHistogram,
     MetricsCollector,
     OperationType,
     metrics_collector,
     track_exchange_operation,
 )
-from src.shared.logger import JsonFormatter, setup_logger
+from src.shared.latency import LatencyTracker, TickToTradeTimer, tick_to_trade_tracker
+from src.shared.log_throttle import LogThrottle
+from src.shared.logger import (
+    JsonFormatter,
+    LogSampler,
+    get_log_stats,
+    setup_logger,
+    throttle_logger,
+)
+from src.shared.market_stats import MarketStatsEngine, market_stats
+from src.shared.openmetrics import OpenMetricsRegistry, openmetrics_registry
+from src.shared.ring_buffer import RingBuffer
 from src.shared.utils import round_step_size, round_tick_size
 
 __all__ = [
@@ -60,14 +75,20 @@ __all__ = [
     "STRATEGY_TYPE",
     "REFRESH_INTERVAL",
     "LOG_LEVEL",
+    "ORDER_JOURNAL_PATH",
     "RISK_LIMITS",
     "METRICS_CONFIG",
     # Logger
     "setup_logger",
     "JsonFormatter",
+    "LogSampler",
+    "get_log_stats",
+    "LogThrottle",
+    "throttle_logger",
     # Utils
     "round_step_size",
     "round_tick_size",
+    "RingBuffer",
     # Error Handling
     "ErrorSeverity",
     "ErrorType",
@@ -78,6 +99,17 @@ __all__ = [
     "ExchangeName",
     "OperationType",
     "MetricsCollector",
+    "LatencyHistogram",
     "metrics_collector",
     "track_exchange_operation",
+    # Latency
+    "TickToTradeTimer",
+    "LatencyTracker",
+    "tick_to_trade_tracker",
+    # Market Stats
+    "MarketStatsEngine",
+    "market_stats",
+    # OpenMetrics
+    "OpenMetricsRegistry",
+    "openmetrics_registry",
 ]
@@ -39,6 +39,68 @@ STRATEGY_TYPE = "fixed_spread"  # Options: "fixed_spread", "funding_rate"
 # System Parameters
 REFRESH_INTERVAL = 2  # Seconds between loops
 LOG_LEVEL = "INFO"
+# Write log records from a background thread in batches (set LOG_ASYNC=0 to disable)
+LOG_ASYNC = os.getenv("LOG_ASYNC", "1") != "0"
+LOG_BATCH_SIZE = 256  # Max records per write
+LOG_FLUSH_INTERVAL = 0.05  # Seconds between flushes when the queue is idle
+LOG_QUEUE_SIZE = 10000  # Records buffered before new ones are dropped
+# Per-logger sampling / rate limiting of records below WARNING
+# e.g. {"AlphaLoop": {"sample_rate": 0.1, "rate_limit": 20}}
+LOG_SAMPLING = {}
+# Repeated-message suppression and per-level rate limits (records/second)
+LOG_THROTTLE = {
+    "enabled": True,
+    "window_seconds": 10.0,
+    "level_rates": {"DEBUG": 50, "INFO": 50, "WARNING": 20, "ERROR": 20},
+}
+# Prices / trades kept in memory by the DataAgent (fixed-size ring buffers)
+DATA_HISTORY_SIZE = 10000
+# Distinct symbols on one venue before public data is fetched via bulk endpoints
+# (a single symbol is cheaper through the per-symbol endpoints)
+MARKET_DATA_BULK_MIN_SYMBOLS = 2
+# Funding-rate history and trend engine
+FUNDING_CONFIG = {
+    "history_size": 1000,  # Settled rates kept per symbol
+    "backfill_days": 30,  # History fetched on first sync
+    "live_ttl_seconds": 30.0,  # Max age of bulk live rates served from memory
+    "trend_window": 6,  # Recent rates used for trend / prediction
+    "trend_threshold": 0.00002,  # Rate change over the window to call a trend
+    "carry_window": 9,  # Settled rates averaged for annualized carry
+    "retry_seconds": 60.0,  # Delay before retrying a failed history sync
+}
+# LLM response cache (TTL + LRU, SQLite-backed; path None keeps it in memory)
+LLM_CACHE = {
+    "enabled": os.getenv("LLM_CACHE", "1") != "0",
+    "ttl_seconds": 300.0,
+    "max_entries": 512,
+    "path": os.getenv("LLM_CACHE_PATH", "logs/llm_cache.db"),
+    # Numbers are bucketed to this many digits. 6 keeps prices a few ticks
+    # apart distinct (3012.4 vs 3012.9); fewer digits share entries across
+    # materially different markets and must be opted into
+    "significant_digits": int(os.getenv("LLM_CACHE_SIGNIFICANT_DIGITS", "6")),
+}
+# Background Quant/Risk advisory worker (the trading cycle never waits on it)
+ADVISORY_CONFIG = {
+    "interval_seconds": 10.0,  # Minimum time between analyses of one instance
+    "max_snapshot_age": 60.0,  # Snapshots older than this are dropped unanalysed
+}
+# Multi-LLM evaluation deadlines (None disables a limit)
+EVALUATION_CONFIG = {
+    "provider_timeout_seconds": 60.0,  # A provider's answer is abandoned after this
+    "hedge_after_seconds": None,  # Re-issue a slow provider's request once after this
+    "quorum": None,  # Return once this many providers have answered
+    "latency_budget_seconds": None,  # Return whatever has answered by then
+    "simulation_paths": 1000,  # Monte Carlo price paths shared by all proposals
+    "simulation_seed": None,  # Fix for reproducible scores (None = fresh per evaluator)
+    "funding_interval_steps": 8,  # Simulation steps are ~1h; funding settles every 8h
+    "funding_rate_reversion": 0.05,  # Per-step pull of simulated funding back to the current rate
+    "funding_rate_volatility": 0.00002,  # Per-step std of simulated funding-rate changes
+    "max_batch_symbols": 50,  # Symbols per /api/evaluation/batch request (one prompt)
+}
+# SQLite file for the persistent order/error journal (":memory:" disables persistence)
+ORDER_JOURNAL_PATH = os.getenv("ORDER_JOURNAL_PATH", "logs/order_journal.db")
+# SQLite file for the multi-LLM evaluation history (":memory:" disables persistence)
+EVALUATION_STORE_PATH = os.getenv("EVALUATION_STORE_PATH", "logs/evaluations.db")
 
 # Risk Limits
 RISK_LIMITS = {
@@ -50,7 +112,7 @@ RISK_LIMITS = {
 # Metrics Configuration (Pluggable)
 METRICS_CONFIG = {
     "layer_1_infrastructure": {
-        "tick_to_trade_latency": {"enabled": True, "target_ms": 5},
+        "tick_to_trade_latency": {"enabled": True, "target_ms": 5, "percentile": 50},
         "websocket_sequence_gap": {"enabled": True, "target": 0},
     },
     "layer_2_execution": {
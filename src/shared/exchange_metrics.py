@@ -11,14 +11,25 @@ Note: This module is separate from src/shared/metrics/ which handles
       operation observability.
 注意：此模块与处理策略评估指标的 src/shared/metrics/ 分开。
       此模块专注于交易所操作可观测性。
+
+Thread safety / 线程安全:
+    MetricsCollector keeps one shard of ExchangeMetrics per recording thread.
+    Writers only touch their own shard; readers merge all shards into a
+    point-in-time snapshot.
+    MetricsCollector 为每个记录线程保留一个 ExchangeMetrics 分片。写入方只修改
+    自己的分片；读取方将所有分片合并为时间点快照。
 """
 
+import math
+import threading
 import time
+from array import array
 from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
+from src.shared.openmetrics import OpenMetricsRegistry, openmetrics_registry
 from src.shared.tracing import get_trace_id
 
 
@@ -36,12 +47,160 @@ class OperationType(str, Enum):
     ACCOUNT_DATA = "account_data"
     PLACE_ORDER = "place_order"
     CANCEL_ORDER = "cancel_order"
+    AMEND_ORDER = "amend_order"
     FETCH_ORDERS = "fetch_orders"
     FETCH_POSITIONS = "fetch_positions"
     CONNECT = "connect"
     DISCONNECT = "disconnect"
 
 
+# Log-bucketed histogram layout: bucket 0 holds values <= HIST_MIN_SECONDS,
+# bucket i >= 1 covers (MIN * GROWTH**(i-1), MIN * GROWTH**i]. With 5% growth
+# every reported percentile is within ~2.5% of the true value.
+# 对数分桶直方图布局：5% 增长率，报告的百分位误差约 2.5% 以内。
+HIST_MIN_SECONDS = 1e-6
+HIST_MAX_SECONDS = 1e3
+HIST_GROWTH = 1.05
+_LOG_GROWTH = math.log(HIST_GROWTH)
+HIST_BUCKETS = (
+    int(math.ceil(math.log(HIST_MAX_SECONDS / HIST_MIN_SECONDS) / _LOG_GROWTH)) + 1
+)
+_ZERO_COUNTS = array("Q", bytes(8 * HIST_BUCKETS))
+
+# Reported percentiles / 报告的百分位
+PERCENTILES = {"p50": 50.0, "p90": 90.0, "p99": 99.0, "p999": 99.9}
+
+
+def _bucket_index(value: float) -> int:
+    """Map a latency in seconds to its histogram bucket (O(1))."""
+    if value <= HIST_MIN_SECONDS:
+        return 0
+    index = int(math.log(value / HIST_MIN_SECONDS) / _LOG_GROWTH) + 1
+    return index if index < HIST_BUCKETS else HIST_BUCKETS - 1
+
+
+def _bucket_value(index: int) -> float:
+    """Representative (geometric midpoint) latency of a bucket."""
+    if index == 0:
+        return HIST_MIN_SECONDS
+    return HIST_MIN_SECONDS * HIST_GROWTH ** (index - 0.5)
+
+
+class LatencyHistogram:
+    """
+    Fixed-memory log-bucketed (HDR-style) latency histogram.
+    固定内存的对数分桶（HDR 风格）延迟直方图。
+
+    Counts live in a preallocated array, so recording is O(1) and does not
+    allocate. Histograms with the same layout merge by adding counts.
+    """
+
+    __slots__ = ("counts", "total")
+
+    def __init__(self):
+        self.counts = array("Q", _ZERO_COUNTS)
+        self.total = 0
+
+    def record(self, value: float) -> None:
+        """Record a latency in seconds / 记录延迟（秒）"""
+        self.counts[_bucket_index(value)] += 1
+        self.total += 1
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add another histogram's counts into this one / 合并另一个直方图"""
+        counts = self.counts
+        for i, c in enumerate(other.counts):
+            if c:
+                counts[i] += c
+        self.total += other.total
+
+    def clear(self) -> None:
+        """Reset all counts in place / 原地清零"""
+        self.counts[:] = _ZERO_COUNTS
+        self.total = 0
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Latency (seconds) at a percentile, or None when empty."""
+        if self.total == 0:
+            return None
+        rank = max(1, math.ceil(pct / 100 * self.total))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return _bucket_value(i)
+        return _bucket_value(HIST_BUCKETS - 1)
+
+
+class WindowedHistogram:
+    """
+    Ring of per-slot histograms for time-windowed percentiles.
+    按时间槽轮转的直方图环，用于时间窗口百分位。
+
+    A slot is cleared in place when its time slot comes around again, so
+    steady-state recording never allocates.
+    """
+
+    def __init__(self, slot_seconds: float, slots: int):
+        self.slot_seconds = slot_seconds
+        self._slots: List[Optional[LatencyHistogram]] = [None] * slots
+        self._epochs: List[int] = [-1] * slots
+
+    def record(self, value: float, now: float) -> None:
+        epoch = int(now // self.slot_seconds)
+        idx = epoch % len(self._slots)
+        hist = self._slots[idx]
+        if hist is None:
+            hist = self._slots[idx] = LatencyHistogram()
+            self._epochs[idx] = epoch
+        elif self._epochs[idx] != epoch:
+            hist.clear()
+            self._epochs[idx] = epoch
+        hist.record(value)
+
+    def merge(self, other: "WindowedHistogram") -> None:
+        """Fold another ring with the same layout into this one, slot by slot."""
+        for idx, (hist, epoch) in enumerate(zip(other._slots, other._epochs)):
+            if hist is None:
+                continue
+            mine = self._slots[idx]
+            if mine is None or self._epochs[idx] < epoch:
+                mine = self._slots[idx] = LatencyHistogram()
+                self._epochs[idx] = epoch
+            elif self._epochs[idx] > epoch:
+                continue
+            mine.merge(hist)
+
+    def snapshot(self, window_seconds: float, now: float) -> LatencyHistogram:
+        """Merge the slots that fall inside the last ``window_seconds``."""
+        current = int(now // self.slot_seconds)
+        oldest = current - max(1, math.ceil(window_seconds / self.slot_seconds)) + 1
+        merged = LatencyHistogram()
+        for hist, epoch in zip(self._slots, self._epochs):
+            if hist is not None and oldest <= epoch <= current:
+                merged.merge(hist)
+        return merged
+
+
+def _summarize_histogram(
+    hist: LatencyHistogram,
+    min_latency: Optional[float] = None,
+    max_latency: Optional[float] = None,
+) -> Dict:
+    """Percentile summary in milliseconds, clamped to the observed range."""
+    summary: Dict = {"count": hist.total}
+    for name, pct in PERCENTILES.items():
+        value = hist.percentile(pct)
+        if value is not None:
+            if min_latency is not None:
+                value = max(value, min_latency)
+            if max_latency is not None:
+                value = min(value, max_latency)
+            value = round(value * 1000, 3)
+        summary[f"{name}_ms"] = value
+    return summary
+
+
 @dataclass
 class LatencyBucket:
     """Latency bucket for tracking response times / 用于跟踪响应时间的延迟桶"""
@@ -50,6 +209,21 @@ class LatencyBucket:
     total_latency: float = 0.0
     min_latency: Optional[float] = None
     max_latency: Optional[float] = None
+    histogram: LatencyHistogram = field(
+        default_factory=LatencyHistogram, repr=False, compare=False
+    )
+    # 10 s slots cover the 1m / 5m windows, 1 min slots cover 1h
+    recent: WindowedHistogram = field(
+        default_factory=lambda: WindowedHistogram(10, 30), repr=False, compare=False
+    )
+    hourly: WindowedHistogram = field(
+        default_factory=lambda: WindowedHistogram(60, 60), repr=False, compare=False
+    )
+    clock: Callable[[], float] = field(
+        default=time.monotonic, repr=False, compare=False
+    )
+
+    WINDOWS = {"1m": ("recent", 60), "5m": ("recent", 300), "1h": ("hourly", 3600)}
 
     def add(self, latency: float):
         """Add latency measurement / 添加延迟测量"""
@@ -59,12 +233,63 @@ class LatencyBucket:
             self.min_latency = latency
         if self.max_latency is None or latency > self.max_latency:
             self.max_latency = latency
+        now = self.clock()
+        self.histogram.record(latency)
+        self.recent.record(latency, now)
+        self.hourly.record(latency, now)
+
+    def merge(self, other: "LatencyBucket") -> None:
+        """Fold another bucket into this one / 合并另一个延迟桶"""
+        if other.count == 0:
+            return
+        self.count += other.count
+        self.total_latency += other.total_latency
+        if self.min_latency is None or other.min_latency < self.min_latency:
+            self.min_latency = other.min_latency
+        if self.max_latency is None or other.max_latency > self.max_latency:
+            self.max_latency = other.max_latency
+        self.histogram.merge(other.histogram)
+        self.recent.merge(other.recent)
+        self.hourly.merge(other.hourly)
 
     @property
     def avg_latency(self) -> float:
         """Average latency / 平均延迟"""
         return self.total_latency / self.count if self.count > 0 else 0.0
 
+    def window_histogram(self, window: str) -> LatencyHistogram:
+        """Merged histogram for a window ("1m", "5m", "1h") / 获取窗口直方图"""
+        ring_name, seconds = self.WINDOWS[window]
+        return getattr(self, ring_name).snapshot(seconds, self.clock())
+
+    def percentile(self, pct: float, window: Optional[str] = None) -> Optional[float]:
+        """
+        Latency (seconds) at a percentile, all-time or over a window.
+        全部时间或窗口内某百分位的延迟（秒）。
+        """
+        hist = self.window_histogram(window) if window else self.histogram
+        value = hist.percentile(pct)
+        if value is None:
+            return None
+        return min(max(value, self.min_latency), self.max_latency)
+
+    def get_percentiles(self) -> Dict:
+        """
+        p50/p90/p99/p999 in ms, all-time and per window.
+        全部时间及各窗口的 p50/p90/p99/p999（毫秒）。
+        """
+        summary = _summarize_histogram(
+            self.histogram, self.min_latency, self.max_latency
+        )
+        summary.pop("count")
+        summary["windows"] = {
+            window: _summarize_histogram(
+                self.window_histogram(window), self.min_latency, self.max_latency
+            )
+            for window in self.WINDOWS
+        }
+        return summary
+
 
 @dataclass
 class ExchangeMetrics:
@@ -112,6 +337,32 @@ class ExchangeMetrics:
         }
         self.recent_errors.append(error_record)
 
+    def merge(self, other: "ExchangeMetrics") -> None:
+        """Fold another shard of the same exchange into this one / 合并同一交易所的另一个分片"""
+        self.total_requests += other.total_requests
+        self.total_errors += other.total_errors
+        for op, bucket in other.latency_buckets.items():
+            self.latency_buckets[op].merge(bucket)
+        for op, count in other.error_counts.items():
+            self.error_counts[op] += count
+        if other.recent_errors:
+            merged = sorted(
+                [*self.recent_errors, *other.recent_errors],
+                key=lambda e: e["timestamp"],
+            )
+            self.recent_errors.clear()
+            self.recent_errors.extend(merged)
+        if other.last_success_time is not None and (
+            self.last_success_time is None
+            or other.last_success_time > self.last_success_time
+        ):
+            self.last_success_time = other.last_success_time
+        if other.last_error_time is not None and (
+            self.last_error_time is None or other.last_error_time > self.last_error_time
+        ):
+            self.last_error_time = other.last_error_time
+            self.last_error_message = other.last_error_message
+
     @property
     def error_rate(self) -> float:
         """Error rate as percentage / 错误率（百分比）"""
@@ -160,6 +411,7 @@ class ExchangeMetrics:
                         else None
                     ),
                     "error_count": self.error_counts[op],
+                    **self.latency_buckets[op].get_percentiles(),
                 }
                 for op in OperationType
                 if self.latency_buckets[op].count > 0 or self.error_counts[op] > 0
@@ -168,29 +420,169 @@ class ExchangeMetrics:
         }
 
 
+@dataclass
+class OrderActionCounts:
+    """Per-strategy order sync action counts / 每个策略的订单同步操作计数"""
+
+    cycles: int = 0
+    last_cycle: Dict[str, int] = field(
+        default_factory=lambda: {"cancel": 0, "place": 0, "amend": 0}
+    )
+    totals: Dict[str, int] = field(
+        default_factory=lambda: {"cancel": 0, "place": 0, "amend": 0}
+    )
+    last_update_time: Optional[float] = None
+
+    def record(self, cancels: int, places: int, amends: int):
+        """Record one sync cycle / 记录一次同步周期"""
+        self.cycles += 1
+        self.last_cycle = {"cancel": cancels, "place": places, "amend": amends}
+        for action, count in self.last_cycle.items():
+            self.totals[action] += count
+        self.last_update_time = time.time()
+
+    def get_summary(self) -> Dict:
+        """Get counts summary / 获取计数摘要"""
+        return {
+            "cycles": self.cycles,
+            "last_cycle": dict(self.last_cycle),
+            "totals": dict(self.totals),
+            "last_update_time": self.last_update_time,
+        }
+
+
+class _Shard:
+    """Metrics recorded by one thread / 单个线程记录的指标"""
+
+    __slots__ = ("lock", "thread", "metrics")
+
+    def __init__(self, thread: Optional[threading.Thread] = None):
+        # Only contended while a reader is merging this shard
+        self.lock = threading.Lock()
+        self.thread = thread
+        self.metrics: Dict[ExchangeName, ExchangeMetrics] = {}
+
+    def get(self, exchange: ExchangeName) -> ExchangeMetrics:
+        metrics = self.metrics.get(exchange)
+        if metrics is None:
+            metrics = self.metrics[exchange] = ExchangeMetrics(exchange=exchange)
+        return metrics
+
+
 class MetricsCollector:
     """
     Global metrics collector / 全局指标收集器
 
     Tracks metrics for all exchanges and operations.
     跟踪所有交易所和操作的指标。
+
+    Each recording thread writes to its own shard, so the engine thread,
+    request handlers and worker pools never contend with each other. Reads
+    merge every shard under its lock into a consistent snapshot; shards of
+    finished threads are folded into a retired shard on read.
     """
 
-    def __init__(self):
-        self._metrics: Dict[ExchangeName, ExchangeMetrics] = {}
+    def __init__(self, registry: Optional[OpenMetricsRegistry] = None):
+        """
+        Args:
+            registry: OpenMetrics registry to export request counters and
+                      latency histograms to (None disables export)
+        """
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._retired = _Shard()
+        self._order_actions: Dict[str, OrderActionCounts] = {}
+        self._requests = self._request_seconds = None
+        if registry is not None:
+            self._requests = registry.counter(
+                "mm_exchange_requests",
+                "Exchange API requests by outcome",
+                ["exchange", "operation", "outcome"],
+            )
+            self._request_seconds = registry.histogram(
+                "mm_exchange_request_seconds",
+                "Exchange API request latency in seconds",
+                ["exchange", "operation"],
+            )
+            self._healthy = registry.gauge(
+                "mm_exchange_healthy", "1 if the exchange is healthy", ["exchange"]
+            )
+            registry.register_collector(self._export_health)
+
+    def _shard(self) -> _Shard:
+        """This thread's shard, registered on first use / 当前线程的分片"""
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard(threading.current_thread())
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def _snapshot(self) -> Dict[ExchangeName, ExchangeMetrics]:
+        """
+        Merge all shards into new ExchangeMetrics objects.
+        将所有分片合并为新的 ExchangeMetrics 对象。
+
+        Every shard lock is held for the merge, so the result reflects a
+        single point in time across threads.
+        """
+        with self._lock:
+            live = []
+            for shard in self._shards:
+                if shard.thread is not None and not shard.thread.is_alive():
+                    # No more writers: fold into the retired shard
+                    for exchange, metrics in shard.metrics.items():
+                        self._retired.get(exchange).merge(metrics)
+                else:
+                    live.append(shard)
+            self._shards = live
+
+            shards = [self._retired, *live]
+            for shard in shards:
+                shard.lock.acquire()
+            try:
+                merged: Dict[ExchangeName, ExchangeMetrics] = {}
+                for shard in shards:
+                    for exchange, metrics in shard.metrics.items():
+                        if exchange not in merged:
+                            merged[exchange] = ExchangeMetrics(exchange=exchange)
+                        merged[exchange].merge(metrics)
+            finally:
+                for shard in shards:
+                    shard.lock.release()
+        # Stable exchange order regardless of which thread saw it first
+        return {
+            exchange: merged[exchange]
+            for exchange in ExchangeName
+            if exchange in merged
+        }
 
     def get_metrics(self, exchange: ExchangeName) -> ExchangeMetrics:
-        """Get or create metrics for exchange / 获取或创建交易所指标"""
-        if exchange not in self._metrics:
-            self._metrics[exchange] = ExchangeMetrics(exchange=exchange)
-        return self._metrics[exchange]
+        """
+        Get a merged snapshot of an exchange's metrics.
+        获取交易所指标的合并快照。
+
+        The returned object is a copy; record through record_success /
+        record_error.
+        """
+        metrics = self._snapshot().get(exchange)
+        return metrics if metrics is not None else ExchangeMetrics(exchange=exchange)
 
     def record_success(
         self, exchange: ExchangeName, operation: OperationType, latency: float
     ):
         """Record successful operation / 记录成功操作"""
-        metrics = self.get_metrics(exchange)
-        metrics.record_success(operation, latency)
+        shard = self._shard()
+        with shard.lock:
+            shard.get(exchange).record_success(operation, latency)
+        if self._requests is not None:
+            self._requests.labels(
+                exchange=exchange.value, operation=operation.value, outcome="success"
+            ).inc()
+            self._request_seconds.labels(
+                exchange=exchange.value, operation=operation.value
+            ).observe(latency)
 
     def record_error(
         self,
@@ -200,16 +592,49 @@ class MetricsCollector:
         error_type: Optional[str] = None,
     ):
         """Record error / 记录错误"""
-        metrics = self.get_metrics(exchange)
-        metrics.record_error(operation, error_message, error_type)
+        shard = self._shard()
+        with shard.lock:
+            shard.get(exchange).record_error(operation, error_message, error_type)
+        if self._requests is not None:
+            self._requests.labels(
+                exchange=exchange.value, operation=operation.value, outcome="error"
+            ).inc()
+
+    def record_order_actions(
+        self, strategy_id: str, cancels: int, places: int, amends: int
+    ):
+        """
+        Record per-cycle order sync action counts for a strategy.
+        记录策略每个周期的订单同步操作计数。
+        """
+        # Once per strategy cycle, so a shared lock is cheap here
+        with self._lock:
+            if strategy_id not in self._order_actions:
+                self._order_actions[strategy_id] = OrderActionCounts()
+            self._order_actions[strategy_id].record(cancels, places, amends)
+
+    def get_order_action_summary(self) -> Dict[str, Dict]:
+        """Get order action counts per strategy / 获取每个策略的订单操作计数"""
+        with self._lock:
+            return {
+                strategy_id: counts.get_summary()
+                for strategy_id, counts in self._order_actions.items()
+            }
 
     def get_all_metrics(self) -> Dict[str, Dict]:
         """Get all metrics summaries / 获取所有指标摘要"""
         return {
             exchange.value: metrics.get_summary()
-            for exchange, metrics in self._metrics.items()
+            for exchange, metrics in self._snapshot().items()
         }
 
+    def _export_health(self) -> None:
+        """Refresh exchange health gauges at scrape time."""
+        for exchange, metrics in self._snapshot().items():
+            self._healthy.labels(exchange=exchange.value).set(
+                1 if metrics.is_healthy else 0
+            )
+
     def get_health_summary(self) -> Dict:
         """Get health summary for all exchanges / 获取所有交易所的健康摘要"""
         return {
@@ -221,12 +646,12 @@ class MetricsCollector:
                 "last_success_time": metrics.last_success_time,
                 "last_error_time": metrics.last_error_time,
             }
-            for exchange, metrics in self._metrics.items()
+            for exchange, metrics in self._snapshot().items()
         }
 
 
 # Global metrics collector instance / 全局指标收集器实例
-metrics_collector = MetricsCollector()
+metrics_collector = MetricsCollector(openmetrics_registry)
 
 
 def track_exchange_operation(exchange: ExchangeName, operation: OperationType):
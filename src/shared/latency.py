@@ -0,0 +1,162 @@
+"""
+Tick-to-Trade Latency Module / 行情到成交延迟模块
+
+Monotonic hot-path timestamps and per-stage latency statistics.
+热路径单调时间戳和分阶段延迟统计。
+
+Owner: Agent ARCH
+
+Stages / 阶段:
+    tick_to_decision: market data received -> target orders decided
+    decision_to_send: target orders decided -> first order request sent
+    send_to_ack:      order request sent -> exchange acknowledgement
+    tick_to_trade:    market data received -> first exchange acknowledgement
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from src.shared.exchange_metrics import LatencyBucket
+from src.shared.openmetrics import Histogram, openmetrics_registry
+
+STAGES = ("tick_to_decision", "decision_to_send", "send_to_ack", "tick_to_trade")
+
+# Window used for headline percentiles (see LatencyBucket.WINDOWS)
+DEFAULT_WINDOW = "5m"
+
+
+def now() -> float:
+    """Monotonic high-resolution timestamp in seconds / 单调高精度时间戳（秒）"""
+    return time.perf_counter()
+
+
+class TickToTradeTimer:
+    """
+    Carries hot-path timestamps through one strategy cycle.
+    在一个策略周期中携带热路径时间戳。
+
+    All timestamps come from ``now()`` (``time.perf_counter``), so stage
+    durations are immune to wall-clock adjustments.
+    """
+
+    __slots__ = ("tick_at", "decision_at", "send_at", "ack_at")
+
+    def __init__(self, tick_at: Optional[float] = None):
+        self.tick_at = tick_at
+        self.decision_at: Optional[float] = None
+        self.send_at: Optional[float] = None
+        self.ack_at: Optional[float] = None
+
+    def mark_decision(self) -> None:
+        self.decision_at = now()
+
+    def mark_send(self) -> None:
+        if self.send_at is None:
+            self.send_at = now()
+
+    def mark_ack(self, ack_at: Optional[float] = None) -> None:
+        """Record the first exchange acknowledgement of the cycle."""
+        if self.ack_at is None:
+            self.ack_at = ack_at if ack_at is not None else now()
+
+    def stage_durations(self) -> Dict[str, float]:
+        """Durations in seconds for every stage whose endpoints were marked."""
+        pairs = {
+            "tick_to_decision": (self.tick_at, self.decision_at),
+            "decision_to_send": (self.decision_at, self.send_at),
+            "send_to_ack": (self.send_at, self.ack_at),
+            "tick_to_trade": (self.tick_at, self.ack_at),
+        }
+        return {
+            stage: end - start
+            for stage, (start, end) in pairs.items()
+            if start is not None and end is not None and end >= start
+        }
+
+
+class LatencyTracker:
+    """
+    Per-stage latency histograms with percentile summaries.
+    分阶段延迟直方图及百分位摘要。
+
+    Each stage is a LatencyBucket (log-bucketed histogram with 1m/5m/1h
+    windows), so recording is O(1) and memory is fixed.
+    """
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.monotonic,
+        histogram: Optional[Histogram] = None,
+    ):
+        """
+        Args:
+            clock: Time source for the rolling windows
+            histogram: OpenMetrics histogram (labelled by ``stage``) to export
+                       every recorded duration to
+        """
+        self._lock = threading.Lock()
+        self._clock = clock
+        self._histogram = histogram
+        self._buckets: Dict[str, LatencyBucket] = {
+            stage: LatencyBucket(clock=clock) for stage in STAGES
+        }
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Record one stage duration / 记录一个阶段耗时"""
+        with self._lock:
+            bucket = self._buckets.get(stage)
+            if bucket is None:
+                bucket = self._buckets[stage] = LatencyBucket(clock=self._clock)
+            bucket.add(seconds)
+        if self._histogram is not None:
+            self._histogram.labels(stage=stage).observe(seconds)
+
+    def record_timer(self, timer: TickToTradeTimer) -> None:
+        """Record every completed stage of a cycle timer / 记录周期计时器的所有已完成阶段"""
+        for stage, seconds in timer.stage_durations().items():
+            self.record(stage, seconds)
+
+    def percentile_ms(
+        self, stage: str, pct: float, window: Optional[str] = DEFAULT_WINDOW
+    ) -> Optional[float]:
+        """Percentile of a stage in milliseconds, or None without samples."""
+        with self._lock:
+            bucket = self._buckets.get(stage)
+            value = bucket.percentile(pct, window) if bucket else None
+        return value * 1000 if value is not None else None
+
+    def get_summary(self) -> Dict[str, Dict]:
+        """
+        Get p50/p90/p99/p999 per stage in milliseconds, all-time and per window.
+        获取每个阶段的 p50/p90/p99/p999（毫秒），含全部时间和各窗口。
+        """
+        summary = {}
+        with self._lock:
+            for stage, bucket in self._buckets.items():
+                if bucket.count == 0:
+                    continue
+                summary[stage] = {
+                    "count": bucket.count,
+                    "avg_ms": round(bucket.avg_latency * 1000, 3),
+                    "max_ms": round(bucket.max_latency * 1000, 3),
+                    **bucket.get_percentiles(),
+                }
+        return summary
+
+    def reset(self) -> None:
+        """Drop all samples / 清除所有样本"""
+        with self._lock:
+            self._buckets = {
+                stage: LatencyBucket(clock=self._clock) for stage in STAGES
+            }
+
+
+# Global tick-to-trade tracker / 全局行情到成交延迟跟踪器
+tick_to_trade_tracker = LatencyTracker(
+    histogram=openmetrics_registry.histogram(
+        "mm_tick_to_trade_seconds",
+        "Hot-path latency per tick-to-trade stage in seconds",
+        ["stage"],
+    )
+)
@@ -0,0 +1,225 @@
+"""
+Log Throttle Module / 日志节流模块
+
+Suppresses repeated log lines and caps per-level log rates so outages do not
+flood stdout with identical records.
+抑制重复日志行并限制各级别日志速率，避免故障期间大量相同记录刷屏。
+
+Owner: Agent ARCH
+
+Behaviour / 行为:
+    - The first occurrence of a message is logged; identical messages within
+      ``window_seconds`` are suppressed and later summarised as
+      "<message> (repeated N times)".
+    - Each level has a token bucket (records per second); records over the
+      budget are dropped and reported in a periodic summary.
+    - CRITICAL records are never throttled.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.shared.openmetrics import openmetrics_registry
+
+# Marker attribute set on summary records so they bypass the throttle
+SUMMARY_ATTR = "throttle_summary"
+
+_DROPPED = openmetrics_registry.counter(
+    "mm_log_dropped",
+    "Log records dropped by throttling",
+    ["logger", "reason"],
+)
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at ``rate`` tokens per second up to ``burst``.
+    以每秒 ``rate`` 个令牌补充、上限为 ``burst`` 的令牌桶。
+    """
+
+    __slots__ = ("rate", "burst", "tokens", "last_refill")
+
+    def __init__(self, rate: float, burst: Optional[float] = None, now: float = 0.0):
+        self.rate = rate
+        self.burst = burst if burst is not None else rate
+        self.tokens = self.burst
+        self.last_refill = now
+
+    def consume(self, now: float) -> bool:
+        """Take one token if available / 如有令牌则取出一个"""
+        self.tokens = min(
+            self.burst, self.tokens + (now - self.last_refill) * self.rate
+        )
+        self.last_refill = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+class _KeyState:
+    __slots__ = ("first_seen", "suppressed", "level", "message", "pathname", "lineno")
+
+    def __init__(self, record: logging.LogRecord, message: str, now: float):
+        self.first_seen = now
+        self.suppressed = 0
+        self.level = record.levelno
+        self.message = message
+        self.pathname = record.pathname
+        self.lineno = record.lineno
+
+
+class LogThrottle(logging.Filter):
+    """
+    Keyed suppression window plus per-level token buckets for one logger.
+    单个日志器的按键抑制窗口及分级别令牌桶。
+
+    Records are keyed by level and message text (or an explicit
+    ``extra={"throttle_key": ...}``). Summaries are emitted through the
+    same logger on the next record after a window expires.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window_seconds: float = 10.0,
+        level_rates: Optional[Dict[str, float]] = None,
+        max_keys: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            name: Logger name (used for summaries and counters)
+            window_seconds: Suppression window for repeated messages
+            level_rates: Records per second per level name, e.g. {"INFO": 20}
+            max_keys: Max distinct messages tracked; beyond this new messages
+                      are only rate limited
+            clock: Time source (monotonic seconds)
+        """
+        super().__init__()
+        self.logger_name = name
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._keys: Dict[Tuple, _KeyState] = {}
+        now = clock()
+        self._buckets: Dict[int, TokenBucket] = {
+            logging.getLevelName(level): TokenBucket(rate, now=now)
+            for level, rate in (level_rates or {}).items()
+        }
+        self._next_sweep = now + window_seconds
+        self._rate_limited_pending: Dict[int, int] = {}
+        self.suppressed = 0
+        self.rate_limited: Dict[str, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.__dict__.get(SUMMARY_ATTR) or record.levelno >= logging.CRITICAL:
+            return True
+
+        summaries: List[logging.LogRecord] = []
+        with self._lock:
+            now = self._clock()
+            if now >= self._next_sweep:
+                summaries = self._sweep(now)
+            allowed = self._admit(record, now, summaries)
+
+        for summary in summaries:
+            logging.getLogger(self.logger_name).handle(summary)
+        return allowed
+
+    def _admit(
+        self, record: logging.LogRecord, now: float, summaries: List[logging.LogRecord]
+    ) -> bool:
+        message = record.getMessage()
+        key = (record.levelno, record.__dict__.get("throttle_key", message))
+
+        state = self._keys.get(key)
+        if state is not None:
+            if now - state.first_seen < self.window_seconds:
+                state.suppressed += 1
+                self.suppressed += 1
+                _DROPPED.labels(logger=self.logger_name, reason="duplicate").inc()
+                return False
+            # Window expired before the next sweep: report it before reuse
+            del self._keys[key]
+            if state.suppressed:
+                summaries.append(self._repeat_summary(state))
+
+        bucket = self._buckets.get(record.levelno)
+        if bucket is not None and not bucket.consume(now):
+            level_name = record.levelname
+            self.rate_limited[level_name] = self.rate_limited.get(level_name, 0) + 1
+            self._rate_limited_pending[record.levelno] = (
+                self._rate_limited_pending.get(record.levelno, 0) + 1
+            )
+            _DROPPED.labels(logger=self.logger_name, reason="rate_limit").inc()
+            return False
+
+        if len(self._keys) < self.max_keys:
+            self._keys[key] = _KeyState(record, message, now)
+        return True
+
+    def _sweep(self, now: float) -> List[logging.LogRecord]:
+        """Expire windows and build summary records / 过期窗口并生成摘要记录"""
+        self._next_sweep = now + self.window_seconds
+        summaries = []
+        expired = [
+            key
+            for key, state in self._keys.items()
+            if now - state.first_seen >= self.window_seconds
+        ]
+        for key in expired:
+            state = self._keys.pop(key)
+            if state.suppressed:
+                summaries.append(self._repeat_summary(state))
+        for level, count in self._rate_limited_pending.items():
+            summaries.append(
+                self._summary(
+                    logging.WARNING,
+                    f"Dropped {count} {logging.getLevelName(level)} records "
+                    f"(rate limit) / 因限速丢弃 {count} 条记录",
+                    "",
+                    0,
+                    rate_limited=count,
+                )
+            )
+        self._rate_limited_pending.clear()
+        return summaries
+
+    def _repeat_summary(self, state: _KeyState) -> logging.LogRecord:
+        return self._summary(
+            state.level,
+            f"{state.message} (repeated {state.suppressed} times)",
+            state.pathname,
+            state.lineno,
+            repeated=state.suppressed,
+        )
+
+    def flush_summaries(self) -> None:
+        """Emit summaries for all pending windows now / 立即输出所有待处理窗口的摘要"""
+        with self._lock:
+            summaries = self._sweep(float("inf"))
+            self._next_sweep = self._clock() + self.window_seconds
+        for summary in summaries:
+            logging.getLogger(self.logger_name).handle(summary)
+
+    def _summary(
+        self, level: int, message: str, pathname: str, lineno: int, **extra
+    ) -> logging.LogRecord:
+        record = logging.LogRecord(
+            self.logger_name, level, pathname, lineno, message, None, None
+        )
+        record.__dict__.update(extra)
+        record.__dict__[SUMMARY_ATTR] = True
+        return record
+
+    def get_stats(self) -> Dict:
+        """Get dropped record counts / 获取丢弃记录计数"""
+        with self._lock:
+            return {
+                "suppressed": self.suppressed,
+                "rate_limited": dict(self.rate_limited),
+            }
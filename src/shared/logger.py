@@ -4,14 +4,36 @@ Logger Module / 日志模块
 Provides JSON-formatted logging for structured log output with trace_id support.
 提供支持 trace_id 的 JSON 格式结构化日志输出。
 
+Records are handed to a background writer thread that formats them and
+writes them in batches, so the calling (trading) thread only pays for an
+enqueue. Per-logger sampling and rate limiting shed low-severity volume, and
+repeated messages are throttled (see log_throttle).
+日志记录交给后台写线程批量格式化和写出，调用（交易）线程只需入队。
+按日志器的采样和限速可削减低级别日志量，重复消息会被节流（见 log_throttle）。
+
 Owner: Agent ARCH
 """
 
+import atexit
 import json
 import logging
+import queue
+import random
 import sys
+import threading
+import time
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional, TextIO
+
+from src.shared.config import (
+    LOG_ASYNC,
+    LOG_BATCH_SIZE,
+    LOG_FLUSH_INTERVAL,
+    LOG_QUEUE_SIZE,
+    LOG_SAMPLING,
+    LOG_THROTTLE,
+)
+from src.shared.log_throttle import LogThrottle, TokenBucket
 
 # Import tracing utilities / 导入追踪工具
 try:
@@ -22,6 +44,38 @@ except ImportError:
         return None
 
 
+# LogRecord attributes that are not user-supplied extra fields
+# 不属于用户额外字段的 LogRecord 属性
+RESERVED_ATTRS = frozenset(
+    {
+        "name",
+        "msg",
+        "args",
+        "created",
+        "filename",
+        "funcName",
+        "levelname",
+        "levelno",
+        "lineno",
+        "module",
+        "msecs",
+        "message",
+        "pathname",
+        "process",
+        "processName",
+        "relativeCreated",
+        "thread",
+        "threadName",
+        "taskName",
+        "exc_info",
+        "exc_text",
+        "stack_info",
+        "extra_data",
+        "trace_id",
+    }
+)
+
+
 class JsonFormatter(logging.Formatter):
     """
     JSON log formatter for structured logging with trace_id support.
@@ -30,7 +84,7 @@ class JsonFormatter(logging.Formatter):
 
     def format(self, record):
         log_record = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": datetime.utcfromtimestamp(record.created).isoformat() + "Z",
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -39,8 +93,8 @@ class JsonFormatter(logging.Formatter):
             "line": record.lineno,
         }
 
-        # Add trace_id from context / 从上下文添加 trace_id
-        trace_id = get_trace_id()
+        # trace_id captured at emit time, else from context / 发出时捕获的 trace_id，否则取上下文
+        trace_id = record.__dict__.get("trace_id") or get_trace_id()
         if trace_id:
             log_record["trace_id"] = trace_id
 
@@ -51,42 +105,284 @@ class JsonFormatter(logging.Formatter):
         # Add any extra fields from record / 从记录添加任何额外字段
         # (e.g., from logger.info("message", extra={"key": "value"}))
         for key, value in record.__dict__.items():
-            if key not in [
-                "name",
-                "msg",
-                "args",
-                "created",
-                "filename",
-                "funcName",
-                "levelname",
-                "levelno",
-                "lineno",
-                "module",
-                "msecs",
-                "message",
-                "pathname",
-                "process",
-                "processName",
-                "relativeCreated",
-                "thread",
-                "threadName",
-                "exc_info",
-                "exc_text",
-                "stack_info",
-                "extra_data",
-            ]:
+            if key not in RESERVED_ATTRS:
                 log_record[key] = value
 
-        return json.dumps(log_record)
+        if record.exc_info:
+            log_record["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(log_record, default=str)
+
+
+class LogSampler(logging.Filter):
+    """
+    Per-logger sampling and rate limiting for records below ``exempt_level``.
+    按日志器对低于 ``exempt_level`` 的记录进行采样和限速。
+
+    Warnings and errors are never sampled. ``rate_limit`` is a token bucket
+    (records per second, bursting up to one second's worth).
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        rate_limit: Optional[float] = None,
+        exempt_level: int = logging.WARNING,
+    ):
+        """
+        Args:
+            sample_rate: Fraction of records kept (0.0 - 1.0)
+            rate_limit: Max records per second, None for unlimited
+            exempt_level: Records at or above this level always pass
+        """
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.rate_limit = rate_limit
+        self.exempt_level = exempt_level
+        self._bucket = (
+            TokenBucket(rate_limit, now=time.monotonic())
+            if rate_limit is not None
+            else None
+        )
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.exempt_level:
+            return True
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            self.dropped += 1
+            return False
+        if self._bucket is None:
+            return True
+
+        with self._lock:
+            if self._bucket.consume(time.monotonic()):
+                return True
+            self.dropped += 1
+            return False
 
 
-def setup_logger(name: str, level: int = logging.INFO) -> logging.Logger:
+class AsyncLogWriter:
+    """
+    Background thread that formats queued records and writes them in batches.
+    后台线程：格式化队列中的记录并批量写出。
+
+    The queue is bounded; when it is full new records are dropped (and
+    counted) rather than blocking the caller.
+    """
+
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        formatter: Optional[logging.Formatter] = None,
+        batch_size: int = LOG_BATCH_SIZE,
+        flush_interval: float = LOG_FLUSH_INTERVAL,
+        max_queue: int = LOG_QUEUE_SIZE,
+    ):
+        self.stream = stream if stream is not None else sys.stdout
+        self.formatter = formatter or JsonFormatter()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.dropped = 0
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                thread = threading.Thread(
+                    target=self._run, name="AsyncLogWriter", daemon=True
+                )
+                thread.start()
+                self._thread = thread
+
+    def enqueue(self, record: logging.LogRecord) -> bool:
+        """Queue a record without blocking / 非阻塞入队记录"""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def flush(self, timeout: float = 1.0) -> bool:
+        """Block until records queued so far are written / 等待已入队记录写出"""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Write pending records and stop the thread / 写出剩余记录并停止线程"""
+        thread = self._thread
+        if thread is None:
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        thread.join(timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = []
+            markers = []
+            stop = False
+            while True:
+                if item is None:
+                    stop = True
+                    break
+                if isinstance(item, threading.Event):
+                    markers.append(item)
+                else:
+                    batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._write(batch)
+            for marker in markers:
+                marker.set()
+            if stop:
+                return
+
+    def _write(self, batch) -> None:
+        if not batch:
+            return
+        lines = []
+        for record in batch:
+            try:
+                lines.append(self.formatter.format(record))
+            except Exception:
+                lines.append(
+                    json.dumps(
+                        {"level": "ERROR", "message": "Failed to format log record"}
+                    )
+                )
+        try:
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+        except Exception:
+            pass
+
+
+class AsyncLogHandler(logging.Handler):
+    """
+    Handler that hands records to an AsyncLogWriter.
+    将记录交给 AsyncLogWriter 的处理器。
+
+    Only context that would be lost on another thread is resolved here: the
+    message arguments are merged and the current trace_id is captured.
+    """
+
+    def __init__(self, writer: AsyncLogWriter, level: int = logging.NOTSET):
+        super().__init__(level)
+        self.writer = writer
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            if record.args:
+                record.msg = record.getMessage()
+                record.args = None
+            if "trace_id" not in record.__dict__:
+                record.trace_id = get_trace_id()
+            self.writer.enqueue(record)
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        self.writer.flush()
+
+
+_writer: Optional[AsyncLogWriter] = None
+_writer_lock = threading.Lock()
+_samplers: Dict[str, LogSampler] = {}
+_throttles: Dict[str, LogThrottle] = {}
+
+
+def get_async_writer() -> AsyncLogWriter:
+    """Get the shared background log writer / 获取共享的后台日志写入器"""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = AsyncLogWriter()
+                atexit.register(_writer.stop)
+                # Registered after stop so it runs first (atexit is LIFO)
+                atexit.register(flush_log_summaries)
+    return _writer
+
+
+def get_log_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Get counts of records dropped by sampling and by a full queue.
+    获取因采样和队列已满而丢弃的记录数。
+    """
+    return {
+        "queue_dropped": _writer.dropped if _writer else 0,
+        "sampled_out": {name: s.dropped for name, s in _samplers.items()},
+        "throttled": {name: t.get_stats() for name, t in _throttles.items()},
+    }
+
+
+def throttle_logger(logger: logging.Logger) -> logging.Logger:
+    """
+    Attach repeated-message suppression and per-level rate limits.
+    附加重复消息抑制和分级别限速。
+
+    Applied by setup_logger; module loggers created with
+    ``logging.getLogger(__name__)`` can opt in directly.
+    """
+    if not LOG_THROTTLE.get("enabled", True) or logger.name in _throttles:
+        return logger
+    throttle = LogThrottle(
+        logger.name,
+        window_seconds=LOG_THROTTLE.get("window_seconds", 10.0),
+        level_rates=LOG_THROTTLE.get("level_rates"),
+    )
+    logger.addFilter(throttle)
+    _throttles[logger.name] = throttle
+    return logger
+
+
+def flush_log_summaries() -> None:
+    """Emit pending "repeated N times" summaries / 输出待处理的重复摘要"""
+    for throttle in list(_throttles.values()):
+        throttle.flush_summaries()
+
+
+def setup_logger(
+    name: str,
+    level: int = logging.INFO,
+    sample_rate: Optional[float] = None,
+    rate_limit: Optional[float] = None,
+) -> logging.Logger:
     """
     Set up a logger with JSON formatting.
 
     Args:
         name: Logger name
         level: Logging level (default: INFO)
+        sample_rate: Fraction of sub-WARNING records kept
+                     (defaults to LOG_SAMPLING[name])
+        rate_limit: Max sub-WARNING records per second
+                    (defaults to LOG_SAMPLING[name])
 
     Returns:
         Configured logger instance
@@ -98,8 +394,22 @@ def setup_logger(name: str, level: int = logging.INFO) -> logging.Logger:
     if logger.hasHandlers():
         return logger
 
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(JsonFormatter())
+    sampling = LOG_SAMPLING.get(name, {})
+    sample_rate = (
+        sampling.get("sample_rate", 1.0) if sample_rate is None else sample_rate
+    )
+    rate_limit = sampling.get("rate_limit") if rate_limit is None else rate_limit
+    if sample_rate < 1.0 or rate_limit is not None:
+        sampler = LogSampler(sample_rate=sample_rate, rate_limit=rate_limit)
+        logger.addFilter(sampler)
+        _samplers[name] = sampler
+    throttle_logger(logger)
+
+    if LOG_ASYNC:
+        handler = AsyncLogHandler(get_async_writer())
+    else:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(JsonFormatter())
     logger.addHandler(handler)
 
     return logger
@@ -0,0 +1,256 @@
+"""
+Market Statistics Module / 市场统计模块
+
+Rolling realized volatility, EWMA volatility and spread statistics per symbol,
+updated from the market data refresh path.
+按交易对维护的滚动已实现波动率、EWMA 波动率和价差统计，由行情刷新路径更新。
+
+Owner: Agent ARCH
+
+Every update is O(1): squared log returns are accumulated in time-bucketed
+rolling sums, so reading a snapshot never rescans price history.
+每次更新都是 O(1)：对数收益平方累积在按时间分桶的滚动和中，读取快照无需重新扫描价格历史。
+
+Volatilities are realized over the window horizon (not annualised), e.g.
+``volatility_24h = 0.03`` means a 3% move over 24 hours.
+波动率为窗口期内的已实现波动率（未年化）。
+"""
+
+import math
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Realized volatility windows in seconds / 已实现波动率窗口（秒）
+VOL_WINDOWS = {"1m": 60, "1h": 3600, "24h": 86400}
+# Buckets per window; expiry granularity is window / buckets
+WINDOW_BUCKETS = 60
+# EWMA half-life for volatility and spread / 波动率和价差的 EWMA 半衰期
+EWMA_HALFLIFE_SECONDS = 600.0
+# Returns needed before a window reports a volatility
+MIN_RETURNS = 2
+
+
+def normalize_symbol(symbol: str) -> str:
+    """
+    Canonical symbol key, e.g. "ETH/USDT:USDT" -> "ETHUSDT".
+    规范化交易对键。
+    """
+    return symbol.split(":")[0].replace("/", "").upper()
+
+
+class RollingSum:
+    """
+    Time-bucketed rolling sum and count over ``window_seconds``.
+    ``window_seconds`` 内按时间分桶的滚动和与计数。
+
+    Expired buckets are subtracted as time advances, so ``add`` and
+    ``totals`` are amortised O(1).
+    """
+
+    __slots__ = ("bucket_seconds", "_sums", "_counts", "_head", "sum", "count")
+
+    def __init__(self, window_seconds: float, buckets: int = WINDOW_BUCKETS):
+        self.bucket_seconds = window_seconds / buckets
+        self._sums: List[float] = [0.0] * buckets
+        self._counts: List[int] = [0] * buckets
+        self._head: Optional[int] = None
+        self.sum = 0.0
+        self.count = 0
+
+    def _advance(self, epoch: int) -> None:
+        if self._head is None or epoch <= self._head:
+            if self._head is None:
+                self._head = epoch
+            return
+        n = len(self._sums)
+        for k in range(1, min(epoch - self._head, n) + 1):
+            idx = (self._head + k) % n
+            self.sum -= self._sums[idx]
+            self.count -= self._counts[idx]
+            self._sums[idx] = 0.0
+            self._counts[idx] = 0
+        if self.count == 0:
+            # Drop accumulated float error once the window is empty
+            self.sum = 0.0
+        self._head = epoch
+
+    def add(self, value: float, ts: float) -> None:
+        epoch = int(ts // self.bucket_seconds)
+        self._advance(epoch)
+        if epoch <= self._head - len(self._sums):
+            return  # Older than the window
+        idx = epoch % len(self._sums)
+        self._sums[idx] += value
+        self._counts[idx] += 1
+        self.sum += value
+        self.count += 1
+
+    def totals(self, ts: float) -> Tuple[float, int]:
+        """Sum and count of values inside the window ending at ``ts``."""
+        self._advance(int(ts // self.bucket_seconds))
+        return self.sum, self.count
+
+
+class SymbolStats:
+    """
+    Streaming volatility and spread statistics for one symbol.
+    单个交易对的流式波动率和价差统计。
+    """
+
+    def __init__(self, ewma_halflife: float = EWMA_HALFLIFE_SECONDS):
+        self._tau = ewma_halflife / math.log(2)
+        self._returns = {
+            name: RollingSum(seconds) for name, seconds in VOL_WINDOWS.items()
+        }
+        self._spreads = RollingSum(VOL_WINDOWS["1h"])
+        self.first_ts: Optional[float] = None
+        self.last_ts: Optional[float] = None
+        self.last_mid: Optional[float] = None
+        self.last_spread_bps: Optional[float] = None
+        # EWMA of squared log return per second / 每秒对数收益平方的 EWMA
+        self.ewma_variance_rate: Optional[float] = None
+        self.ewma_spread_bps: Optional[float] = None
+        self.samples = 0
+
+    def update(
+        self,
+        mid: float,
+        ts: float,
+        best_bid: Optional[float] = None,
+        best_ask: Optional[float] = None,
+    ) -> None:
+        """Add one mid price (and optional top of book) / 添加一个中间价（及可选盘口）"""
+        if not mid or mid <= 0:
+            return
+        if self.first_ts is None:
+            self.first_ts = ts
+        self.samples += 1
+
+        prev_mid, prev_ts = self.last_mid, self.last_ts
+        if prev_mid is not None and ts >= prev_ts:
+            r = math.log(mid / prev_mid)
+            r2 = r * r
+            for window in self._returns.values():
+                window.add(r2, ts)
+            dt = ts - prev_ts
+            if dt > 0:
+                alpha = 1.0 - math.exp(-dt / self._tau)
+                rate = r2 / dt
+                self.ewma_variance_rate = (
+                    rate
+                    if self.ewma_variance_rate is None
+                    else self.ewma_variance_rate
+                    + alpha * (rate - self.ewma_variance_rate)
+                )
+
+        if best_bid and best_ask and best_ask >= best_bid:
+            spread_bps = (best_ask - best_bid) / mid * 10000
+            self.last_spread_bps = spread_bps
+            self._spreads.add(spread_bps, ts)
+            if self.ewma_spread_bps is None or prev_ts is None:
+                self.ewma_spread_bps = spread_bps
+            else:
+                alpha = 1.0 - math.exp(-max(ts - prev_ts, 0.0) / self._tau)
+                self.ewma_spread_bps += alpha * (spread_bps - self.ewma_spread_bps)
+
+        self.last_mid = mid
+        self.last_ts = ts
+
+    def realized_volatility(self, window: str, ts: float) -> Optional[float]:
+        """
+        Realized volatility over a window, scaled to the full window when less
+        history has been observed. None until MIN_RETURNS returns are seen.
+        """
+        sum_r2, count = self._returns[window].totals(ts)
+        if count < MIN_RETURNS or self.first_ts is None:
+            return None
+        horizon = VOL_WINDOWS[window]
+        covered = min(horizon, ts - self.first_ts)
+        if covered <= 0:
+            return None
+        return math.sqrt(sum_r2 * horizon / covered)
+
+    def snapshot(self, ts: float) -> Dict[str, Optional[float]]:
+        """Current statistics / 当前统计"""
+        spread_sum, spread_count = self._spreads.totals(ts)
+        snapshot: Dict[str, Optional[float]] = {
+            "mid_price": self.last_mid,
+            "samples": self.samples,
+            "updated_at": self.last_ts,
+        }
+        for window in VOL_WINDOWS:
+            snapshot[f"volatility_{window}"] = self.realized_volatility(window, ts)
+        snapshot["ewma_volatility_1h"] = (
+            math.sqrt(self.ewma_variance_rate * 3600)
+            if self.ewma_variance_rate is not None
+            else None
+        )
+        snapshot["spread_bps"] = self.last_spread_bps
+        snapshot["spread_bps_mean_1h"] = (
+            spread_sum / spread_count if spread_count else None
+        )
+        snapshot["spread_bps_ewma"] = self.ewma_spread_bps
+        return snapshot
+
+
+class MarketStatsEngine:
+    """
+    Per-symbol market statistics shared by the engine, agents and API.
+    引擎、代理和 API 共享的按交易对市场统计。
+    """
+
+    def __init__(self, clock=time.time):
+        self._lock = threading.Lock()
+        self._clock = clock
+        self._symbols: Dict[str, SymbolStats] = {}
+
+    def update(
+        self, symbol: str, market_data: Dict, ts: Optional[float] = None
+    ) -> None:
+        """
+        Feed a market data dict (mid_price, best_bid, best_ask).
+        输入行情数据字典。
+        """
+        if not isinstance(market_data, dict):
+            return
+        mid = market_data.get("mid_price")
+        if not isinstance(mid, (int, float)):
+            return
+        bid = market_data.get("best_bid")
+        ask = market_data.get("best_ask")
+        key = normalize_symbol(symbol)
+        ts = self._clock() if ts is None else ts
+        with self._lock:
+            stats = self._symbols.get(key)
+            if stats is None:
+                stats = self._symbols[key] = SymbolStats()
+            stats.update(
+                float(mid),
+                ts,
+                bid if isinstance(bid, (int, float)) else None,
+                ask if isinstance(ask, (int, float)) else None,
+            )
+
+    def get(
+        self, symbol: str, ts: Optional[float] = None
+    ) -> Dict[str, Optional[float]]:
+        """
+        Snapshot for a symbol (empty dict if never seen).
+        获取交易对快照（未见过则返回空字典）。
+        """
+        key = normalize_symbol(symbol)
+        ts = self._clock() if ts is None else ts
+        with self._lock:
+            stats = self._symbols.get(key)
+            return stats.snapshot(ts) if stats else {}
+
+    def get_all(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Snapshots for every symbol / 所有交易对的快照"""
+        ts = self._clock()
+        with self._lock:
+            return {key: stats.snapshot(ts) for key, stats in self._symbols.items()}
+
+
+# Global market statistics engine / 全局市场统计引擎
+market_stats = MarketStatsEngine()
@@ -11,6 +11,7 @@ from typing import Any, Dict, List, Optional
 
 import numpy as np
 
+from src.shared.latency import LatencyTracker, tick_to_trade_tracker
 from src.shared.metrics.base import Metric
 
 
@@ -18,11 +19,14 @@ class SharpeRatio(Metric):
     """Sharpe Ratio metric for risk-adjusted returns."""
 
     def calculate(self, data: Dict[str, Any]) -> float:
-        trades: List[Dict] = data.get("trades", [])
-        if len(trades) < 10:
+        # Prefer the contiguous PnL column when the caller provides one
+        pnls = data.get("trade_pnls")
+        if pnls is None:
+            trades: List[Dict] = data.get("trades", [])
+            pnls = [t["pnl"] for t in trades]
+        if len(pnls) < 10:
             return 0.0
 
-        pnls = [t["pnl"] for t in trades]
         returns = np.diff(pnls)
 
         if len(returns) > 0 and np.std(returns) > 0:
@@ -47,8 +51,28 @@ class FillRate(Metric):
 
 
 class TickToTradeLatency(Metric):
-    """Tick-to-trade latency in milliseconds."""
-
-    def calculate(self, data: Dict[str, Any]) -> float:
-        # Mock implementation
-        return 3.5  # ms
+    """
+    Tick-to-trade latency in milliseconds.
+
+    Measured on the hot path (market data receipt -> exchange ack) by the
+    engine; reports the configured percentile (default p50) of the recent
+    window, or None before any order has been acknowledged.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        config: Dict[str, Any],
+        tracker: Optional[LatencyTracker] = None,
+    ):
+        super().__init__(name, config)
+        self.tracker = tracker or tick_to_trade_tracker
+        self.percentile = config.get("percentile", 50)
+
+    def calculate(self, data: Dict[str, Any]) -> Optional[float]:
+        value = self.tracker.percentile_ms("tick_to_trade", self.percentile)
+        return round(value, 3) if value is not None else None
+
+    def get_percentiles(self) -> Dict[str, Dict]:
+        """Per-stage p50/p90/p99 summary in milliseconds."""
+        return self.tracker.get_summary()
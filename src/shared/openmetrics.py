@@ -0,0 +1,353 @@
+"""
+OpenMetrics Module / OpenMetrics 指标导出模块
+
+Counters, gauges and histograms exported in OpenMetrics text format.
+以 OpenMetrics 文本格式导出的计数器、仪表和直方图。
+
+Owner: Agent ARCH
+
+Usage / 用法:
+    from src.shared.openmetrics import openmetrics_registry
+
+    cycles = openmetrics_registry.counter(
+        "mm_engine_cycles", "Engine cycles run", ["outcome"]
+    )
+    cycles.labels(outcome="ok").inc()
+    text = openmetrics_registry.render()
+"""
+
+import bisect
+import math
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Label value used once a metric reaches its series limit / 超出序列上限后使用的标签值
+OVERFLOW_LABEL_VALUE = "__overflow__"
+DEFAULT_MAX_SERIES = 200
+
+# Default latency buckets in seconds / 默认延迟桶（秒）
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+class _Metric:
+    """Base class for a metric family with labelled series."""
+
+    kind = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        max_series: int = DEFAULT_MAX_SERIES,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.max_series = max_series
+        self._lock = threading.Lock()
+        self._series: Dict[LabelValues, object] = {}
+        self.overflowed = 0
+
+    def _new_series(self):
+        raise NotImplementedError
+
+    def labels(self, **labels: str):
+        """
+        Get the series for a label set, creating it if needed.
+
+        Once ``max_series`` distinct label sets exist, new ones are folded into
+        a single overflow series so unbounded values (order IDs, prices) cannot
+        blow up memory or the scrape.
+        """
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        series = self._series.get(key)
+        if series is not None:
+            return series
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                if len(self._series) >= self.max_series:
+                    self.overflowed += 1
+                    key = (OVERFLOW_LABEL_VALUE,) * len(self.labelnames)
+                    series = self._series.get(key)
+                if series is None:
+                    series = self._series[key] = self._new_series()
+        return series
+
+    def _default(self):
+        return self.labels()
+
+    def _samples(self) -> List[Tuple[str, LabelValues, Dict[str, str], float]]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        """Render this family in OpenMetrics text format."""
+        lines = [
+            f"# TYPE {self.name} {self.kind}",
+            f"# HELP {self.name} {_escape_help(self.documentation)}",
+        ]
+        for suffix, values, extra, value in self._samples():
+            label_text = _format_labels(self.labelnames, values, extra)
+            lines.append(f"{self.name}{suffix}{label_text} {_format_value(value)}")
+        return lines
+
+
+class _CounterSeries:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter / 单调递增计数器"""
+
+    kind = "counter"
+
+    def _new_series(self):
+        return _CounterSeries()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+    def _samples(self):
+        with self._lock:
+            items = list(self._series.items())
+        return [("_total", values, {}, s.value) for values, s in items]
+
+
+class _GaugeSeries:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+
+class Gauge(_Metric):
+    """Value that can go up and down / 可增可减的仪表"""
+
+    kind = "gauge"
+
+    def _new_series(self):
+        return _GaugeSeries()
+
+    def set(self, value: float) -> None:
+        self._default().set(value)
+
+    def _samples(self):
+        with self._lock:
+            items = list(self._series.items())
+        return [("", values, {}, s.value) for values, s in items]
+
+
+class _HistogramSeries:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        # One count per finite bound plus +Inf
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        idx = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[idx] += 1
+            self.sum += value
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram / 累积分桶直方图"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        max_series: int = DEFAULT_MAX_SERIES,
+    ):
+        super().__init__(name, documentation, labelnames, max_series)
+        self.buckets = tuple(sorted(float(b) for b in buckets if b != math.inf))
+
+    def _new_series(self):
+        return _HistogramSeries(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+    def _samples(self):
+        with self._lock:
+            items = list(self._series.items())
+        samples = []
+        for values, series in items:
+            with series._lock:
+                counts = list(series.counts)
+                total_sum = series.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                samples.append(
+                    ("_bucket", values, {"le": _format_value(bound)}, cumulative)
+                )
+            samples.append(("_count", values, {}, cumulative))
+            samples.append(("_sum", values, {}, total_sum))
+        return samples
+
+
+class OpenMetricsRegistry:
+    """
+    Registry of metric families with scrape-time collectors.
+    指标族注册表，支持抓取时回调收集器。
+
+    Collectors are callables run before each render to refresh gauges from
+    state that already lives elsewhere (positions, health summaries).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {metric.kind}")
+            return metric
+
+    def counter(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        max_series: int = DEFAULT_MAX_SERIES,
+    ) -> Counter:
+        """Get or create a counter (name without the _total suffix)."""
+        return self._get_or_create(Counter, name, documentation, labelnames, max_series)
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        max_series: int = DEFAULT_MAX_SERIES,
+    ) -> Gauge:
+        """Get or create a gauge."""
+        return self._get_or_create(Gauge, name, documentation, labelnames, max_series)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        max_series: int = DEFAULT_MAX_SERIES,
+    ) -> Histogram:
+        """Get or create a histogram."""
+        return self._get_or_create(
+            Histogram, name, documentation, labelnames, buckets, max_series
+        )
+
+    def get(self, name: str) -> Optional[_Metric]:
+        """Get a registered metric family by name."""
+        return self._metrics.get(name)
+
+    def register_collector(self, collector: Callable[[], None]) -> None:
+        """Register a callable run before every render."""
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        Render all metrics in OpenMetrics text format.
+        以 OpenMetrics 文本格式渲染所有指标。
+        """
+        with self._lock:
+            collectors = list(self._collectors)
+        for collector in collectors:
+            try:
+                collector()
+            except Exception:
+                # A broken collector must not break the scrape
+                continue
+
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(
+    names: Tuple[str, ...], values: LabelValues, extra: Dict[str, str]
+) -> str:
+    pairs = list(zip(names, values)) + list(extra.items())
+    if not pairs:
+        return ""
+    inner = ",".join(f'{k}="{_escape_label(v)}"' for k, v in pairs)
+    return "{" + inner + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(value)
+    return repr(value)
+
+
+# Global OpenMetrics registry / 全局 OpenMetrics 注册表
+openmetrics_registry = OpenMetricsRegistry()
@@ -0,0 +1,163 @@
+"""
+Ring Buffer Module / 环形缓冲区模块
+
+Fixed-capacity ring buffer backed by NumPy arrays with typed columns.
+基于 NumPy 数组、带类型列的固定容量环形缓冲区。
+
+Owner: Agent ARCH
+
+Each column is stored twice back to back (a "mirrored" buffer), so the most
+recent N rows are always one contiguous slice. ``view()`` therefore returns
+zero-copy arrays that ``np.diff`` / ``np.std`` can use directly.
+每列连续存储两份（镜像缓冲区），最近 N 行始终是一个连续切片，``view()`` 返回的
+零拷贝数组可直接用于 ``np.diff`` / ``np.std``。
+
+Usage / 用法:
+    prices = RingBuffer(1000)
+    prices.append(101.5)
+    returns = np.diff(prices.view())
+
+    pnl = RingBuffer(1000, {"timestamp": np.int64, "pnl": np.float64})
+    pnl.append(1700000000000, 12.5)
+    pnl.view("pnl", last=100)
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+
+DEFAULT_COLUMN = "value"
+
+ColumnSpec = Union[None, type, np.dtype, Dict[str, Any]]
+
+
+class RingBuffer:
+    """
+    Fixed-capacity, append-only ring buffer of typed columns.
+    固定容量、仅追加的带类型列环形缓冲区。
+
+    Appends are O(1) and never allocate; once full, the oldest row is
+    overwritten. Views are read-only and reflect the buffer at the time of
+    the call; take a copy if the data must outlive later appends.
+    """
+
+    def __init__(self, capacity: int, columns: ColumnSpec = None):
+        """
+        Args:
+            capacity: Maximum number of rows kept
+            columns: Mapping of column name to dtype, a single dtype, or None
+                     for one float64 column
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if columns is None:
+            columns = {DEFAULT_COLUMN: np.float64}
+        elif not isinstance(columns, dict):
+            columns = {DEFAULT_COLUMN: columns}
+
+        self.capacity = capacity
+        self.columns = tuple(columns)
+        self._data: Dict[str, np.ndarray] = {
+            name: np.zeros(2 * capacity, dtype=dtype) for name, dtype in columns.items()
+        }
+        self._single = len(self.columns) == 1
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def full(self) -> bool:
+        return self._size == self.capacity
+
+    def append(self, *values: Any, **named: Any) -> None:
+        """
+        Append one row, positionally in column order or by column name.
+        追加一行（按列顺序或列名）。
+        """
+        if named:
+            values = tuple(named[name] for name in self.columns)
+        elif len(values) != len(self.columns):
+            raise ValueError(f"Expected {len(self.columns)} values, got {len(values)}")
+        i = self._next
+        j = i + self.capacity
+        for name, value in zip(self.columns, values):
+            column = self._data[name]
+            column[i] = value
+            column[j] = value
+        self._next = (i + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def extend(self, rows) -> None:
+        """Append several rows (scalars for single-column buffers, else tuples)."""
+        for row in rows:
+            if self._single:
+                self.append(row)
+            else:
+                self.append(*row)
+
+    def _start(self, count: int) -> int:
+        return (self._next - count) % self.capacity
+
+    def view(
+        self, column: Optional[str] = None, last: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Zero-copy, read-only view of the most recent rows of a column.
+        某列最近若干行的零拷贝只读视图。
+
+        Args:
+            column: Column name (optional for single-column buffers)
+            last: Number of most recent rows (default: all)
+        """
+        if column is None:
+            if not self._single:
+                raise ValueError("column is required for multi-column buffers")
+            column = self.columns[0]
+        count = self._size if last is None else max(0, min(last, self._size))
+        start = self._start(count)
+        view = self._data[column][start : start + count]
+        view.flags.writeable = False
+        return view
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            rows = range(self._size)[index]
+            return [self._row(i) for i in rows]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("ring buffer index out of range")
+        return self._row(index)
+
+    def _row(self, index: int):
+        pos = self._start(self._size) + index
+        if self._single:
+            return self._data[self.columns[0]][pos].item()
+        return [self._data[name][pos].item() for name in self.columns]
+
+    def __iter__(self) -> Iterator:
+        return iter(self.tolist())
+
+    def tolist(self) -> List:
+        """
+        Rows as Python values, oldest first (scalars or [col, ...] lists).
+        按从旧到新的顺序以 Python 值返回所有行。
+        """
+        if self._single:
+            return self.view().tolist()
+        columns = [self.view(name).tolist() for name in self.columns]
+        return [list(row) for row in zip(*columns)]
+
+    def clear(self) -> None:
+        """Drop all rows (storage is kept) / 清空所有行（保留存储）"""
+        self._next = 0
+        self._size = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"RingBuffer(capacity={self.capacity}, columns={self.columns}, "
+            f"size={self._size})"
+        )
@@ -3,9 +3,14 @@
 
 """
 Trading module components:
+- advisory: Background Quant/Risk advisory worker
 - engine: AlphaLoop trading engine
 - exchange: Exchange client (Binance)
+- funding: Funding-rate history and trend engine
+- market_data: Bulk market data fetch planning
 - order_manager: Order synchronization
+- order_journal: Persistent order/error journal
+- order_table: ID-indexed order records
 - risk_manager: Position risk management
 - performance: Performance tracking
 - simulation: Market simulation
@@ -13,20 +18,35 @@ Trading module components:
 - strategies/: Trading strategies
 """
 
+from src.trading.advisory import AdvisoryWorker, CycleSnapshot
 from src.trading.engine import AlphaLoop
 from src.trading.exchange import BinanceClient
+from src.trading.funding import FundingRateStore, funding_store
+from src.trading.market_data import MarketDataPlanner
+from src.trading.order_journal import OrderJournal
 from src.trading.order_manager import OrderManager
-from src.trading.performance import PerformanceTracker
+from src.trading.order_table import OrderRecord, OrderTable
+from src.trading.performance import DrawdownTracker, PerformanceTracker, StreamingStats
 from src.trading.risk_manager import RiskManager
 from src.trading.simulation import MarketSimulator
 from src.trading.strategy_instance import StrategyInstance
 
 __all__ = [
+    "AdvisoryWorker",
     "AlphaLoop",
+    "CycleSnapshot",
     "BinanceClient",
+    "FundingRateStore",
+    "funding_store",
+    "MarketDataPlanner",
     "OrderManager",
+    "OrderJournal",
+    "OrderRecord",
+    "OrderTable",
     "RiskManager",
     "PerformanceTracker",
+    "StreamingStats",
+    "DrawdownTracker",
     "MarketSimulator",
     "StrategyInstance",
 ]
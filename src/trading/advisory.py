@@ -0,0 +1,303 @@
+"""
+Advisory Module / 顾问模块
+
+Runs Quant analysis and Risk validation off the trading cycle.
+在交易循环之外运行量化分析和风险校验。
+
+Owner: Agent TRADING
+
+The engine submits one CycleSnapshot per running instance each cycle and
+returns immediately; a background worker analyses the latest snapshot of
+each instance at its own cadence (an LLM call can take seconds) and posts
+approved parameters back through StrategyInstance.apply_params, which is
+atomic with respect to order calculation. Snapshots are coalesced per
+instance, so a slow analysis never builds a backlog.
+引擎每个周期为每个运行中的实例提交一个 CycleSnapshot 并立即返回；后台工作线程按自身节奏
+分析每个实例的最新快照（LLM 调用可能需要数秒），并通过 StrategyInstance.apply_params
+原子地回写已批准的参数。快照按实例合并，慢速分析不会造成积压。
+
+Analysis never runs on the submitting thread: the first submit starts the
+worker if it is not running. Callers that own the worker's lifetime pair
+start() with stop(); flush() waits for queued analyses to finish.
+分析从不在提交线程上执行：首次提交时若工作线程未运行则惰性启动。
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from src.shared.config import ADVISORY_CONFIG
+from src.shared.latency import now
+from src.shared.logger import setup_logger
+from src.shared.openmetrics import openmetrics_registry
+
+logger = setup_logger("Advisory")
+
+_SNAPSHOTS = openmetrics_registry.counter(
+    "mm_advisory_snapshots", "Cycle snapshots submitted for analysis", ("outcome",)
+)
+_DECISIONS = openmetrics_registry.counter(
+    "mm_advisory_decisions",
+    "Advisory analyses by outcome",
+    ("strategy_id", "outcome"),
+)
+_ANALYSIS_SECONDS = openmetrics_registry.histogram(
+    "mm_advisory_analysis_seconds",
+    "Quant analysis plus Risk validation time in seconds",
+    ("strategy_id",),
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+_PENDING = openmetrics_registry.gauge(
+    "mm_advisory_pending", "Instances with a snapshot awaiting analysis"
+)
+
+
+@dataclass
+class CycleSnapshot:
+    """
+    Inputs for one instance's analysis, captured by the trading cycle.
+    交易循环捕获的单个实例分析输入。
+    """
+
+    strategy_id: str
+    instance: Any
+    config: Dict[str, Any]
+    metrics: Dict[str, Any]
+    created_at: float = field(default_factory=now)
+
+
+class AdvisoryWorker:
+    """
+    Background Quant/Risk pipeline posting approved updates to instances.
+    将已批准更新回写到实例的后台量化/风险流水线。
+    """
+
+    def __init__(
+        self,
+        quant,
+        risk,
+        interval_seconds: float = ADVISORY_CONFIG["interval_seconds"],
+        max_snapshot_age: float = ADVISORY_CONFIG["max_snapshot_age"],
+    ):
+        """
+        Args:
+            quant: Agent with analyze_and_propose(config, metrics)
+            risk: Agent with validate_proposal(proposal)
+            interval_seconds: Minimum time between analyses of one instance
+            max_snapshot_age: Snapshots older than this are dropped
+        """
+        self.quant = quant
+        self.risk = risk
+        self.interval_seconds = interval_seconds
+        self.max_snapshot_age = max_snapshot_age
+        self._lock = threading.Lock()
+        # Signalled when an analysis finishes (see flush)
+        self._idle = threading.Condition(self._lock)
+        self._in_flight = 0
+        self._pending: Dict[str, CycleSnapshot] = {}
+        self._last_run: Dict[str, float] = {}
+        self.last_decisions: Dict[str, Dict[str, Any]] = {}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        """
+        Start the background thread (no-op if already running).
+
+        Returns:
+            True if a thread was started
+        """
+        with self._lock:
+            if self.running:
+                return False
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="advisory-worker", daemon=True
+            )
+            self._thread.start()
+        logger.info("Advisory worker started")
+        return True
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background thread after the current analysis."""
+        thread = self._thread
+        self._stop.set()
+        self._wake.set()
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+
+    def submit(self, snapshot: CycleSnapshot) -> None:
+        """
+        Queue a snapshot, replacing any unanalysed one for the same instance.
+        提交快照，替换同一实例尚未分析的快照。
+
+        Returns immediately; the worker thread is started if not running.
+        """
+        with self._lock:
+            coalesced = snapshot.strategy_id in self._pending
+            self._pending[snapshot.strategy_id] = snapshot
+            _PENDING.set(len(self._pending))
+        _SNAPSHOTS.labels(outcome="coalesced" if coalesced else "queued").inc()
+        # Start lazily rather than analysing on the caller's (trading) thread
+        # 惰性启动，而非在调用方（交易）线程上分析
+        self.start()
+        self._wake.set()
+
+    def process_pending(self, respect_interval: bool = True) -> int:
+        """
+        Analyse queued snapshots that are due.
+        分析已到期的排队快照。
+
+        Args:
+            respect_interval: Skip instances analysed within interval_seconds
+
+        Returns:
+            Number of snapshots analysed
+        """
+        current = now()
+        with self._lock:
+            due: List[CycleSnapshot] = []
+            for strategy_id, snapshot in list(self._pending.items()):
+                last = self._last_run.get(strategy_id)
+                if (
+                    respect_interval
+                    and last is not None
+                    and current - last < self.interval_seconds
+                ):
+                    continue
+                due.append(self._pending.pop(strategy_id))
+                self._last_run[strategy_id] = current
+            self._in_flight += len(due)
+            _PENDING.set(len(self._pending))
+
+        for snapshot in due:
+            try:
+                self._decide(snapshot, self._advise(snapshot))
+            finally:
+                with self._idle:
+                    self._in_flight -= 1
+                    self._idle.notify_all()
+        return len(due)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until no snapshot is queued or being analysed.
+        等待所有排队快照分析完成。
+
+        Returns:
+            False if the timeout expired first
+        """
+        with self._idle:
+            return self._idle.wait_for(
+                lambda: not self._pending and not self._in_flight, timeout
+            )
+
+    def _run(self) -> None:
+        poll = max(min(self.interval_seconds, 1.0), 0.05)
+        while not self._stop.is_set():
+            self._wake.wait(poll)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.process_pending()
+            except Exception as e:
+                logger.error(f"Advisory worker error: {e}")
+
+    def _decide(self, snapshot: CycleSnapshot, outcome: str) -> None:
+        _DECISIONS.labels(strategy_id=snapshot.strategy_id, outcome=outcome).inc()
+        with self._lock:
+            self.last_decisions[snapshot.strategy_id] = {
+                "outcome": outcome,
+                "snapshot_age": now() - snapshot.created_at,
+            }
+
+    def _advise(self, snapshot: CycleSnapshot) -> str:
+        """Analyse one snapshot and apply the result / 分析单个快照并应用结果"""
+        strategy_id = snapshot.strategy_id
+        instance = snapshot.instance
+        if now() - snapshot.created_at > self.max_snapshot_age:
+            logger.info(f"Dropping stale snapshot for strategy '{strategy_id}'")
+            return "stale"
+        if not instance.running:
+            return "inactive"
+
+        started = now()
+        try:
+            proposal = self.quant.analyze_and_propose(snapshot.config, snapshot.metrics)
+            if not proposal:
+                logger.info(
+                    f"No changes proposed for strategy '{strategy_id}'. Skipping."
+                )
+                return "no_change"
+
+            # Safely access proposal spread, handling Mock objects
+            # 安全访问 proposal spread，处理 Mock 对象
+            spread_value = (
+                proposal.get("spread") if isinstance(proposal, dict) else None
+            )
+            spread_str = (
+                f"{spread_value:.2%}"
+                if isinstance(spread_value, (int, float))
+                else "N/A"
+            )
+            logger.info(
+                f"Quant proposing spread {spread_str} for strategy '{strategy_id}'"
+            )
+            approved, reason = self._validate(proposal)
+        except Exception as e:
+            logger.error(f"Advisory analysis failed for strategy '{strategy_id}': {e}")
+            return "error"
+        finally:
+            _ANALYSIS_SECONDS.labels(strategy_id=strategy_id).observe(now() - started)
+
+        if approved:
+            # Drop the proposal if parameters changed since the snapshot
+            # 若参数在快照后已被修改，则丢弃该提案
+            if not instance.apply_params(
+                {"spread": proposal["spread"]}, expected=snapshot.config
+            ):
+                logger.info(
+                    f"Parameters of strategy '{strategy_id}' changed during analysis; "
+                    "proposal discarded"
+                )
+                return "superseded"
+            logger.info(
+                f"Applying new config for strategy '{strategy_id}'",
+                extra={"extra_data": {"proposal": proposal}},
+            )
+            instance.alert = None
+            return "approved"
+
+        logger.warning(f"Proposal rejected for strategy '{strategy_id}': {reason}")
+        safe_defaults = instance.reset_to_safe_defaults()
+        logger.info(
+            f"Auto-fallback to safe defaults for strategy '{strategy_id}'",
+            extra={"extra_data": {"safe_defaults": safe_defaults}},
+        )
+        instance.alert = {
+            "type": "warning",
+            "message": f"Risk Rejection: {reason}",
+            "suggestion": f"Auto-fallback to safe defaults (Spread: {safe_defaults['spread']*100:.2f}%).",
+        }
+        return "rejected"
+
+    def _validate(self, proposal):
+        # Safely unpack validate_proposal result / 安全解包 validate_proposal 结果
+        try:
+            validation_result = self.risk.validate_proposal(proposal)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Error validating proposal: {e}. Assuming approved.")
+            return True, None
+        if isinstance(validation_result, tuple) and len(validation_result) == 2:
+            return validation_result
+        # If not a tuple, assume approved / 如果不是元组，假设已批准
+        return (
+            bool(validation_result) if validation_result is not None else True
+        ), None
@@ -8,6 +8,7 @@ Owner: Agent TRADING
 """
 
 import sys
+import threading
 import time
 from collections import deque
 from typing import Dict, Optional
@@ -15,10 +16,18 @@ from typing import Dict, Optional
 from src.ai.agents.data import DataAgent
 from src.ai.agents.quant import QuantAgent
 from src.ai.agents.risk import RiskAgent
-from src.shared.config import STRATEGY_TYPE
+from src.shared.config import ORDER_JOURNAL_PATH, STRATEGY_TYPE
+from src.shared.exchange_metrics import metrics_collector
+from src.shared.latency import TickToTradeTimer, now, tick_to_trade_tracker
 from src.shared.logger import setup_logger
+from src.shared.market_stats import market_stats
+from src.shared.openmetrics import openmetrics_registry
 from src.shared.tracing import get_trace_id
+from src.trading.advisory import AdvisoryWorker, CycleSnapshot
 from src.trading.exchange import BinanceClient
+from src.trading.funding import funding_store
+from src.trading.market_data import MarketDataPlanner
+from src.trading.order_journal import OrderJournal
 from src.trading.order_manager import OrderManager
 from src.trading.simulation import MarketSimulator
 from src.trading.strategies.fixed_spread import FixedSpreadStrategy
@@ -27,6 +36,31 @@ from src.trading.strategy_instance import StrategyInstance
 
 logger = setup_logger("AlphaLoop")
 
+# OpenMetrics series exported at /metrics / 在 /metrics 导出的 OpenMetrics 序列
+_CYCLES = openmetrics_registry.counter(
+    "mm_engine_cycles", "AlphaLoop cycles run", ["outcome"]
+)
+_STRATEGY_CYCLE_SECONDS = openmetrics_registry.histogram(
+    "mm_strategy_cycle_seconds",
+    "Duration of one strategy instance cycle in seconds",
+    ["strategy_id"],
+)
+_ORDER_ACTIONS = openmetrics_registry.counter(
+    "mm_order_actions", "Order sync actions issued", ["strategy_id", "action"]
+)
+_ERRORS = openmetrics_registry.counter(
+    "mm_errors", "Errors recorded by the engine", ["type"], max_series=50
+)
+_POSITION = openmetrics_registry.gauge(
+    "mm_position", "Current position size", ["strategy_id", "symbol"]
+)
+
+
+def _ack_time(order: Dict) -> float:
+    """Exchange ack timestamp stamped by the client, else the current time."""
+    ack_at = order.get("ack_at")
+    return ack_at if isinstance(ack_at, float) else now()
+
 
 class AlphaLoop:
     """
@@ -37,7 +71,19 @@ class AlphaLoop:
     支持多个策略实例独立运行。
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        order_journal: Optional[OrderJournal] = None,
+        order_journal_path: Optional[str] = None,
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            order_journal: Persistent order/error journal (opened lazily if None)
+            order_journal_path: SQLite file for that journal (defaults to
+                ORDER_JOURNAL_PATH, ":memory:" disables persistence)
+        """
         # Multi-strategy support: dict of StrategyInstance objects
         self.strategy_instances: Dict[str, StrategyInstance] = {}
 
@@ -59,13 +105,112 @@ class AlphaLoop:
         self.quant = QuantAgent()
         self.risk = RiskAgent()
         self.data = DataAgent()
+        # Symbol whose prices fill the Data agent's history / 数据代理价格历史对应的交易对
+        self._reference_symbol: Optional[str] = None
+        # Quant/Risk analysis runs off the trading cycle / 量化/风险分析在交易循环之外运行
+        self.advisor = AdvisoryWorker(self.quant, self.risk)
+        self.market_data_planner = MarketDataPlanner()
         self.om = OrderManager()  # Legacy order manager
         self.alert = None  # Global alert
         self.current_stage = "Idle"
         self.active_orders = []  # Legacy: aggregated orders
         self.system_logs = deque(maxlen=50)
+        # Bounded in-memory views for display; the journal holds full history
         self.order_history = deque(maxlen=200)
         self.error_history = deque(maxlen=200)
+        self.order_journal_path = order_journal_path
+        self._order_journal = order_journal
+        self._order_journal_lock = threading.Lock()
+
+    @property
+    def order_journal(self) -> OrderJournal:
+        """
+        Order/error journal, opened on first use so that constructing an
+        engine does not touch the disk.
+        订单/错误日志，首次使用时才打开。
+        """
+        if self._order_journal is None:
+            with self._order_journal_lock:
+                if self._order_journal is None:
+                    self._order_journal = self._open_order_journal(
+                        self.order_journal_path or ORDER_JOURNAL_PATH
+                    )
+        return self._order_journal
+
+    @order_journal.setter
+    def order_journal(self, journal: OrderJournal) -> None:
+        self._order_journal = journal
+
+    @staticmethod
+    def _open_order_journal(path: str) -> OrderJournal:
+        """Open the order journal at ``path``, falling back to an in-memory one."""
+        try:
+            return OrderJournal(path)
+        except Exception as e:
+            logger.warning(
+                f"Failed to open order journal at {path}: {e}. "
+                "Using in-memory journal."
+            )
+            return OrderJournal(":memory:")
+
+    def _amend_order(
+        self,
+        instance: StrategyInstance,
+        order_id: str,
+        target: Dict,
+        timer: Optional[TickToTradeTimer] = None,
+    ) -> bool:
+        """
+        Modify a resting order in place, keeping its record and journal in sync.
+
+        Returns:
+            True if the exchange accepted the amend
+        """
+        if not hasattr(instance.exchange, "amend_order"):
+            return False
+        if timer is not None:
+            timer.mark_send()
+        result = instance.exchange.amend_order(order_id, target)
+        if not result:
+            return False
+        if timer is not None:
+            timer.mark_ack(_ack_time(result))
+
+        new_id = result.get("id") or order_id
+        price = target.get("price")
+        quantity = target.get("quantity")
+        if new_id == order_id:
+            instance.amend_order_record(order_id, price, quantity)
+            self.order_journal.record_amend(order_id, price, quantity)
+            return True
+
+        # Exchange assigned a new ID: retire the old record, track the new one
+        instance.set_order_status(order_id, "amended")
+        self.order_journal.update_status(order_id, "amended")
+        order_record = {
+            "id": new_id,
+            "symbol": instance.exchange.symbol,
+            "side": target.get("side"),
+            "price": price,
+            "quantity": quantity,
+            "status": "placed",
+            "timestamp": time.time(),
+            "strategy_id": instance.strategy_id,
+            "strategy_type": instance.strategy_type,
+        }
+        self.order_journal.record_order(order_record)
+        self.order_history.append(instance.record_order(order_record))
+        return True
+
+    def _record_error(
+        self, instance: Optional[StrategyInstance], error_record: dict
+    ) -> None:
+        """Append an error to the instance/global histories and the journal."""
+        if instance is not None:
+            instance.error_history.append(error_record)
+        self.error_history.append(error_record)
+        _ERRORS.labels(type=error_record.get("type") or "unknown").inc()
+        self.order_journal.record_error(error_record)
 
     def add_strategy_instance(
         self,
@@ -295,12 +440,23 @@ class AlphaLoop:
                     "strategy_type": instance.strategy_type,
                     "trace_id": get_trace_id(),
                 }
-                instance.error_history.append(error_record)
-                self.error_history.append(error_record)
+                self._record_error(instance, error_record)
                 return
 
             market_data = instance.latest_market_data
+            # Feeds the stats unless the bulk fetch already did this cycle
+            # 若本周期批量获取尚未输入，则输入统计
+            market_data["market_stats"] = self.market_data_planner.observe(
+                instance.symbol, market_data
+            )
             funding_rate = instance.latest_funding_rate
+            timer = TickToTradeTimer(instance.market_data_received_at)
+
+            position = (instance.latest_account_data or {}).get("position_amt")
+            if isinstance(position, (int, float)):
+                _POSITION.labels(
+                    strategy_id=instance.strategy_id, symbol=instance.symbol
+                ).set(position)
 
             target_orders = instance.calculate_target_orders(market_data, funding_rate)
 
@@ -312,30 +468,51 @@ class AlphaLoop:
                 instance.clear_tracked_orders()
                 instance.strategy_switched = False
             else:
-                all_orders = instance.exchange.fetch_open_orders()
-                current_orders = [
-                    o for o in all_orders if o.get("id") in instance.tracked_order_ids
-                ]
+                # StrategyInstance.sync_orders filters to tracked orders
+                current_orders = instance.exchange.fetch_open_orders()
+
+            plan = instance.plan_orders(current_orders, target_orders)
+            timer.mark_decision()
+            to_cancel_ids = list(plan.cancel)
+            to_place = list(plan.place)
+            for current, target in plan.replace:
+                to_cancel_ids.append(current["id"])
+                to_place.append(target)
+
+            amended = 0
+            for current, target in plan.amend:
+                if self._amend_order(instance, current["id"], target, timer):
+                    amended += 1
+                else:
+                    # Amend rejected: fall back to cancel + place
+                    to_cancel_ids.append(current["id"])
+                    to_place.append(target)
 
-            to_cancel_ids, to_place = instance.sync_orders(
-                current_orders, target_orders
+            metrics_collector.record_order_actions(
+                instance.strategy_id, len(to_cancel_ids), len(to_place), amended
             )
+            for action, count in (
+                ("cancel", len(to_cancel_ids)),
+                ("place", len(to_place)),
+                ("amend", amended),
+            ):
+                if count:
+                    _ORDER_ACTIONS.labels(
+                        strategy_id=instance.strategy_id, action=action
+                    ).inc(count)
 
             if to_cancel_ids:
                 for order_id in to_cancel_ids:
-                    instance.remove_tracked_order(order_id)
-                    for hist_order in instance.order_history:
-                        if hist_order.get("id") == order_id:
-                            hist_order["status"] = "cancelled"
+                    instance.set_order_status(order_id, "cancelled")
+                    self.order_journal.update_status(order_id, "cancelled")
                 instance.exchange.cancel_orders(to_cancel_ids)
 
             if to_place:
+                timer.mark_send()
                 placed_orders = instance.exchange.place_orders(to_place)
                 for order in placed_orders:
+                    timer.mark_ack(_ack_time(order))
                     order_id = order.get("id")
-                    if order_id:
-                        instance.add_tracked_order(order_id)
-
                     order_record = {
                         "id": order_id or "unknown",
                         "symbol": instance.exchange.symbol,
@@ -347,8 +524,11 @@ class AlphaLoop:
                         "strategy_id": instance.strategy_id,
                         "strategy_type": instance.strategy_type,
                     }
-                    instance.order_history.append(order_record)
-                    self.order_history.append(order_record)
+                    self.order_journal.record_order(order_record)
+                    # Shared record so status updates show in both views
+                    self.order_history.append(instance.record_order(order_record))
+
+            tick_to_trade_tracker.record_timer(timer)
 
             # Check for order errors after placing orders (even if no orders were placed) / 在下单后检查订单错误（即使没有下单）
             if hasattr(instance.exchange, "last_order_error"):
@@ -368,8 +548,7 @@ class AlphaLoop:
                         "strategy_type": instance.strategy_type,
                         "trace_id": get_trace_id(),  # Include trace_id for correlation / 包含 trace_id 用于关联
                     }
-                    instance.error_history.append(error_record)
-                    self.error_history.append(error_record)
+                    self._record_error(instance, error_record)
 
                     if error_type in [
                         "insufficient_funds",
@@ -393,9 +572,7 @@ class AlphaLoop:
                     instance.exchange.last_order_error = None
 
                 all_orders = instance.exchange.fetch_open_orders()
-                instance.active_orders = [
-                    o for o in all_orders if o.get("id") in instance.tracked_order_ids
-                ]
+                instance.active_orders = instance.filter_tracked_orders(all_orders)
                 for order in instance.active_orders:
                     if "amount" not in order:
                         order["amount"] = order.get("quantity", 0)
@@ -424,14 +601,38 @@ class AlphaLoop:
                 "strategy_type": instance.strategy_type,
                 "trace_id": get_trace_id(),  # Include trace_id for correlation / 包含 trace_id 用于关联
             }
-            instance.error_history.append(error_record)
-            self.error_history.append(error_record)
+            self._record_error(instance, error_record)
             instance.alert = {
                 "type": "error",
                 "message": f"Strategy '{instance.strategy_id}' error: {e}",
                 "suggestion": "Check logs or retry.",
             }
 
+    @staticmethod
+    def _reference_price(instance: Optional[StrategyInstance]) -> Optional[float]:
+        """Real mid price of one instance's symbol / 单个实例交易对的真实中间价"""
+        market_data = getattr(instance, "latest_market_data", None)
+        if isinstance(market_data, dict):
+            mid = market_data.get("mid_price")
+            if isinstance(mid, (int, float)) and mid > 0:
+                return float(mid)
+        return None
+
+    def _ingest_reference_price(self, price: Optional[float]) -> None:
+        """
+        Feed the default instance's price to the Data agent.
+        将默认实例的价格输入数据代理。
+
+        The history is a single series, so it restarts whenever the default
+        symbol changes instead of splicing two markets together.
+        """
+        default_instance = self.strategy_instances.get("default")
+        symbol = default_instance.symbol if default_instance else None
+        if symbol != self._reference_symbol:
+            self.data.price_history.clear()
+            self._reference_symbol = symbol
+        self.data.ingest_data({"price": price}, [])
+
     def run_cycle(self) -> None:
         """Run one cycle of all strategy instances."""
         logger.info(
@@ -446,6 +647,8 @@ class AlphaLoop:
         has_real_exchange = any(
             inst.use_real_exchange for inst in self.strategy_instances.values()
         )
+        # Price fed to the Data agent: real mid when available / 输入数据代理的价格：优先真实中间价
+        reference_price = None
 
         if has_real_exchange and not active_instances:
             self.set_stage("Idle (no active strategies)")
@@ -454,20 +657,38 @@ class AlphaLoop:
         elif active_instances:
             self.set_stage("Execution")
             try:
+                # Fetch public data for all instances via bulk endpoints
+                # 通过批量端点获取所有实例的公共数据
+                self.market_data_planner.refresh(
+                    instance for _, instance in active_instances
+                )
                 for strategy_id, instance in active_instances:
                     logger.info(
                         f"Executing strategy instance: {strategy_id} (symbol: {instance.symbol})"
                     )
+                    started = now()
                     self._run_strategy_instance_cycle(instance)
+                    _STRATEGY_CYCLE_SECONDS.labels(strategy_id=strategy_id).observe(
+                        now() - started
+                    )
+
+                # Backfill / extend funding history once a settlement is due
+                # 结算到期后回填或扩展资金费率历史
+                for _, instance in active_instances:
+                    funding_store.sync_history(instance.exchange, instance.symbol)
 
                 self.active_orders = []
                 for _, instance in active_instances:
                     self.active_orders.extend(instance.active_orders)
+                default_instance = self.strategy_instances.get("default")
+                if any(inst is default_instance for _, inst in active_instances):
+                    reference_price = self._reference_price(default_instance)
 
                 stats = {"realized_pnl": 0.0, "win_rate": 0.0}
             except Exception as e:
                 logger.error(f"Error in cycle: {e}")
-                self.error_history.append(
+                self._record_error(
+                    None,
                     {
                         "timestamp": time.time(),
                         "symbol": "unknown",
@@ -477,7 +698,7 @@ class AlphaLoop:
                         "details": None,
                         "strategy_type": "system",
                         "trace_id": get_trace_id(),  # Include trace_id for correlation / 包含 trace_id 用于关联
-                    }
+                    },
                 )
                 self.alert = {
                     "type": "error",
@@ -485,6 +706,7 @@ class AlphaLoop:
                     "suggestion": "Check logs or retry.",
                 }
                 self.set_stage("Idle (cycle error)")
+                _CYCLES.labels(outcome="error").inc()
                 return
         else:
             self.set_stage("Market Simulation")
@@ -493,6 +715,7 @@ class AlphaLoop:
                 sim = MarketSimulator(default_instance.strategy)
                 stats = sim.run(steps=500)
                 mock_market = sim.generate_market_data()
+                reference_price = mock_market.get("mid_price")
                 self.active_orders = default_instance.calculate_target_orders(
                     mock_market
                 )
@@ -502,7 +725,7 @@ class AlphaLoop:
 
         # Data Ingestion & Analysis
         self.set_stage("Data: Analyzing Market")
-        self.data.ingest_data({"price": 1000}, [])
+        self._ingest_reference_price(reference_price)
         metrics = self.data.calculate_metrics()
 
         volatility = metrics.get("volatility", 0)
@@ -523,7 +746,8 @@ class AlphaLoop:
             extra={"extra_data": {"pnl": stats["realized_pnl"], "metrics": metrics}},
         )
 
-        # Quant Analysis & Proposal for each strategy instance
+        # Hand snapshots to the advisory worker; never wait on Quant/LLM analysis
+        # 将快照交给顾问工作线程；从不等待量化/LLM 分析
         for strategy_id, instance in self.strategy_instances.items():
             if not instance.running:
                 continue
@@ -552,79 +776,32 @@ class AlphaLoop:
                     "strategy_pnl": 0.0,
                     "funding_rate": 0.0,
                 }
-            proposal = self.quant.analyze_and_propose(
-                current_config, {**stats, **metrics, **strategy_metrics}
-            )
-
-            if not proposal:
-                logger.info(
-                    f"No changes proposed for strategy '{strategy_id}'. Skipping."
+            symbol = getattr(instance, "symbol", None)
+            if isinstance(symbol, str):
+                strategy_metrics["market_stats"] = market_stats.get(symbol)
+            self.advisor.submit(
+                CycleSnapshot(
+                    strategy_id=strategy_id,
+                    instance=instance,
+                    config=current_config,
+                    metrics={**stats, **metrics, **strategy_metrics},
                 )
-                continue
-
-            # Safely access proposal spread, handling Mock objects
-            # 安全访问 proposal spread，处理 Mock 对象
-            if isinstance(proposal, dict) and "spread" in proposal:
-                spread_value = proposal["spread"]
-                if isinstance(spread_value, (int, float)):
-                    spread_str = f"{spread_value:.2%}"
-                else:
-                    spread_str = "N/A"
-            else:
-                spread_str = "N/A"
-            logger.info(
-                f"Quant proposing spread {spread_str} for strategy '{strategy_id}'"
             )
 
-            # Safely unpack validate_proposal result / 安全解包 validate_proposal 结果
-            try:
-                validation_result = self.risk.validate_proposal(proposal)
-                if isinstance(validation_result, tuple) and len(validation_result) == 2:
-                    approved, reason = validation_result
-                else:
-                    # If not a tuple, assume approved / 如果不是元组，假设已批准
-                    approved = (
-                        bool(validation_result)
-                        if validation_result is not None
-                        else True
-                    )
-                    reason = None
-            except (TypeError, ValueError) as e:
-                logger.warning(f"Error validating proposal: {e}. Assuming approved.")
-                approved = True
-                reason = None
-
-            if approved:
-                logger.info(
-                    f"Applying new config for strategy '{strategy_id}'",
-                    extra={"extra_data": {"proposal": proposal}},
-                )
-                instance.strategy.spread = proposal["spread"]
-                instance.alert = None
-            else:
-                logger.warning(
-                    f"Proposal rejected for strategy '{strategy_id}': {reason}"
-                )
-
-                safe_defaults = instance.reset_to_safe_defaults()
-                logger.info(
-                    f"Auto-fallback to safe defaults for strategy '{strategy_id}'",
-                    extra={"extra_data": {"safe_defaults": safe_defaults}},
-                )
-
-                instance.alert = {
-                    "type": "warning",
-                    "message": f"Risk Rejection: {reason}",
-                    "suggestion": f"Auto-fallback to safe defaults (Spread: {safe_defaults['spread']*100:.2f}%).",
-                }
+        _CYCLES.labels(outcome="ok").inc()
 
     def run_continuous(self, cycles: int = 5) -> None:
         """Run multiple cycles continuously."""
-        for i in range(cycles):
-            logger.info(f"Iteration {i+1}")
-            self.run_cycle()
-            self.set_stage("Idle")
-            time.sleep(1)
+        started_advisor = self.advisor.start()
+        try:
+            for i in range(cycles):
+                logger.info(f"Iteration {i+1}")
+                self.run_cycle()
+                self.set_stage("Idle")
+                time.sleep(1)
+        finally:
+            if started_advisor:
+                self.advisor.stop(timeout=5.0)
 
 
 if __name__ == "__main__":
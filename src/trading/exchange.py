@@ -24,8 +24,11 @@ from ccxt import (
 )
 
 from src.shared.config import API_KEY, API_SECRET, LEVERAGE, SYMBOL
+from src.shared.latency import now
+from src.shared.logger import throttle_logger
 
-logger = logging.getLogger(__name__)
+# Throttled: repeated failures during outages are summarised, not repeated
+logger = throttle_logger(logging.getLogger(__name__))
 
 
 class BinanceClient:
@@ -187,6 +190,27 @@ class BinanceClient:
                 "minNotional": 5.0,
             }
 
+    @staticmethod
+    def _precision_steps(market):
+        """Tick and step size from a ccxt market's precision (None if unknown)."""
+        tick_size = None
+        step_size = None
+        if market and "precision" in market:
+            precision = market["precision"]
+            if "price" in precision:
+                price_precision = precision["price"]
+                if isinstance(price_precision, int) and price_precision > 0:
+                    tick_size = 10 ** (-price_precision)
+                elif isinstance(price_precision, float) and price_precision < 1:
+                    tick_size = price_precision
+            if "amount" in precision:
+                amount_precision = precision["amount"]
+                if isinstance(amount_precision, int) and amount_precision > 0:
+                    step_size = 10 ** (-amount_precision)
+                elif isinstance(amount_precision, float) and amount_precision < 1:
+                    step_size = amount_precision
+        return tick_size, step_size
+
     def fetch_market_data(self):
         """Fetches top 5 order book and calculates mid price."""
         try:
@@ -199,25 +223,7 @@ class BinanceClient:
             else:
                 mid_price = None
 
-            tick_size = None
-            step_size = None
-            if self.market:
-                if "precision" in self.market:
-                    precision = self.market["precision"]
-                    if "price" in precision:
-                        price_precision = precision["price"]
-                        if isinstance(price_precision, int) and price_precision > 0:
-                            tick_size = 10 ** (-price_precision)
-                        elif isinstance(price_precision, float) and price_precision < 1:
-                            tick_size = price_precision
-                    if "amount" in precision:
-                        amount_precision = precision["amount"]
-                        if isinstance(amount_precision, int) and amount_precision > 0:
-                            step_size = 10 ** (-amount_precision)
-                        elif (
-                            isinstance(amount_precision, float) and amount_precision < 1
-                        ):
-                            step_size = amount_precision
+            tick_size, step_size = self._precision_steps(self.market)
 
             return {
                 "best_bid": best_bid,
@@ -273,25 +279,35 @@ class BinanceClient:
             logger.error(f"Error fetching funding rate for {symbol}: {e}")
             return 0.0
 
+    def _markets_by_id(self, symbols):
+        """
+        Map exchange market ids to (requested symbol, market).
+
+        Symbols may be unified ("ETH/USDT:USDT") or exchange ids ("ETHUSDT").
+        """
+        if not self.exchange.markets:
+            self.exchange.load_markets()
+        markets = self.exchange.markets
+        by_id = {market["id"]: market for market in markets.values()}
+
+        result = {}
+        for symbol in symbols:
+            market = markets.get(symbol) or by_id.get(symbol)
+            if market is not None:
+                result[market["id"]] = (symbol, market)
+        return result
+
     def fetch_bulk_funding_rates(self, symbols):
         """Fetches funding rates for multiple symbols efficiently."""
         try:
             all_rates = self.exchange.fapiPublicGetPremiumIndex()
-
-            if not self.exchange.markets:
-                self.exchange.load_markets()
-
-            id_to_symbol = {
-                self.exchange.markets[sym]["id"]: sym
-                for sym in symbols
-                if sym in self.exchange.markets
-            }
+            markets_by_id = self._markets_by_id(symbols)
 
             result = {}
             for rate_info in all_rates:
                 market_id = rate_info.get("symbol")
-                if market_id in id_to_symbol:
-                    symbol = id_to_symbol[market_id]
+                if market_id in markets_by_id:
+                    symbol = markets_by_id[market_id][0]
                     predicted = rate_info.get("predictedFundingRate")
                     last = rate_info.get("lastFundingRate")
 
@@ -311,6 +327,64 @@ class BinanceClient:
             logger.error(f"Error fetching bulk funding rates: {e}")
             return {symbol: 0.0 for symbol in symbols}
 
+    def fetch_funding_rate_history(self, symbol, since=None, limit=1000):
+        """
+        Fetches settled funding rates since ``since`` (ms).
+
+        Returns:
+            List of (timestamp_ms, rate) tuples, oldest first
+        """
+        try:
+            records = self.exchange.fetch_funding_rate_history(
+                symbol, since=since, limit=limit
+            )
+            history = [
+                (int(r["timestamp"]), float(r["fundingRate"]))
+                for r in records
+                if r.get("timestamp") is not None and r.get("fundingRate") is not None
+            ]
+            history.sort()
+            return history
+        except Exception as e:
+            logger.error(f"Error fetching funding rate history for {symbol}: {e}")
+            return []
+
+    def fetch_bulk_market_data(self, symbols):
+        """
+        Fetches top of book for multiple symbols with one bookTicker call.
+
+        Returns a dict of symbol -> market data in the fetch_market_data
+        format, keyed as requested; symbols without a usable quote are omitted.
+        """
+        try:
+            tickers = self.exchange.fapiPublicGetTickerBookTicker()
+            markets_by_id = self._markets_by_id(symbols)
+
+            now_ms = time.time() * 1000
+            result = {}
+            for ticker in tickers:
+                match = markets_by_id.get(ticker.get("symbol"))
+                if match is None:
+                    continue
+                symbol, market = match
+                best_bid = float(ticker.get("bidPrice") or 0) or None
+                best_ask = float(ticker.get("askPrice") or 0) or None
+                if not (best_bid and best_ask):
+                    continue
+                tick_size, step_size = self._precision_steps(market)
+                result[symbol] = {
+                    "best_bid": best_bid,
+                    "best_ask": best_ask,
+                    "mid_price": (best_bid + best_ask) / 2,
+                    "timestamp": float(ticker.get("time") or now_ms),
+                    "tick_size": tick_size,
+                    "step_size": step_size,
+                }
+            return result
+        except Exception as e:
+            logger.error(f"Error fetching bulk market data: {e}")
+            return {}
+
     def fetch_ticker_stats(self):
         """Fetches 24h ticker statistics."""
         try:
@@ -427,6 +501,9 @@ class BinanceClient:
                     price=order["price"],
                     params={"timeInForce": "GTX"},
                 )
+                if isinstance(res, dict):
+                    # Monotonic ack time for tick-to-trade measurement
+                    res["ack_at"] = now()
                 created_orders.append(res)
                 logger.info(
                     f"Placed {order['side']} order at {order['price']} qty {qty}"
@@ -523,6 +600,47 @@ class BinanceClient:
             except Exception as e:
                 logger.error(f"Error canceling order {oid}: {e}", exc_info=True)
 
+    def amend_order(self, order_id, order):
+        """
+        Modifies a resting limit order in place (single PUT /fapi/v1/order).
+
+        Args:
+            order_id: Exchange order ID to modify
+            order: Target order dict with 'side', 'price', 'quantity'
+
+        Returns:
+            The amended order, or None if the amend was rejected (the caller
+            should fall back to cancel + place)
+        """
+        try:
+            qty = order["quantity"]
+            step_size = self.get_symbol_limits()["stepSize"]
+            if step_size:
+                qty = round(qty / step_size) * step_size
+            res = self.exchange.edit_order(
+                order_id,
+                self.symbol,
+                "limit",
+                order["side"],
+                qty,
+                order["price"],
+            )
+            if isinstance(res, dict):
+                res["ack_at"] = now()
+            logger.info(f"Amended order {order_id} to {order['price']} qty {qty}")
+            return res
+        except OrderNotFound as e:
+            logger.warning(f"Order {order_id} not found for amend: {e}")
+        except RateLimitExceeded as e:
+            logger.warning(f"Rate limit hit, skipping amend of {order_id}: {e}")
+        except NetworkError as e:
+            logger.error(f"Network error amending order {order_id}: {e}")
+        except ExchangeError as e:
+            logger.error(f"Exchange error amending order {order_id}: {e}")
+        except Exception as e:
+            logger.error(f"Error amending order {order_id}: {e}", exc_info=True)
+        return None
+
     def cancel_all_orders(self):
         """Cancels all open orders for the symbol."""
         try:
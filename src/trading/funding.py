@@ -0,0 +1,264 @@
+"""
+Funding Rate Module / 资金费率模块
+
+Per-symbol funding-rate history with trend, predicted next rate and
+annualized carry, kept in memory for strategies and the API.
+按交易对保存资金费率历史，并计算趋势、预测下期费率和年化收益，供策略和 API 从内存读取。
+
+Owner: Agent TRADING
+
+Settled rates are backfilled once per symbol and then fetched incrementally
+after each settlement; live (predicted) rates come from the refresh path and
+from throttled bulk calls. Histories are keyed by venue so Binance and
+Hyperliquid rates (8h vs 1h settlement) never mix.
+已结算费率每个交易对回填一次，之后在每次结算后增量获取；实时（预测）费率来自刷新路径和
+限频的批量调用。历史按交易所区分，避免混合不同结算周期的费率。
+"""
+
+import threading
+import time
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.shared.config import FUNDING_CONFIG
+from src.shared.logger import setup_logger
+from src.shared.market_stats import normalize_symbol
+from src.shared.ring_buffer import RingBuffer
+from src.trading.market_data import venue_key
+
+logger = setup_logger("Funding")
+
+# Settlement interval assumed until history shows otherwise (Binance: 8h)
+DEFAULT_INTERVAL_MS = 8 * 3600 * 1000
+DAY_MS = 86400 * 1000
+YEAR_MS = 365 * DAY_MS
+
+
+class FundingHistory:
+    """
+    Settled funding rates and the latest live rate for one symbol.
+    单个交易对的已结算资金费率和最新实时费率。
+    """
+
+    def __init__(self, capacity: int = FUNDING_CONFIG["history_size"]):
+        self.settled = RingBuffer(capacity, {"timestamp": np.int64, "rate": np.float64})
+        self.live_rate: Optional[float] = None
+        self.live_updated_at: Optional[float] = None
+        self.backfilled = False
+        self.next_sync_ms = 0
+
+    @property
+    def last_settled_ms(self) -> Optional[int]:
+        return int(self.settled[-1][0]) if len(self.settled) else None
+
+    def add_settled(self, records: Iterable[Tuple[int, float]]) -> int:
+        """
+        Append settled rates newer than the last one stored.
+        追加比已存储的最新记录更新的已结算费率。
+
+        Returns:
+            Number of records added
+        """
+        last = self.last_settled_ms
+        added = 0
+        for ts, rate in records:
+            if last is not None and ts <= last:
+                continue
+            self.settled.append(ts, rate)
+            last = ts
+            added += 1
+        return added
+
+    def set_live(self, rate: float, at: Optional[float] = None) -> None:
+        self.live_rate = float(rate)
+        self.live_updated_at = time.time() if at is None else at
+
+    def interval_ms(self) -> int:
+        """Settlement interval inferred from history / 从历史推断结算周期"""
+        if len(self.settled) < 2:
+            return DEFAULT_INTERVAL_MS
+        gaps = np.diff(self.settled.view("timestamp", last=24))
+        gaps = gaps[gaps > 0]
+        return int(np.median(gaps)) if gaps.size else DEFAULT_INTERVAL_MS
+
+    def _recent(self) -> np.ndarray:
+        """Recent settled rates plus the live rate / 最近已结算费率加实时费率"""
+        window = FUNDING_CONFIG["trend_window"]
+        rates = self.settled.view("rate", last=window)
+        if self.live_rate is not None:
+            rates = np.append(rates, self.live_rate)[-window:]
+        return rates
+
+    def _slope(self, rates: np.ndarray) -> float:
+        if rates.size < 2:
+            return 0.0
+        return float(np.polyfit(np.arange(rates.size), rates, 1)[0])
+
+    def trend(self) -> str:
+        """
+        "rising", "falling" or "stable" from the fitted change over the window.
+        根据窗口内拟合变化判断趋势。
+        """
+        rates = self._recent()
+        change = self._slope(rates) * max(rates.size - 1, 0)
+        threshold = FUNDING_CONFIG["trend_threshold"]
+        if change > threshold:
+            return "rising"
+        if change < -threshold:
+            return "falling"
+        return "stable"
+
+    def predicted_rate(self) -> Optional[float]:
+        """
+        Next settlement rate: the venue's live estimate when known, otherwise
+        a linear extrapolation of recent settled rates.
+        下期结算费率：优先使用交易所实时预测，否则对近期已结算费率线性外推。
+        """
+        if self.live_rate is not None:
+            return self.live_rate
+        rates = self._recent()
+        if rates.size == 0:
+            return None
+        return float(rates[-1] + self._slope(rates))
+
+    def snapshot(self) -> Dict:
+        """Current funding view / 当前资金费率视图"""
+        interval = self.interval_ms()
+        periods_per_day = DAY_MS / interval
+        current = self.live_rate
+        if current is None and len(self.settled):
+            current = float(self.settled[-1][1])
+
+        carry_rates = self.settled.view("rate", last=FUNDING_CONFIG["carry_window"])
+        if carry_rates.size:
+            mean_rate = float(carry_rates.mean())
+        else:
+            mean_rate = current
+        annualized_carry = (
+            mean_rate * YEAR_MS / interval if mean_rate is not None else None
+        )
+        last_settled = self.last_settled_ms
+
+        return {
+            "funding_rate": current,
+            "predicted_rate": self.predicted_rate(),
+            "trend": self.trend(),
+            "daily_yield": current * periods_per_day if current is not None else None,
+            "annualized_carry": annualized_carry,
+            "interval_hours": interval / 3_600_000,
+            "history_count": len(self.settled),
+            "last_settled_at": last_settled,
+            "next_settlement_at": last_settled + interval if last_settled else None,
+            "live_updated_at": self.live_updated_at,
+        }
+
+
+class FundingRateStore:
+    """
+    Funding histories for every (venue, symbol) seen.
+    所有（交易所, 交易对）的资金费率历史。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histories: Dict[Tuple[Hashable, str], FundingHistory] = {}
+        self._bulk_fetched_at: Dict[Tuple[Hashable, Tuple[str, ...]], float] = {}
+
+    def _history(self, client, symbol: str) -> FundingHistory:
+        key = (venue_key(client), normalize_symbol(symbol))
+        history = self._histories.get(key)
+        if history is None:
+            history = self._histories[key] = FundingHistory()
+        return history
+
+    def record_live(
+        self, client, symbol: str, rate, at: Optional[float] = None
+    ) -> None:
+        """Store a live funding rate / 存储实时资金费率"""
+        if not isinstance(rate, (int, float)):
+            return
+        with self._lock:
+            self._history(client, symbol).set_live(rate, at)
+
+    def refresh_live(
+        self,
+        client,
+        symbols: List[str],
+        max_age: float = FUNDING_CONFIG["live_ttl_seconds"],
+    ) -> bool:
+        """
+        Fetch live rates with one bulk call unless fetched within ``max_age``.
+        除非在 ``max_age`` 内已获取，否则通过一次批量调用获取实时费率。
+
+        Exchange errors propagate to the caller.
+
+        Returns:
+            True if the exchange was queried
+        """
+        key = (venue_key(client), tuple(sorted(symbols)))
+        now = time.time()
+        fetched_at = self._bulk_fetched_at.get(key)
+        if fetched_at is not None and now - fetched_at < max_age:
+            return False
+        rates = client.fetch_bulk_funding_rates(symbols)
+        with self._lock:
+            for symbol, rate in (rates or {}).items():
+                if isinstance(rate, (int, float)):
+                    self._history(client, symbol).set_live(rate, now)
+            self._bulk_fetched_at[key] = now
+        return True
+
+    def sync_history(self, client, symbol: str, now_ms: Optional[int] = None) -> int:
+        """
+        Backfill (first call) or incrementally fetch settled rates when a new
+        settlement is due.
+        首次回填或在新结算到期时增量获取已结算费率。
+
+        Returns:
+            Number of settled rates added
+        """
+        if not callable(getattr(type(client), "fetch_funding_rate_history", None)):
+            return 0
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        with self._lock:
+            history = self._history(client, symbol)
+            if now_ms < history.next_sync_ms:
+                return 0
+            last = history.last_settled_ms
+            if history.backfilled and last is not None:
+                since = last + 1
+            else:
+                since = now_ms - FUNDING_CONFIG["backfill_days"] * DAY_MS
+            # Claim the slot so concurrent callers do not fetch too
+            history.next_sync_ms = now_ms + int(FUNDING_CONFIG["retry_seconds"] * 1000)
+
+        try:
+            records = client.fetch_funding_rate_history(symbol, since=since)
+        except Exception as e:
+            logger.error(f"Funding history sync failed for {symbol}: {e}")
+            return 0
+
+        with self._lock:
+            added = history.add_settled(records or [])
+            history.backfilled = True
+            last = history.last_settled_ms
+            if last is not None and last + history.interval_ms() > now_ms:
+                history.next_sync_ms = last + history.interval_ms()
+        if added:
+            logger.info(f"Funding history for {symbol}: +{added} settled rates")
+        return added
+
+    def get(self, client, symbol: str) -> Dict:
+        """
+        Funding snapshot for a symbol (empty dict if never seen).
+        获取交易对的资金费率快照（未见过则返回空字典）。
+        """
+        key = (venue_key(client), normalize_symbol(symbol))
+        with self._lock:
+            history = self._histories.get(key)
+            return history.snapshot() if history else {}
+
+
+# Global funding rate store / 全局资金费率存储
+funding_store = FundingRateStore()
@@ -27,8 +27,11 @@ from src.shared.config import (
     LEVERAGE,
     SYMBOL,
 )
+from src.shared.latency import now
+from src.shared.logger import throttle_logger
 
-logger = logging.getLogger(__name__)
+# Throttled: repeated failures during outages are summarised, not repeated
+logger = throttle_logger(logging.getLogger(__name__))
 
 
 class AuthenticationError(Exception):
@@ -660,13 +663,28 @@ class HyperliquidClient:
 
     def fetch_market_data(self) -> Optional[Dict]:
         """Fetches top 5 order book and calculates mid price / 获取前 5 档订单簿并计算中间价"""
+        market_data = self._fetch_book(self.symbol)
+        if market_data is None:
+            return None
+        try:
+            market_data["funding_rate"] = self.fetch_funding_rate()
+        except Exception as e:
+            logger.error(f"Error fetching market data: {e}", exc_info=True)
+            return None
+        return market_data
+
+    def _fetch_book(self, symbol: str) -> Optional[Dict]:
+        """
+        Top of the l2Book for one symbol, without funding.
+        单个交易对的 l2Book 最优档位（不含资金费率）。
+        """
         try:
             # Convert symbol format (e.g., "ETH/USDT:USDT" -> "ETH")
             # 转换交易对格式（例如，"ETH/USDT:USDT" -> "ETH"）
             symbol_base = (
-                self.symbol.split("/")[0]
-                if "/" in self.symbol
-                else self.symbol.split(":")[0] if ":" in self.symbol else self.symbol
+                symbol.split("/")[0]
+                if "/" in symbol
+                else symbol.split(":")[0] if ":" in symbol else symbol
             )
 
             # Hyperliquid uses coin name without /USDT suffix
@@ -712,6 +730,17 @@ class HyperliquidClient:
                     if isinstance(levels, dict):
                         bids = levels.get("bids", [])
                         asks = levels.get("asks", [])
+                    elif (
+                        isinstance(levels, list)
+                        and len(levels) == 2
+                        and all(isinstance(side, list) for side in levels)
+                        and all(
+                            isinstance(level, dict) for side in levels for level in side
+                        )
+                    ):
+                        # Hyperliquid format: {"levels": [[bid, ...], [ask, ...]]}
+                        # Hyperliquid 格式: {"levels": [[买档, ...], [卖档, ...]]}
+                        bids, asks = levels
                     else:
                         # Format 2: {"levels": [[price, size], ...]} - single array
                         # 格式 2: {"levels": [[价格, 数量], ...]} - 单个数组
@@ -866,10 +895,6 @@ class HyperliquidClient:
                     )
                     return None
 
-            # Fetch funding rate
-            # 获取资金费率
-            funding_rate = self.fetch_funding_rate()
-
             # Return market data
             # 返回市场数据
             return {
@@ -877,7 +902,6 @@ class HyperliquidClient:
                 "best_ask": best_ask,
                 "mid_price": mid_price,
                 "timestamp": int(time.time() * 1000),
-                "funding_rate": funding_rate,
                 "tick_size": None,  # Will be populated from symbol limits if needed
                 "step_size": None,  # Will be populated from symbol limits if needed
             }
@@ -956,34 +980,127 @@ class HyperliquidClient:
             logger.error(f"Error fetching multiple prices: {e}")
             return {symbol: None for symbol in symbols}
 
+    def fetch_bulk_market_data(self, symbols: List[str]) -> Dict[str, Dict]:
+        """
+        Fetch market data for multiple symbols with one funding call.
+        通过一次资金费率调用获取多个交易对的市场数据。
+
+        Hyperliquid has no bulk book endpoint and allMids carries no
+        bid/ask, which the strategies' post-only guard and the spread stats
+        need. Each symbol's l2Book is therefore still read, but funding comes
+        from one metaAndAssetCtxs call instead of one per symbol. Symbols
+        without a book or mid are omitted.
+        Hyperliquid 没有批量订单簿端点，allMids 也不含买卖价，因此仍逐个读取 l2Book，
+        但资金费率只需一次 metaAndAssetCtxs 调用。无订单簿或中间价的交易对会被省略。
+
+        Args:
+            symbols: List of trading symbols (e.g., ["ETH/USDT:USDT", "BTC/USDT:USDT"])
+
+        Returns:
+            Dictionary mapping symbol to market data (fetch_market_data format)
+        """
+        funding_rates = self.fetch_bulk_funding_rates(symbols)
+        result = {}
+        for symbol in dict.fromkeys(symbols):
+            market_data = self._fetch_book(symbol)
+            if market_data is None:
+                continue
+            market_data["funding_rate"] = funding_rates.get(symbol, 0.0)
+            result[symbol] = market_data
+        return result
+
+    @staticmethod
+    def _coin_for(symbol: str) -> str:
+        """Hyperliquid coin name for a symbol, e.g. "ETH/USDT:USDT" -> "ETH" """
+        symbol_base = (
+            symbol.split("/")[0]
+            if "/" in symbol
+            else symbol.split(":")[0] if ":" in symbol else symbol
+        )
+        return symbol_base.replace("USDT", "").replace("/", "").replace(":", "").upper()
+
     def fetch_funding_rate(self) -> float:
         """Fetches the funding rate signal for the symbol / 获取交易对的资金费率信号"""
-        try:
-            # Placeholder implementation
-            # In a full implementation, we'd fetch from Hyperliquid API
-            return 0.0
-        except Exception as e:
-            logger.error(f"Error fetching funding rate: {e}")
-            return 0.0
+        return self.fetch_funding_rate_for_symbol(self.symbol)
 
     def fetch_funding_rate_for_symbol(self, symbol: str) -> float:
         """Fetches the funding rate for a specific symbol / 获取特定交易对的资金费率"""
-        try:
-            # Placeholder implementation
-            return 0.0
-        except Exception as e:
-            logger.error(f"Error fetching funding rate for {symbol}: {e}")
-            return 0.0
+        return self.fetch_bulk_funding_rates([symbol]).get(symbol, 0.0)
 
     def fetch_bulk_funding_rates(self, symbols: List[str]) -> Dict[str, float]:
-        """Fetches funding rates for multiple symbols efficiently / 高效获取多个交易对的资金费率"""
+        """
+        Fetches current funding rates for multiple symbols with one
+        metaAndAssetCtxs call / 通过一次 metaAndAssetCtxs 调用获取多个交易对的当前资金费率
+        """
         try:
-            # Placeholder implementation
-            return {symbol: 0.0 for symbol in symbols}
+            response = self._make_request(
+                method="POST",
+                endpoint="/info",
+                data={"type": "metaAndAssetCtxs"},
+                public=True,
+            )
+            # Format: [{"universe": [{"name": "ETH", ...}, ...]}, [{"funding": "0.0000125", ...}, ...]]
+            if not isinstance(response, list) or len(response) < 2:
+                logger.warning(
+                    "Unexpected metaAndAssetCtxs response format / 意外的 metaAndAssetCtxs 响应格式"
+                )
+                return {symbol: 0.0 for symbol in symbols}
+
+            universe = (
+                response[0].get("universe", []) if isinstance(response[0], dict) else []
+            )
+            contexts = response[1] if isinstance(response[1], list) else []
+            funding_by_coin = {}
+            for asset, ctx in zip(universe, contexts):
+                try:
+                    funding_by_coin[asset["name"].upper()] = float(ctx["funding"])
+                except (KeyError, TypeError, ValueError, AttributeError):
+                    continue
+
+            return {
+                symbol: funding_by_coin.get(self._coin_for(symbol), 0.0)
+                for symbol in symbols
+            }
         except Exception as e:
             logger.error(f"Error fetching bulk funding rates: {e}")
             return {symbol: 0.0 for symbol in symbols}
 
+    def fetch_funding_rate_history(
+        self, symbol: str, since: Optional[int] = None
+    ) -> List[tuple]:
+        """
+        Fetches settled funding rates since ``since`` (ms) / 获取自 ``since``（毫秒）以来的已结算资金费率
+
+        Returns:
+            List of (timestamp_ms, rate) tuples, oldest first
+        """
+        try:
+            if since is None:
+                since = int((time.time() - 7 * 86400) * 1000)
+            response = self._make_request(
+                method="POST",
+                endpoint="/info",
+                data={
+                    "type": "fundingHistory",
+                    "coin": self._coin_for(symbol),
+                    "startTime": int(since),
+                },
+                public=True,
+            )
+            if not isinstance(response, list):
+                return []
+            history = []
+            for item in response:
+                try:
+                    history.append((int(item["time"]), float(item["fundingRate"])))
+                except (KeyError, TypeError, ValueError):
+                    continue
+            history.sort()
+            return history
+        except Exception as e:
+            logger.error(f"Error fetching funding rate history for {symbol}: {e}")
+            return []
+
     def fetch_ticker_stats(self) -> Optional[Dict]:
         """Fetches 24h ticker statistics / 获取 24 小时行情统计"""
         try:
@@ -1528,6 +1645,8 @@ class HyperliquidClient:
                 # Parse response
                 order_result = self._parse_order_response(response, order)
                 if order_result:
+                    # Monotonic ack time for tick-to-trade measurement
+                    order_result["ack_at"] = now()
                     created_orders.append(order_result)
                     order_type = order.get("type", "limit").lower()
                     side = order.get("side", "").lower()
@@ -1661,6 +1780,79 @@ class HyperliquidClient:
                 logger.error(error_msg, exc_info=True)
                 raise
 
+    def amend_order(self, order_id: str, order: Dict) -> Optional[Dict]:
+        """
+        Modifies a resting order in place / 原地修改挂单
+
+        Sends a single ``modify`` action so the order keeps its ID.
+        发送单个 ``modify`` 操作，订单 ID 保持不变。
+
+        Args:
+            order_id: Exchange order ID to modify
+            order: Target order dict with side, price, quantity
+
+        Returns:
+            Amended order dictionary, or None if the amend was rejected
+            (caller should fall back to cancel + place)
+        """
+        validation_error = self._validate_order(order)
+        if not order_id or validation_error:
+            logger.error(
+                f"Invalid amend for order {order_id}: {validation_error}. "
+                f"订单 {order_id} 的修改无效: {validation_error}。"
+            )
+            return None
+
+        order_payload = self._build_order_payload(order)
+        modify_payload = {
+            "action": {
+                "type": "modify",
+                "oid": int(order_id) if str(order_id).isdigit() else order_id,
+                "order": order_payload["action"]["orders"][0],
+            },
+            "nonce": order_payload["nonce"],
+            "vaultAddress": None,
+        }
+
+        try:
+            response = self._make_request(
+                method="POST",
+                endpoint="/exchange",
+                data=modify_payload,
+                public=False,
+            )
+        except Exception as e:
+            logger.error(
+                f"Error amending order {order_id}: {e}. 修改订单 {order_id} 时出错: {e}。",
+                exc_info=True,
+            )
+            return None
+
+        if not response or response.get("status") != "ok":
+            error_text = (response or {}).get("response", response)
+            logger.error(
+                f"Failed to amend order {order_id}: {error_text}. "
+                f"修改订单 {order_id} 失败: {error_text}。"
+            )
+            return None
+
+        logger.info(
+            f"Amended order {order_id} to price={order.get('price')}, "
+            f"qty={order.get('quantity')}"
+        )
+        return {
+            "id": str(order_id),
+            "order_id": str(order_id),
+            "symbol": self.symbol,
+            "side": order.get("side", "").lower(),
+            "type": "limit",
+            "price": order.get("price"),
+            "quantity": order.get("quantity"),
+            "status": "open",
+            "timestamp": int(time.time() * 1000),
+            "ack_at": now(),
+        }
+
     def cancel_all_orders(self) -> None:
         """Cancels all open orders for the symbol / 取消交易对的所有未成交订单"""
         try:
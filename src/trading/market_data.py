@@ -0,0 +1,166 @@
+"""
+Market Data Planner Module / 市场数据规划模块
+
+Plans each cycle's public market data fetches across all active strategy
+instances, folding per-symbol calls into the venues' bulk endpoints.
+为每个周期规划所有活跃策略实例的公共行情获取，将逐交易对调用合并到交易所的批量端点。
+
+Owner: Agent TRADING
+
+Instances are grouped by venue (client class and testnet flag). For each
+group one client issues a bulk quote call (Binance bookTicker; Hyperliquid
+reads each l2Book but funding once) and, when quotes carry no funding, one
+bulk funding call (Binance premiumIndex). Results are primed on each instance
+so ``refresh_data`` only fetches private account data. Quotes must carry the
+same fields as ``fetch_market_data``, since strategies rely on the book.
+实例按交易所分组；每组一次批量报价调用，必要时再一次批量资金费率调用。
+结果预置到各实例上，``refresh_data`` 只需获取私有账户数据。
+
+The planner is also the only writer of the rolling market stats: each
+symbol's quote is fed exactly once per cycle, from the bulk fetch or, for
+instances refreshed per symbol, via ``observe``.
+规划器也是滚动市场统计的唯一写入者：每个交易对每周期只输入一次。
+"""
+
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from src.shared.config import MARKET_DATA_BULK_MIN_SYMBOLS
+from src.shared.latency import now
+from src.shared.logger import setup_logger
+from src.shared.market_stats import MarketStatsEngine, market_stats, normalize_symbol
+
+logger = setup_logger("MarketDataPlanner")
+
+
+def venue_key(client) -> Hashable:
+    """
+    Key identifying the venue a client talks to (class and testnet flag).
+    标识客户端所连接交易所的键（类和测试网标志）。
+    """
+    return type(client), getattr(client, "testnet", None)
+
+
+class FetchBatch:
+    """
+    Instances on one venue whose public data is fetched together.
+    同一交易所上一起获取公共数据的实例。
+    """
+
+    __slots__ = ("client", "instances")
+
+    def __init__(self, client):
+        self.client = client
+        self.instances: List = []
+
+    @property
+    def symbols(self) -> List[str]:
+        """Distinct symbols in first-seen order / 按首次出现顺序的去重交易对"""
+        return list(dict.fromkeys(instance.symbol for instance in self.instances))
+
+
+class MarketDataPlanner:
+    """
+    Batches public market data fetches for a set of strategy instances.
+    为一组策略实例批量获取公共市场数据。
+    """
+
+    def __init__(
+        self,
+        min_symbols: int = MARKET_DATA_BULK_MIN_SYMBOLS,
+        stats: Optional[MarketStatsEngine] = None,
+    ):
+        """
+        Args:
+            min_symbols: Distinct symbols on a venue before bulk endpoints are used
+            stats: Market stats fed once per symbol per cycle (default: shared)
+        """
+        self.min_symbols = min_symbols
+        self.stats = market_stats if stats is None else stats
+        # Symbols already fed to the stats this cycle
+        self._observed: Set[str] = set()
+
+    def observe(self, symbol: str, market_data: Dict) -> Dict[str, Optional[float]]:
+        """
+        Feed a symbol's quote to the market stats once per cycle.
+        每周期将交易对行情输入市场统计一次。
+
+        Returns:
+            The symbol's current stats snapshot
+        """
+        key = normalize_symbol(symbol)
+        if key not in self._observed:
+            self._observed.add(key)
+            self.stats.update(symbol, market_data)
+        return self.stats.get(symbol)
+
+    def plan(self, instances: Iterable) -> List[FetchBatch]:
+        """
+        Group instances into bulk fetch batches.
+        将实例分组为批量获取批次。
+
+        Instances whose client has no bulk endpoint, and venues with fewer
+        than ``min_symbols`` symbols, are left to per-symbol refresh.
+        """
+        batches: Dict[Hashable, FetchBatch] = {}
+        for instance in instances:
+            client = getattr(instance, "exchange", None)
+            if client is None or not isinstance(getattr(instance, "symbol", None), str):
+                continue
+            if not callable(getattr(type(client), "fetch_bulk_market_data", None)):
+                continue
+            venue = venue_key(client)
+            batch = batches.get(venue)
+            if batch is None:
+                batch = batches[venue] = FetchBatch(client)
+            batch.instances.append(instance)
+        return [b for b in batches.values() if len(b.symbols) >= self.min_symbols]
+
+    def _fetch(self, batch: FetchBatch) -> Dict[str, Tuple[Dict, float]]:
+        symbols = batch.symbols
+        market_data = batch.client.fetch_bulk_market_data(symbols)
+        if not isinstance(market_data, dict):
+            return {}
+        if all("funding_rate" in data for data in market_data.values()):
+            funding_rates = {
+                symbol: data["funding_rate"] for symbol, data in market_data.items()
+            }
+        else:
+            funding_rates = batch.client.fetch_bulk_funding_rates(symbols)
+            if not isinstance(funding_rates, dict):
+                funding_rates = {}
+        return {
+            symbol: (data, funding_rates.get(symbol, 0.0))
+            for symbol, data in market_data.items()
+            if isinstance(data, dict) and data.get("mid_price")
+        }
+
+    def refresh(self, instances: Iterable) -> int:
+        """
+        Fetch public data in bulk and prime each covered instance.
+        批量获取公共数据并预置到对应实例。
+
+        Starts a new cycle for ``observe``.
+
+        Returns:
+            Number of instances primed; the rest refresh per symbol
+        """
+        self._observed = set()
+        primed = 0
+        for batch in self.plan(instances):
+            try:
+                quotes = self._fetch(batch)
+            except Exception as e:
+                logger.error(f"Bulk market data fetch failed: {e}")
+                continue
+            received_at = now()
+            for symbol, (market_data, _) in quotes.items():
+                self.observe(symbol, market_data)
+            for instance in batch.instances:
+                quote = quotes.get(instance.symbol)
+                if quote is None:
+                    continue
+                market_data, funding_rate = quote
+                # Each instance gets its own copy (refresh_data annotates it)
+                instance.prime_market_data(dict(market_data), funding_rate, received_at)
+                primed += 1
+        return primed
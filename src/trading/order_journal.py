@@ -0,0 +1,397 @@
+"""
+Order Journal Module / 订单日志模块
+
+Append-only, indexed journal of order lifecycle events and errors backed by SQLite.
+基于 SQLite 的订单生命周期事件和错误的追加式索引日志。
+
+Owner: Agent TRADING
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS order_events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    order_id TEXT,
+    event TEXT NOT NULL,
+    status TEXT,
+    timestamp REAL NOT NULL,
+    payload TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_order_events_order_id ON order_events(order_id);
+
+CREATE TABLE IF NOT EXISTS orders (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    order_id TEXT NOT NULL,
+    symbol TEXT,
+    side TEXT,
+    price REAL,
+    quantity REAL,
+    status TEXT,
+    strategy_id TEXT,
+    strategy_type TEXT,
+    timestamp REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_orders_order_id ON orders(order_id);
+CREATE INDEX IF NOT EXISTS idx_orders_strategy ON orders(strategy_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_orders_symbol ON orders(symbol, timestamp);
+CREATE INDEX IF NOT EXISTS idx_orders_timestamp ON orders(timestamp);
+
+CREATE TABLE IF NOT EXISTS errors (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp REAL NOT NULL,
+    symbol TEXT,
+    type TEXT,
+    message TEXT,
+    details TEXT,
+    strategy_id TEXT,
+    strategy_type TEXT,
+    trace_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_errors_timestamp ON errors(timestamp);
+CREATE INDEX IF NOT EXISTS idx_errors_symbol ON errors(symbol, timestamp);
+CREATE INDEX IF NOT EXISTS idx_errors_strategy ON errors(strategy_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_errors_type ON errors(type, timestamp);
+"""
+
+_ORDER_COLUMNS = (
+    "order_id, symbol, side, price, quantity, status, "
+    "strategy_id, strategy_type, timestamp"
+)
+# Stored for orders placed without an exchange ID. Such rows cannot be
+# addressed individually, so updates by this ID are skipped
+UNKNOWN_ORDER_ID = "unknown"
+_ERROR_COLUMNS = (
+    "timestamp, symbol, type, message, details, " "strategy_id, strategy_type, trace_id"
+)
+
+
+class OrderJournal:
+    """
+    Persistent journal of order lifecycle events and errors.
+    订单生命周期事件和错误的持久化日志。
+
+    Every lifecycle event is appended to ``order_events``; the ``orders``
+    table holds the latest state per order and is updated in place by ID.
+    Writes never raise into the caller: a failing write is logged and dropped
+    so the trading cycle is not interrupted.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        Open (or create) the journal database.
+
+        Args:
+            path: SQLite file path, or ":memory:" for a non-persistent journal
+        """
+        self.path = path
+        if path != ":memory:":
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def record_order(self, order: Dict[str, Any]) -> None:
+        """
+        Journal a newly placed order.
+
+        Args:
+            order: Order record with id, symbol, side, price, quantity, status,
+                   timestamp, strategy_id and strategy_type
+        """
+        now = time.time()
+        order_id = str(order.get("id") or UNKNOWN_ORDER_ID)
+        timestamp = order.get("timestamp") or now
+        status = order.get("status", "placed")
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT INTO order_events (order_id, event, status, timestamp, payload) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (order_id, "placed", status, timestamp, _dumps(order)),
+                )
+                self._conn.execute(
+                    f"INSERT INTO orders ({_ORDER_COLUMNS}, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        order_id,
+                        order.get("symbol"),
+                        order.get("side"),
+                        order.get("price"),
+                        order.get("quantity"),
+                        status,
+                        order.get("strategy_id"),
+                        order.get("strategy_type"),
+                        timestamp,
+                        now,
+                    ),
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Failed to journal order {order_id}: {e}")
+
+    def update_status(self, order_id: str, status: str) -> None:
+        """
+        Record a status transition for an order (indexed update by order ID).
+
+        Args:
+            order_id: Exchange order ID
+            status: New status (e.g. "cancelled", "filled")
+        """
+        if _unaddressable(order_id):
+            logger.warning(
+                f"Skipping status {status!r} for order without an exchange ID"
+            )
+            return
+        now = time.time()
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT INTO order_events (order_id, event, status, timestamp) "
+                    "VALUES (?, ?, ?, ?)",
+                    (order_id, "status", status, now),
+                )
+                self._conn.execute(
+                    "UPDATE orders SET status = ?, updated_at = ? WHERE order_id = ?",
+                    (status, now, order_id),
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Failed to journal status for order {order_id}: {e}")
+
+    def record_amend(
+        self, order_id: str, price: Optional[float], quantity: Optional[float]
+    ) -> None:
+        """
+        Record an in-place modification of an order's price and size.
+
+        Args:
+            order_id: Exchange order ID
+            price: New limit price
+            quantity: New size
+        """
+        if _unaddressable(order_id):
+            logger.warning("Skipping amend for order without an exchange ID")
+            return
+        now = time.time()
+        payload = {"price": price, "quantity": quantity}
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT INTO order_events (order_id, event, status, timestamp, payload) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (order_id, "amended", None, now, _dumps(payload)),
+                )
+                self._conn.execute(
+                    "UPDATE orders SET price = ?, quantity = ?, updated_at = ? "
+                    "WHERE order_id = ?",
+                    (price, quantity, now, order_id),
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Failed to journal amend for order {order_id}: {e}")
+
+    def record_error(self, error: Dict[str, Any]) -> None:
+        """
+        Journal an error record.
+
+        Args:
+            error: Error record as appended to ``error_history``
+        """
+        details = error.get("details")
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    f"INSERT INTO errors ({_ERROR_COLUMNS}) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        error.get("timestamp") or time.time(),
+                        error.get("symbol"),
+                        error.get("type"),
+                        error.get("message"),
+                        _dumps(details) if details is not None else None,
+                        error.get("strategy_id"),
+                        error.get("strategy_type"),
+                        error.get("trace_id"),
+                    ),
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Failed to journal error record: {e}")
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def get_order(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """Get the latest journaled state of an order, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_ORDER_COLUMNS} FROM orders WHERE order_id = ? "
+                "ORDER BY seq DESC LIMIT 1",
+                (order_id,),
+            ).fetchone()
+        return _order_row_to_dict(row) if row else None
+
+    def query_orders(
+        self,
+        symbol: Optional[str] = None,
+        status: Optional[str] = None,
+        strategy_id: Optional[str] = None,
+        strategy_type: Optional[str] = None,
+        from_time: Optional[float] = None,
+        to_time: Optional[float] = None,
+        limit: int = 200,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Query orders, newest first, with optional filters and pagination.
+
+        Returns:
+            List of order dicts in the same shape as ``order_history`` entries
+        """
+        where, params = _build_filters(
+            {
+                "symbol": symbol,
+                "status": status,
+                "strategy_id": strategy_id,
+                "strategy_type": strategy_type,
+            },
+            from_time,
+            to_time,
+        )
+        sql = (
+            f"SELECT {_ORDER_COLUMNS} FROM orders{where} "
+            "ORDER BY timestamp DESC, seq DESC LIMIT ? OFFSET ?"
+        )
+        with self._lock:
+            rows = self._conn.execute(sql, (*params, limit, offset)).fetchall()
+        return [_order_row_to_dict(row) for row in rows]
+
+    def query_errors(
+        self,
+        symbol: Optional[str] = None,
+        error_type: Optional[str] = None,
+        strategy_id: Optional[str] = None,
+        strategy_type: Optional[str] = None,
+        from_time: Optional[float] = None,
+        to_time: Optional[float] = None,
+        limit: int = 200,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Query errors, newest first, with optional filters and pagination.
+
+        Returns:
+            List of error dicts in the same shape as ``error_history`` entries
+        """
+        where, params = _build_filters(
+            {
+                "symbol": symbol,
+                "type": error_type,
+                "strategy_id": strategy_id,
+                "strategy_type": strategy_type,
+            },
+            from_time,
+            to_time,
+        )
+        sql = (
+            f"SELECT {_ERROR_COLUMNS} FROM errors{where} "
+            "ORDER BY timestamp DESC, seq DESC LIMIT ? OFFSET ?"
+        )
+        with self._lock:
+            rows = self._conn.execute(sql, (*params, limit, offset)).fetchall()
+        return [_error_row_to_dict(row) for row in rows]
+
+    def get_order_events(self, order_id: str) -> List[Dict[str, Any]]:
+        """Get the full lifecycle of an order, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT event, status, timestamp FROM order_events "
+                "WHERE order_id = ? ORDER BY seq",
+                (order_id,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+
+def _unaddressable(order_id: Optional[str]) -> bool:
+    """True if an update by this ID would hit every order stored without an ID."""
+    return not order_id or str(order_id) == UNKNOWN_ORDER_ID
+
+
+def _dumps(value: Any) -> str:
+    """Serialize a payload for storage, tolerating non-JSON values."""
+    return json.dumps(value, default=str)
+
+
+def _build_filters(equals: Dict[str, Any], from_time, to_time):
+    """Build a WHERE clause from equality filters and a time range."""
+    clauses = []
+    params: List[Any] = []
+    for column, value in equals.items():
+        if value:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if from_time:
+        clauses.append("timestamp >= ?")
+        params.append(from_time)
+    if to_time:
+        clauses.append("timestamp <= ?")
+        params.append(to_time)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    return where, params
+
+
+def _order_row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        "id": row["order_id"],
+        "symbol": row["symbol"],
+        "side": row["side"],
+        "price": row["price"],
+        "quantity": row["quantity"],
+        "status": row["status"],
+        "timestamp": row["timestamp"],
+        "strategy_id": row["strategy_id"],
+        "strategy_type": row["strategy_type"],
+    }
+
+
+def _error_row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+    details = row["details"]
+    if details is not None:
+        try:
+            details = json.loads(details)
+        except ValueError:
+            pass
+    return {
+        "timestamp": row["timestamp"],
+        "symbol": row["symbol"],
+        "type": row["type"],
+        "message": row["message"],
+        "details": details,
+        "strategy_id": row["strategy_id"],
+        "strategy_type": row["strategy_type"],
+        "trace_id": row["trace_id"],
+    }
@@ -8,16 +8,66 @@ Owner: Agent TRADING
 """
 
 import logging
-from typing import Any, Dict, List, Tuple
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Default price increment when the market tick size is unknown (ETHUSDT)
+DEFAULT_TICK_SIZE = 0.01
+
+
+@dataclass
+class OrderDiff:
+    """
+    Result of diffing current orders against a target ladder.
+    当前订单与目标订单阶梯的差异结果。
+
+    ``replace`` and ``amend`` pair a resting order with the target level it
+    should move to. Amends are small enough moves to modify the order in
+    place; replaces (and amends, for callers without an amend path) are
+    executed as cancel + place.
+    """
+
+    keep: List[Dict[str, Any]] = field(default_factory=list)
+    cancel: List[str] = field(default_factory=list)
+    place: List[Dict[str, Any]] = field(default_factory=list)
+    replace: List[Tuple[Dict[str, Any], Dict[str, Any]]] = field(default_factory=list)
+    amend: List[Tuple[Dict[str, Any], Dict[str, Any]]] = field(default_factory=list)
+
 
 class OrderManager:
     """Manages order synchronization."""
 
+    def __init__(
+        self,
+        tick_size: float = DEFAULT_TICK_SIZE,
+        tolerance_ticks: float = 1.0,
+        size_tolerance: Optional[float] = None,
+        amend_max_price_pct: float = 0.01,
+        amend_max_size_pct: float = 0.5,
+    ):
+        """
+        Args:
+            tick_size: Default price tick, used when sync is not given one
+            tolerance_ticks: Orders within this many ticks of a target are kept
+            size_tolerance: Relative size change that forces a modification;
+                            None ignores size (exchange-side quantity rounding
+                            would otherwise cause churn)
+            amend_max_price_pct: Largest relative price move done as an amend
+            amend_max_size_pct: Largest relative size change done as an amend
+        """
+        self.tick_size = tick_size
+        self.tolerance_ticks = tolerance_ticks
+        self.size_tolerance = size_tolerance
+        self.amend_max_price_pct = amend_max_price_pct
+        self.amend_max_size_pct = amend_max_size_pct
+
     def sync_orders(
-        self, current_orders: List[Dict[str, Any]], target_orders: List[Dict[str, Any]]
+        self,
+        current_orders: List[Dict[str, Any]],
+        target_orders: List[Dict[str, Any]],
+        tick_size: Optional[float] = None,
     ) -> Tuple[List[str], List[Dict[str, Any]]]:
         """
         Compares current and target orders to determine actions.
@@ -25,43 +75,131 @@ class OrderManager:
         Args:
             current_orders: List of current open orders
             target_orders: List of target orders to achieve
+            tick_size: Market price tick (defaults to the manager's tick_size)
 
         Returns:
             Tuple of (order_ids_to_cancel, orders_to_place)
         """
-        to_cancel = []
-        to_place = []
-
-        # Helper to group by side
-        curr_buy = next((o for o in current_orders if o["side"] == "buy"), None)
-        curr_sell = next((o for o in current_orders if o["side"] == "sell"), None)
-
-        tgt_buy = next((o for o in target_orders if o["side"] == "buy"), None)
-        tgt_sell = next((o for o in target_orders if o["side"] == "sell"), None)
-
-        # Compare Buy
-        if tgt_buy:
-            if curr_buy:
-                # Check if price changed significantly (> 0.01 tolerance)
-                if abs(curr_buy["price"] - tgt_buy["price"]) > 0.01:
-                    to_cancel.append(curr_buy["id"])
-                    to_place.append(tgt_buy)
-            else:
-                to_place.append(tgt_buy)
-        else:
-            if curr_buy:
-                to_cancel.append(curr_buy["id"])
-
-        # Compare Sell
-        if tgt_sell:
-            if curr_sell:
-                if abs(curr_sell["price"] - tgt_sell["price"]) > 0.01:
-                    to_cancel.append(curr_sell["id"])
-                    to_place.append(tgt_sell)
+        diff = self.diff_orders(current_orders, target_orders, tick_size)
+        to_cancel = list(diff.cancel)
+        to_place = list(diff.place)
+        for current, target in diff.replace + diff.amend:
+            to_cancel.append(current["id"])
+            to_place.append(target)
+        return to_cancel, to_place
+
+    def diff_orders(
+        self,
+        current_orders: List[Dict[str, Any]],
+        target_orders: List[Dict[str, Any]],
+        tick_size: Optional[float] = None,
+    ) -> OrderDiff:
+        """
+        Diff N-level ladders per side by price level.
+
+        Each side is sorted from the touch outward and merged in one pass, so
+        the cost is O(n log n). Levels within tolerance are kept to preserve
+        queue priority; leftover resting orders are paired with leftover
+        targets before anything is cancelled or placed. Pairs that move
+        within the amend bounds are emitted as ``amend``, others as
+        ``replace``.
+
+        Args:
+            current_orders: List of current open orders
+            target_orders: List of target orders to achieve
+            tick_size: Market price tick (defaults to the manager's tick_size)
+
+        Returns:
+            OrderDiff describing keep/cancel/place/replace actions
+        """
+        tick = tick_size if tick_size and tick_size > 0 else self.tick_size
+        # Small epsilon so float noise on an exact boundary is not a change
+        tolerance = tick * self.tolerance_ticks + tick * 1e-6
+
+        diff = OrderDiff()
+        for side in ("buy", "sell"):
+            self._diff_side(
+                [o for o in current_orders if o.get("side") == side],
+                [o for o in target_orders if o.get("side") == side],
+                side,
+                tolerance,
+                diff,
+            )
+        return diff
+
+    def _diff_side(
+        self,
+        current: List[Dict[str, Any]],
+        target: List[Dict[str, Any]],
+        side: str,
+        tolerance: float,
+        diff: OrderDiff,
+    ) -> None:
+        """Merge one side of the book into ``diff``."""
+        # Sort key grows away from the touch: bids descending, asks ascending
+        sign = -1.0 if side == "buy" else 1.0
+        current = sorted(current, key=lambda o: sign * o["price"])
+        target = sorted(target, key=lambda o: sign * o["price"])
+
+        stale: List[Dict[str, Any]] = []
+        missing: List[Dict[str, Any]] = []
+        i = j = 0
+        while i < len(current) and j < len(target):
+            curr, tgt = current[i], target[j]
+            gap = sign * (curr["price"] - tgt["price"])
+            if abs(gap) <= tolerance:
+                if self._size_changed(curr, tgt):
+                    self._add_pair(curr, tgt, diff)
+                else:
+                    diff.keep.append(curr)
+                i += 1
+                j += 1
+            elif gap < 0:
+                # Resting order sits at a level the target ladder no longer has
+                stale.append(curr)
+                i += 1
             else:
-                to_place.append(tgt_sell)
+                missing.append(tgt)
+                j += 1
+        stale.extend(current[i:])
+        missing.extend(target[j:])
+
+        paired = min(len(stale), len(missing))
+        for curr, tgt in zip(stale[:paired], missing[:paired]):
+            self._add_pair(curr, tgt, diff)
+        diff.cancel.extend(o["id"] for o in stale[paired:])
+        diff.place.extend(missing[paired:])
+
+    def _add_pair(
+        self, current: Dict[str, Any], target: Dict[str, Any], diff: OrderDiff
+    ) -> None:
+        """Classify a resting order / target pair as amend or replace."""
+        if self._within_amend_bounds(current, target):
+            diff.amend.append((current, target))
         else:
-            if curr_sell:
-                to_cancel.append(curr_sell["id"])
+            diff.replace.append((current, target))
 
-        return to_cancel, to_place
+    def _within_amend_bounds(
+        self, current: Dict[str, Any], target: Dict[str, Any]
+    ) -> bool:
+        """Check whether a move is small enough to modify in place."""
+        if not current.get("id") or not target.get("price"):
+            return False
+        price_move = abs(current["price"] - target["price"]) / target["price"]
+        if price_move > self.amend_max_price_pct:
+            return False
+        curr_qty = current.get("quantity", current.get("amount"))
+        tgt_qty = target.get("quantity", target.get("amount"))
+        if curr_qty and tgt_qty:
+            return abs(curr_qty - tgt_qty) <= self.amend_max_size_pct * abs(tgt_qty)
+        return True
+
+    def _size_changed(self, current: Dict[str, Any], target: Dict[str, Any]) -> bool:
+        """Check whether the size moved beyond ``size_tolerance``."""
+        if self.size_tolerance is None:
+            return False
+        curr_qty = current.get("quantity", current.get("amount"))
+        tgt_qty = target.get("quantity", target.get("amount"))
+        if not curr_qty or not tgt_qty:
+            return False
+        return abs(curr_qty - tgt_qty) > self.size_tolerance * abs(tgt_qty)
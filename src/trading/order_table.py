@@ -0,0 +1,223 @@
+"""
+Order Table Module / 订单表模块
+
+ID-indexed table of order records with a bounded ordered view for display.
+按订单 ID 索引的订单记录表，附带用于展示的有界有序视图。
+
+Owner: Agent TRADING
+"""
+
+from collections import deque
+from typing import Any, Dict, Iterable, KeysView, List, Optional
+
+# Statuses for which an order is still resting on the book
+OPEN_STATUSES = frozenset({"placed", "open"})
+
+
+class OrderRecord:
+    """
+    Compact order record.
+    紧凑的订单记录。
+
+    Supports the mapping subset (``get``, ``[]``, ``keys``) used by consumers of
+    ``order_history`` so records can stand in for the previous dict entries.
+    """
+
+    __slots__ = (
+        "id",
+        "symbol",
+        "side",
+        "price",
+        "quantity",
+        "status",
+        "timestamp",
+        "strategy_id",
+        "strategy_type",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        symbol: Optional[str] = None,
+        side: Optional[str] = None,
+        price: Optional[float] = None,
+        quantity: Optional[float] = None,
+        status: str = "placed",
+        timestamp: float = 0.0,
+        strategy_id: Optional[str] = None,
+        strategy_type: Optional[str] = None,
+    ):
+        self.id = id
+        self.symbol = symbol
+        self.side = side
+        self.price = price
+        self.quantity = quantity
+        self.status = status
+        self.timestamp = timestamp
+        self.strategy_id = strategy_id
+        self.strategy_type = strategy_type
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "OrderRecord":
+        """Build a record from an order dict, ignoring unknown keys."""
+        return cls(**{k: data[k] for k in cls.__slots__ if k in data})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dict."""
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    def keys(self):
+        return self.__slots__
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self.__slots__:
+            return getattr(self, key)
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__
+
+    def __repr__(self) -> str:
+        return f"OrderRecord({self.to_dict()!r})"
+
+
+class OrderTable:
+    """
+    ID-indexed order table for a single strategy instance.
+    单个策略实例的按 ID 索引订单表。
+
+    Lookups, status transitions and open-order membership checks are O(1).
+    ``history`` is a bounded deque of the most recent records for display.
+    The index only holds records that are open or still in ``history``: a
+    record is dropped once it has both closed and fallen out of the history,
+    so the index stays bounded however many orders a long run places.
+    """
+
+    def __init__(self, history_size: int = 200):
+        self._index: Dict[str, OrderRecord] = {}
+        # Open orders tracked by this strategy (insertion-ordered)
+        self._open: Dict[str, OrderRecord] = {}
+        self.history: deque = deque(maxlen=history_size)
+        # Copies of each ID currently in ``history``
+        self._history_ids: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self._index
+
+    @property
+    def open_ids(self) -> KeysView:
+        """Live view of tracked open order IDs."""
+        return self._open.keys()
+
+    def add(self, order: Dict[str, Any]) -> OrderRecord:
+        """
+        Add a newly placed order.
+
+        Args:
+            order: Order dict (or OrderRecord)
+
+        Returns:
+            The stored OrderRecord
+        """
+        record = (
+            order if isinstance(order, OrderRecord) else OrderRecord.from_dict(order)
+        )
+
+        if len(self.history) == self.history.maxlen:
+            evicted = self.history[0]
+            remaining = self._history_ids.get(evicted.id, 1) - 1
+            if remaining:
+                self._history_ids[evicted.id] = remaining
+            else:
+                self._history_ids.pop(evicted.id, None)
+                self._release(evicted.id)
+        self.history.append(record)
+        self._history_ids[record.id] = self._history_ids.get(record.id, 0) + 1
+
+        if record.id and record.id != "unknown":
+            self._index[record.id] = record
+            if record.status in OPEN_STATUSES:
+                self._open[record.id] = record
+        return record
+
+    def get(self, order_id: str) -> Optional[OrderRecord]:
+        """Get an order record by ID."""
+        return self._index.get(order_id)
+
+    def set_status(self, order_id: str, status: str) -> bool:
+        """
+        Transition an order to a new status.
+
+        Returns:
+            True if the order was found
+        """
+        record = self._index.get(order_id)
+        if record is None:
+            self._open.pop(order_id, None)
+            return False
+        record.status = status
+        if status in OPEN_STATUSES:
+            self._open[order_id] = record
+        else:
+            self._open.pop(order_id, None)
+            self._release(order_id)
+        return True
+
+    def amend(
+        self, order_id: str, price: Optional[float], quantity: Optional[float]
+    ) -> bool:
+        """
+        Apply an in-place modification to an order.
+
+        Returns:
+            True if the order was found
+        """
+        record = self._index.get(order_id)
+        if record is None:
+            return False
+        record.price = price
+        record.quantity = quantity
+        return True
+
+    def track(self, order_id: str) -> None:
+        """Mark an order ID as open, creating a minimal record if unknown."""
+        record = self._index.get(order_id)
+        if record is None:
+            record = OrderRecord(id=order_id)
+            self._index[order_id] = record
+        self._open[order_id] = record
+
+    def untrack(self, order_id: str) -> None:
+        """Stop tracking an order ID without changing its status."""
+        self._open.pop(order_id, None)
+        self._release(order_id)
+
+    def clear_open(self) -> None:
+        """Stop tracking all open orders."""
+        closed = list(self._open)
+        self._open.clear()
+        for order_id in closed:
+            self._release(order_id)
+
+    def _release(self, order_id: str) -> None:
+        """Drop a record from the index once it is neither open nor in history."""
+        if order_id not in self._open and order_id not in self._history_ids:
+            self._index.pop(order_id, None)
+
+    def filter_open(self, orders: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Keep only exchange orders that belong to this strategy."""
+        open_orders = self._open
+        return [o for o in orders if o.get("id") in open_orders]
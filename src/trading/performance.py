@@ -7,13 +7,111 @@ Tracks trading performance metrics including PnL and win rate.
 Owner: Agent TRADING
 """
 
-from collections import deque
+import math
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.shared.ring_buffer import RingBuffer
+
+
+class StreamingStats:
+    """
+    Welford running mean/variance with downside deviation.
+    Welford 滚动均值/方差及下行偏差。
+
+    O(1) per update and numerically stable; variances are population
+    variances (matching ``np.std``).
+    """
+
+    __slots__ = ("count", "mean", "_m2", "_downside_sq")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._downside_sq = 0.0
+
+    def update(self, value: float) -> None:
+        """Add one observation / 添加一个观测值"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < 0:
+            self._downside_sq += value * value
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def downside_deviation(self) -> float:
+        """Root mean square of negative observations (target 0)."""
+        return math.sqrt(self._downside_sq / self.count) if self.count else 0.0
+
+    def sharpe(self, risk_free_rate: float = 0.0) -> float:
+        """Mean excess over standard deviation, 0.0 when undefined."""
+        std = self.std
+        if self.count < 1 or std == 0:
+            return 0.0
+        return (self.mean - risk_free_rate) / std
+
+    def sortino(self, risk_free_rate: float = 0.0) -> float:
+        """Mean excess over downside deviation, 0.0 when undefined."""
+        downside = self.downside_deviation
+        if downside == 0:
+            return 0.0
+        return (self.mean - risk_free_rate) / downside
+
+
+class DrawdownTracker:
+    """
+    Running peak and maximum drawdown of an equity curve.
+    权益曲线的滚动峰值和最大回撤。
+    """
+
+    __slots__ = ("peak", "current", "max_drawdown", "max_drawdown_ratio")
+
+    def __init__(self, initial: float = 0.0):
+        self.peak = initial
+        self.current = initial
+        self.max_drawdown = 0.0
+        # Drawdown as a fraction of the peak (only while the peak is positive)
+        self.max_drawdown_ratio = 0.0
+
+    def update(self, value: float) -> None:
+        """Add the latest equity value / 添加最新权益值"""
+        self.current = value
+        if value > self.peak:
+            self.peak = value
+            return
+        drawdown = self.peak - value
+        if drawdown > self.max_drawdown:
+            self.max_drawdown = drawdown
+        if self.peak > 0:
+            ratio = drawdown / self.peak
+            if ratio > self.max_drawdown_ratio:
+                self.max_drawdown_ratio = ratio
+
+    @property
+    def current_drawdown(self) -> float:
+        return self.peak - self.current
 
 
 class PerformanceTracker:
-    """Tracks trading performance metrics."""
+    """
+    Tracks trading performance metrics.
+
+    ``pnl_history`` keeps the last ``max_history`` snapshots for display,
+    while the return, drawdown and turnover statistics are streamed over the
+    whole session in O(1) per update.
+    """
 
     def __init__(self, max_history: int = 100):
         """
@@ -25,9 +123,20 @@ class PerformanceTracker:
         self.realized_pnl = 0.0
         self.total_trades = 0
         self.winning_trades = 0
-        self.pnl_history = deque(maxlen=max_history)
+        self.pnl_history = RingBuffer(
+            max_history, {"timestamp": np.int64, "pnl": np.float64}
+        )
         self.last_position = 0.0
         self.avg_entry_price = 0.0
+        self._init_streaming_stats()
+
+    def _init_streaming_stats(self) -> None:
+        # Returns are relative changes between consecutive PnL snapshots
+        self.return_stats = StreamingStats()
+        self.drawdown = DrawdownTracker()
+        self._last_snapshot_pnl: Optional[float] = None
+        self.turnover = 0.0  # Traded notional (quote currency)
+        self.volume = 0.0  # Traded size (base asset)
 
     def update_position(self, new_position: float, current_price: float) -> None:
         """
@@ -38,6 +147,9 @@ class PerformanceTracker:
             current_price: Current market price
         """
         position_change = new_position - self.last_position
+        if position_change:
+            self.volume += abs(position_change)
+            self.turnover += abs(position_change) * current_price
 
         # If position decreased (partial or full close)
         if abs(new_position) < abs(self.last_position):
@@ -76,7 +188,14 @@ class PerformanceTracker:
     def _add_pnl_snapshot(self) -> None:
         """Add current PnL to history with timestamp."""
         timestamp = int(datetime.now().timestamp() * 1000)
-        self.pnl_history.append([timestamp, round(self.realized_pnl, 4)])
+        pnl = round(self.realized_pnl, 4)
+        self.pnl_history.append(timestamp, pnl)
+
+        previous = self._last_snapshot_pnl
+        if previous is not None and previous != 0:
+            self.return_stats.update((pnl - previous) / abs(previous))
+        self._last_snapshot_pnl = pnl
+        self.drawdown.update(pnl)
 
     def get_win_rate(self) -> float:
         """Calculate win rate percentage."""
@@ -85,13 +204,30 @@ class PerformanceTracker:
         return round((self.winning_trades / self.total_trades) * 100, 2)
 
     def get_stats(self) -> Dict[str, Any]:
-        """Get all performance statistics."""
+        """
+        Get all performance statistics.
+
+        Sharpe and Sortino are per-snapshot (not annualised), computed over
+        the full session rather than just ``pnl_history``.
+        """
+        returns = self.return_stats
         return {
             "realized_pnl": round(self.realized_pnl, 4),
             "total_trades": self.total_trades,
             "winning_trades": self.winning_trades,
             "win_rate": self.get_win_rate(),
-            "pnl_history": list(self.pnl_history),
+            "pnl_history": self.pnl_history.tolist(),
+            "return_count": returns.count,
+            "return_mean": returns.mean,
+            "return_std": returns.std,
+            "sharpe_ratio": round(returns.sharpe(), 2),
+            "sortino_ratio": round(returns.sortino(), 2),
+            "peak_pnl": self.drawdown.peak,
+            "current_drawdown": round(self.drawdown.current_drawdown, 4),
+            "max_drawdown": round(self.drawdown.max_drawdown, 4),
+            "max_drawdown_ratio": round(self.drawdown.max_drawdown_ratio, 4),
+            "turnover": round(self.turnover, 4),
+            "volume": round(self.volume, 8),
         }
 
     def reset(self) -> None:
@@ -102,3 +238,4 @@ class PerformanceTracker:
         self.pnl_history.clear()
         self.last_position = 0.0
         self.avg_entry_price = 0.0
+        self._init_streaming_stats()
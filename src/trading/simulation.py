@@ -10,24 +10,45 @@ Owner: Agent TRADING
 import random
 from typing import Any, Dict
 
+from src.shared.config import EVALUATION_CONFIG
 from src.trading.performance import PerformanceTracker
+from src.trading.strategies import accepts_funding_rate
 from src.trading.strategies.fixed_spread import FixedSpreadStrategy
 
 
 class MarketSimulator:
     """Simulates market conditions for strategy testing."""
 
-    def __init__(self, strategy=None):
+    def __init__(
+        self,
+        strategy=None,
+        funding_rate: float = 0.0,
+        funding_interval: int = EVALUATION_CONFIG["funding_interval_steps"],
+    ):
         """
         Initialize simulator.
 
         Args:
             strategy: Strategy instance to test (defaults to FixedSpreadStrategy)
+            funding_rate: Starting funding rate; the simulated rate reverts to it
+            funding_interval: Steps between funding payments on the position
         """
         self.strategy = strategy or FixedSpreadStrategy()
         self.performance = PerformanceTracker()
         self.current_price = 2000.0
         self.position = 0.0
+        self.base_funding_rate = funding_rate
+        self.current_funding_rate = funding_rate
+        self.funding_interval = funding_interval
+        self.funding_pnl = 0.0
+        self._passes_funding = accepts_funding_rate(self.strategy)
+
+    def _step_funding_rate(self) -> float:
+        """Mean-reverting walk of the funding rate."""
+        self.current_funding_rate += EVALUATION_CONFIG["funding_rate_reversion"] * (
+            self.base_funding_rate - self.current_funding_rate
+        ) + random.gauss(0, EVALUATION_CONFIG["funding_rate_volatility"])
+        return self.current_funding_rate
 
     def generate_market_data(self) -> Dict[str, float]:
         """Generate simulated market data."""
@@ -54,11 +75,17 @@ class MarketSimulator:
             steps: Number of simulation steps
 
         Returns:
-            Performance statistics
+            Performance statistics, plus ``funding_pnl`` (longs pay when the
+            rate is positive) and ``net_pnl`` (realized + funding)
         """
-        for _ in range(steps):
+        for step in range(steps):
             market_data = self.generate_market_data()
-            orders = self.strategy.calculate_target_orders(market_data)
+            if self._passes_funding:
+                orders = self.strategy.calculate_target_orders(
+                    market_data, funding_rate=self.current_funding_rate
+                )
+            else:
+                orders = self.strategy.calculate_target_orders(market_data)
 
             # Simple fill logic: if price moves through our orders
             for order in orders:
@@ -75,7 +102,14 @@ class MarketSimulator:
                             self.position, market_data["mid_price"]
                         )
 
-        return self.performance.get_stats()
+            rate = self._step_funding_rate()
+            if self.funding_interval and (step + 1) % self.funding_interval == 0:
+                self.funding_pnl -= self.position * market_data["mid_price"] * rate
+
+        stats = self.performance.get_stats()
+        stats["funding_pnl"] = round(self.funding_pnl, 4)
+        stats["net_pnl"] = round(stats["realized_pnl"] + self.funding_pnl, 4)
+        return stats
 
 
 if __name__ == "__main__":
@@ -7,10 +7,26 @@ Trading strategies:
 - funding_rate: Funding rate skew strategy
 """
 
+import inspect
+
 from src.trading.strategies.fixed_spread import FixedSpreadStrategy
 from src.trading.strategies.funding_rate import FundingRateStrategy
 
+
+def accepts_funding_rate(strategy) -> bool:
+    """
+    Whether strategy.calculate_target_orders takes a funding_rate argument.
+    策略的 calculate_target_orders 是否接受 funding_rate 参数。
+    """
+    try:
+        parameters = inspect.signature(strategy.calculate_target_orders).parameters
+    except (AttributeError, TypeError, ValueError):
+        return False
+    return "funding_rate" in parameters
+
+
 __all__ = [
     "FixedSpreadStrategy",
     "FundingRateStrategy",
+    "accepts_funding_rate",
 ]
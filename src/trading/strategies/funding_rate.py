@@ -55,8 +55,10 @@ class FundingRateStrategy:
 
         Args:
             market_data: Dict with 'mid_price', 'best_bid', 'best_ask',
-                        optional 'tick_size', 'step_size'
-            funding_rate: Funding rate (e.g., 0.0001 for 0.01%)
+                        optional 'tick_size', 'step_size' and 'funding'
+                        (funding store snapshot)
+            funding_rate: Funding rate (e.g., 0.0001 for 0.01%), used when
+                          the funding snapshot has no predicted rate
 
         Returns:
             List of order dicts with 'side', 'price', 'quantity'
@@ -65,6 +67,11 @@ class FundingRateStrategy:
         if not mid_price or mid_price <= 0:
             return []
 
+        # Prefer the predicted next rate from the funding store
+        predicted = (market_data.get("funding") or {}).get("predicted_rate")
+        if isinstance(predicted, (int, float)):
+            funding_rate = predicted
+
         # Calculate skew based on funding rate
         # If rate > 0 (Longs pay Shorts), we want to be Short -> Sell closer, Buy further
         skew_offset = funding_rate * self.skew_factor * mid_price
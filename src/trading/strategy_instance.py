@@ -7,14 +7,20 @@ Encapsulates a single strategy instance with isolated state.
 Owner: Agent TRADING
 """
 
+import threading
 import time
 from collections import deque
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, KeysView, List, Optional, Tuple
 
 from src.shared.config import SYMBOL
+from src.shared.latency import now
 from src.shared.logger import setup_logger
+from src.shared.market_stats import market_stats
 from src.trading.exchange import BinanceClient
-from src.trading.order_manager import OrderManager
+from src.trading.funding import funding_store
+from src.trading.order_manager import OrderDiff, OrderManager
+from src.trading.order_table import OrderRecord, OrderTable
+from src.trading.strategies import accepts_funding_rate
 from src.trading.strategies.fixed_spread import FixedSpreadStrategy
 from src.trading.strategies.funding_rate import FundingRateStrategy
 
@@ -77,17 +83,23 @@ class StrategyInstance:
         self.strategy_switched = False
         self.alert: Optional[str] = None
         self.active_orders: List[Dict[str, Any]] = []
-        self.order_history: deque = deque(maxlen=200)
+        # ID-indexed orders; order_history is its bounded display view
+        self.orders = OrderTable(history_size=200)
+        self.order_history: deque = self.orders.history
         self.error_history: deque = deque(maxlen=200)
-        # Track order IDs for this strategy instance
-        self.tracked_order_ids: Set[str] = set()
         # Running state for this strategy instance
         self.running = False
 
         # Data cache for this strategy instance
         self.latest_market_data: Optional[Dict[str, Any]] = None
+        # Monotonic receipt time of latest_market_data (tick-to-trade start)
+        self.market_data_received_at: Optional[float] = None
         self.latest_funding_rate = 0.0
         self.latest_account_data: Optional[Dict[str, Any]] = None
+        # Public data fetched in bulk for the next refresh (see MarketDataPlanner)
+        self._primed_market_data: Optional[Tuple[Dict[str, Any], float, float]] = None
+        # Guards strategy parameters against the advisory worker's updates
+        self.params_lock = threading.RLock()
 
     def get_strategy_name(self) -> str:
         """Get human-readable strategy name."""
@@ -97,12 +109,40 @@ class StrategyInstance:
 
     def reset_to_safe_defaults(self) -> Dict[str, Any]:
         """Reset strategy parameters to safe defaults."""
-        return self.strategy.reset_to_safe_defaults()
+        with self.params_lock:
+            return self.strategy.reset_to_safe_defaults()
 
     def get_safe_defaults(self) -> Dict[str, Any]:
         """Get safe default parameters."""
         return self.strategy.get_safe_defaults()
 
+    def get_params(self, names) -> Dict[str, Any]:
+        """Consistent read of strategy parameters (missing ones are None)."""
+        with self.params_lock:
+            return {name: getattr(self.strategy, name, None) for name in names}
+
+    def apply_params(
+        self, updates: Dict[str, Any], expected: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Atomically update strategy parameters.
+        原子地更新策略参数。
+
+        Args:
+            updates: Attribute values to set on the strategy
+            expected: Values the parameters must still hold; if any changed
+                (e.g. a manual config update) nothing is applied
+
+        Returns:
+            True if the updates were applied
+        """
+        with self.params_lock:
+            if expected and self.get_params(expected) != expected:
+                return False
+            for name, value in updates.items():
+                setattr(self.strategy, name, value)
+            return True
+
     def calculate_target_orders(
         self, market_data: Dict[str, Any], funding_rate: float = 0.0
     ) -> List[Dict[str, Any]]:
@@ -116,13 +156,11 @@ class StrategyInstance:
         Returns:
             List of target orders
         """
-        if hasattr(self.strategy.calculate_target_orders, "__code__") and (
-            "funding_rate" in self.strategy.calculate_target_orders.__code__.co_varnames
-        ):
-            return self.strategy.calculate_target_orders(
-                market_data, funding_rate=funding_rate
-            )
-        else:
+        with self.params_lock:
+            if accepts_funding_rate(self.strategy):
+                return self.strategy.calculate_target_orders(
+                    market_data, funding_rate=funding_rate
+                )
             return self.strategy.calculate_target_orders(market_data)
 
     def sync_orders(
@@ -139,36 +177,120 @@ class StrategyInstance:
             Tuple of (order_ids_to_cancel, orders_to_place)
         """
         # Filter current_orders to only include tracked orders for this strategy
-        filtered_orders = [
-            o for o in current_orders if o.get("id") in self.tracked_order_ids
-        ]
-        return self.order_manager.sync_orders(filtered_orders, target_orders)
+        filtered_orders = self.orders.filter_open(current_orders)
+        return self.order_manager.sync_orders(
+            filtered_orders, target_orders, tick_size=self._market_tick_size()
+        )
+
+    def plan_orders(
+        self, current_orders: List[Dict[str, Any]], target_orders: List[Dict[str, Any]]
+    ) -> OrderDiff:
+        """
+        Plan keep/cancel/place/amend actions for this strategy instance.
+
+        Args:
+            current_orders: Current open orders (filtered to tracked orders)
+            target_orders: Target orders to achieve
+
+        Returns:
+            OrderDiff from the instance's order manager
+        """
+        filtered_orders = self.orders.filter_open(current_orders)
+        return self.order_manager.diff_orders(
+            filtered_orders, target_orders, tick_size=self._market_tick_size()
+        )
+
+    def _market_tick_size(self) -> Optional[float]:
+        """Price tick of the instance's market, if the exchange reported one."""
+        tick_size = (self.latest_market_data or {}).get("tick_size")
+        if isinstance(tick_size, (int, float)) and tick_size > 0:
+            return float(tick_size)
+        return None
+
+    @property
+    def tracked_order_ids(self) -> KeysView:
+        """IDs of open orders placed by this strategy (live view)."""
+        return self.orders.open_ids
+
+    def record_order(self, order: Dict[str, Any]) -> OrderRecord:
+        """
+        Record a newly placed order and start tracking it.
+
+        Args:
+            order: Order record dict
+
+        Returns:
+            The stored OrderRecord (also appended to order_history)
+        """
+        return self.orders.add(order)
+
+    def set_order_status(self, order_id: str, status: str) -> bool:
+        """
+        Update an order's status by ID in O(1).
+
+        Returns:
+            True if the order is known to this instance
+        """
+        return self.orders.set_status(order_id, status)
+
+    def amend_order_record(
+        self, order_id: str, price: Optional[float], quantity: Optional[float]
+    ) -> bool:
+        """Apply an in-place amend to a tracked order's record."""
+        return self.orders.amend(order_id, price, quantity)
+
+    def filter_tracked_orders(
+        self, orders: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Keep only exchange orders tracked by this strategy."""
+        return self.orders.filter_open(orders)
 
     def add_tracked_order(self, order_id: str) -> None:
         """Add an order ID to the tracked set for this strategy."""
-        self.tracked_order_ids.add(order_id)
+        self.orders.track(order_id)
 
     def remove_tracked_order(self, order_id: str) -> None:
         """Remove an order ID from the tracked set."""
-        self.tracked_order_ids.discard(order_id)
+        self.orders.untrack(order_id)
 
     def clear_tracked_orders(self) -> None:
         """Clear all tracked order IDs."""
-        self.tracked_order_ids.clear()
+        self.orders.clear_open()
+
+    def prime_market_data(
+        self, market_data: Dict[str, Any], funding_rate: float, received_at: float
+    ) -> None:
+        """
+        Provide bulk-fetched public data for the next refresh_data call.
+
+        Args:
+            market_data: Market data in fetch_market_data format
+            funding_rate: Funding rate for this instance's symbol
+            received_at: Monotonic time the data was received
+        """
+        self._primed_market_data = (market_data, funding_rate, received_at)
 
     def refresh_data(self) -> bool:
         """
         Fetch fresh data from exchange and update cache.
 
+        Public data primed by prime_market_data is used instead of the
+        per-symbol market data and funding rate calls.
+
         Returns:
             True if data refreshed successfully, False otherwise
         """
         if not self.use_real_exchange or not self.exchange:
             return False
 
+        primed, self._primed_market_data = self._primed_market_data, None
         try:
             # Fetch current market data
-            market_data = self.exchange.fetch_market_data()
+            if primed is not None:
+                market_data, funding_rate, received_at = primed
+            else:
+                market_data = self.exchange.fetch_market_data()
+                received_at = now()
             if not market_data or not market_data.get("mid_price"):
                 logger.error(
                     f"Strategy '{self.strategy_id}': Failed to fetch market data"
@@ -186,13 +308,24 @@ class StrategyInstance:
                 )
 
             # Fetch funding rate
-            funding_rate = self.exchange.fetch_funding_rate()
+            if primed is None:
+                funding_rate = self.exchange.fetch_funding_rate()
 
             # Fetch Account Data
             account_data = self.exchange.fetch_account_data()
 
+            # Attach the rolling stats snapshot (fed by the MarketDataPlanner)
+            # 附加滚动统计快照（由 MarketDataPlanner 输入）
+            market_data["market_stats"] = market_stats.get(self.symbol)
+
+            # Record the live funding rate and attach the funding view
+            # 记录实时资金费率并附加资金费率视图
+            funding_store.record_live(self.exchange, self.symbol, funding_rate)
+            market_data["funding"] = funding_store.get(self.exchange, self.symbol)
+
             # Update Cache
             self.latest_market_data = market_data
+            self.market_data_received_at = received_at
             self.latest_funding_rate = funding_rate
             self.latest_account_data = account_data
             return True
@@ -216,6 +349,7 @@ class StrategyInstance:
                 self.symbol = symbol
                 # Invalidate cache
                 self.latest_market_data = None
+                self._primed_market_data = None
                 self.latest_funding_rate = 0.0
                 self.latest_account_data = None
                 logger.info(
@@ -0,0 +1,52 @@
+"""
+Shared test fixtures / 共享测试夹具
+
+Owner: Agent QA
+"""
+
+import pytest
+
+import src.ai.cache as llm_cache
+import src.ai.evaluation.store as evaluation_store
+import src.trading.engine as engine
+from src.shared.config import LLM_CACHE
+from src.trading.advisory import AdvisoryWorker
+
+
+@pytest.fixture(autouse=True)
+def in_memory_storage(monkeypatch):
+    """
+    Keep tests out of the production SQLite files under logs/.
+    测试不写入 logs/ 下的生产 SQLite 文件。
+
+    The order journal, LLM response cache and evaluation store are all opened
+    lazily, so pointing their paths at memory here covers every engine, cache
+    and store created during the test.
+    """
+    monkeypatch.setattr(engine, "ORDER_JOURNAL_PATH", ":memory:")
+    monkeypatch.setitem(LLM_CACHE, "path", None)
+    monkeypatch.setattr(llm_cache, "_llm_cache", None)
+    monkeypatch.setattr(evaluation_store, "EVALUATION_STORE_PATH", ":memory:")
+    monkeypatch.setattr(evaluation_store, "_evaluation_store", None)
+
+
+@pytest.fixture(autouse=True)
+def stop_advisory_workers(monkeypatch):
+    """
+    Stop advisory worker threads started during the test.
+    停止测试期间启动的顾问工作线程。
+
+    Submitting a snapshot starts the worker lazily, so any engine cycle run
+    by a test leaves a thread behind otherwise.
+    """
+    started = []
+    original_start = AdvisoryWorker.start
+
+    def start(self):
+        started.append(self)
+        return original_start(self)
+
+    monkeypatch.setattr(AdvisoryWorker, "start", start)
+    yield
+    for worker in started:
+        worker.stop(timeout=5)
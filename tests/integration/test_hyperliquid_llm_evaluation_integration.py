@@ -18,6 +18,7 @@ from fastapi.testclient import TestClient
 import server
 from src.ai.evaluation.evaluator import MultiLLMEvaluator
 from src.ai.evaluation.schemas import MarketContext
+from src.ai.evaluation.store import EvaluationStore
 from src.trading.hyperliquid_client import HyperliquidClient
 
 
@@ -567,9 +568,12 @@ class TestHyperliquidLLMApplyIntegration:
             failed_evaluations=0,
         )
 
+        store = EvaluationStore()
+        store.record("ETHUSDT", "hyperliquid", None, [], aggregated)
+
         with patch("server.bot_engine", mock_bot_engine), patch(
-            "server._last_evaluation_aggregated", aggregated
-        ), patch("server._last_evaluation_results", []):
+            "server.get_evaluation_store", return_value=store
+        ):
             client = TestClient(server.app)
 
             # Apply consensus suggestion
@@ -0,0 +1,177 @@
+"""
+Unit tests for the advisory worker
+顾问工作线程单元测试
+
+Owner: Agent QA
+"""
+
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from src.trading.advisory import AdvisoryWorker, CycleSnapshot
+from src.trading.strategies.fixed_spread import FixedSpreadStrategy
+from src.trading.strategy_instance import StrategyInstance
+
+
+def _instance(strategy_id="default"):
+    instance = StrategyInstance.__new__(StrategyInstance)
+    instance.strategy_id = strategy_id
+    instance.strategy = FixedSpreadStrategy()
+    instance.params_lock = threading.RLock()
+    instance.running = True
+    instance.alert = None
+    return instance
+
+
+def _snapshot(instance, **kwargs):
+    return CycleSnapshot(
+        strategy_id=instance.strategy_id,
+        instance=instance,
+        config={"spread": instance.strategy.spread},
+        metrics={"volatility": 0.01},
+        **kwargs,
+    )
+
+
+def _agents(spread=0.02, approved=True, reason="Approved"):
+    quant = Mock()
+    quant.analyze_and_propose.return_value = {"spread": spread}
+    risk = Mock()
+    risk.validate_proposal.return_value = (approved, reason)
+    return quant, risk
+
+
+@pytest.fixture
+def workers():
+    """Build workers and stop their threads after the test"""
+    created = []
+
+    def make(quant, risk, **kwargs):
+        worker = AdvisoryWorker(quant, risk, **kwargs)
+        created.append(worker)
+        return worker
+
+    yield make
+    for worker in created:
+        worker.stop(timeout=5)
+
+
+class TestAdvisoryWorkerAnalysis:
+    def test_approved_proposal_applied(self, workers):
+        instance = _instance()
+        quant, risk = _agents(spread=0.02)
+        worker = workers(quant, risk)
+
+        worker.submit(_snapshot(instance))
+
+        assert worker.flush(timeout=5)
+        assert instance.strategy.spread == 0.02
+        assert worker.last_decisions["default"]["outcome"] == "approved"
+
+    def test_rejection_falls_back_to_safe_defaults(self, workers):
+        instance = _instance()
+        instance.strategy.spread = 0.03
+        quant, risk = _agents(spread=0.5, approved=False, reason="too wide")
+        worker = workers(quant, risk)
+
+        worker.submit(_snapshot(instance))
+
+        assert worker.flush(timeout=5)
+        assert instance.strategy.spread == instance.get_safe_defaults()["spread"]
+        assert "Risk Rejection: too wide" in instance.alert["message"]
+
+    def test_proposal_discarded_when_params_changed(self, workers):
+        instance = _instance()
+        quant, risk = _agents(spread=0.02)
+        snapshot = _snapshot(instance)
+        instance.strategy.spread = 0.004  # Manual update during analysis
+        worker = workers(quant, risk)
+
+        worker.submit(snapshot)
+
+        assert worker.flush(timeout=5)
+        assert instance.strategy.spread == 0.004
+        assert worker.last_decisions["default"]["outcome"] == "superseded"
+
+    def test_stale_snapshot_dropped(self, workers):
+        instance = _instance()
+        quant, risk = _agents()
+        worker = workers(quant, risk, max_snapshot_age=1.0)
+
+        worker.submit(_snapshot(instance, created_at=time.perf_counter() - 10))
+
+        assert worker.flush(timeout=5)
+        quant.analyze_and_propose.assert_not_called()
+
+    def test_quant_error_is_contained(self, workers):
+        instance = _instance()
+        quant, risk = _agents()
+        quant.analyze_and_propose.side_effect = RuntimeError("LLM down")
+        worker = workers(quant, risk)
+
+        worker.submit(_snapshot(instance))
+
+        assert worker.flush(timeout=5)
+        assert worker.last_decisions["default"]["outcome"] == "error"
+
+    def test_submit_never_analyses_on_the_caller_thread(self, workers):
+        instance = _instance()
+        quant, risk = _agents()
+        threads = []
+        quant.analyze_and_propose.side_effect = lambda *a: (
+            threads.append(threading.current_thread()) or {"spread": 0.02}
+        )
+        worker = workers(quant, risk)
+        assert not worker.running
+
+        worker.submit(_snapshot(instance))
+
+        assert worker.running
+        assert worker.flush(timeout=5)
+        assert threads and threads[0] is not threading.current_thread()
+
+
+class TestAdvisoryWorkerThread:
+    def test_submit_does_not_wait_on_analysis(self):
+        instance = _instance()
+        release = threading.Event()
+        quant, risk = _agents(spread=0.02)
+        quant.analyze_and_propose.side_effect = lambda *a: (
+            release.wait(5) and {"spread": 0.02}
+        )
+        worker = AdvisoryWorker(quant, risk, interval_seconds=0.05)
+        worker.start()
+        try:
+            started = time.perf_counter()
+            worker.submit(_snapshot(instance))
+            assert time.perf_counter() - started < 0.5
+
+            release.set()
+            deadline = time.time() + 5
+            while instance.strategy.spread != 0.02 and time.time() < deadline:
+                time.sleep(0.01)
+            assert instance.strategy.spread == 0.02
+        finally:
+            release.set()
+            worker.stop(timeout=5)
+        assert not worker.running
+
+    def test_snapshots_coalesce_per_instance(self):
+        instance = _instance()
+        quant, risk = _agents()
+        worker = AdvisoryWorker(quant, risk, interval_seconds=60)
+        worker._thread = Mock(is_alive=Mock(return_value=True))
+
+        worker.submit(_snapshot(instance))
+        latest = _snapshot(instance)
+        worker.submit(latest)
+
+        assert worker._pending == {"default": latest}
+        assert worker.process_pending() == 1
+        quant.analyze_and_propose.assert_called_once()
+        # Within the interval the next snapshot waits
+        worker.submit(_snapshot(instance))
+        assert worker.process_pending() == 0
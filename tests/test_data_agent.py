@@ -39,3 +39,13 @@ class TestDataAgent:
         metrics = self.agent.calculate_metrics()
         assert "sharpe_ratio" in metrics
         assert "slippage_bps" in metrics
+
+    def test_history_is_bounded(self):
+        agent = DataAgent(history_size=5)
+        for i in range(12):
+            agent.ingest_data({"price": float(i)}, [{"pnl": float(i)}])
+
+        assert len(agent.price_history) == 5
+        assert len(agent.trade_history) == 5
+        assert agent.price_history.tolist() == [7.0, 8.0, 9.0, 10.0, 11.0]
+        assert agent.trade_pnls.tolist() == [7.0, 8.0, 9.0, 10.0, 11.0]
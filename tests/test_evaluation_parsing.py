@@ -0,0 +1,118 @@
+"""
+Unit tests for tolerant LLM response parsing
+LLM 响应容错解析单元测试
+
+Owner: Agent QA
+"""
+
+import pytest
+
+from src.ai.evaluation.parsing import (
+    EMPTY,
+    INVALID_JSON,
+    NO_JSON,
+    SCHEMA,
+    UNBALANCED,
+    ExtractionError,
+    _PARSE_FAILURES,
+    coerce_proposal,
+    extract_json,
+    parse_proposal,
+)
+
+
+class TestExtractJson:
+    def test_plain_object(self):
+        assert extract_json('{"spread": 0.01}') == {"spread": 0.01}
+
+    def test_prose_and_code_fence(self):
+        text = (
+            "Based on the data, I suggest:\n```json\n"
+            '{"spread": 0.012, "reasoning": "use {braces} wisely"}\n```\n'
+            "Let me know if you need more."
+        )
+        assert extract_json(text) == {"spread": 0.012, "reasoning": "use {braces} wisely"}
+
+    def test_trailing_commas_removed_outside_strings(self):
+        text = '{"spread": 0.01, "notes": ["a, }", "b",], "x": {"y": 1,},}'
+        assert extract_json(text) == {"spread": 0.01, "notes": ["a, }", "b"], "x": {"y": 1}}
+
+    def test_escaped_quotes(self):
+        assert extract_json('Answer: {"reasoning": "say \\"hi\\" }"} done') == {
+            "reasoning": 'say "hi" }'
+        }
+
+    def test_skips_braces_in_prose(self):
+        text = 'Format {spread} as requested: {"spread": 0.02}'
+        assert extract_json(text) == {"spread": 0.02}
+
+    def test_array_when_allowed(self):
+        text = 'Here: [{"symbol": "ETHUSDT"},] thanks'
+        assert extract_json(text, types=(list, dict)) == [{"symbol": "ETHUSDT"}]
+        # Only objects by default
+        assert extract_json(text) == {"symbol": "ETHUSDT"}
+
+    @pytest.mark.parametrize(
+        "text, reason",
+        [
+            ("   ", EMPTY),
+            ("I cannot help with that.", NO_JSON),
+            ('{"spread": 0.01, "reasoning": "cut off', UNBALANCED),
+            ("{'spread': 0.01}", INVALID_JSON),
+        ],
+    )
+    def test_failure_reasons(self, text, reason):
+        with pytest.raises(ExtractionError) as excinfo:
+            extract_json(text)
+        assert excinfo.value.reason == reason
+
+
+class TestCoerceProposal:
+    def test_schema_directed_coercion(self):
+        proposal = coerce_proposal(
+            {
+                "Strategy": "funding_rate",
+                "spread": "1.2%",
+                "skewFactor": "150",
+                "confidence": 85,
+                "Risk Level": "low",
+                "unrelated": [1, 2],
+            }
+        )
+
+        assert proposal.recommended_strategy == "FundingRate"
+        assert proposal.spread == pytest.approx(0.012)
+        assert proposal.skew_factor == 150.0
+        assert proposal.confidence == pytest.approx(0.85)
+        assert proposal.risk_level == "low"
+        # Missing keys keep the evaluator's defaults
+        assert proposal.quantity == 0.1 and proposal.leverage == 1.0
+
+    def test_rejects_non_numeric_and_irrelevant(self):
+        with pytest.raises(ExtractionError) as excinfo:
+            coerce_proposal({"spread": "wide"})
+        assert excinfo.value.reason == SCHEMA
+        with pytest.raises(ExtractionError):
+            coerce_proposal({"answer": 42})
+        with pytest.raises(ExtractionError):
+            coerce_proposal({"reasoning": "no number"}, required=("spread",))
+
+
+class TestParseProposal:
+    def test_failure_counted_by_reason(self):
+        series = _PARSE_FAILURES.labels(source="test", reason=NO_JSON)
+        before = series.value
+
+        proposal = parse_proposal("No JSON here", "LLM", source="test")
+
+        assert proposal.parse_success is False
+        assert proposal.spread == 0.01
+        assert series.value == before + 1
+
+    def test_success_keeps_raw_response(self):
+        raw = 'Sure! {"recommended_strategy": "FixedSpread", "spread": 0.015,}'
+        proposal = parse_proposal(raw, "LLM")
+
+        assert proposal.parse_success is True
+        assert proposal.spread == 0.015
+        assert proposal.provider_name == "LLM" and proposal.raw_response == raw
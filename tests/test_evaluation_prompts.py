@@ -4,12 +4,14 @@ Unit Tests for Evaluation Prompt Templates
 
 Tests for:
 - StrategyAdvisorPrompt
+- BatchStrategyAdvisorPrompt
 - RiskAdvisorPrompt
 - MarketDiagnosisPrompt
 """
 
 import pytest
 from src.ai.evaluation.prompts import (
+    BatchStrategyAdvisorPrompt,
     MarketDiagnosisPrompt,
     RiskAdvisorPrompt,
     StrategyAdvisorPrompt,
@@ -17,6 +19,42 @@ from src.ai.evaluation.prompts import (
 from src.ai.evaluation.schemas import MarketContext
 
 
+class TestBatchStrategyAdvisorPrompt:
+    """Test cases for BatchStrategyAdvisorPrompt"""
+
+    @staticmethod
+    def _context(symbol, mid_price):
+        return MarketContext(
+            symbol=symbol,
+            mid_price=mid_price,
+            best_bid=mid_price * 0.9999,
+            best_ask=mid_price * 1.0001,
+            spread_bps=2.0,
+            volatility_24h=0.035,
+            volatility_1h=0.012,
+            funding_rate=0.0001,
+            funding_rate_trend="rising",
+        )
+
+    def test_one_row_per_symbol_after_static_prefix(self):
+        prompt = BatchStrategyAdvisorPrompt.generate(
+            [self._context("ETHUSDT", 2500.0), self._context("BTCUSDT", 65000.0)]
+        )
+
+        assert prompt.startswith(BatchStrategyAdvisorPrompt.PREFIX)
+        rows = [line for line in prompt.splitlines() if line.startswith(("ETHUSDT", "BTCUSDT"))]
+        assert len(rows) == 2
+        assert "65000" in rows[1]
+        assert "JSON array" in prompt
+
+    def test_prefix_identical_across_batches(self):
+        first = BatchStrategyAdvisorPrompt.generate([self._context("ETHUSDT", 2500.0)])
+        second = BatchStrategyAdvisorPrompt.generate([self._context("SOLUSDT", 150.0)])
+        prefix = BatchStrategyAdvisorPrompt.PREFIX
+
+        assert first[: len(prefix)] == second[: len(prefix)]
+
+
 class TestStrategyAdvisorPrompt:
     """Test cases for StrategyAdvisorPrompt"""
 
@@ -0,0 +1,172 @@
+"""
+Unit tests for the persisted evaluation store
+评估记录存储单元测试
+
+Owner: Agent QA
+"""
+
+import pytest
+
+from src.ai.evaluation.schemas import (
+    AggregatedResult,
+    EvaluationResult,
+    SimulationResult,
+    StrategyConsensus,
+    StrategyProposal,
+)
+from src.ai.evaluation.store import EvaluationStore
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _result(provider, strategy="FixedSpread", rank=1, score=50.0, pnl=10.0, ok=True):
+    return EvaluationResult(
+        provider_name=provider,
+        proposal=StrategyProposal(
+            recommended_strategy=strategy,
+            spread=0.01,
+            leverage=2.0,
+            provider_name=provider,
+            parse_success=ok,
+        ),
+        simulation=SimulationResult(realized_pnl=pnl, pnl_history=[1.0, 2.0]),
+        score=score,
+        rank=rank,
+        latency_ms=100.0,
+        status="ok" if ok else "error",
+    )
+
+
+def _aggregated(consensus="FixedSpread"):
+    return AggregatedResult(
+        strategy_consensus=StrategyConsensus(consensus_strategy=consensus),
+        consensus_proposal=StrategyProposal(recommended_strategy=consensus, spread=0.02),
+    )
+
+
+@pytest.fixture
+def store():
+    clock = FakeClock()
+    store = EvaluationStore(clock=clock)
+    store.clock = clock
+    yield store
+    store.close()
+
+
+class TestRecordAndQuery:
+    def test_round_trip(self, store):
+        evaluation_id = store.record(
+            "ETHUSDT", "binance", None, [_result("A"), _result("B", rank=2)], _aggregated()
+        )
+
+        record = store.get(evaluation_id)
+        assert record["symbol"] == "ETHUSDT" and record["exchange"] == "binance"
+        assert [r["provider_name"] for r in record["results"]] == ["A", "B"]
+        assert "pnl_history" not in record["results"][0]["simulation"]
+        assert record["applied"] is None
+
+        assert store.get_proposal(evaluation_id).spread == 0.02
+        assert store.get_proposal(evaluation_id, "B").leverage == 2.0
+        assert store.get_proposal(evaluation_id, "Missing") is None
+        assert store.get("missing") is None
+
+    def test_query_by_symbol_provider_and_time(self, store):
+        first = store.record("ETHUSDT", "binance", None, [_result("A")], _aggregated())
+        store.clock.now = 2000.0
+        second = store.record("BTCUSDT", "binance", None, [_result("B")], _aggregated())
+
+        assert [e["id"] for e in store.query()] == [second, first]
+        assert [e["id"] for e in store.query(symbol="ETHUSDT")] == [first]
+        assert [e["id"] for e in store.query(provider="B")] == [second]
+        assert [e["id"] for e in store.query(since=1500.0)] == [second]
+        assert [e["id"] for e in store.query(until=1500.0)] == [first]
+        assert store.latest_id() == second
+        assert store.latest_id("ETHUSDT") == first
+
+    def test_target_and_latest_per_exchange(self, store):
+        binance = store.record("ETHUSDT", "binance", None, [_result("A")], _aggregated())
+        store.clock.now = 2000.0
+        hyperliquid = store.record("ETHUSDT", "hyperliquid", None, [_result("A")], _aggregated())
+
+        assert store.get_target(binance) == {"symbol": "ETHUSDT", "exchange": "binance"}
+        assert store.get_target("missing") is None
+        assert store.latest_id("ETHUSDT") == hyperliquid
+        assert store.latest_id("ETHUSDT", "binance") == binance
+        assert store.latest_id("BTCUSDT", "binance") is None
+
+    def test_mark_applied(self, store):
+        evaluation_id = store.record("ETHUSDT", "binance", None, [_result("A")], _aggregated())
+
+        store.mark_applied(evaluation_id, "individual", "A", {"spread": 0.01})
+
+        applied = store.get(evaluation_id)["applied"]
+        assert applied["source"] == "individual" and applied["provider_name"] == "A"
+        assert applied["config"] == {"spread": 0.01}
+        assert store.leaderboard()[0]["applied"] == 1
+
+
+class TestLeaderboard:
+    def test_counters_track_runs(self, store):
+        store.record(
+            "ETHUSDT",
+            "binance",
+            None,
+            [_result("A", score=80.0, pnl=20.0), _result("B", "FundingRate", rank=2, score=40.0)],
+            _aggregated("FixedSpread"),
+        )
+        store.record(
+            "BTCUSDT",
+            "binance",
+            None,
+            [_result("B", score=60.0), _result("A", rank=2, ok=False, score=0.0)],
+            _aggregated("FixedSpread"),
+        )
+
+        board = {entry["provider"]: entry for entry in store.leaderboard()}
+        assert board["A"]["runs"] == 2
+        assert board["A"]["valid_rate"] == 0.5
+        assert board["A"]["win_rate"] == 0.5
+        assert board["A"]["avg_score"] == 40.0
+        assert board["A"]["avg_pnl"] == 20.0  # Failed run not counted
+        assert board["B"]["consensus_rate"] == 0.5
+        assert board["B"]["avg_score"] == 50.0
+        assert [e["provider"] for e in store.leaderboard()] == ["B", "A"]
+
+        eth = store.leaderboard(symbol="ETHUSDT")
+        assert [(e["provider"], e["rank"]) for e in eth] == [("A", 1), ("B", 2)]
+
+    def test_update_backs_out_previous_contribution(self, store):
+        evaluation_id = store.record("ETHUSDT", "binance", None, [_result("A")], _aggregated())
+
+        # A late provider outranks A
+        store.update(
+            evaluation_id,
+            [_result("Late", score=90.0), _result("A", rank=2)],
+            _aggregated(),
+        )
+
+        board = {entry["provider"]: entry for entry in store.leaderboard()}
+        assert board["A"]["runs"] == 1 and board["A"]["win_rate"] == 0.0
+        assert board["Late"]["win_rate"] == 1.0
+        assert len(store.get(evaluation_id)["results"]) == 2
+
+    def test_persists_across_reopen(self, tmp_path):
+        path = str(tmp_path / "evaluations.db")
+        first = EvaluationStore(path)
+        evaluation_id = first.record("ETHUSDT", "binance", None, [_result("A")], _aggregated())
+        first.close()
+
+        reopened = EvaluationStore(path)
+        assert reopened.latest_id() == evaluation_id
+        assert reopened.leaderboard()[0]["provider"] == "A"
+        reopened.close()
+
+    def test_unknown_sort_key(self, store):
+        with pytest.raises(ValueError):
+            store.leaderboard(sort_by="bogus")
@@ -462,3 +462,55 @@ class TestCommission:
         assert result["realized_pnl"] == 0.0
         assert result["commission"] == 0.0
         assert result["net_pnl"] == 0.0
+
+    @patch("src.trading.exchange.ccxt.binanceusdm")
+    def test_amend_order_uses_single_edit_request(self, mock_binance):
+        """Test amend_order modifies the order with one edit_order call"""
+        mock_exchange = MagicMock()
+        mock_exchange.load_markets.return_value = {
+            "ETH/USDT:USDT": {
+                "id": "ETHUSDT",
+                "symbol": "ETH/USDT:USDT",
+                "limits": {"amount": {"min": 0.001}, "cost": {"min": 5}},
+                "precision": {"amount": 0.001},
+            }
+        }
+        mock_exchange.edit_order.return_value = {"id": "42", "price": 3001.0}
+        mock_binance.return_value = mock_exchange
+
+        with patch("src.trading.exchange.LEVERAGE", 5):
+            client = BinanceClient()
+
+        result = client.amend_order(
+            "42", {"side": "buy", "price": 3001.0, "quantity": 0.02}
+        )
+
+        assert result["id"] == "42"
+        mock_exchange.edit_order.assert_called_once()
+        args = mock_exchange.edit_order.call_args.args
+        assert args[0] == "42"
+        assert args[1] == "ETH/USDT:USDT"
+        assert args[3] == "buy"
+        assert args[5] == 3001.0
+        mock_exchange.cancel_order.assert_not_called()
+        mock_exchange.create_order.assert_not_called()
+
+    @patch("src.trading.exchange.ccxt.binanceusdm")
+    def test_amend_order_rejected_returns_none(self, mock_binance):
+        """Test amend_order returns None when the exchange rejects it"""
+        from ccxt import InvalidOrder
+
+        mock_exchange = MagicMock()
+        mock_exchange.load_markets.return_value = {
+            "ETH/USDT:USDT": {"id": "ETHUSDT", "symbol": "ETH/USDT:USDT"}
+        }
+        mock_exchange.edit_order.side_effect = InvalidOrder("would immediately match")
+        mock_binance.return_value = mock_exchange
+
+        with patch("src.trading.exchange.LEVERAGE", 5):
+            client = BinanceClient()
+
+        assert (
+            client.amend_order("42", {"side": "buy", "price": 3001.0, "quantity": 0.02})
+            is None
+        )
@@ -201,3 +201,56 @@ class TestFundingRateNegativeValues:
 
         assert rates["BTC/USDT:USDT"] == 0.0001
         assert rates["ETH/USDT:USDT"] == -0.00015
+
+
+class TestFetchBulkMarketData:
+    """Tests for fetch_bulk_market_data method"""
+
+    def test_fetch_bulk_market_data_single_call(self, mock_exchange):
+        """Test quotes for several symbols come from one bookTicker call"""
+        mock_exchange.exchange.markets["ETH/USDT:USDT"]["precision"] = {
+            "price": 0.01,
+            "amount": 0.001,
+        }
+        mock_exchange.exchange.fapiPublicGetTickerBookTicker.return_value = [
+            {"symbol": "BTCUSDT", "bidPrice": "50000.0", "askPrice": "50002.0"},
+            {"symbol": "ETHUSDT", "bidPrice": "3000.0", "askPrice": "3001.0"},
+            {"symbol": "SOLUSDT", "bidPrice": "0", "askPrice": "0"},
+            {"symbol": "XRPUSDT", "bidPrice": "1.0", "askPrice": "1.1"},
+        ]
+
+        symbols = ["BTC/USDT:USDT", "ETH/USDT:USDT", "SOL/USDT:USDT"]
+        data = mock_exchange.fetch_bulk_market_data(symbols)
+
+        assert set(data) == {"BTC/USDT:USDT", "ETH/USDT:USDT"}
+        assert data["BTC/USDT:USDT"]["mid_price"] == 50001.0
+        assert data["ETH/USDT:USDT"]["best_ask"] == 3001.0
+        assert data["ETH/USDT:USDT"]["tick_size"] == 0.01
+        assert data["ETH/USDT:USDT"]["step_size"] == 0.001
+        mock_exchange.exchange.fapiPublicGetTickerBookTicker.assert_called_once_with()
+
+    def test_fetch_bulk_market_data_accepts_exchange_ids(self, mock_exchange):
+        """Test bare ids ("ETHUSDT") resolve through the markets table"""
+        mock_exchange.exchange.fapiPublicGetTickerBookTicker.return_value = [
+            {"symbol": "BTCUSDT", "bidPrice": "50000.0", "askPrice": "50002.0"},
+            {"symbol": "ETHUSDT", "bidPrice": "3000.0", "askPrice": "3001.0"},
+        ]
+        mock_exchange.exchange.fapiPublicGetPremiumIndex.return_value = [
+            {"symbol": "ETHUSDT", "lastFundingRate": "0.0003"},
+        ]
+
+        data = mock_exchange.fetch_bulk_market_data(["ETHUSDT", "BTC/USDT:USDT"])
+        rates = mock_exchange.fetch_bulk_funding_rates(["ETHUSDT"])
+
+        # Keyed as requested
+        assert set(data) == {"ETHUSDT", "BTC/USDT:USDT"}
+        assert data["ETHUSDT"]["mid_price"] == 3000.5
+        assert rates == {"ETHUSDT": 0.0003}
+
+    def test_fetch_bulk_market_data_api_error(self, mock_exchange):
+        """Test API errors return no quotes"""
+        mock_exchange.exchange.fapiPublicGetTickerBookTicker.side_effect = Exception(
+            "API Error"
+        )
+
+        assert mock_exchange.fetch_bulk_market_data(["ETH/USDT:USDT"]) == {}
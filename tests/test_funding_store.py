@@ -0,0 +1,111 @@
+"""
+Unit tests for the funding-rate history store
+资金费率历史存储单元测试
+
+Owner: Agent QA
+"""
+
+import pytest
+
+from src.trading.funding import DEFAULT_INTERVAL_MS, FundingHistory, FundingRateStore
+
+HOUR_MS = 3600 * 1000
+
+
+class FakeFundingClient:
+    """Client serving settled funding history and counting calls"""
+
+    def __init__(self, history, live=None):
+        self.history = history
+        self.live = live or {}
+        self.history_calls = []
+        self.bulk_calls = 0
+
+    def fetch_funding_rate_history(self, symbol, since=None):
+        self.history_calls.append(since)
+        return [(ts, rate) for ts, rate in self.history if ts >= since]
+
+    def fetch_bulk_funding_rates(self, symbols):
+        self.bulk_calls += 1
+        return {s: self.live[s] for s in symbols if s in self.live}
+
+
+class TestFundingHistory:
+    """Test FundingHistory class / 测试 FundingHistory 类"""
+
+    def test_trend_prediction_and_carry(self):
+        """Test rising rates are detected and extrapolated"""
+        history = FundingHistory()
+        rates = [0.0001, 0.00012, 0.00014, 0.00016, 0.00018, 0.0002]
+        history.add_settled((i * 8 * HOUR_MS, r) for i, r in enumerate(rates))
+
+        snapshot = history.snapshot()
+        assert snapshot["trend"] == "rising"
+        assert snapshot["predicted_rate"] == pytest.approx(0.00022)
+        assert snapshot["interval_hours"] == 8
+        assert snapshot["annualized_carry"] == pytest.approx(
+            sum(rates) / len(rates) * 3 * 365
+        )
+        assert snapshot["daily_yield"] == pytest.approx(0.0006)
+
+    def test_live_rate_overrides_prediction(self):
+        """Test the venue's live estimate is the predicted rate"""
+        history = FundingHistory()
+        history.add_settled([(0, 0.0001), (8 * HOUR_MS, 0.0001)])
+        history.set_live(0.00005)
+
+        snapshot = history.snapshot()
+        assert snapshot["funding_rate"] == 0.00005
+        assert snapshot["predicted_rate"] == 0.00005
+        assert snapshot["trend"] == "falling"
+
+    def test_ignores_duplicate_settlements(self):
+        """Test only newer settlements are appended"""
+        history = FundingHistory()
+        assert history.add_settled([(0, 0.1), (HOUR_MS, 0.2)]) == 2
+        assert history.add_settled([(HOUR_MS, 0.2), (2 * HOUR_MS, 0.3)]) == 1
+        assert history.interval_ms() == HOUR_MS
+        assert FundingHistory().interval_ms() == DEFAULT_INTERVAL_MS
+
+
+class TestFundingRateStore:
+    """Test FundingRateStore class / 测试 FundingRateStore 类"""
+
+    def test_backfill_then_incremental_sync(self):
+        """Test history is backfilled once and then fetched after settlements"""
+        interval = 8 * HOUR_MS
+        now = 100 * interval
+        client = FakeFundingClient([(now - i * interval, 0.0001) for i in range(5, 0, -1)])
+        store = FundingRateStore()
+
+        assert store.sync_history(client, "ETH/USDT:USDT", now_ms=now) == 5
+        # Not due until the next settlement
+        assert store.sync_history(client, "ETH/USDT:USDT", now_ms=now + 1000) == 0
+        assert len(client.history_calls) == 1
+
+        client.history.append((now, 0.0002))
+        assert store.sync_history(client, "ETHUSDT", now_ms=now + interval) == 1
+        assert client.history_calls[-1] == now - interval + 1
+        assert store.get(client, "ETH/USDT:USDT")["history_count"] == 6
+
+    def test_refresh_live_serves_from_memory(self):
+        """Test bulk live rates are fetched at most once per TTL"""
+        client = FakeFundingClient([], live={"BTC/USDT:USDT": 0.0003})
+        store = FundingRateStore()
+
+        assert store.refresh_live(client, ["BTC/USDT:USDT", "ETH/USDT:USDT"])
+        assert not store.refresh_live(client, ["ETH/USDT:USDT", "BTC/USDT:USDT"])
+        assert client.bulk_calls == 1
+        assert store.get(client, "BTC/USDT:USDT")["funding_rate"] == 0.0003
+        assert store.get(client, "ETH/USDT:USDT") == {}
+
+    def test_venues_are_separate(self):
+        """Test the same symbol on different venues keeps separate histories"""
+
+        class OtherVenue(FakeFundingClient):
+            pass
+
+        store = FundingRateStore()
+        store.record_live(FakeFundingClient([]), "ETHUSDT", 0.0001)
+
+        assert store.get(OtherVenue([]), "ETHUSDT") == {}
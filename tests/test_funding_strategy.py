@@ -192,6 +192,21 @@ class TestFundingRateStrategyDynamicPrecision:
         assert orders == []
 
 
+    def test_calculate_target_orders_uses_predicted_funding(self):
+        strategy = FundingRateStrategy()
+        strategy.spread = 0.002
+        strategy.quantity = 1.0
+        strategy.skew_factor = 100.0
+
+        with_snapshot = strategy.calculate_target_orders(
+            {"mid_price": 1000.0, "funding": {"predicted_rate": 0.0001}}, 0.0
+        )
+        with_argument = strategy.calculate_target_orders({"mid_price": 1000.0}, 0.0001)
+
+        # The funding store's predicted rate takes precedence over the argument
+        assert with_snapshot == with_argument
+
+
 class TestRiskAgentFunding:
     def test_validate_skew_factor(self):
         risk = RiskAgent()
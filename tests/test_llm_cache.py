@@ -0,0 +1,194 @@
+"""
+Unit tests for the LLM response cache
+LLM 响应缓存单元测试
+
+Owner: Agent QA
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from src.ai.cache import LLMResponseCache, bucket_context, cache_key, normalize_prompt
+from src.ai.llm import LLMGateway
+
+
+class _Clock:
+    def __init__(self, t: float = 1000.0):
+        self.t = t
+
+    def __call__(self) -> float:
+        return self.t
+
+
+def _provider(response="ok", name="Gemini (gemini-3-pro)"):
+    provider = Mock()
+    provider.name = name
+    provider._model_name = "gemini-3-pro"
+    provider.generate.return_value = response
+    return provider
+
+
+class TestCacheKey:
+    """Test key normalization and bucketing / 测试键规范化和分桶"""
+
+    def test_whitespace_is_normalized(self):
+        assert cache_key("p", "m", "a  b\n c") == cache_key("p", "m", "a b c")
+        assert cache_key("p", "m", "a") != cache_key("q", "m", "a")
+        assert cache_key("p", "m", "a") != cache_key("p", "n", "a")
+
+    def test_prompt_numbers_bucketed(self):
+        assert normalize_prompt("price $3,012.5 vol 0.0312", 2) == "price $3000 vol 0.031"
+        assert cache_key("p", "m", "mid 3012.5", significant_digits=2) == cache_key(
+            "p", "m", "mid 2998.0", significant_digits=2
+        )
+        assert cache_key("p", "m", "mid 3012.5") != cache_key("p", "m", "mid 2998.0")
+
+    def test_context_bucketing(self):
+        assert bucket_context({"b": 0.01234, "a": "ETH", "n": None}, 2) == {
+            "a": "ETH",
+            "b": 0.012,
+            "n": None,
+        }
+        near = cache_key("p", "m", "mid 2501", {"mid_price": 2501.0}, significant_digits=2)
+        same = cache_key("p", "m", "mid 2497", {"mid_price": 2497.0}, significant_digits=2)
+        far = cache_key("p", "m", "mid 2700", {"mid_price": 2700.0}, significant_digits=2)
+        assert near == same
+        assert near != far
+
+    def test_default_precision_keeps_distinct_markets_apart(self):
+        prompt = "ETHUSDT mid {mid} spread {spread} bps"
+
+        def key(mid, spread):
+            context = {"symbol": "ETHUSDT", "mid_price": mid, "spread_bps": spread}
+            return cache_key("p", "m", prompt.format(mid=mid, spread=spread), context)
+
+        assert key(3012.0, 1.2) != key(3049.0, 1.2)
+        assert key(3012.4, 1.2) != key(3012.9, 1.2)
+        assert key(3012.0, 1.2) != key(3012.0, 1.5)
+        # Float noise below the precision still shares an entry
+        assert key(3012.0, 1.2) == key(3012.0000001, 1.2)
+
+
+class TestLLMResponseCache:
+    """Test LLMResponseCache class / 测试 LLMResponseCache 类"""
+
+    def test_hit_miss_and_stats(self):
+        cache = LLMResponseCache()
+        provider = _provider()
+
+        assert cache.generate(provider, "prompt") == ("ok", False)
+        assert cache.generate(provider, "prompt ") == ("ok", True)
+        provider.generate.assert_called_once_with("prompt")
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_ttl_expiry(self):
+        clock = _Clock()
+        cache = LLMResponseCache(ttl_seconds=10, clock=clock)
+        provider = _provider()
+        cache.generate(provider, "prompt")
+
+        clock.t += 11
+        assert cache.generate(provider, "prompt") == ("ok", False)
+        assert provider.generate.call_count == 2
+
+    def test_lru_eviction(self):
+        cache = LLMResponseCache(max_entries=2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.get("a")
+        cache.put("c", "3")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_errors_are_not_cached(self):
+        cache = LLMResponseCache()
+        provider = _provider()
+        provider.generate.side_effect = RuntimeError("API error")
+
+        with pytest.raises(RuntimeError):
+            cache.generate(provider, "prompt")
+        assert cache.get_stats()["entries"] == 0
+
+    def test_disk_backing_survives_restart(self, tmp_path):
+        path = str(tmp_path / "llm_cache.db")
+        first = LLMResponseCache(path=path)
+        first.generate(_provider("persisted"), "prompt")
+        first.close()
+
+        second = LLMResponseCache(path=path)
+        provider = _provider("fresh")
+        assert second.generate(provider, "prompt") == ("persisted", True)
+        provider.generate.assert_not_called()
+
+
+class TestGatewayCache:
+    """Test LLMGateway with a cache / 测试带缓存的 LLMGateway"""
+
+    def test_gateway_buckets_prompt_numbers(self):
+        provider = _provider('{"spread": 0.01}')
+        gateway = LLMGateway(
+            provider, cache=LLMResponseCache(significant_digits=2), bucket_prompt=True
+        )
+
+        gateway.generate("Performance: {'pnl': 101.2}")
+        gateway.generate("Performance: {'pnl': 100.9}")
+
+        provider.generate.assert_called_once()
+
+
+class TestEvaluatorCache:
+    """Test MultiLLMEvaluator with a cache / 测试带缓存的 MultiLLMEvaluator"""
+
+    def _evaluator(self, provider, cache):
+        from src.ai.evaluation.evaluator import MultiLLMEvaluator
+
+        return MultiLLMEvaluator([provider], simulation_steps=20, parallel=False, cache=cache)
+
+    @staticmethod
+    def _context(mid):
+        from src.ai.evaluation.schemas import MarketContext
+
+        return MarketContext(
+            symbol="ETHUSDT",
+            mid_price=mid,
+            best_bid=mid - 0.5,
+            best_ask=mid + 0.5,
+            spread_bps=4.0,
+            volatility_24h=0.03,
+            volatility_1h=0.01,
+            funding_rate=0.0001,
+            funding_rate_trend="stable",
+        )
+
+    def test_near_identical_contexts_share_responses_when_opted_in(self):
+        provider = _provider(
+            '{"recommended_strategy": "FixedSpread", "spread": 0.012, '
+            '"confidence": 0.8, "reasoning": "ok"}'
+        )
+        evaluator = self._evaluator(provider, LLMResponseCache(significant_digits=2))
+        context = self._context
+
+        first = evaluator.evaluate(context(2501.0))
+        second = evaluator.evaluate(context(2502.0))
+
+        provider.generate.assert_called_once()
+        assert not first[0].cached
+        assert second[0].cached
+        assert second[0].proposal.spread == first[0].proposal.spread
+
+    def test_distinct_markets_do_not_share_responses_by_default(self):
+        provider = _provider('{"recommended_strategy": "FixedSpread", "spread": 0.012}')
+        evaluator = self._evaluator(provider, LLMResponseCache())
+
+        evaluator.evaluate(self._context(3012.0))
+        later = evaluator.evaluate(self._context(3049.0))
+
+        assert provider.generate.call_count == 2
+        assert not later[0].cached
@@ -11,7 +11,8 @@ Tests for:
 - GeminiProvider.name property
 """
 
-from unittest.mock import Mock, patch
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
@@ -89,6 +90,26 @@ class TestOpenAIProvider:
                 with pytest.raises(RuntimeError, match="OpenAI API error"):
                     provider.generate("Test prompt")
 
+    def test_agenerate_uses_shared_async_client(self):
+        """agenerate awaits the async SDK client, shared by instances on one loop"""
+        with patch.dict("os.environ", {"OPENAI_API_KEY": "test_key"}):
+            with patch("openai.OpenAI"), patch("openai.AsyncOpenAI") as mock_async:
+                mock_response = Mock()
+                mock_response.choices = [Mock()]
+                mock_response.choices[0].message.content = "Async content"
+                mock_client = Mock()
+                mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+                mock_async.return_value = mock_client
+
+                async def run():
+                    first = await OpenAIProvider().agenerate("Test prompt")
+                    second = await OpenAIProvider().agenerate("Test prompt")
+                    return first, second
+
+                assert asyncio.run(run()) == ("Async content", "Async content")
+                mock_async.assert_called_once_with(api_key="test_key")
+                assert mock_client.chat.completions.create.await_count == 2
+
     def test_init_import_error(self):
         """Test initialization failure when openai package is not installed"""
         with patch.dict("os.environ", {"OPENAI_API_KEY": "test_key"}):
@@ -163,6 +184,18 @@ class TestClaudeProvider:
                 with pytest.raises(RuntimeError, match="Claude API error"):
                     provider.generate("Test prompt")
 
+    def test_agenerate_error(self):
+        """agenerate wraps async SDK errors like generate"""
+        with patch.dict("os.environ", {"ANTHROPIC_API_KEY": "test_key"}):
+            with patch("anthropic.Anthropic"), patch("anthropic.AsyncAnthropic") as mock_async:
+                mock_client = Mock()
+                mock_client.messages.create = AsyncMock(side_effect=Exception("API Error"))
+                mock_async.return_value = mock_client
+
+                provider = ClaudeProvider()
+                with pytest.raises(RuntimeError, match="Claude API error"):
+                    asyncio.run(provider.agenerate("Test prompt"))
+
     def test_init_import_error(self):
         """Test initialization failure when anthropic package is not installed"""
         with patch.dict("os.environ", {"ANTHROPIC_API_KEY": "test_key"}):
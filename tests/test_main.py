@@ -90,8 +90,10 @@ class TestAlphaLoop:
 
         engine = AlphaLoop()
 
-        # Run one cycle manually
+        # Run one cycle manually; analysis completes on the advisory worker
         engine.run_cycle()
+        assert engine.advisor.flush(timeout=5)
+        engine.advisor.stop(timeout=5)
 
         # Verify flow
         mock_client.fetch_market_data.assert_called()
@@ -169,6 +171,8 @@ class TestAlphaLoop:
 
         engine = AlphaLoop()
         engine.run_cycle()
+        assert engine.advisor.flush(timeout=5)
+        engine.advisor.stop(timeout=5)
 
         # Verify
         mock_risk.validate_proposal.assert_called()
@@ -821,3 +825,145 @@ class TestErrorHandlingAndAlerts:
         # At least one should have error history if error occurred
         assert len(default_instance.error_history) >= 0  # May or may not have error
         assert len(strategy_2_instance.error_history) >= 0
+
+
+class TestOrderAmend:
+    """Test that small quote moves amend resting orders in place"""
+
+    @patch("src.trading.strategy_instance.BinanceClient")
+    @patch("src.trading.engine.DataAgent")
+    @patch("src.trading.engine.QuantAgent")
+    @patch("src.trading.engine.RiskAgent")
+    def test_small_move_amends_instead_of_replacing(
+        self, mock_risk, mock_quant, mock_data, mock_client_cls
+    ):
+        mock_client = Mock()
+        mock_client.symbol = "ETH/USDT:USDT"
+        mock_client.fetch_account_data.return_value = {"balance": 10000.0}
+        mock_client.fetch_funding_rate.return_value = 0.0
+        mock_client.last_order_error = None
+        mock_client_cls.return_value = mock_client
+
+        resting = []
+
+        def place_orders(orders):
+            placed = [
+                {"id": f"o{i}", "side": o["side"], "price": o["price"], "amount": o["quantity"]}
+                for i, o in enumerate(orders)
+            ]
+            resting.extend(placed)
+            return placed
+
+        mock_client.place_orders.side_effect = place_orders
+        mock_client.fetch_open_orders.side_effect = lambda: [dict(o) for o in resting]
+        mock_client.amend_order.side_effect = lambda order_id, order: {"id": order_id}
+        mock_risk.return_value.validate_proposal.return_value = (True, "Approved")
+
+        engine = AlphaLoop()
+        instance = engine.strategy_instances["default"]
+
+        mock_client.fetch_market_data.return_value = {
+            "mid_price": 3000.0,
+            "best_bid": 2999.9,
+            "best_ask": 3000.1,
+            "timestamp": time.time() * 1000,
+        }
+        engine._run_strategy_instance_cycle(instance)
+        assert mock_client.place_orders.call_count == 1
+
+        mock_client.fetch_market_data.return_value = {
+            "mid_price": 3003.0,
+            "best_bid": 3002.9,
+            "best_ask": 3003.1,
+            "timestamp": time.time() * 1000,
+        }
+        engine._run_strategy_instance_cycle(instance)
+
+        assert mock_client.amend_order.call_count == 2
+        mock_client.cancel_orders.assert_not_called()
+        assert mock_client.place_orders.call_count == 1
+        amended_ids = {call.args[0] for call in mock_client.amend_order.call_args_list}
+        assert amended_ids == {"o0", "o1"}
+        first_buy = next(o for o in resting if o["side"] == "buy")
+        buy_record = instance.orders.get(first_buy["id"])
+        assert buy_record["price"] > first_buy["price"]
+        assert set(instance.tracked_order_ids) == {"o0", "o1"}
+
+
+class TestTickToTradeInstrumentation:
+    """Test hot-path latency instrumentation in the strategy cycle"""
+
+    @patch("src.trading.engine.tick_to_trade_tracker")
+    @patch("src.trading.strategy_instance.BinanceClient")
+    @patch("src.trading.engine.DataAgent")
+    @patch("src.trading.engine.QuantAgent")
+    @patch("src.trading.engine.RiskAgent")
+    def test_cycle_records_stage_timestamps(
+        self, mock_risk, mock_quant, mock_data, mock_client_cls, mock_tracker
+    ):
+        mock_client = Mock()
+        mock_client.symbol = "ETH/USDT:USDT"
+        mock_client.fetch_market_data.return_value = {
+            "mid_price": 3000.0,
+            "timestamp": time.time() * 1000,
+        }
+        mock_client.fetch_funding_rate.return_value = 0.0
+        mock_client.fetch_account_data.return_value = {"balance": 10000.0}
+        mock_client.fetch_open_orders.return_value = []
+        mock_client.place_orders.return_value = [
+            {"id": "1", "side": "buy", "price": 2990.0, "amount": 0.01}
+        ]
+        mock_client.last_order_error = None
+        mock_client_cls.return_value = mock_client
+
+        engine = AlphaLoop()
+        instance = engine.strategy_instances["default"]
+        engine._run_strategy_instance_cycle(instance)
+
+        timer = mock_tracker.record_timer.call_args.args[0]
+        stages = timer.stage_durations()
+        assert set(stages) == {
+            "tick_to_decision",
+            "decision_to_send",
+            "send_to_ack",
+            "tick_to_trade",
+        }
+        assert timer.tick_at == instance.market_data_received_at
+        assert stages["tick_to_trade"] >= stages["send_to_ack"]
+
+
+class TestReferencePrice:
+    """Test the Data agent's price series tracks the default symbol"""
+
+    @patch("src.trading.engine.funding_store")
+    @patch("src.trading.strategy_instance.BinanceClient")
+    @patch("src.trading.engine.QuantAgent")
+    @patch("src.trading.engine.RiskAgent")
+    def test_reference_price_follows_default_symbol(
+        self, mock_risk, mock_quant, mock_client_cls, mock_funding_store
+    ):
+        engine = AlphaLoop()
+        engine.market_data_planner = Mock()
+        engine.advisor = Mock()
+        default = engine.strategy_instances["default"]
+        default.latest_market_data = {"mid_price": 3000.0}
+        other = Mock(
+            use_real_exchange=True,
+            running=True,
+            symbol="BTCUSDT",
+            active_orders=[],
+            latest_market_data={"mid_price": 60000.0},
+        )
+        # Listed first: its price must not leak into the default series
+        engine.strategy_instances = {"btc": other, "default": default}
+
+        with patch.object(engine, "_run_strategy_instance_cycle"):
+            engine.run_cycle()
+            engine.run_cycle()
+            assert engine.data.price_history.tolist() == [3000.0, 3000.0]
+
+            default.symbol = "SOLUSDT"
+            default.latest_market_data = {"mid_price": 150.0}
+            engine.run_cycle()
+
+        assert engine.data.price_history.tolist() == [150.0]
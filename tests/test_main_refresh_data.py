@@ -194,3 +194,26 @@ class TestRefreshData:
 
             assert result is True
             assert instance.latest_market_data is not None
+
+    def test_refresh_data_uses_primed_public_data(self, mock_exchange):
+        """Test primed bulk data replaces per-symbol public calls"""
+        with patch(
+            "src.trading.strategy_instance.BinanceClient",
+            return_value=mock_exchange,
+        ):
+            instance = StrategyInstance("test_strategy", "fixed_spread")
+            instance.prime_market_data(
+                {"mid_price": 1005.0, "timestamp": time.time() * 1000}, 0.0003, 1.0
+            )
+
+            assert instance.refresh_data() is True
+            assert instance.latest_market_data["mid_price"] == 1005.0
+            assert instance.latest_funding_rate == 0.0003
+            assert instance.market_data_received_at == 1.0
+            mock_exchange.fetch_market_data.assert_not_called()
+            mock_exchange.fetch_funding_rate.assert_not_called()
+            mock_exchange.fetch_account_data.assert_called_once()
+
+            # Priming applies to one refresh only
+            instance.refresh_data()
+            mock_exchange.fetch_market_data.assert_called_once()
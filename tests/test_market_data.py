@@ -0,0 +1,129 @@
+"""
+Unit tests for the market data planner
+市场数据规划器单元测试
+
+Owner: Agent QA
+"""
+
+from unittest.mock import Mock
+
+from src.shared.market_stats import MarketStatsEngine
+from src.trading.market_data import MarketDataPlanner
+
+
+class FakeBulkClient:
+    """Client exposing bulk endpoints that counts calls"""
+
+    testnet = False
+
+    def __init__(self, quotes, funding=None):
+        self.quotes = quotes
+        self.funding = funding or {}
+        self.bulk_calls = 0
+        self.funding_calls = 0
+
+    def fetch_bulk_market_data(self, symbols):
+        self.bulk_calls += 1
+        return {s: dict(self.quotes[s]) for s in symbols if s in self.quotes}
+
+    def fetch_bulk_funding_rates(self, symbols):
+        self.funding_calls += 1
+        return {s: self.funding.get(s, 0.0) for s in symbols}
+
+
+def _instance(client, symbol):
+    instance = Mock()
+    instance.exchange = client
+    instance.symbol = symbol
+    return instance
+
+
+class TestMarketDataPlanner:
+    """Test MarketDataPlanner class / 测试 MarketDataPlanner 类"""
+
+    def test_groups_venue_into_one_batch(self):
+        """Test instances on one venue share a bulk call"""
+        quotes = {
+            "ETH/USDT:USDT": {"mid_price": 3000.0},
+            "BTC/USDT:USDT": {"mid_price": 50000.0},
+        }
+        clients = [FakeBulkClient(quotes, {"ETH/USDT:USDT": 0.0001}) for _ in range(3)]
+        instances = [
+            _instance(clients[0], "ETH/USDT:USDT"),
+            _instance(clients[1], "BTC/USDT:USDT"),
+            _instance(clients[2], "ETH/USDT:USDT"),
+        ]
+
+        primed = MarketDataPlanner().refresh(instances)
+
+        assert primed == 3
+        assert sum(c.bulk_calls for c in clients) == 1
+        assert sum(c.funding_calls for c in clients) == 1
+        market_data, funding_rate, _ = instances[2].prime_market_data.call_args[0]
+        assert market_data == {"mid_price": 3000.0}
+        assert funding_rate == 0.0001
+        # Instances sharing a symbol get separate copies
+        assert (
+            instances[0].prime_market_data.call_args[0][0]
+            is not instances[2].prime_market_data.call_args[0][0]
+        )
+
+    def test_funding_in_quotes_skips_funding_call(self):
+        """Test venues that return funding with quotes need one call"""
+        quotes = {
+            "ETH": {"mid_price": 3000.0, "funding_rate": 0.0002},
+            "BTC": {"mid_price": 50000.0, "funding_rate": 0.0},
+        }
+        client = FakeBulkClient(quotes)
+
+        MarketDataPlanner().refresh([_instance(client, "ETH"), _instance(client, "BTC")])
+
+        assert client.bulk_calls == 1
+        assert client.funding_calls == 0
+
+    def test_single_symbol_and_missing_quotes_use_per_symbol_refresh(self):
+        """Test small venues and unquoted symbols are not primed"""
+        client = FakeBulkClient({"ETH": {"mid_price": 3000.0}})
+        single = _instance(client, "ETH")
+
+        assert MarketDataPlanner().refresh([single]) == 0
+        single.prime_market_data.assert_not_called()
+
+        missing = _instance(client, "DOGE")
+        assert MarketDataPlanner().refresh([single, missing]) == 1
+        missing.prime_market_data.assert_not_called()
+
+    def test_clients_without_bulk_endpoints_are_skipped(self):
+        """Test clients lacking bulk endpoints are left alone"""
+        instances = [_instance(Mock(), "ETH"), _instance(Mock(), "BTC")]
+
+        assert MarketDataPlanner().plan(instances) == []
+
+    def test_market_stats_fed_once_per_symbol_per_cycle(self):
+        """Test shared symbols feed the stats once, however many instances"""
+        quotes = {"ETH": {"mid_price": 3000.0}, "BTC": {"mid_price": 50000.0}}
+        client = FakeBulkClient(quotes)
+        stats = Mock(wraps=MarketStatsEngine())
+        planner = MarketDataPlanner(stats=stats)
+        instances = [_instance(client, s) for s in ("ETH", "BTC", "ETH", "ETH")]
+
+        planner.refresh(instances)
+        for instance in instances:
+            planner.observe(instance.symbol, quotes[instance.symbol])
+
+        assert sorted(c.args[0] for c in stats.update.call_args_list) == ["BTC", "ETH"]
+
+        # The next cycle feeds each symbol again
+        planner.refresh(instances)
+        assert stats.update.call_count == 4
+
+    def test_observe_feeds_per_symbol_refreshes_once(self):
+        """Test instances outside bulk batches feed the stats via observe"""
+        stats = MarketStatsEngine()
+        planner = MarketDataPlanner(stats=stats)
+        planner.refresh([])
+
+        planner.observe("ETH/USDT:USDT", {"mid_price": 3000.0})
+        planner.observe("ETHUSDT", {"mid_price": 3100.0})
+
+        assert stats.get("ETHUSDT")["mid_price"] == 3000.0
@@ -1,7 +1,13 @@
 import numpy as np
 import pytest
 
-from src.shared.metrics.definitions import FillRate, SharpeRatio, Slippage
+from src.shared.latency import LatencyTracker
+from src.shared.metrics.definitions import (
+    FillRate,
+    SharpeRatio,
+    Slippage,
+    TickToTradeLatency,
+)
 
 
 class TestSharpeRatio:
@@ -40,3 +46,21 @@ class TestFillRate:
     def test_calculate(self):
         metric = FillRate("fill_rate", {})
         assert metric.calculate({}) == 0.85  # Mock value
+
+
+class TestTickToTradeLatency:
+    def test_calculate_without_samples(self):
+        metric = TickToTradeLatency("t2t", {}, tracker=LatencyTracker())
+        assert metric.calculate({}) is None
+
+    def test_calculate_reports_measured_percentile(self):
+        tracker = LatencyTracker()
+        for ms in range(1, 101):
+            tracker.record("tick_to_trade", ms / 1000)
+
+        p50 = TickToTradeLatency("t2t", {}, tracker=tracker).calculate({})
+        assert p50 == pytest.approx(50.0, rel=0.03)
+        p99 = TickToTradeLatency("t2t", {"percentile": 99}, tracker=tracker)
+        assert p99.calculate({}) == pytest.approx(99.0, rel=0.03)
+        summary = p99.get_percentiles()["tick_to_trade"]
+        assert summary["p90_ms"] == pytest.approx(90.0, rel=0.03)
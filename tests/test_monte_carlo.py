@@ -0,0 +1,197 @@
+"""
+Unit tests for the Monte Carlo proposal simulator
+蒙特卡洛建议模拟器单元测试
+
+Owner: Agent QA
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from src.ai.evaluation.evaluator import MultiLLMEvaluator
+from src.ai.evaluation.monte_carlo import (
+    MonteCarloSimulator,
+    simulate_fixed_spread,
+    simulate_quotes,
+    summarize,
+)
+from src.ai.evaluation.schemas import (
+    EvaluationResult,
+    MarketContext,
+    SimulationResult,
+    StrategyProposal,
+)
+
+
+def _context():
+    return MarketContext(
+        symbol="ETH/USDT:USDT",
+        mid_price=2500.0,
+        best_bid=2499.5,
+        best_ask=2500.5,
+        spread_bps=4.0,
+        volatility_24h=0.03,
+        volatility_1h=0.01,
+        funding_rate=0.0001,
+        funding_rate_trend="stable",
+    )
+
+
+def _proposal(spread, quantity=0.1, confidence=0.8, strategy="FixedSpread", skew=100.0):
+    return StrategyProposal(
+        recommended_strategy=strategy,
+        spread=spread,
+        skew_factor=skew,
+        quantity=quantity,
+        confidence=confidence,
+        provider_name="Test",
+        parse_success=True,
+    )
+
+
+class TestFixedSpreadKernel:
+    def test_round_trip_realizes_spread(self):
+        # Down through the bid, back up through the ask
+        prices = np.array([[100.0, 98.0, 100.0]])
+        metrics = simulate_fixed_spread(prices, spreads=[0.02], quantities=[1.0])
+
+        # Buy at 99.0, sell at 98.0 * 1.01 = 98.98
+        assert metrics["realized_pnl"][0, 0] == np.float64(98.98 - 99.0)
+        assert metrics["total_trades"][0, 0] == 1
+        assert metrics["winning_trades"][0, 0] == 0
+        assert metrics["max_drawdown"][0, 0] > 0
+
+    def test_no_fill_inside_spread(self):
+        prices = np.array([[100.0, 100.2, 99.9, 100.0]])
+        metrics = simulate_fixed_spread(prices, spreads=[0.01], quantities=[1.0])
+
+        assert metrics["total_trades"][0, 0] == 0
+        assert metrics["realized_pnl"][0, 0] == 0.0
+        assert metrics["sharpe_ratio"][0, 0] == 0.0
+
+    def test_summarize_confidence_interval(self):
+        stats = summarize(np.array([[1.0, 3.0], [2.0, 2.0]]))
+
+        assert list(stats.mean) == [2.0, 2.0]
+        assert stats.ci_low[0] < 2.0 < stats.ci_high[0]
+        assert stats.ci_low[1] == stats.ci_high[1] == 2.0
+
+
+    def test_funding_skew_shifts_quotes(self):
+        # Positive funding pushes both quotes down: the ask now fills, the bid does not
+        prices = np.array([[100.0, 100.45]])
+        rates = np.array([[0.001, 0.001]])
+        plain = simulate_quotes(prices, [0.01], [1.0], funding_rates=rates)
+        skewed = simulate_quotes(
+            prices, [0.01], [1.0], skew_factors=[3.0], funding_rates=rates, funding_interval=0
+        )
+
+        assert plain["total_pnl"][0, 0] == 0.0
+        # Short 1 @ 100.5 - 0.3, marked at 100.45
+        assert skewed["total_pnl"][0, 0] == pytest.approx(100.2 - 100.45)
+
+    def test_funding_paid_on_position(self):
+        # Buy at 99 on the first step, hold a long through a positive funding settlement
+        prices = np.array([[100.0, 98.0, 98.0]])
+        rates = np.full((1, 3), 0.001)
+        metrics = simulate_quotes(
+            prices, [0.02], [1.0], funding_rates=rates, funding_interval=2
+        )
+
+        assert metrics["funding_pnl"][0, 0] == -98.0 * 0.001
+        assert metrics["realized_pnl"][0, 0] == metrics["funding_pnl"][0, 0]
+
+
+class TestMonteCarloSimulator:
+    def test_common_random_numbers_across_calls(self):
+        simulator = MonteCarloSimulator(paths=200, steps=100, seed=7)
+        batch = simulator.run([(0.005, 0.1), (0.01, 0.1)], 2500.0, 0.01)
+        alone = simulator.run([(0.01, 0.1)], 2500.0, 0.01)
+
+        assert alone[0] == batch[1]
+
+    def test_seed_reproducible(self):
+        first = MonteCarloSimulator(paths=50, steps=50, seed=1).run(
+            [(0.005, 0.1)], 2500.0, 0.01
+        )
+        second = MonteCarloSimulator(paths=50, steps=50, seed=1).run(
+            [(0.005, 0.1)], 2500.0, 0.01
+        )
+        assert first == second
+
+    def test_reports_confidence_intervals(self):
+        simulator = MonteCarloSimulator(paths=300, steps=200, seed=3)
+        (summary,) = simulator.run([(0.005, 0.1)], 2500.0, 0.01)
+
+        for metric in ("realized_pnl", "sharpe_ratio", "max_drawdown"):
+            low, high = summary["confidence_intervals"][metric]
+            assert low <= summary[metric] <= high
+        assert summary["total_trades"] > 0
+        assert 0 <= summary["win_rate"] <= 1
+
+    def test_strategies_side_by_side_on_identical_paths(self):
+        simulator = MonteCarloSimulator(paths=200, steps=160, seed=5)
+        fixed, skewed = simulator.run(
+            [(0.004, 0.1), (0.004, 0.1, 200.0)], 2500.0, 0.01, funding_rate=0.0005
+        )
+        # Funding-free run on the same price shocks
+        (no_funding,) = simulator.run([(0.004, 0.1)], 2500.0, 0.01)
+
+        assert fixed != skewed
+        assert fixed["funding_pnl"] != 0.0
+        # Funding never moves FixedSpread quotes, only its cash flows
+        assert fixed["realized_pnl"] - fixed["funding_pnl"] == pytest.approx(
+            no_funding["realized_pnl"] - no_funding["funding_pnl"]
+        )
+        # Leaning short into positive funding collects it
+        assert skewed["funding_pnl"] > fixed["funding_pnl"]
+
+    def test_thousand_paths_five_proposals_under_a_second(self):
+        evaluator = MultiLLMEvaluator(
+            providers=[], simulation_steps=500, simulation_paths=1000, simulation_seed=0
+        )
+        proposals = [_proposal(s) for s in (0.002, 0.005, 0.01, 0.02)]
+        proposals.append(_proposal(0.01, strategy="FundingRate"))
+
+        started = time.perf_counter()
+        results = evaluator.simulate_proposals(proposals, _context())
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 1.0
+        assert len(results) == 5
+        assert all(r.paths == 1000 and r.simulation_steps == 500 for r in results)
+
+
+class TestMonteCarloScoring:
+    def test_uncertain_pnl_ranked_below_certain_pnl(self):
+        evaluator = MultiLLMEvaluator(providers=[])
+        certain = SimulationResult(
+            realized_pnl=20.0,
+            confidence_intervals={"realized_pnl": [18.0, 22.0]},
+        )
+        uncertain = SimulationResult(
+            realized_pnl=20.0,
+            confidence_intervals={"realized_pnl": [-60.0, 100.0]},
+        )
+        results = evaluator._score_and_rank(
+            [
+                EvaluationResult("wide", _proposal(0.01), uncertain),
+                EvaluationResult("narrow", _proposal(0.01), certain),
+            ]
+        )
+
+        assert [r.provider_name for r in results] == ["narrow", "wide"]
+
+    def test_drawdown_penalized(self):
+        evaluator = MultiLLMEvaluator(providers=[])
+        results = evaluator._score_and_rank(
+            [
+                EvaluationResult("deep", _proposal(0.01), SimulationResult(max_drawdown=80.0)),
+                EvaluationResult("shallow", _proposal(0.01), SimulationResult(max_drawdown=5.0)),
+            ]
+        )
+
+        assert results[0].provider_name == "shallow"
+        assert results[0].score > results[1].score
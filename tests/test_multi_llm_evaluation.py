@@ -679,6 +679,354 @@ class TestUSML006_LatencyMeasurement:
 # ============================================================================
 
 
+class TestEvaluationDeadlines:
+    """Per-provider timeouts, hedging, quorum and latency budget"""
+
+    RESPONSE = '{"recommended_strategy": "FixedSpread", "spread": 0.01, "confidence": 0.8}'
+
+    @pytest.fixture
+    def sample_market_context(self):
+        from src.ai.evaluation.schemas import MarketContext
+
+        return MarketContext(
+            symbol="ETHUSDT",
+            mid_price=2500.0,
+            best_bid=2499.5,
+            best_ask=2500.5,
+            spread_bps=4.0,
+            volatility_24h=0.035,
+            volatility_1h=0.012,
+            funding_rate=0.0001,
+            funding_rate_trend="stable",
+        )
+
+    def _provider(self, name, delay=0.0):
+        provider = Mock()
+        provider.name = name
+
+        def generate(prompt):
+            time.sleep(delay)
+            return self.RESPONSE
+
+        provider.generate.side_effect = generate
+        return provider
+
+    def test_provider_timeout_returns_timeout_result(self, sample_market_context):
+        from src.ai.evaluation.evaluator import MultiLLMEvaluator
+
+        fast = self._provider("Fast")
+        slow = self._provider("Slow", delay=1.0)
+        evaluator = MultiLLMEvaluator(
+            providers=[fast, slow], simulation_steps=20, provider_timeout=0.2
+        )
+
+        started = time.time()
+        results = evaluator.evaluate(sample_market_context)
+
+        assert time.time() - started < 0.9
+        by_name = {r.provider_name: r for r in results}
+        assert by_name["Fast"].status == "ok"
+        assert by_name["Slow"].status == "timeout"
+        assert by_name["Slow"].proposal.parse_success is False
+
+    def test_quorum_returns_early_and_streams_late_results(self, sample_market_context):
+        import threading
+
+        from src.ai.evaluation.evaluator import MultiLLMEvaluator
+
+        late = []
+        delivered = threading.Event()
+
+        def on_late(result):
+            late.append(result)
+            delivered.set()
+
+        evaluator = MultiLLMEvaluator(
+            providers=[self._provider("A"), self._provider("B", delay=0.5)],
+            simulation_steps=20,
+            quorum=1,
+            on_late_result=on_late,
+        )
+
+        started = time.time()
+        results = evaluator.evaluate(sample_market_context)
+
+        assert time.time() - started < 0.4
+        assert [r.provider_name for r in results] == ["A"]
+        assert evaluator.pending_providers == ["B"]
+        assert delivered.wait(5)
+        assert late[0].provider_name == "B"
+        assert late[0].proposal.parse_success is True
+
+    def test_latency_budget_returns_partial_results(self, sample_market_context):
+        from src.ai.evaluation.evaluator import MultiLLMEvaluator
+
+        evaluator = MultiLLMEvaluator(
+            providers=[self._provider("A"), self._provider("B", delay=1.0)],
+            simulation_steps=20,
+        )
+
+        started = time.time()
+        results = evaluator.evaluate(sample_market_context, latency_budget=0.2)
+
+        assert time.time() - started < 0.9
+        assert [r.provider_name for r in results] == ["A"]
+        assert evaluator.pending_providers == ["B"]
+
+    def test_hedged_request_wins_for_slow_provider(self, sample_market_context):
+        from src.ai.evaluation.evaluator import MultiLLMEvaluator
+
+        calls = []
+        provider = Mock()
+        provider.name = "Flaky"
+
+        def generate(prompt):
+            calls.append(prompt)
+            # First attempt stalls, the hedge answers immediately
+            if len(calls) == 1:
+                time.sleep(1.0)
+            return self.RESPONSE
+
+        provider.generate.side_effect = generate
+        evaluator = MultiLLMEvaluator(
+            providers=[provider, self._provider("Other")],
+            simulation_steps=20,
+            hedge_after=0.1,
+        )
+
+        started = time.time()
+        results = evaluator.evaluate(sample_market_context)
+
+        assert time.time() - started < 0.9
+        assert len(calls) == 2
+        assert all(r.proposal.parse_success for r in results)
+
+
+class TestAsyncEvaluation:
+    """asyncio evaluation path (aevaluate / LLMProvider.agenerate)"""
+
+    RESPONSE = TestEvaluationDeadlines.RESPONSE
+
+    @pytest.fixture
+    def sample_market_context(self):
+        from src.ai.evaluation.schemas import MarketContext
+
+        return MarketContext(
+            symbol="ETHUSDT",
+            mid_price=2500.0,
+            best_bid=2499.5,
+            best_ask=2500.5,
+            spread_bps=4.0,
+            volatility_24h=0.035,
+            volatility_1h=0.012,
+            funding_rate=0.0001,
+            funding_rate_trend="stable",
+        )
+
+    def _provider(self, name, delay=0.0, calls=None):
+        import asyncio
+
+        from src.ai.llm import LLMProvider
+
+        response = self.RESPONSE
+
+        class AsyncProvider(LLMProvider):
+            @property
+            def name(self):
+                return name
+
+            def generate(self, prompt):
+                raise AssertionError("async path must not call generate")
+
+            async def agenerate(self, prompt):
+                if calls is not None:
+                    calls.append(name)
+                await asyncio.sleep(delay(len(calls)) if callable(delay) else delay)
+                return response
+
+        return AsyncProvider()
+
+    def test_providers_awaited_concurrently(self, sample_market_context):
+        import asyncio
+        import threading
+
+        from src.ai.evaluation.evaluator import MultiLLMEvaluator
+
+        evaluator = MultiLLMEvaluator(
+            providers=[self._provider(n, delay=0.3) for n in ("A", "B", "C")],
+            simulation_steps=20,
+        )
+        threads_before = threading.active_count()
+
+        started = time.time()
+        results = asyncio.run(evaluator.aevaluate(sample_market_context))
+
+        assert time.time() - started < 0.8
+        assert sorted(r.provider_name for r in results) == ["A", "B", "C"]
+        assert all(r.simulation.simulation_steps == 20 for r in results)
+        assert [r.rank for r in results] == [1, 2, 3]
+        assert threading.active_count() <= threads_before + 1
+
+    def test_many_symbols_concurrently(self, sample_market_context):
+        import asyncio
+        from dataclasses import replace
+
+        from src.ai.evaluation.evaluator import MultiLLMEvaluator
+
+        evaluator = MultiLLMEvaluator(
+            providers=[self._provider("A", delay=0.2)], simulation_steps=20
+        )
+        contexts = [replace(sample_market_context, symbol=f"SYM{i}") for i in range(10)]
+
+        async def run_all():
+            return await asyncio.gather(*(evaluator.aevaluate(c) for c in contexts))
+
+        started = time.time()
+        batches = asyncio.run(run_all())
+
+        assert time.time() - started < 1.0
+        assert all(len(results) == 1 for results in batches)
+
+    def test_timeout_quorum_and_late_result(self, sample_market_context):
+        import asyncio
+
+        from src.ai.evaluation.evaluator import MultiLLMEvaluator
+
+        late = []
+        evaluator = MultiLLMEvaluator(
+            providers=[
+                self._provider("Fast"),
+                self._provider("Late", delay=0.2),
+                self._provider("Stuck", delay=5.0),
+            ],
+            simulation_steps=20,
+            provider_timeout=0.4,
+            quorum=1,
+            on_late_result=late.append,
+        )
+
+        async def run():
+            pending = []
+            results = await evaluator.aevaluate(sample_market_context, pending=pending)
+            await asyncio.sleep(0.6)  # Let the stragglers resolve
+            return results, pending
+
+        results, pending = asyncio.run(run())
+
+        assert [r.provider_name for r in results] == ["Fast"]
+        assert sorted(pending) == ["Late", "Stuck"]
+        by_name = {r.provider_name: r for r in late}
+        assert by_name["Late"].status == "ok"
+        assert by_name["Late"].simulation.simulation_steps == 20
+        assert by_name["Stuck"].status == "timeout"
+
+    def test_hedged_request_wins(self, sample_market_context):
+        import asyncio
+
+        from src.ai.evaluation.evaluator import MultiLLMEvaluator
+
+        calls = []
+        # First attempt stalls, the hedge answers immediately
+        provider = self._provider(
+            "Flaky", delay=lambda n: 5.0 if n == 1 else 0.0, calls=calls
+        )
+        evaluator = MultiLLMEvaluator(
+            providers=[provider], simulation_steps=20, hedge_after=0.1
+        )
+
+        started = time.time()
+        results = asyncio.run(evaluator.aevaluate(sample_market_context))
+
+        assert time.time() - started < 0.9
+        assert len(calls) == 2
+        assert results[0].proposal.parse_success
+
+    def test_sync_only_provider_falls_back_to_thread(self, sample_market_context):
+        import asyncio
+
+        from src.ai.evaluation.evaluator import MultiLLMEvaluator
+
+        provider = Mock()
+        provider.name = "Legacy"
+        provider.generate.return_value = self.RESPONSE
+        evaluator = MultiLLMEvaluator(providers=[provider], simulation_steps=20)
+
+        results = asyncio.run(evaluator.aevaluate(sample_market_context))
+
+        provider.generate.assert_called_once()
+        assert results[0].proposal.parse_success
+
+
+class TestBatchEvaluation:
+    """Multi-symbol evaluation with one prompt per provider"""
+
+    def _contexts(self):
+        from src.ai.evaluation.schemas import MarketContext
+
+        return [
+            MarketContext(
+                symbol=symbol,
+                mid_price=price,
+                best_bid=price * 0.9999,
+                best_ask=price * 1.0001,
+                spread_bps=2.0,
+                volatility_24h=0.03,
+                volatility_1h=0.01,
+                funding_rate=0.0001,
+                funding_rate_trend="stable",
+            )
+            for symbol, price in (("ETHUSDT", 2500.0), ("BTCUSDT", 65000.0))
+        ]
+
+    def test_one_call_per_provider_for_all_symbols(self):
+        import json
+
+        from src.ai.evaluation.evaluator import MultiLLMEvaluator
+
+        provider = Mock()
+        provider.name = "A"
+        provider.generate.return_value = "```json\n" + json.dumps(
+            [
+                {"symbol": "ETHUSDT", "spread": 0.01, "confidence": 0.8},
+                {"symbol": "btc-usdt", "recommended_strategy": "FundingRate", "spread": 0.02},
+            ]
+        ) + "\n```"
+        evaluator = MultiLLMEvaluator(providers=[provider], simulation_steps=20)
+
+        by_symbol = evaluator.evaluate_batch(self._contexts())
+
+        provider.generate.assert_called_once()
+        assert set(by_symbol) == {"ETHUSDT", "BTCUSDT"}
+        eth, btc = by_symbol["ETHUSDT"][0], by_symbol["BTCUSDT"][0]
+        assert eth.proposal.spread == 0.01 and eth.proposal.parse_success
+        assert btc.proposal.recommended_strategy == "FundingRate"
+        assert btc.simulation.simulation_steps == 20 and btc.rank == 1
+
+    def test_missing_symbol_and_failed_provider(self):
+        import json
+
+        from src.ai.evaluation.evaluator import MultiLLMEvaluator
+
+        partial = Mock()
+        partial.name = "Partial"
+        partial.generate.return_value = "Sure! " + json.dumps(
+            [{"symbol": "ETHUSDT", "spread": 0.01}]
+        ) + " Hope this helps."
+        broken = Mock()
+        broken.name = "Broken"
+        broken.generate.side_effect = RuntimeError("down")
+        evaluator = MultiLLMEvaluator(providers=[partial, broken], simulation_steps=20)
+
+        by_symbol = evaluator.evaluate_batch(self._contexts())
+
+        eth = {r.provider_name: r for r in by_symbol["ETHUSDT"]}
+        btc = {r.provider_name: r for r in by_symbol["BTCUSDT"]}
+        assert eth["Partial"].proposal.parse_success
+        assert "No proposal for BTCUSDT" in btc["Partial"].proposal.parse_error
+        assert eth["Broken"].status == "error" and btc["Broken"].status == "error"
+        assert eth["Broken"].rank == 2
+
+
 class TestMarketContext:
     """测试市场上下文数据模型"""
 
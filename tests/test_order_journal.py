@@ -0,0 +1,182 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import server
+from src.trading.order_journal import OrderJournal
+
+
+def _order(order_id, **overrides):
+    order = {
+        "id": order_id,
+        "symbol": "ETH/USDT:USDT",
+        "side": "buy",
+        "price": 2000.0,
+        "quantity": 0.1,
+        "status": "placed",
+        "timestamp": time.time(),
+        "strategy_id": "default",
+        "strategy_type": "fixed_spread",
+    }
+    order.update(overrides)
+    return order
+
+
+class TestOrderJournal:
+    """Test cases for OrderJournal"""
+
+    def setup_method(self):
+        self.journal = OrderJournal(":memory:")
+
+    def test_record_and_get_order(self):
+        self.journal.record_order(_order("1"))
+
+        order = self.journal.get_order("1")
+        assert order["id"] == "1"
+        assert order["status"] == "placed"
+        assert order["strategy_id"] == "default"
+
+    def test_update_status_by_id(self):
+        self.journal.record_order(_order("1"))
+        self.journal.record_order(_order("2"))
+
+        self.journal.update_status("1", "cancelled")
+
+        assert self.journal.get_order("1")["status"] == "cancelled"
+        assert self.journal.get_order("2")["status"] == "placed"
+        events = self.journal.get_order_events("1")
+        assert [e["event"] for e in events] == ["placed", "status"]
+
+    def test_updates_skip_orders_without_exchange_id(self):
+        self.journal.record_order(_order(None))
+        self.journal.record_order(_order(None, side="sell"))
+
+        self.journal.update_status("unknown", "cancelled")
+        self.journal.record_amend("unknown", 1.0, 1.0)
+
+        orders = self.journal.query_orders()
+        assert [o["id"] for o in orders] == ["unknown", "unknown"]
+        assert {o["status"] for o in orders} == {"placed"}
+        assert {o["price"] for o in orders} == {2000.0}
+
+    def test_record_amend_updates_price_and_size(self):
+        self.journal.record_order(_order("1"))
+
+        self.journal.record_amend("1", 2001.0, 0.2)
+
+        order = self.journal.get_order("1")
+        assert order["price"] == 2001.0
+        assert order["quantity"] == 0.2
+        assert order["status"] == "placed"
+        events = self.journal.get_order_events("1")
+        assert [e["event"] for e in events] == ["placed", "amended"]
+
+    def test_query_orders_filters_and_sorts_newest_first(self):
+        now = time.time()
+        self.journal.record_order(_order("1", timestamp=now - 20))
+        self.journal.record_order(
+            _order("2", timestamp=now - 10, strategy_type="funding_rate")
+        )
+        self.journal.record_order(
+            _order("3", timestamp=now, symbol="BTC/USDT:USDT", strategy_id="s2")
+        )
+
+        assert [o["id"] for o in self.journal.query_orders()] == ["3", "2", "1"]
+        assert [
+            o["id"] for o in self.journal.query_orders(symbol="ETH/USDT:USDT")
+        ] == ["2", "1"]
+        assert [
+            o["id"] for o in self.journal.query_orders(strategy_type="funding_rate")
+        ] == ["2"]
+        assert [o["id"] for o in self.journal.query_orders(strategy_id="s2")] == [
+            "3"
+        ]
+        assert [
+            o["id"] for o in self.journal.query_orders(from_time=now - 15)
+        ] == ["3", "2"]
+
+    def test_query_orders_pagination(self):
+        now = time.time()
+        for i in range(5):
+            self.journal.record_order(_order(str(i), timestamp=now + i))
+
+        page = self.journal.query_orders(limit=2, offset=1)
+        assert [o["id"] for o in page] == ["3", "2"]
+
+    def test_record_and_query_errors(self):
+        self.journal.record_error(
+            {
+                "timestamp": time.time(),
+                "symbol": "ETH/USDT:USDT",
+                "type": "invalid_order",
+                "message": "bad",
+                "details": {"raw_error": "x"},
+                "strategy_id": "default",
+                "strategy_type": "fixed_spread",
+                "trace_id": "req_1",
+            }
+        )
+
+        errors = self.journal.query_errors(error_type="invalid_order")
+        assert len(errors) == 1
+        assert errors[0]["details"] == {"raw_error": "x"}
+        assert errors[0]["trace_id"] == "req_1"
+        assert self.journal.query_errors(error_type="cycle_error") == []
+
+    def test_history_survives_reopen(self, tmp_path):
+        path = str(tmp_path / "journal.db")
+        journal = OrderJournal(path)
+        journal.record_order(_order("1"))
+        journal.update_status("1", "cancelled")
+        journal.close()
+
+        reopened = OrderJournal(path)
+        assert reopened.get_order("1")["status"] == "cancelled"
+
+    def test_unserializable_values_do_not_raise(self):
+        self.journal.record_order(_order("1", quantity=object()))
+        assert self.journal.get_order("1") is None
+
+
+class _JournalBotEngine:
+    def __init__(self, journal):
+        self.order_journal = journal
+        self.order_history = []
+        self.error_history = []
+
+
+def test_order_history_endpoint_reads_journal(monkeypatch):
+    journal = OrderJournal(":memory:")
+    now = time.time()
+    for i in range(3):
+        journal.record_order(_order(str(i), timestamp=now + i))
+    journal.update_status("0", "cancelled")
+    monkeypatch.setattr(server, "bot_engine", _JournalBotEngine(journal))
+
+    client = TestClient(server.app)
+    resp = client.get("/api/order-history", params={"status": "cancelled"})
+    assert resp.status_code == 200
+    assert [o["id"] for o in resp.json()] == ["0"]
+
+    resp = client.get("/api/order-history", params={"limit": 1})
+    assert [o["id"] for o in resp.json()] == ["2"]
+
+
+def test_engine_opens_journal_lazily_at_injected_path(tmp_path):
+    from unittest.mock import patch
+
+    from src.trading.engine import AlphaLoop
+
+    path = tmp_path / "journal.db"
+    with patch("src.trading.strategy_instance.BinanceClient"), patch(
+        "src.trading.engine.DataAgent"
+    ), patch("src.trading.engine.QuantAgent"), patch("src.trading.engine.RiskAgent"):
+        engine = AlphaLoop(order_journal_path=str(path))
+
+    # Constructing the engine does not touch the disk
+    assert not path.exists()
+
+    engine.order_journal.record_order(_order("1"))
+    assert path.exists()
+    assert engine.order_journal.get_order("1")["id"] == "1"
@@ -153,3 +153,109 @@ class TestOrderManager:
         assert len(to_cancel) == 1
         assert len(to_place) == 1
         assert to_place[0]["side"] == "sell"
+
+    def test_sync_orders_tick_relative_tolerance(self):
+        """Test tolerance scales with the market tick size"""
+        current_orders = [
+            {"id": "1", "side": "buy", "price": 0.012340, "quantity": 1000},
+        ]
+        target_orders = [{"side": "buy", "price": 0.012345, "quantity": 1000}]
+
+        # Default 0.01 tolerance would hide a 5-tick move on a 1e-6 tick market
+        to_cancel, to_place = self.om.sync_orders(
+            current_orders, target_orders, tick_size=0.000001
+        )
+        assert to_cancel == ["1"]
+        assert len(to_place) == 1
+
+        to_cancel, to_place = self.om.sync_orders(
+            current_orders, [{"side": "buy", "price": 0.012341, "quantity": 1000}],
+            tick_size=0.000001,
+        )
+        assert to_cancel == []
+        assert to_place == []
+
+
+class TestOrderManagerLadder:
+    """Test cases for multi-level ladder diffing"""
+
+    def setup_method(self):
+        self.om = OrderManager()
+
+    @staticmethod
+    def _ladder(side, prices, with_ids=False):
+        return [
+            {
+                **({"id": f"{side}{i}"} if with_ids else {}),
+                "side": side,
+                "price": price,
+                "quantity": 0.02,
+            }
+            for i, price in enumerate(prices)
+        ]
+
+    def test_shifted_ladder_keeps_overlapping_levels(self):
+        """Levels that still exist after a shift keep their queue priority"""
+        current = self._ladder("buy", [3000.0, 2999.0, 2998.0], with_ids=True)
+        target = self._ladder("buy", [2999.0, 2998.0, 2997.0])
+
+        diff = self.om.diff_orders(current, target)
+
+        assert [o["id"] for o in diff.keep] == ["buy1", "buy2"]
+        assert [(c["id"], t["price"]) for c, t in diff.amend] == [("buy0", 2997.0)]
+        assert diff.cancel == []
+        assert diff.place == []
+
+    def test_extra_levels_cancelled_and_missing_levels_placed(self):
+        current = self._ladder("sell", [3010.0, 3011.0, 3012.0], with_ids=True)
+        target = self._ladder("sell", [3010.0])
+
+        diff = self.om.diff_orders(current, target)
+        assert [o["id"] for o in diff.keep] == ["sell0"]
+        assert sorted(diff.cancel) == ["sell1", "sell2"]
+
+        diff = self.om.diff_orders(current[:1], self._ladder("sell", [3010.0, 3011.0]))
+        assert [o["price"] for o in diff.place] == [3011.0]
+
+    def test_unsorted_input_is_matched_by_level(self):
+        current = self._ladder("buy", [2998.0, 3000.0, 2999.0], with_ids=True)
+        target = self._ladder("buy", [3000.0, 2998.0, 2999.0])
+
+        to_cancel, to_place = self.om.sync_orders(current, target)
+        assert to_cancel == []
+        assert to_place == []
+
+    def test_size_change_detected_when_enabled(self):
+        om = OrderManager(size_tolerance=0.05)
+        current = self._ladder("buy", [3000.0], with_ids=True)
+        target = [{"side": "buy", "price": 3000.0, "quantity": 0.04}]
+
+        diff = om.diff_orders(current, target)
+        assert len(diff.amend) == 1
+        assert self.om.diff_orders(current, target).keep == current
+
+    def test_large_ladder(self):
+        current = self._ladder("buy", [3000.0 - i for i in range(50)], with_ids=True)
+        target = self._ladder("buy", [2990.0 - i for i in range(50)])
+
+        diff = self.om.diff_orders(current, target)
+        assert len(diff.keep) == 40
+        # Top levels move 50.0 deeper (~1.7%), beyond the 1% amend bound
+        assert len(diff.replace) == 10
+
+    def test_large_move_is_replaced_not_amended(self):
+        current = self._ladder("sell", [3010.0], with_ids=True)
+        target = self._ladder("sell", [3100.0])
+
+        diff = self.om.diff_orders(current, target)
+        assert diff.amend == []
+        assert len(diff.replace) == 1
+
+    def test_sync_orders_flattens_amends(self):
+        current = self._ladder("buy", [3000.0], with_ids=True)
+        target = self._ladder("buy", [3001.0])
+
+        assert len(self.om.diff_orders(current, target).amend) == 1
+        to_cancel, to_place = self.om.sync_orders(current, target)
+        assert to_cancel == ["buy0"]
+        assert to_place == target
@@ -0,0 +1,114 @@
+import pytest
+
+from src.trading.order_table import OrderRecord, OrderTable
+
+
+def _order(order_id, **overrides):
+    order = {
+        "id": order_id,
+        "symbol": "ETH/USDT:USDT",
+        "side": "buy",
+        "price": 2000.0,
+        "quantity": 0.1,
+        "status": "placed",
+        "timestamp": 1.0,
+        "strategy_id": "default",
+        "strategy_type": "fixed_spread",
+    }
+    order.update(overrides)
+    return order
+
+
+class TestOrderRecord:
+    """Test cases for OrderRecord"""
+
+    def test_mapping_access(self):
+        record = OrderRecord.from_dict(_order("1", extra="ignored"))
+
+        assert record["id"] == "1"
+        assert record.get("strategy_type") == "fixed_spread"
+        assert record.get("missing", "x") == "x"
+        assert dict(record) == record.to_dict()
+        with pytest.raises(KeyError):
+            record["missing"]
+
+    def test_setitem_updates_slot(self):
+        record = OrderRecord.from_dict(_order("1"))
+        record["status"] = "cancelled"
+        assert record.status == "cancelled"
+
+
+class TestOrderTable:
+    """Test cases for OrderTable"""
+
+    def test_add_indexes_and_tracks_open_orders(self):
+        table = OrderTable()
+        record = table.add(_order("1"))
+
+        assert table.get("1") is record
+        assert "1" in table.open_ids
+        assert list(table.history) == [record]
+
+    def test_set_status_untracks_and_updates_history_view(self):
+        table = OrderTable()
+        table.add(_order("1"))
+        table.add(_order("2"))
+
+        assert table.set_status("1", "cancelled") is True
+        assert table.history[0]["status"] == "cancelled"
+        assert list(table.open_ids) == ["2"]
+        assert table.set_status("missing", "cancelled") is False
+
+    def test_filter_open(self):
+        table = OrderTable()
+        table.add(_order("1"))
+        table.add(_order("2"))
+        table.set_status("2", "cancelled")
+
+        exchange_orders = [{"id": "1"}, {"id": "2"}, {"id": "other"}]
+        assert table.filter_open(exchange_orders) == [{"id": "1"}]
+
+    def test_unknown_ids_are_not_indexed(self):
+        table = OrderTable()
+        table.add(_order("unknown"))
+
+        assert len(table.history) == 1
+        assert len(table) == 0
+        assert list(table.open_ids) == []
+
+    def test_history_is_bounded_and_evicts_closed_records(self):
+        table = OrderTable(history_size=2)
+        table.add(_order("1"))
+        table.set_status("1", "cancelled")
+        table.add(_order("2"))
+        table.add(_order("3"))
+
+        assert [o["id"] for o in table.history] == ["2", "3"]
+        assert table.get("1") is None
+        assert table.get("2") is not None
+
+    def test_open_orders_survive_history_eviction(self):
+        table = OrderTable(history_size=1)
+        table.add(_order("1"))
+        table.add(_order("2"))
+
+        assert table.get("1") is not None
+        assert set(table.open_ids) == {"1", "2"}
+
+    def test_index_stays_bounded_under_churn(self):
+        table = OrderTable(history_size=10)
+        for i in range(1000):
+            table.add(_order(str(i)))
+            # Close orders after they have already left the history
+            if i >= 20:
+                table.set_status(str(i - 20), "filled")
+            # Index-only records from track() are released once untracked
+            table.track(f"t{i}")
+            table.untrack(f"t{i}")
+
+        assert len(table) <= 10 + 20
+        assert table.get("0") is None
+        assert table.get("999") is not None
+
+        table.clear_open()
+        assert len(table) == 10
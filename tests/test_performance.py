@@ -162,3 +162,87 @@ class TestPerformanceTracker:
         assert len(self.tracker.pnl_history) == 0
         assert self.tracker.last_position == 0.0
         assert self.tracker.avg_entry_price == 0.0
+
+
+class TestStreamingStatistics:
+    """Test cases for the streamed session statistics"""
+
+    def test_streaming_stats_match_numpy(self):
+        """Welford mean/std match a full recomputation"""
+        import numpy as np
+
+        from src.trading.performance import StreamingStats
+
+        values = [0.5, -1.2, 3.3, 0.0, -0.7, 2.2, 1.1]
+        stats = StreamingStats()
+        for v in values:
+            stats.update(v)
+
+        assert stats.count == len(values)
+        assert stats.mean == pytest.approx(np.mean(values))
+        assert stats.std == pytest.approx(np.std(values))
+        downside = np.sqrt(np.mean(np.minimum(values, 0) ** 2))
+        assert stats.downside_deviation == pytest.approx(downside)
+        assert stats.sortino() == pytest.approx(np.mean(values) / downside)
+
+    def test_drawdown_tracker(self):
+        """Running peak and max drawdown"""
+        from src.trading.performance import DrawdownTracker
+
+        dd = DrawdownTracker()
+        for value in [10, 20, 15, 25, 5, 12]:
+            dd.update(value)
+
+        assert dd.peak == 25
+        assert dd.max_drawdown == 20
+        assert dd.max_drawdown_ratio == pytest.approx(0.8)
+        assert dd.current_drawdown == 13
+
+    def test_sharpe_covers_full_session(self):
+        """Sharpe is computed over every snapshot, not just pnl_history"""
+        from src.ai.evaluation.evaluator import MultiLLMEvaluator
+
+        tracker = PerformanceTracker(max_history=3)
+        full = PerformanceTracker(max_history=1000)
+        for close in [3100, 2950, 3200, 3050, 3150, 2900, 3300]:
+            for t in (tracker, full):
+                t.update_position(0.1, 3000.0)
+                t.update_position(0.0, close)
+
+        stats = tracker.get_stats()
+        expected = MultiLLMEvaluator._calculate_sharpe(
+            None, full.get_stats()["pnl_history"]
+        )
+
+        assert len(stats["pnl_history"]) == 3
+        assert stats["return_count"] == 6
+        assert stats["sharpe_ratio"] == expected
+
+    def test_drawdown_and_turnover_in_stats(self):
+        """get_stats exposes drawdown and turnover"""
+        tracker = PerformanceTracker()
+        tracker.update_position(0.1, 3000.0)
+        tracker.update_position(0.0, 3100.0)  # +10
+        tracker.update_position(0.1, 3000.0)
+        tracker.update_position(0.0, 2960.0)  # -4
+
+        stats = tracker.get_stats()
+
+        assert stats["peak_pnl"] == 10.0
+        assert stats["max_drawdown"] == pytest.approx(4.0)
+        assert stats["max_drawdown_ratio"] == pytest.approx(0.4)
+        assert stats["volume"] == pytest.approx(0.4)
+        assert stats["turnover"] == pytest.approx(0.1 * (3000 + 3100 + 3000 + 2960))
+
+    def test_reset_clears_streaming_stats(self):
+        """reset clears the streamed statistics"""
+        tracker = PerformanceTracker()
+        tracker.update_position(0.1, 3000.0)
+        tracker.update_position(0.0, 3100.0)
+
+        tracker.reset()
+        stats = tracker.get_stats()
+
+        assert stats["return_count"] == 0
+        assert stats["turnover"] == 0.0
+        assert stats["max_drawdown"] == 0.0
@@ -30,6 +30,18 @@ class TestQuantAgent:
         assert proposal["spread"] == 0.02
         mock_gateway.generate.assert_called_once()
 
+    def test_analyze_with_llm_prose_wrapped_json(self):
+        """Test JSON surrounded by prose with a trailing comma is still used"""
+        mock_gateway = Mock()
+        mock_gateway.generate.return_value = (
+            'I recommend widening:\n```json\n{"spread": "0.018", "reasoning": "Vol",}\n```'
+        )
+
+        agent = QuantAgent(gateway=mock_gateway)
+        proposal = agent.analyze_and_propose({"spread": 0.01}, {"sharpe_ratio": 0.5})
+
+        assert proposal["spread"] == 0.018
+
     def test_analyze_with_llm_json_error(self):
         """Test LLM returns invalid JSON, falls back to rules"""
         mock_gateway = Mock()
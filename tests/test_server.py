@@ -524,3 +524,21 @@ class TestServer:
             assert data["realized_pnl"] == 15.0
             assert data["commission"] == 0.0
             assert data["net_pnl"] == 15.0
+
+    def test_openmetrics_endpoint(self, mock_bot, mock_exchange):
+        """Test GET /metrics returns OpenMetrics text"""
+        with patch("server.bot_engine", mock_bot), patch(
+            "server.get_default_exchange", return_value=mock_exchange
+        ):
+            from server import app
+
+            client = TestClient(app)
+
+            response = client.get("/metrics")
+
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith(
+                "application/openmetrics-text"
+            )
+            assert "# TYPE mm_engine_cycles counter" in response.text
+            assert response.text.endswith("# EOF\n")
@@ -1,11 +1,14 @@
 import asyncio
 import time
 from typing import Any, Dict, List
+from unittest.mock import Mock
 
 import pytest
 from fastapi.testclient import TestClient
 
 import server
+from src.ai.evaluation.store import EvaluationStore
+from src.shared.market_stats import MarketStatsEngine
 from src.trading.strategies.funding_rate import FundingRateStrategy
 from src.ai.evaluation.schemas import (
     AggregatedResult,
@@ -195,6 +198,28 @@ def test_error_history_filters_by_type(client_fixed_strategy):
     assert err0["symbol"] == "ETH/USDT:USDT"
 
 
+def test_bot_loop_stops_the_advisory_worker_on_exit(monkeypatch):
+    """The worker started by the bot loop is stopped when the loop ends."""
+    advisor = Mock()
+    monkeypatch.setattr(server.bot_engine, "advisor", advisor)
+    monkeypatch.setattr(server, "is_running", False)
+
+    server.run_bot_loop()
+
+    advisor.start.assert_called_once()
+    advisor.stop.assert_called_once()
+
+
+def test_shutdown_stops_the_advisory_worker(monkeypatch):
+    advisor = Mock()
+    monkeypatch.setattr(server.bot_engine, "advisor", advisor)
+
+    with TestClient(server.app):
+        pass
+
+    advisor.stop.assert_called_once()
+
+
 @pytest.fixture
 def client_with_evaluation(monkeypatch):
     """Test client with mocked evaluation environment."""
@@ -221,6 +246,8 @@ def client_with_evaluation(monkeypatch):
 
     monkeypatch.setattr(server, "get_default_exchange", lambda: DummyExchange())
     monkeypatch.setattr(server, "create_all_providers", lambda: ["mock"])
+    store = EvaluationStore()
+    monkeypatch.setattr(server, "get_evaluation_store", lambda: store)
 
     proposal1 = StrategyProposal(
         recommended_strategy="FundingRate",
@@ -334,7 +361,7 @@ def client_with_evaluation(monkeypatch):
         def __init__(self, *args, **kwargs):
             pass
 
-        def evaluate(self, context):
+        async def aevaluate(self, context, pending=None):
             return eval_results
 
         def aggregate_results(self, results):
@@ -373,6 +400,18 @@ def test_run_evaluation_returns_results(client_with_evaluation):
     assert "consensus_report" in data
 
 
+
+def test_run_evaluation_reads_market_stats_without_feeding_them(
+    client_with_evaluation, monkeypatch
+):
+    stats = MarketStatsEngine()
+    monkeypatch.setattr(server, "market_stats", stats)
+
+    resp = client_with_evaluation.post("/api/evaluation/run", json={"symbol": "ETHUSDT"})
+
+    assert resp.status_code == 200
+    assert stats.get_all() == {}
+
 def test_apply_evaluation_consensus(client_with_evaluation, monkeypatch):
     client_with_evaluation.post("/api/evaluation/run", json={"symbol": "ETHUSDT"})
 
@@ -431,6 +470,377 @@ def test_apply_individual_provider_not_found(client_with_evaluation):
     assert resp.status_code == 200
     assert resp.json()["error"].startswith("Provider Unknown not found")
 
+
+def test_apply_evaluation_by_id_targets_that_run(client_with_evaluation, monkeypatch):
+    first = client_with_evaluation.post("/api/evaluation/run", json={"symbol": "ETHUSDT"}).json()
+    second = client_with_evaluation.post("/api/evaluation/run", json={"symbol": "ETHUSDT"}).json()
+    assert first["evaluation_id"] != second["evaluation_id"]
+
+    async def fake_update(*args):
+        return {"status": "updated"}
+
+    monkeypatch.setattr(server, "update_config", fake_update)
+    monkeypatch.setattr(server, "update_leverage", fake_update)
+
+    resp = client_with_evaluation.post(
+        "/api/evaluation/apply",
+        json={
+            "source": "individual",
+            "provider_name": "Gemini (mock)",
+            "evaluation_id": first["evaluation_id"],
+        },
+    )
+    assert resp.json()["evaluation_id"] == first["evaluation_id"]
+
+    record = client_with_evaluation.get(f"/api/evaluation/{first['evaluation_id']}").json()
+    assert record["applied"]["provider_name"] == "Gemini (mock)"
+    assert client_with_evaluation.get(
+        f"/api/evaluation/{second['evaluation_id']}"
+    ).json()["applied"] is None
+
+    missing = client_with_evaluation.post(
+        "/api/evaluation/apply", json={"source": "consensus", "evaluation_id": "nope"}
+    )
+    assert "not found" in missing.json()["error"]
+
+
+def test_apply_evaluation_only_targets_the_bots_market(client_with_evaluation, monkeypatch):
+    """The bot trades ETHUSDT on binance (DummyExchange); other runs are refused."""
+    eth = client_with_evaluation.post("/api/evaluation/run", json={"symbol": "ETHUSDT"}).json()
+    btc = client_with_evaluation.post("/api/evaluation/run", json={"symbol": "BTCUSDT"}).json()
+    applied = []
+
+    async def fake_update(config):
+        applied.append(config)
+        return {"status": "updated"}
+
+    monkeypatch.setattr(server, "update_config", fake_update)
+    monkeypatch.setattr(server, "update_leverage", fake_update)
+
+    wrong = client_with_evaluation.post(
+        "/api/evaluation/apply",
+        json={"source": "consensus", "evaluation_id": btc["evaluation_id"]},
+    ).json()
+    assert wrong["status"] == "error"
+    assert "BTCUSDT" in wrong["error"] and "ETHUSDT" in wrong["error"]
+    assert not applied
+
+    # Without an ID the latest run for the bot's symbol is used, not the newest overall
+    latest = client_with_evaluation.post(
+        "/api/evaluation/apply", json={"source": "consensus"}
+    ).json()
+    assert latest["evaluation_id"] == eth["evaluation_id"]
+    assert len(applied) == 2  # config + leverage
+
+    hyperliquid_id = server.get_evaluation_store().record(
+        "ETHUSDT", "hyperliquid", None, [], AggregatedResult()
+    )
+    other_exchange = client_with_evaluation.post(
+        "/api/evaluation/apply",
+        json={"source": "consensus", "evaluation_id": hyperliquid_id},
+    ).json()
+    assert other_exchange["status"] == "error"
+    assert "hyperliquid" in other_exchange["error"]
+    assert len(applied) == 2
+
+
+def test_evaluation_history_and_leaderboard(client_with_evaluation):
+    run = client_with_evaluation.post("/api/evaluation/run", json={"symbol": "ETHUSDT"}).json()
+
+    history = client_with_evaluation.get(
+        "/api/evaluation/history", params={"symbol": "ETHUSDT", "provider": "OpenAI (mock)"}
+    ).json()
+    assert [e["id"] for e in history["evaluations"]] == [run["evaluation_id"]]
+    assert history["evaluations"][0]["consensus_strategy"] == "FundingRate"
+
+    board = client_with_evaluation.get(
+        "/api/evaluation/leaderboard", params={"sort_by": "win_rate"}
+    ).json()
+    assert [p["provider"] for p in board["providers"]] == ["Gemini (mock)", "OpenAI (mock)"]
+    assert board["providers"][0]["win_rate"] == 1.0
+
+    bad = client_with_evaluation.get("/api/evaluation/leaderboard", params={"sort_by": "x"})
+    assert "Invalid sort_by" in bad.json()["error"]
+
+
+def test_stream_evaluation_emits_progressive_events(client_with_evaluation, monkeypatch):
+    import json
+    from unittest.mock import Mock
+
+    from src.ai.evaluation.evaluator import MultiLLMEvaluator
+
+    def provider(name, strategy):
+        p = Mock()
+        p.name = name
+        p.generate.return_value = json.dumps(
+            {"recommended_strategy": strategy, "spread": 0.01, "confidence": 0.8}
+        )
+        return p
+
+    monkeypatch.setattr(server, "MultiLLMEvaluator", MultiLLMEvaluator)
+    monkeypatch.setattr(server, "get_llm_cache", lambda: None)
+    monkeypatch.setattr(
+        server,
+        "create_all_providers",
+        lambda: [provider("A", "FixedSpread"), provider("B", "FundingRate")],
+    )
+
+    resp = client_with_evaluation.post(
+        "/api/evaluation/stream", json={"symbol": "ETHUSDT", "simulation_steps": 20}
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in resp.text.splitlines() if line]
+
+    kinds = [e["event"] for e in events]
+    assert kinds[0] == "start" and kinds[-1] == "done"
+    assert kinds.count("proposal") == 2 and kinds.count("simulation") == 2
+    for name in ("A", "B"):
+        order = [
+            e["event"]
+            for e in events
+            if e.get("result", {}).get("provider_name") == name
+        ]
+        assert order == ["proposal", "simulation"]
+    assert events[kinds.index("simulation") + 1]["event"] == "consensus"
+    assert {r["provider_name"] for r in events[-1]["ranking"]} == {"A", "B"}
+
+    # The streamed run is stored for the apply endpoint
+    stored = server.get_evaluation_store().get(events[-1]["evaluation_id"])
+    assert {r["provider_name"] for r in stored["results"]} == {"A", "B"}
+
+
+def test_batch_evaluation_calls_each_provider_once(client_with_evaluation, monkeypatch):
+    import json
+    from unittest.mock import Mock
+
+    from src.ai.evaluation.evaluator import MultiLLMEvaluator
+
+    def provider(name):
+        p = Mock()
+        p.name = name
+        p.generate.return_value = "Here you go:\n" + json.dumps(
+            [
+                {"symbol": "ETHUSDT", "recommended_strategy": "FixedSpread", "spread": 0.01},
+                {"symbol": "BTC/USDT", "recommended_strategy": "FundingRate", "spread": 0.02},
+            ]
+        )
+        return p
+
+    providers = [provider("A"), provider("B")]
+    monkeypatch.setattr(server, "MultiLLMEvaluator", MultiLLMEvaluator)
+    monkeypatch.setattr(server, "get_llm_cache", lambda: None)
+    monkeypatch.setattr(server, "create_all_providers", lambda: providers)
+
+    resp = client_with_evaluation.post(
+        "/api/evaluation/batch",
+        json={"symbols": ["ETHUSDT", "BTCUSDT", "SOLUSDT"], "simulation_steps": 20},
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+
+    assert data["provider_calls"] == 2
+    assert all(p.generate.call_count == 1 for p in providers)
+    prompt = providers[0].generate.call_args[0][0]
+    assert all(symbol in prompt for symbol in ("ETHUSDT", "BTCUSDT", "SOLUSDT"))
+
+    assert set(data["results"]) == {"ETHUSDT", "BTCUSDT", "SOLUSDT"}
+    btc = data["results"]["BTCUSDT"]["individual_results"]
+    assert {r["proposal"]["recommended_strategy"] for r in btc} == {"FundingRate"}
+    assert all(r["simulation"]["simulation_steps"] == 20 for r in btc)
+    # No proposal returned for SOL: failed entries, still reported
+    sol = data["results"]["SOLUSDT"]["individual_results"]
+    assert not any(r["proposal"]["parse_success"] for r in sol)
+
+
+def test_batch_evaluation_prepares_off_the_event_loop_with_bulk_quotes(
+    client_with_evaluation, monkeypatch
+):
+    import json
+
+    from src.ai.evaluation.evaluator import MultiLLMEvaluator
+
+    class BulkExchange:
+        symbol = "ETHUSDT"
+
+        def __init__(self):
+            self.bulk_calls = []
+            self.book_calls = 0
+
+        def fetch_bulk_market_data(self, symbols):
+            self.bulk_calls.append(list(symbols))
+            return {
+                "ETHUSDT": {"mid_price": 2000.0, "best_bid": 1999.5, "best_ask": 2000.5},
+                "BTCUSDT": {"mid_price": 50000.0, "best_bid": 49999.0, "best_ask": 50001.0},
+            }
+
+        def fetch_market_data(self):
+            self.book_calls += 1
+            return {"mid_price": 150.0, "best_bid": 149.9, "best_ask": 150.1}
+
+        def fetch_account_data(self):
+            return {"position_amt": 0.0, "balance": 1000.0, "leverage": 1}
+
+    exchange = BulkExchange()
+    monkeypatch.setattr(server, "get_default_exchange", lambda: exchange)
+    provider = Mock()
+    provider.name = "A"
+    provider.generate.return_value = json.dumps(
+        [{"symbol": "ETHUSDT", "recommended_strategy": "FixedSpread", "spread": 0.01}]
+    )
+    monkeypatch.setattr(server, "MultiLLMEvaluator", MultiLLMEvaluator)
+    monkeypatch.setattr(server, "get_llm_cache", lambda: None)
+    monkeypatch.setattr(server, "create_all_providers", lambda: [provider])
+    threaded = []
+
+    async def recording_to_thread(func, *args, **kwargs):
+        threaded.append(func.__name__)
+        return func(*args, **kwargs)
+
+    monkeypatch.setattr(asyncio, "to_thread", recording_to_thread)
+
+    resp = client_with_evaluation.post(
+        "/api/evaluation/batch",
+        json={"symbols": ["ETHUSDT", "BTC/USDT", "SOLUSDT"], "simulation_steps": 20},
+    )
+    data = resp.json()
+
+    assert "_prepare_batch_evaluation" in threaded
+    assert exchange.bulk_calls == [["ETHUSDT", "BTCUSDT", "SOLUSDT"]]
+    # Only the symbol missing from the bulk response is fetched on its own
+    assert exchange.book_calls == 1
+    assert data["results"]["BTCUSDT"]["market_data"]["mid_price"] == 50000.0
+    assert data["results"]["SOLUSDT"]["market_data"]["mid_price"] == 150.0
+
+
+def test_batch_evaluation_uses_binance_bulk_quotes(client_with_evaluation, monkeypatch):
+    import json
+    from unittest.mock import patch
+
+    from src.ai.evaluation.evaluator import MultiLLMEvaluator
+    from src.trading.exchange import BinanceClient
+
+    with patch("src.trading.exchange.ccxt.binanceusdm") as mock_ccxt:
+        ccxt_exchange = Mock()
+        ccxt_exchange.urls = {"api": {}, "test": {}}
+        ccxt_exchange.has = {}
+        ccxt_exchange.markets = {
+            "ETH/USDT:USDT": {"id": "ETHUSDT"},
+            "BTC/USDT:USDT": {"id": "BTCUSDT"},
+        }
+        ccxt_exchange.load_markets.return_value = ccxt_exchange.markets
+        mock_ccxt.return_value = ccxt_exchange
+        exchange = BinanceClient()
+    ccxt_exchange.fapiPublicGetTickerBookTicker.return_value = [
+        {"symbol": "ETHUSDT", "bidPrice": "1999.5", "askPrice": "2000.5"},
+        {"symbol": "BTCUSDT", "bidPrice": "49999.0", "askPrice": "50001.0"},
+    ]
+    exchange.fetch_market_data = Mock(side_effect=AssertionError("per-symbol fetch"))
+    exchange.fetch_account_data = Mock(
+        return_value={"position_amt": 0.0, "balance": 1000.0, "leverage": 1}
+    )
+    monkeypatch.setattr(server, "get_default_exchange", lambda: exchange)
+    provider = Mock()
+    provider.name = "A"
+    provider.generate.return_value = json.dumps(
+        [{"symbol": "ETHUSDT", "recommended_strategy": "FixedSpread", "spread": 0.01}]
+    )
+    monkeypatch.setattr(server, "MultiLLMEvaluator", MultiLLMEvaluator)
+    monkeypatch.setattr(server, "get_llm_cache", lambda: None)
+    monkeypatch.setattr(server, "create_all_providers", lambda: [provider])
+
+    resp = client_with_evaluation.post(
+        "/api/evaluation/batch",
+        json={"symbols": ["ETHUSDT", "BTC/USDT"], "simulation_steps": 20},
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+
+    ccxt_exchange.fapiPublicGetTickerBookTicker.assert_called_once_with()
+    exchange.fetch_market_data.assert_not_called()
+    assert data["results"]["ETHUSDT"]["market_data"]["best_bid"] == 1999.5
+    assert data["results"]["BTCUSDT"]["market_data"]["mid_price"] == 50000.0
+
+
+def test_batch_evaluation_accepts_bulk_quotes_without_a_book(
+    client_with_evaluation, monkeypatch
+):
+    import json
+
+    from src.ai.evaluation.evaluator import MultiLLMEvaluator
+
+    class MidsOnlyExchange:
+        """Bulk quotes shaped like Hyperliquid allMids: no bid/ask"""
+
+        symbol = "ETHUSDT"
+
+        def fetch_bulk_market_data(self, symbols):
+            return {
+                symbol: {
+                    "mid_price": price,
+                    "best_bid": None,
+                    "best_ask": None,
+                    "tick_size": None,
+                    "step_size": None,
+                }
+                for symbol, price in (("ETHUSDT", 2000.0), ("BTCUSDT", 50000.0))
+            }
+
+        def fetch_market_data(self):
+            raise AssertionError("bulk quotes should cover every symbol")
+
+        def fetch_account_data(self):
+            return {"position_amt": 0.0, "balance": 1000.0, "leverage": 1}
+
+    monkeypatch.setattr(server, "get_default_exchange", lambda: MidsOnlyExchange())
+    provider = Mock()
+    provider.name = "A"
+    provider.generate.return_value = json.dumps(
+        [{"symbol": "ETHUSDT", "recommended_strategy": "FixedSpread", "spread": 0.01}]
+    )
+    monkeypatch.setattr(server, "MultiLLMEvaluator", MultiLLMEvaluator)
+    monkeypatch.setattr(server, "get_llm_cache", lambda: None)
+    monkeypatch.setattr(server, "create_all_providers", lambda: [provider])
+
+    resp = client_with_evaluation.post(
+        "/api/evaluation/batch",
+        json={"symbols": ["ETHUSDT", "BTCUSDT"], "simulation_steps": 20},
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+
+    assert set(data["results"]) == {"ETHUSDT", "BTCUSDT"}
+    eth = data["results"]["ETHUSDT"]["market_data"]
+    assert eth["mid_price"] == 2000.0
+    assert eth["best_bid"] < eth["mid_price"] < eth["best_ask"]
+
+
+def test_run_evaluation_prepares_off_the_event_loop(client_with_evaluation, monkeypatch):
+    threaded = []
+
+    async def recording_to_thread(func, *args, **kwargs):
+        threaded.append(func.__name__)
+        return func(*args, **kwargs)
+
+    monkeypatch.setattr(asyncio, "to_thread", recording_to_thread)
+
+    client_with_evaluation.post("/api/evaluation/run", json={"symbol": "ETHUSDT"})
+    # Stop the stream once prepared; only its preparation is under test
+    monkeypatch.setattr(server, "_create_evaluator", lambda *a: (None, {"error": "stop"}))
+    resp = client_with_evaluation.post("/api/evaluation/stream", json={"symbol": "ETHUSDT"})
+    assert resp.json() == {"error": "stop"}
+
+    assert threaded.count("_prepare_evaluation") == 2
+
+def test_batch_evaluation_rejects_oversized_watchlist(client_with_evaluation):
+    limit = server.EVALUATION_CONFIG["max_batch_symbols"]
+    resp = client_with_evaluation.post(
+        "/api/evaluation/batch",
+        json={"symbols": [f"SYM{i}USDT" for i in range(limit + 1)]},
+    )
+    assert resp.status_code == 200
+    assert resp.json()["error"].startswith("Too many symbols")
+
 class TestErrorHistoryAPI:
     """Comprehensive tests for /api/error-history endpoint."""
 
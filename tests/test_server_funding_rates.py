@@ -165,3 +165,21 @@ class TestFundingRatesEndpoint:
             "1000FLOKI/USDT:USDT",
         ]
         assert set(call_args) == set(expected_symbols)
+
+    def test_funding_rates_served_from_memory(self, mock_exchange):
+        """Test repeated requests within the live TTL reuse stored rates"""
+        mock_exchange.fetch_bulk_funding_rates.return_value = {
+            "BTC/USDT:USDT": 0.0001,
+        }
+
+        with patch("server.get_default_exchange", return_value=mock_exchange):
+            from server import app
+
+            client = TestClient(app)
+            first = client.get("/api/funding-rates").json()
+            second = client.get("/api/funding-rates").json()
+
+        assert first == second
+        assert first[0]["trend"] == "stable"
+        assert first[0]["predicted_rate"] == 0.0001
+        mock_exchange.fetch_bulk_funding_rates.assert_called_once()
@@ -38,3 +38,36 @@ class TestMarketSimulator:
         assert "total_trades" in stats
         assert "win_rate" in stats
         assert mock_strategy.calculate_target_orders.called
+
+    def test_run_passes_funding_rate_and_accrues_payments(self):
+        from src.trading.strategies.funding_rate import FundingRateStrategy
+
+        strategy = FundingRateStrategy()
+        calls = []
+        original = strategy.calculate_target_orders
+
+        def track(market_data, funding_rate=0.0):
+            calls.append(funding_rate)
+            return original(market_data, funding_rate=funding_rate)
+
+        strategy.calculate_target_orders = track
+        sim = MarketSimulator(strategy, funding_rate=0.001, funding_interval=1)
+        sim.position = 1.0  # Start long so funding is paid from the first step
+        stats = sim.run(steps=5)
+
+        assert calls and all(abs(rate - 0.001) < 0.0005 for rate in calls)
+        assert "funding_pnl" in stats
+        assert stats["net_pnl"] == round(stats["realized_pnl"] + sim.funding_pnl, 4)
+
+    def test_funding_rate_only_passed_to_strategies_that_take_it(self):
+        class LocalFunding:
+            spread = 0.01
+
+            def calculate_target_orders(self, market_data):
+                funding_rate = 0.0  # A local, not a parameter
+                return []
+
+        sim = MarketSimulator(LocalFunding(), funding_rate=0.001)
+
+        assert sim._passes_funding is False
+        assert sim.run(steps=3)["total_trades"] == 0
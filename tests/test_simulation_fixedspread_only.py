@@ -1,10 +1,10 @@
 """
-Test that simulation only uses FixedSpread strategy
-测试模拟中仅使用 FixedSpread 策略
+Test that the single-path StrategySimulator only uses FixedSpread strategy
+测试单路径 StrategySimulator 仅使用 FixedSpread 策略
 
-This test verifies that even if LLM recommends FundingRate strategy,
-the simulation will always use FixedSpread strategy.
-此测试验证即使 LLM 建议 FundingRate 策略，模拟也始终使用 FixedSpread 策略。
+FundingRate proposals are simulated by the vectorized Monte Carlo engine,
+which models the skew itself instead of importing FundingRateStrategy.
+FundingRate 建议由向量化蒙特卡洛引擎模拟，引擎自行实现偏移而不导入 FundingRateStrategy。
 """
 
 import pytest
@@ -62,10 +62,10 @@ class TestSimulationFixedSpreadOnly:
         # Verify funding_rate is not stored
         assert not hasattr(simulator, "funding_rate")
 
-    def test_run_simulation_always_uses_fixedspread(self, sample_market_context):
+    def test_run_simulation_handles_funding_rate_proposal(self, sample_market_context):
         """
-        Test that _run_simulation always uses FixedSpread, even if proposal recommends FundingRate
-        测试 _run_simulation 始终使用 FixedSpread，即使建议是 FundingRate
+        Test that _run_simulation runs a FundingRate proposal through the vectorized engine
+        测试 _run_simulation 通过向量化引擎运行 FundingRate 建议
         """
         evaluator = MultiLLMEvaluator(providers=[], simulation_steps=10)
 
@@ -87,7 +87,7 @@ class TestSimulationFixedSpreadOnly:
         # Verify simulation completed (even though proposal was FundingRate)
         assert result is not None
         assert result.simulation_steps == 10
-        # The simulation should have run with FixedSpread strategy internally
+        assert isinstance(result.funding_pnl, float)
 
     def test_simulator_does_not_use_funding_rate_parameter(self):
         """
@@ -146,8 +146,8 @@ class TestSimulationFixedSpreadOnly:
         self, sample_market_context
     ):
         """
-        Test that simulation creates only FixedSpreadStrategy, never FundingRateStrategy
-        测试模拟仅创建 FixedSpreadStrategy，从不创建 FundingRateStrategy
+        Test that simulation never instantiates FundingRateStrategy
+        测试模拟从不创建 FundingRateStrategy
         """
         # Verify FundingRateStrategy is not imported in evaluator
         import src.ai.evaluation.evaluator as evaluator_module
@@ -180,7 +180,7 @@ class TestSimulationFixedSpreadOnly:
             parse_success=True,
         )
 
-        # Both should use FixedSpreadStrategy
+        # Both run through the vectorized engine
         result1 = evaluator._run_simulation(funding_proposal, sample_market_context)
         result2 = evaluator._run_simulation(fixedspread_proposal, sample_market_context)
 
@@ -188,7 +188,7 @@ class TestSimulationFixedSpreadOnly:
         assert result1 is not None
         assert result2 is not None
 
-        # Verify both simulations completed (they both used FixedSpread internally)
+        # Verify both simulations completed
         assert result1.simulation_steps == 10
         assert result2.simulation_steps == 10
 
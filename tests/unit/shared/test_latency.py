@@ -0,0 +1,90 @@
+"""
+Unit tests for tick-to-trade latency module / 行情到成交延迟模块单元测试
+
+Tests for monotonic stage timers and per-stage percentile summaries.
+测试单调阶段计时器和分阶段百分位摘要。
+
+Owner: Agent QA
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.shared.latency import LatencyTracker, TickToTradeTimer
+
+
+class TestTickToTradeTimer:
+    """Test TickToTradeTimer class / 测试 TickToTradeTimer 类"""
+
+    def test_stage_durations(self):
+        """Test stage durations from marks / 测试由标记计算阶段耗时"""
+        timer = TickToTradeTimer(tick_at=10.0)
+        with patch("src.shared.latency.now", side_effect=[10.002, 10.003, 10.010]):
+            timer.mark_decision()
+            timer.mark_send()
+            timer.mark_ack()
+
+        durations = timer.stage_durations()
+
+        assert durations["tick_to_decision"] == pytest.approx(0.002)
+        assert durations["decision_to_send"] == pytest.approx(0.001)
+        assert durations["send_to_ack"] == pytest.approx(0.007)
+        assert durations["tick_to_trade"] == pytest.approx(0.010)
+
+    def test_first_send_and_ack_win(self):
+        """Test only the first send/ack of a cycle counts / 测试只记录周期内第一次发送/确认"""
+        timer = TickToTradeTimer(tick_at=1.0)
+        timer.mark_ack(2.0)
+        timer.mark_ack(3.0)
+        assert timer.ack_at == 2.0
+
+    def test_incomplete_cycle_has_partial_stages(self):
+        """Test no-order cycle only records decision stage / 测试无订单周期只记录决策阶段"""
+        timer = TickToTradeTimer(tick_at=1.0)
+        timer.mark_decision()
+
+        assert set(timer.stage_durations()) == {"tick_to_decision"}
+        assert TickToTradeTimer().stage_durations() == {}
+
+
+class TestLatencyTracker:
+    """Test LatencyTracker class / 测试 LatencyTracker 类"""
+
+    def test_summary_percentiles(self):
+        """Test p50/p90/p99 summary / 测试 p50/p90/p99 摘要"""
+        tracker = LatencyTracker()
+        for ms in range(1, 101):
+            tracker.record("send_to_ack", ms / 1000)
+
+        summary = tracker.get_summary()["send_to_ack"]
+
+        assert summary["count"] == 100
+        assert summary["p50_ms"] == pytest.approx(50.0, rel=0.03)
+        assert summary["p90_ms"] == pytest.approx(90.0, rel=0.03)
+        assert summary["p99_ms"] == pytest.approx(99.0, rel=0.03)
+        assert summary["max_ms"] == 100.0
+        assert summary["windows"]["1m"]["count"] == 100
+
+    def test_headline_percentile_uses_recent_window(self):
+        """Test old samples age out of the 5m window / 测试旧样本移出 5 分钟窗口"""
+        clock = [0.0]
+        tracker = LatencyTracker(clock=lambda: clock[0])
+        for _ in range(100):
+            tracker.record("tick_to_trade", 1.0)
+        clock[0] = 600.0
+        for _ in range(10):
+            tracker.record("tick_to_trade", 0.001)
+
+        assert tracker.percentile_ms("tick_to_trade", 99) == pytest.approx(1.0, rel=0.03)
+        all_time = tracker.percentile_ms("tick_to_trade", 99, window=None)
+        assert all_time == pytest.approx(1000.0, rel=0.03)
+
+    def test_record_timer(self):
+        """Test recording a cycle timer / 测试记录周期计时器"""
+        tracker = LatencyTracker()
+        timer = TickToTradeTimer(tick_at=1.0)
+        timer.decision_at = 1.001
+        tracker.record_timer(timer)
+
+        assert list(tracker.get_summary()) == ["tick_to_decision"]
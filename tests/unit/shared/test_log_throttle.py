@@ -0,0 +1,154 @@
+"""
+Unit tests for log throttle module / 日志节流模块单元测试
+
+Tests for repeated-message suppression, summaries and per-level rate limits.
+测试重复消息抑制、摘要和分级别限速。
+
+Owner: Agent QA
+"""
+
+import logging
+
+from src.shared.log_throttle import LogThrottle, TokenBucket
+
+
+class _Clock:
+    def __init__(self, t: float = 0.0):
+        self.t = t
+
+    def __call__(self) -> float:
+        return self.t
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def _make_logger(name: str, **kwargs):
+    clock = _Clock()
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    handler = _ListHandler()
+    logger.handlers = [handler]
+    logger.filters = []
+    throttle = LogThrottle(name, clock=clock, **kwargs)
+    logger.addFilter(throttle)
+    return logger, throttle, handler, clock
+
+
+class TestTokenBucket:
+    """Test TokenBucket class / 测试 TokenBucket 类"""
+
+    def test_refill(self):
+        """Test tokens refill over time / 测试令牌随时间补充"""
+        bucket = TokenBucket(rate=2, now=0.0)
+
+        assert bucket.consume(0.0)
+        assert bucket.consume(0.0)
+        assert not bucket.consume(0.0)
+        assert bucket.consume(0.5)
+
+
+class TestLogThrottle:
+    """Test LogThrottle class / 测试 LogThrottle 类"""
+
+    def test_suppresses_repeats_and_summarises(self):
+        """Test repeats are suppressed then summarised / 测试重复被抑制后汇总"""
+        logger, throttle, handler, clock = _make_logger(
+            "test.throttle.repeat", window_seconds=10
+        )
+        for _ in range(5):
+            logger.warning("No response")
+
+        assert [r.getMessage() for r in handler.records] == ["No response"]
+        assert throttle.get_stats()["suppressed"] == 4
+
+        clock.t = 11
+        logger.warning("No response")
+
+        messages = [r.getMessage() for r in handler.records]
+        assert messages == [
+            "No response",
+            "No response (repeated 4 times)",
+            "No response",
+        ]
+        assert handler.records[1].repeated == 4
+
+    def test_expired_window_is_summarised_before_the_sweep(self):
+        """Test a key reused before the sweep keeps its count / 测试清扫前复用的键仍汇总计数"""
+        logger, throttle, handler, clock = _make_logger(
+            "test.throttle.reuse", window_seconds=10
+        )
+        for t in (5, 6, 7, 8, 9, 10.5, 16, 17):
+            clock.t = t
+            logger.error("boom")
+
+        assert [r.getMessage() for r in handler.records] == [
+            "boom",
+            "boom (repeated 5 times)",
+            "boom",
+        ]
+        throttle.flush_summaries()
+        assert handler.records[-1].getMessage() == "boom (repeated 1 times)"
+
+    def test_distinct_messages_pass(self):
+        """Test different messages are not suppressed / 测试不同消息不被抑制"""
+        logger, _, handler, _ = _make_logger("test.throttle.distinct")
+        logger.info("a")
+        logger.info("b")
+        logger.error("a")
+
+        assert len(handler.records) == 3
+
+    def test_explicit_throttle_key(self):
+        """Test throttle_key groups varying messages / 测试 throttle_key 合并不同消息"""
+        logger, _, handler, _ = _make_logger("test.throttle.key")
+        logger.error("timeout after 1.2s", extra={"throttle_key": "timeout"})
+        logger.error("timeout after 1.4s", extra={"throttle_key": "timeout"})
+
+        assert len(handler.records) == 1
+
+    def test_level_rate_limit(self):
+        """Test per-level token bucket / 测试分级别令牌桶"""
+        logger, throttle, handler, clock = _make_logger(
+            "test.throttle.rate", window_seconds=10, level_rates={"INFO": 3}
+        )
+        for i in range(10):
+            logger.info(f"tick {i}")
+            logger.error(f"error {i}")
+
+        infos = [r for r in handler.records if r.levelno == logging.INFO]
+        errors = [r for r in handler.records if r.levelno == logging.ERROR]
+        assert len(infos) == 3
+        assert len(errors) == 10
+        assert throttle.get_stats()["rate_limited"] == {"INFO": 7}
+
+        clock.t = 10
+        logger.error("next")
+
+        summary = [r for r in handler.records if getattr(r, "rate_limited", 0)]
+        assert summary[0].rate_limited == 7
+
+    def test_critical_never_throttled(self):
+        """Test CRITICAL always passes / 测试 CRITICAL 总是通过"""
+        logger, _, handler, _ = _make_logger("test.throttle.critical")
+        for _ in range(3):
+            logger.critical("halt")
+
+        assert len(handler.records) == 3
+
+    def test_flush_summaries(self):
+        """Test pending summaries can be flushed / 测试可立即输出待处理摘要"""
+        logger, throttle, handler, _ = _make_logger("test.throttle.flush")
+        logger.warning("down")
+        logger.warning("down")
+
+        throttle.flush_summaries()
+
+        assert handler.records[-1].getMessage() == "down (repeated 1 times)"
@@ -0,0 +1,130 @@
+"""
+Unit tests for logger module / 日志模块单元测试
+
+Tests for JSON formatting, the background batch writer and log sampling.
+测试 JSON 格式化、后台批量写入器和日志采样。
+
+Owner: Agent QA
+"""
+
+import io
+import json
+import logging
+from unittest.mock import patch
+
+from src.shared.logger import (
+    AsyncLogHandler,
+    AsyncLogWriter,
+    JsonFormatter,
+    LogSampler,
+)
+from src.shared.tracing import set_trace_id
+
+
+def _record(msg="hello", level=logging.INFO, args=None, **extra):
+    record = logging.LogRecord("test", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestJsonFormatter:
+    """Test JsonFormatter class / 测试 JsonFormatter 类"""
+
+    def test_includes_extra_fields(self):
+        """Test extra fields are emitted / 测试输出额外字段"""
+        output = json.loads(JsonFormatter().format(_record(order_id="abc")))
+
+        assert output["message"] == "hello"
+        assert output["level"] == "INFO"
+        assert output["order_id"] == "abc"
+        assert "msg" not in output
+        assert "threadName" not in output
+
+    def test_uses_captured_trace_id(self):
+        """Test trace_id captured on the record wins / 测试优先使用记录中的 trace_id"""
+        output = json.loads(JsonFormatter().format(_record(trace_id="t-1")))
+
+        assert output["trace_id"] == "t-1"
+
+    def test_non_serializable_extra(self):
+        """Test non-JSON extras are stringified / 测试不可序列化字段转为字符串"""
+        output = json.loads(JsonFormatter().format(_record(obj=object())))
+
+        assert output["obj"].startswith("<object")
+
+
+class TestAsyncLogWriter:
+    """Test AsyncLogWriter and AsyncLogHandler / 测试异步日志写入器和处理器"""
+
+    def test_writes_batched_json_lines(self):
+        """Test records are written by the background thread / 测试后台线程写出记录"""
+        stream = io.StringIO()
+        writer = AsyncLogWriter(stream=stream, batch_size=4)
+        handler = AsyncLogHandler(writer)
+        for i in range(10):
+            handler.emit(_record("order %s", args=(i,)))
+
+        assert writer.flush()
+        lines = stream.getvalue().splitlines()
+        writer.stop()
+
+        assert [json.loads(line)["message"] for line in lines] == [
+            f"order {i}" for i in range(10)
+        ]
+
+    def test_captures_trace_id_on_caller_thread(self):
+        """Test trace_id from the caller context is kept / 测试保留调用方上下文的 trace_id"""
+        stream = io.StringIO()
+        writer = AsyncLogWriter(stream=stream)
+        handler = AsyncLogHandler(writer)
+        set_trace_id("caller-trace")
+        try:
+            handler.emit(_record())
+        finally:
+            set_trace_id(None)
+
+        writer.flush()
+        writer.stop()
+
+        assert json.loads(stream.getvalue())["trace_id"] == "caller-trace"
+
+    def test_full_queue_drops_without_blocking(self):
+        """Test a full queue drops records / 测试队列满时丢弃记录"""
+        writer = AsyncLogWriter(stream=io.StringIO(), max_queue=2)
+        # Keep the thread from draining the queue
+        writer._thread = object()
+        for _ in range(5):
+            writer.enqueue(_record())
+
+        assert writer.dropped == 3
+
+
+class TestLogSampler:
+    """Test LogSampler class / 测试 LogSampler 类"""
+
+    def test_warnings_never_sampled(self):
+        """Test records at WARNING and above always pass / 测试警告及以上总是通过"""
+        sampler = LogSampler(sample_rate=0.0, rate_limit=0.0)
+
+        assert sampler.filter(_record(level=logging.ERROR))
+        assert not sampler.filter(_record(level=logging.INFO))
+        assert sampler.dropped == 1
+
+    def test_rate_limit(self):
+        """Test token bucket rate limiting / 测试令牌桶限速"""
+        with patch("src.shared.logger.time.monotonic", return_value=100.0):
+            sampler = LogSampler(rate_limit=3)
+            passed = sum(sampler.filter(_record()) for _ in range(10))
+
+        assert passed == 3
+        assert sampler.dropped == 7
+
+        with patch("src.shared.logger.time.monotonic", return_value=101.0):
+            assert sampler.filter(_record())
+
+    def test_sample_rate(self):
+        """Test probabilistic sampling / 测试概率采样"""
+        sampler = LogSampler(sample_rate=0.5)
+        with patch("src.shared.logger.random.random", side_effect=[0.1, 0.9]):
+            assert sampler.filter(_record())
+            assert not sampler.filter(_record())
@@ -0,0 +1,116 @@
+"""
+Unit tests for market stats module / 市场统计模块单元测试
+
+Tests for rolling realized volatility, EWMA volatility and spread statistics.
+测试滚动已实现波动率、EWMA 波动率和价差统计。
+
+Owner: Agent QA
+"""
+
+import math
+
+import pytest
+
+from src.shared.market_stats import (
+    MarketStatsEngine,
+    RollingSum,
+    SymbolStats,
+    normalize_symbol,
+)
+
+
+class TestRollingSum:
+    """Test RollingSum class / 测试 RollingSum 类"""
+
+    def test_expires_old_buckets(self):
+        """Test values leave the window / 测试数值移出窗口"""
+        window = RollingSum(60, buckets=6)
+        window.add(1.0, 0)
+        window.add(2.0, 30)
+
+        assert window.totals(30) == (3.0, 2)
+        assert window.totals(65) == (2.0, 1)
+        assert window.totals(1000) == (0.0, 0)
+
+    def test_ignores_values_older_than_window(self):
+        """Test late values outside the window are dropped / 测试丢弃窗口外的迟到数值"""
+        window = RollingSum(60, buckets=6)
+        window.add(1.0, 500)
+        window.add(5.0, 100)
+
+        assert window.totals(500) == (1.0, 1)
+
+
+class TestSymbolStats:
+    """Test SymbolStats class / 测试 SymbolStats 类"""
+
+    def test_realized_volatility(self):
+        """Test vol equals sqrt of summed squared log returns / 测试波动率为对数收益平方和的平方根"""
+        stats = SymbolStats()
+        prices = [100.0, 101.0, 100.0, 102.0, 101.0]
+        for i, price in enumerate(prices):
+            stats.update(price, ts=i * 10.0)
+
+        expected = math.sqrt(
+            sum(math.log(b / a) ** 2 for a, b in zip(prices, prices[1:]))
+        )
+        # 40s of history scaled to the 60s window
+        assert stats.realized_volatility("1m", 40.0) == pytest.approx(
+            expected * math.sqrt(60 / 40)
+        )
+        assert stats.realized_volatility("1h", 40.0) == pytest.approx(
+            expected * math.sqrt(3600 / 40)
+        )
+
+    def test_needs_returns_before_reporting(self):
+        """Test None until enough returns / 测试收益不足时返回 None"""
+        stats = SymbolStats()
+        stats.update(100.0, ts=0.0)
+        stats.update(101.0, ts=1.0)
+
+        snapshot = stats.snapshot(1.0)
+        assert snapshot["volatility_1h"] is None
+        assert snapshot["ewma_volatility_1h"] is not None
+
+    def test_short_window_expires(self):
+        """Test 1m vol drops out while 1h remains / 测试 1m 波动率过期而 1h 保留"""
+        stats = SymbolStats()
+        for i, price in enumerate([100.0, 101.0, 100.0]):
+            stats.update(price, ts=float(i))
+
+        snapshot = stats.snapshot(300.0)
+        assert snapshot["volatility_1m"] is None
+        assert snapshot["volatility_1h"] > 0
+
+    def test_spread_stats(self):
+        """Test spread in bps / 测试价差（基点）"""
+        stats = SymbolStats()
+        stats.update(100.0, ts=0.0, best_bid=99.99, best_ask=100.01)
+        stats.update(100.0, ts=1.0, best_bid=99.97, best_ask=100.03)
+
+        snapshot = stats.snapshot(1.0)
+        assert snapshot["spread_bps"] == pytest.approx(6.0)
+        assert snapshot["spread_bps_mean_1h"] == pytest.approx(4.0)
+        assert 2.0 < snapshot["spread_bps_ewma"] < 6.0
+
+
+class TestMarketStatsEngine:
+    """Test MarketStatsEngine class / 测试 MarketStatsEngine 类"""
+
+    def test_symbols_share_normalized_key(self):
+        """Test symbol formats map to one series / 测试不同格式的交易对映射到同一序列"""
+        engine = MarketStatsEngine(clock=lambda: 0.0)
+        engine.update("ETH/USDT:USDT", {"mid_price": 2000.0}, ts=0.0)
+        engine.update("ETHUSDT", {"mid_price": 2010.0}, ts=1.0)
+
+        assert normalize_symbol("eth/usdt:usdt") == "ETHUSDT"
+        assert engine.get("ETHUSDT", ts=1.0)["samples"] == 2
+        assert engine.get("BTCUSDT") == {}
+
+    def test_ignores_missing_mid(self):
+        """Test invalid market data is ignored / 测试忽略无效行情"""
+        engine = MarketStatsEngine()
+        engine.update("ETHUSDT", {"mid_price": None})
+        engine.update("ETHUSDT", None)
+
+        assert engine.get_all() == {}
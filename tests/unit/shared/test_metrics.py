@@ -7,6 +7,7 @@ Tests for exchange metrics tracking, latency buckets, and error rates.
 Owner: Agent QA
 """
 
+import threading
 import time
 from unittest.mock import patch
 
@@ -16,6 +17,7 @@ from src.shared.exchange_metrics import (
     ExchangeMetrics,
     ExchangeName,
     LatencyBucket,
+    LatencyHistogram,
     MetricsCollector,
     OperationType,
     metrics_collector,
@@ -46,6 +48,81 @@ class TestLatencyBucket:
         assert bucket.avg_latency == 0.0
 
 
+class TestLatencyHistogram:
+    """Test log-bucketed latency histograms / 测试对数分桶延迟直方图"""
+
+    def test_percentiles_within_relative_error(self):
+        """Test percentile accuracy / 测试百分位精度"""
+        hist = LatencyHistogram()
+        for ms in range(1, 1001):
+            hist.record(ms / 1000)
+
+        assert hist.total == 1000
+        assert hist.percentile(50) == pytest.approx(0.5, rel=0.03)
+        assert hist.percentile(99) == pytest.approx(0.99, rel=0.03)
+        assert hist.percentile(99.9) == pytest.approx(0.999, rel=0.03)
+
+    def test_empty_and_out_of_range(self):
+        """Test empty histogram and extreme values / 测试空直方图和极端值"""
+        hist = LatencyHistogram()
+        assert hist.percentile(50) is None
+
+        hist.record(0.0)
+        hist.record(1e9)
+        assert hist.percentile(1) == pytest.approx(1e-6)
+        assert hist.percentile(100) > 900
+
+    def test_merge_and_clear(self):
+        """Test merging counts / 测试合并计数"""
+        a, b = LatencyHistogram(), LatencyHistogram()
+        a.record(0.001)
+        b.record(0.1)
+        b.record(0.1)
+
+        a.merge(b)
+        assert a.total == 3
+        assert a.percentile(90) == pytest.approx(0.1, rel=0.03)
+
+        a.clear()
+        assert a.total == 0
+        assert a.percentile(50) is None
+
+
+class TestLatencyBucketWindows:
+    """Test time-windowed latency percentiles / 测试时间窗口延迟百分位"""
+
+    def test_windows_rotate(self):
+        """Test 1m/5m/1h windows / 测试 1m/5m/1h 窗口"""
+        clock = [1000.0]
+        bucket = LatencyBucket(clock=lambda: clock[0])
+        bucket.add(1.0)
+        clock[0] += 120  # 2 minutes later
+        bucket.add(0.01)
+
+        assert bucket.window_histogram("1m").total == 1
+        assert bucket.window_histogram("5m").total == 2
+        assert bucket.window_histogram("1h").total == 2
+        assert bucket.percentile(50, window="1m") == pytest.approx(0.01, rel=0.03)
+
+        clock[0] += 3 * 3600
+        assert bucket.window_histogram("1h").total == 0
+        assert bucket.percentile(50) is not None
+
+    def test_percentiles_in_summary(self):
+        """Test p50/p90/p99/p999 in get_summary / 测试 get_summary 中的百分位"""
+        metrics = ExchangeMetrics(exchange=ExchangeName.BINANCE)
+        for ms in range(1, 101):
+            metrics.record_success(OperationType.PLACE_ORDER, ms / 1000)
+
+        op = metrics.get_summary()["operations"]["place_order"]
+
+        for key in ("p50_ms", "p90_ms", "p99_ms", "p999_ms"):
+            assert key in op
+        assert op["p99_ms"] == pytest.approx(99.0, rel=0.03)
+        assert op["p999_ms"] <= op["max_latency_ms"]
+        assert op["windows"]["1m"]["count"] == 100
+
+
 class TestExchangeMetrics:
     """Test ExchangeMetrics class / 测试 ExchangeMetrics 类"""
 
@@ -181,6 +258,81 @@ class TestMetricsCollector:
         assert health["binance"]["is_healthy"] is True
         assert health["binance"]["error_rate"] == 0.0
 
+    def test_record_order_actions(self):
+        """Test per-cycle order action counts / 测试每周期订单操作计数"""
+        collector = MetricsCollector()
+        collector.record_order_actions("default", cancels=2, places=2, amends=1)
+        collector.record_order_actions("default", cancels=0, places=0, amends=3)
+
+        summary = collector.get_order_action_summary()["default"]
+
+        assert summary["cycles"] == 2
+        assert summary["last_cycle"] == {"cancel": 0, "place": 0, "amend": 3}
+        assert summary["totals"] == {"cancel": 2, "place": 2, "amend": 4}
+
+
+class TestMetricsCollectorConcurrency:
+    """Test sharded MetricsCollector under threads / 测试多线程下的分片收集器"""
+
+    def test_concurrent_records_are_not_lost(self):
+        """Test no updates are lost across threads / 测试跨线程不丢失更新"""
+        collector = MetricsCollector()
+        per_thread = 2000
+        threads = [
+            threading.Thread(
+                target=lambda: [
+                    collector.record_success(
+                        ExchangeName.BINANCE, OperationType.MARKET_DATA, 0.01
+                    )
+                    for _ in range(per_thread)
+                ]
+            )
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        # Read while writers are running
+        while any(t.is_alive() for t in threads):
+            collector.get_all_metrics()
+        for t in threads:
+            t.join()
+
+        metrics = collector.get_metrics(ExchangeName.BINANCE)
+        bucket = metrics.latency_buckets[OperationType.MARKET_DATA]
+        assert metrics.total_requests == 8 * per_thread
+        assert bucket.count == 8 * per_thread
+        assert bucket.histogram.total == 8 * per_thread
+
+    def test_snapshot_merges_thread_shards(self):
+        """Test shards from finished threads are merged / 测试合并已结束线程的分片"""
+        collector = MetricsCollector()
+        worker = threading.Thread(
+            target=collector.record_error,
+            args=(ExchangeName.BINANCE, OperationType.PLACE_ORDER, "late"),
+        )
+        collector.record_success(ExchangeName.BINANCE, OperationType.PLACE_ORDER, 0.2)
+        worker.start()
+        worker.join()
+
+        summary = collector.get_all_metrics()["binance"]
+        # A second read after the dead thread's shard was retired
+        again = collector.get_all_metrics()["binance"]
+
+        assert summary["total_requests"] == again["total_requests"] == 2
+        assert summary["total_errors"] == 1
+        assert summary["last_error_message"] == "late"
+        assert summary["operations"]["place_order"]["count"] == 1
+        assert summary["operations"]["place_order"]["error_count"] == 1
+
+    def test_get_metrics_is_snapshot(self):
+        """Test get_metrics returns a copy / 测试 get_metrics 返回副本"""
+        collector = MetricsCollector()
+        snapshot = collector.get_metrics(ExchangeName.BINANCE)
+        collector.record_success(ExchangeName.BINANCE, OperationType.MARKET_DATA, 0.1)
+
+        assert snapshot.total_requests == 0
+        assert collector.get_metrics(ExchangeName.BINANCE).total_requests == 1
+
 
 class TestTrackExchangeOperation:
     """Test track_exchange_operation decorator / 测试 track_exchange_operation 装饰器"""
@@ -0,0 +1,148 @@
+"""
+Unit tests for OpenMetrics module / OpenMetrics 模块单元测试
+
+Tests for counters, gauges, histograms, cardinality guards and text rendering.
+测试计数器、仪表、直方图、基数保护和文本渲染。
+
+Owner: Agent QA
+"""
+
+import pytest
+
+from src.shared.exchange_metrics import ExchangeName, MetricsCollector, OperationType
+from src.shared.latency import LatencyTracker, TickToTradeTimer
+from src.shared.openmetrics import OVERFLOW_LABEL_VALUE, OpenMetricsRegistry
+
+
+class TestOpenMetricsRegistry:
+    """Test OpenMetricsRegistry class / 测试 OpenMetricsRegistry 类"""
+
+    def test_counter_renders_total_suffix(self):
+        """Test counter exposition / 测试计数器导出"""
+        registry = OpenMetricsRegistry()
+        counter = registry.counter("mm_cycles", "Cycles run", ["outcome"])
+        counter.labels(outcome="ok").inc()
+        counter.labels(outcome="ok").inc(2)
+
+        text = registry.render()
+
+        assert "# TYPE mm_cycles counter" in text
+        assert "# HELP mm_cycles Cycles run" in text
+        assert 'mm_cycles_total{outcome="ok"} 3' in text
+        assert text.endswith("# EOF\n")
+
+    def test_counter_rejects_negative(self):
+        """Test counters only increase / 测试计数器只能递增"""
+        registry = OpenMetricsRegistry()
+        with pytest.raises(ValueError):
+            registry.counter("mm_c", "c").inc(-1)
+
+    def test_gauge_set(self):
+        """Test gauge exposition / 测试仪表导出"""
+        registry = OpenMetricsRegistry()
+        registry.gauge("mm_position", "Position", ["symbol"]).labels(
+            symbol="ETHUSDT"
+        ).set(-0.5)
+
+        assert 'mm_position{symbol="ETHUSDT"} -0.5' in registry.render()
+
+    def test_histogram_cumulative_buckets(self):
+        """Test histogram buckets are cumulative / 测试直方图桶为累积值"""
+        registry = OpenMetricsRegistry()
+        hist = registry.histogram("mm_latency_seconds", "Latency", buckets=[0.1, 1.0])
+        for value in (0.05, 0.5, 0.5, 5.0):
+            hist.observe(value)
+
+        text = registry.render()
+
+        assert 'mm_latency_seconds_bucket{le="0.1"} 1' in text
+        assert 'mm_latency_seconds_bucket{le="1"} 3' in text
+        assert 'mm_latency_seconds_bucket{le="+Inf"} 4' in text
+        assert "mm_latency_seconds_count 4" in text
+        assert "mm_latency_seconds_sum 6.05" in text
+
+    def test_same_name_returns_same_metric(self):
+        """Test get-or-create semantics / 测试获取或创建语义"""
+        registry = OpenMetricsRegistry()
+        assert registry.counter("mm_x", "x") is registry.counter("mm_x", "x")
+        with pytest.raises(ValueError):
+            registry.gauge("mm_x", "x")
+
+    def test_cardinality_guard(self):
+        """Test series beyond max_series collapse into overflow / 测试超限序列合并"""
+        registry = OpenMetricsRegistry()
+        counter = registry.counter("mm_orders", "Orders", ["order_id"], max_series=3)
+        for i in range(10):
+            counter.labels(order_id=str(i)).inc()
+
+        text = registry.render()
+
+        # 3 real series plus the single overflow series
+        assert len(counter._series) == 4
+        assert counter.overflowed == 7
+        assert f'mm_orders_total{{order_id="{OVERFLOW_LABEL_VALUE}"}} 7' in text
+
+    def test_label_values_escaped(self):
+        """Test label escaping / 测试标签转义"""
+        registry = OpenMetricsRegistry()
+        registry.counter("mm_err", "Errors", ["type"]).labels(type='a"b').inc()
+
+        assert 'mm_err_total{type="a\\"b"} 1' in registry.render()
+
+    def test_collectors_run_at_render(self):
+        """Test collectors refresh gauges before render / 测试收集器在渲染前运行"""
+        registry = OpenMetricsRegistry()
+        gauge = registry.gauge("mm_g", "g")
+        registry.register_collector(lambda: gauge.set(7))
+
+        def broken():
+            raise RuntimeError("boom")
+
+        registry.register_collector(broken)
+
+        assert "mm_g 7" in registry.render()
+
+
+class TestOpenMetricsFeeds:
+    """Test components exporting to a registry / 测试组件导出到注册表"""
+
+    def test_metrics_collector_exports_requests(self):
+        """Test exchange requests are exported / 测试交易所请求导出"""
+        registry = OpenMetricsRegistry()
+        collector = MetricsCollector(registry)
+        collector.record_success(
+            ExchangeName.BINANCE, OperationType.PLACE_ORDER, 0.02
+        )
+        collector.record_error(
+            ExchangeName.BINANCE, OperationType.PLACE_ORDER, "rejected"
+        )
+
+        text = registry.render()
+
+        assert (
+            'mm_exchange_requests_total{exchange="binance",operation="place_order",'
+            'outcome="success"} 1' in text
+        )
+        assert 'outcome="error"} 1' in text
+        assert (
+            'mm_exchange_request_seconds_count{exchange="binance",'
+            'operation="place_order"} 1' in text
+        )
+        assert 'mm_exchange_healthy{exchange="binance"}' in text
+
+    def test_metrics_collector_without_registry(self):
+        """Test export is optional / 测试导出为可选"""
+        collector = MetricsCollector()
+        collector.record_success(ExchangeName.BINANCE, OperationType.PLACE_ORDER, 0.02)
+
+    def test_latency_tracker_exports_stages(self):
+        """Test tick-to-trade stages are exported / 测试行情到成交阶段导出"""
+        registry = OpenMetricsRegistry()
+        tracker = LatencyTracker(
+            histogram=registry.histogram("mm_t2t_seconds", "t2t", ["stage"])
+        )
+        timer = TickToTradeTimer(tick_at=1.0)
+        timer.decision_at = 1.001
+        tracker.record_timer(timer)
+
+        assert 'mm_t2t_seconds_count{stage="tick_to_decision"} 1' in registry.render()
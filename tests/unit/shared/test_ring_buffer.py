@@ -0,0 +1,79 @@
+"""
+Unit tests for ring buffer module / 环形缓冲区模块单元测试
+
+Tests for wrap-around, zero-copy views and typed columns.
+测试环绕、零拷贝视图和带类型列。
+
+Owner: Agent QA
+"""
+
+import numpy as np
+import pytest
+
+from src.shared.ring_buffer import RingBuffer
+
+
+class TestRingBuffer:
+    """Test RingBuffer class / 测试 RingBuffer 类"""
+
+    def test_append_and_index(self):
+        """Test appends and indexing / 测试追加和索引"""
+        buf = RingBuffer(3)
+        buf.append(1.0)
+        buf.append(2.0)
+
+        assert len(buf) == 2
+        assert buf[0] == 1.0
+        assert buf[-1] == 2.0
+        assert buf.tolist() == [1.0, 2.0]
+        with pytest.raises(IndexError):
+            buf[2]
+
+    def test_wraps_and_keeps_latest(self):
+        """Test oldest rows are overwritten / 测试覆盖最旧的行"""
+        buf = RingBuffer(4)
+        buf.extend(range(10))
+
+        assert buf.full
+        assert len(buf) == 4
+        assert buf.tolist() == [6.0, 7.0, 8.0, 9.0]
+        assert buf[0] == 6.0
+        assert buf[1:3] == [7.0, 8.0]
+
+    def test_view_is_contiguous_zero_copy(self):
+        """Test views share memory in order after wrapping / 测试环绕后视图零拷贝且有序"""
+        buf = RingBuffer(5)
+        buf.extend([1, 2, 3, 4, 5, 6, 7])
+
+        view = buf.view()
+
+        assert view.flags.c_contiguous
+        assert not view.flags.owndata
+        assert not view.flags.writeable
+        np.testing.assert_array_equal(view, [3, 4, 5, 6, 7])
+        np.testing.assert_array_equal(buf.view(last=2), [6, 7])
+        np.testing.assert_array_equal(np.diff(view), [1, 1, 1, 1])
+
+    def test_typed_columns(self):
+        """Test multi-column buffers / 测试多列缓冲区"""
+        buf = RingBuffer(2, {"timestamp": np.int64, "pnl": np.float64})
+        buf.append(1000, 1.5)
+        buf.append(timestamp=2000, pnl=-0.5)
+        buf.append(3000, 2.0)
+
+        assert buf.view("timestamp").dtype == np.int64
+        assert buf.tolist() == [[2000, -0.5], [3000, 2.0]]
+        assert buf[-1] == [3000, 2.0]
+        with pytest.raises(ValueError):
+            buf.view()
+        with pytest.raises(ValueError):
+            buf.append(1)
+
+    def test_clear(self):
+        """Test clear drops rows / 测试清空"""
+        buf = RingBuffer(3)
+        buf.extend([1, 2])
+        buf.clear()
+
+        assert len(buf) == 0
+        assert buf.view().size == 0
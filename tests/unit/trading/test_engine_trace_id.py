@@ -13,6 +13,7 @@ import pytest
 
 from src.shared.tracing import generate_trace_id, set_trace_id
 from src.trading.engine import AlphaLoop
+from src.trading.order_manager import OrderDiff
 
 
 class TestEngineErrorHistoryTraceId:
@@ -90,18 +91,16 @@ class TestEngineErrorHistoryTraceId:
         
         # Mock OrderManager to return orders to place
         # Mock OrderManager 以返回要放置的订单
-        # sync_orders returns (order_ids_to_cancel, orders_to_place)
-        # sync_orders 返回 (order_ids_to_cancel, orders_to_place)
+        # diff_orders returns an OrderDiff with orders_to_place
+        # diff_orders 返回包含 orders_to_place 的 OrderDiff
         mock_order_manager = Mock()
-        # sync_orders returns (order_ids_to_cancel, orders_to_place)
-        # sync_orders 返回 (order_ids_to_cancel, orders_to_place)
         # Orders must have 'quantity' field for place_orders
         # 订单必须有 'quantity' 字段以供 place_orders 使用
         orders_to_place = [
             {"side": "BUY", "price": 100.0, "quantity": 0.1, "amount": 0.1},
             {"side": "SELL", "price": 101.0, "quantity": 0.1, "amount": 0.1},
         ]
-        mock_order_manager.sync_orders.return_value = ([], orders_to_place)
+        mock_order_manager.diff_orders.return_value = OrderDiff(place=orders_to_place)
         mock_order_manager_cls.return_value = mock_order_manager
 
         # Set trace_id
@@ -173,7 +172,7 @@ class TestEngineErrorHistoryTraceId:
         mock_strategy_cls.return_value = Mock()
         # Mock OrderManager
         mock_order_manager = Mock()
-        mock_order_manager.sync_orders.return_value = ([], [])
+        mock_order_manager.diff_orders.return_value = OrderDiff()
         mock_order_manager_cls.return_value = mock_order_manager
 
         # Set trace_id
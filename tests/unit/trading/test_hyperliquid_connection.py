@@ -944,3 +944,53 @@ class TestHyperliquidClientRateLimitRetry:
         # 验证重试成功
         assert result is not None
         assert result.get("status") == "ok"
+
+
+class TestHyperliquidClientBulkMarketData:
+    """Test bulk quotes keep the book / 测试批量行情保留订单簿"""
+
+    @patch.dict(
+        os.environ,
+        {
+            "HYPERLIQUID_API_KEY": "test_key",
+            "HYPERLIQUID_API_SECRET": "test_secret",
+        },
+    )
+    @patch("src.trading.hyperliquid_client.requests")
+    def test_bulk_market_data_reads_books_and_funding_once(self, mock_requests):
+        """Test each symbol gets bid/ask from l2Book and funding from one call"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"status": "ok"}
+        mock_requests.post.return_value = mock_response
+
+        from src.trading.hyperliquid_client import HyperliquidClient
+
+        client = HyperliquidClient()
+        books = {
+            "ETH": {"levels": [[{"px": "2999.5"}], [{"px": "3000.5"}]]},
+            "BTC": {"levels": [[{"px": "59990"}], [{"px": "60010"}]]},
+        }
+        funding = [
+            {"universe": [{"name": "ETH"}, {"name": "BTC"}]},
+            [{"funding": "0.0001"}, {"funding": "-0.0002"}],
+        ]
+
+        def respond(method, endpoint, data=None, public=False):
+            if data["type"] == "l2Book":
+                return books[data["coin"]]
+            if data["type"] == "metaAndAssetCtxs":
+                return funding
+            raise AssertionError(f"unexpected request {data}")
+
+        with patch.object(client, "_make_request", side_effect=respond) as request:
+            quotes = client.fetch_bulk_market_data(["ETH/USDT:USDT", "BTC/USDT:USDT"])
+
+        types = [c.kwargs["data"]["type"] for c in request.call_args_list]
+        assert types.count("metaAndAssetCtxs") == 1
+        assert types.count("l2Book") == 2
+        eth = quotes["ETH/USDT:USDT"]
+        assert (eth["best_bid"], eth["best_ask"]) == (2999.5, 3000.5)
+        assert eth["mid_price"] == 3000.0
+        assert eth["funding_rate"] == 0.0001
+        assert quotes["BTC/USDT:USDT"]["funding_rate"] == -0.0002
@@ -1169,3 +1169,80 @@ class TestHyperliquidClientOrderManagerIntegration:
 
         # Verify interface compatibility
         assert isinstance(result, list)
+
+
+class TestHyperliquidClientOrderAmend:
+    """Test in-place order modification / 测试原地改单"""
+
+    @patch.dict(
+        os.environ,
+        {
+            "HYPERLIQUID_API_KEY": "test_key",
+            "HYPERLIQUID_API_SECRET": "test_secret",
+        },
+    )
+    @patch("src.trading.hyperliquid_client.requests")
+    def test_amend_order_sends_single_modify_action(self, mock_requests):
+        """Amend sends one modify request and keeps the order ID / 改单发送单个 modify 请求并保留订单 ID"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"status": "ok"}
+        mock_requests.post.return_value = mock_response
+
+        from src.trading.hyperliquid_client import HyperliquidClient
+
+        client = HyperliquidClient()
+        mock_requests.post.reset_mock()
+
+        modify_response = MagicMock()
+        modify_response.status_code = 200
+        modify_response.json.return_value = {
+            "status": "ok",
+            "response": {"type": "default"},
+        }
+        mock_requests.post.return_value = modify_response
+
+        result = client.amend_order(
+            "12345", {"side": "buy", "price": 3001.0, "quantity": 0.01}
+        )
+
+        assert result["id"] == "12345"
+        assert result["price"] == 3001.0
+        assert mock_requests.post.call_count == 1
+        payload = mock_requests.post.call_args.kwargs["json"]
+        assert payload["action"]["type"] == "modify"
+        assert payload["action"]["oid"] == 12345
+        assert payload["action"]["order"]["p"] == "3001.0"
+
+    @patch.dict(
+        os.environ,
+        {
+            "HYPERLIQUID_API_KEY": "test_key",
+            "HYPERLIQUID_API_SECRET": "test_secret",
+        },
+    )
+    @patch("src.trading.hyperliquid_client.requests")
+    def test_amend_order_rejected_returns_none(self, mock_requests):
+        """Rejected amend returns None so caller can replace / 改单被拒时返回 None"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"status": "ok"}
+        mock_requests.post.return_value = mock_response
+
+        from src.trading.hyperliquid_client import HyperliquidClient
+
+        client = HyperliquidClient()
+
+        error_response = MagicMock()
+        error_response.status_code = 200
+        error_response.json.return_value = {
+            "status": "err",
+            "response": "Cannot modify canceled or filled order",
+        }
+        mock_requests.post.return_value = error_response
+
+        result = client.amend_order(
+            "12345", {"side": "buy", "price": 3001.0, "quantity": 0.01}
+        )
+
+        assert result is None
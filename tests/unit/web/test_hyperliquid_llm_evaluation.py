@@ -15,6 +15,7 @@ import pytest
 from fastapi.testclient import TestClient
 
 import server
+from src.ai.evaluation.store import EvaluationStore
 from src.trading.hyperliquid_client import HyperliquidClient
 from src.trading.exchange import BinanceClient
 
@@ -486,9 +487,7 @@ class TestHyperliquidApplyAPI:
 
         # Mock evaluation results
         # 模拟评估结果
-        with patch("server._last_evaluation_results", []), patch(
-            "server._last_evaluation_aggregated", None
-        ):
+        with patch("server.get_evaluation_store", return_value=EvaluationStore()):
             client = TestClient(server.app)
 
             # Note: Apply API may need to be updated to accept exchange parameter